@@ -0,0 +1,174 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Command line options, result files and baseline comparison shared by all benchmarks.
+
+All benchmarks store their results in the same JSON format:
+
+    {"metadata": {...}, "results": {"<case>": {"status": "ok", "<metric>": <value>, ...}}}
+
+The metrics ending with `_s` (time) and `_mb` (memory) are the costs compared with a baseline,
+where higher values are regressions. The other metrics (e.g. the amount of generated edges) are
+stored to describe each case, but they are not compared.
+
+Usage, from each benchmark script:
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\\n\\n")[0].strip())
+    add_common_arguments(parser, default_repeat=5)
+    args = parser.parse_args()
+    results = {"case": keep_best_run(lambda: measure_case(...), args.repeat)}
+    store_and_compare_results(results, args)
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable, Dict, List, Optional
+
+# The suffixes of the metrics that are compared with the baseline
+COST_METRICS_SUFFIXES = ("_s", "_mb")
+
+
+def add_common_arguments(parser: argparse.ArgumentParser, default_repeat: int) -> None:
+    """Add the options for repeating the runs, storing the results and comparing them."""
+    parser.add_argument(
+        "--repeat", type=int, default=default_repeat, help="Runs for each benchmark case."
+    )
+    parser.add_argument("--output", type=str, help="JSON file where to store the results.")
+    parser.add_argument("--baseline", type=str, help="JSON file with the results to compare to.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative increase of time or memory reported as a regression.",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with an error code if any regression is found.",
+    )
+
+
+def is_cost_metric(metric_name: str, value: Any) -> bool:
+    """Check if a metric is a time or memory cost, that is compared with the baseline."""
+    return (
+        metric_name.endswith(COST_METRICS_SUFFIXES)
+        and isinstance(value, (int, float))
+        and not isinstance(value, bool)
+    )
+
+
+def time_call(function: Callable[..., Any], *args: Any) -> float:
+    """Get the time in seconds spent to call the function with the provided arguments."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def keep_best_run(measure: Callable[[], Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    """
+    Run a measurement `repeat` times, keeping the lowest value of each cost metric.
+
+    The other metrics are expected to be the same in all runs: the ones of the last run are kept.
+    """
+    assert repeat > 0, f"The amount of repetitions must be positive, found {repeat}."
+    results: Dict[str, Any] = {}
+    for run_idx in range(repeat):
+        run_results = measure()
+        if run_results.get("status", "ok") != "ok":
+            return run_results
+        for metric_name, value in run_results.items():
+            if run_idx > 0 and is_cost_metric(metric_name, value):
+                value = min(results[metric_name], value)
+            results[metric_name] = value
+    return {"status": "ok", **results}
+
+
+def _get_as2fm_version() -> Optional[str]:
+    try:
+        return version("as2fm")
+    except PackageNotFoundError:
+        return None
+
+
+def get_metadata(repeat: int) -> Dict[str, Any]:
+    """Describe the environment the benchmarks are running in."""
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "as2fm": _get_as2fm_version(),
+        "repeat": repeat,
+    }
+
+
+def compare_results(
+    new_results: Dict[str, Any], baseline_results: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Print a comparison between two benchmark runs.
+
+    :param new_results: The results of the current run.
+    :param baseline_results: The results of the reference run.
+    :param threshold: The relative increase (e.g. 0.1 for 10%) considered a regression.
+    :return: The cases having a time or memory regression.
+    """
+    regressions: List[str] = []
+    print(f"\n{'Case':<75} Ratio to the baseline")
+    for case_name, new_result in new_results["results"].items():
+        old_result = baseline_results["results"].get(case_name)
+        if old_result is None or new_result["status"] != "ok" or old_result["status"] != "ok":
+            old_status = "missing" if old_result is None else old_result["status"]
+            print(f"{case_name:<75} new: {new_result['status']}, baseline: {old_status}")
+            continue
+        ratios = {
+            metric_name: value / old_result[metric_name]
+            for metric_name, value in new_result.items()
+            if is_cost_metric(metric_name, value) and old_result.get(metric_name, 0) > 0
+        }
+        is_regression = any(ratio > 1.0 + threshold for ratio in ratios.values())
+        if is_regression:
+            regressions.append(case_name)
+        print(
+            f"{case_name:<75} "
+            + ", ".join(f"{metric_name} {ratio:.2f}x" for metric_name, ratio in ratios.items())
+            + ("  <-- REGRESSION" if is_regression else "")
+        )
+    return regressions
+
+
+def store_and_compare_results(results: Dict[str, Dict[str, Any]], args: argparse.Namespace):
+    """
+    Store the results of the benchmark cases, and compare them to the baseline (if provided).
+
+    :param results: The results of each benchmark case.
+    :param args: The parsed command line options, as defined by `add_common_arguments`.
+    """
+    new_results = {"metadata": get_metadata(args.repeat), "results": results}
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(new_results, f, indent=2)
+    if args.baseline is not None:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline_results = json.load(f)
+        regressions = compare_results(new_results, baseline_results, args.threshold)
+        print(f"\nFound {len(regressions)} regressions (threshold {args.threshold:.0%}).")
+        if args.fail_on_regression and len(regressions) > 0:
+            sys.exit(1)
@@ -0,0 +1,168 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the conversion time and peak memory of `interpret_top_level_xml`.
+
+The suite covers all RoAML models in `test/jani_generator/_test_data` and `examples`, plus
+synthetic systems of increasing size (ROS nodes exchanging one topic each, generated with
+`as2fm.jani_generator.synthetic_model_generator`). Each conversion runs in a separate process,
+so that the peak RSS of different models does not affect each other.
+
+Usage:
+
+    # Run the whole suite and store the results
+    python benchmarks/bench_conversion.py --output baseline.json
+    # Run it again (e.g. after an update) and compare against the stored results
+    python benchmarks/bench_conversion.py --output new.json --baseline baseline.json
+
+Use `--filter` to select a subset of the models, and `--fail-on-regression` to get a non-zero
+exit code if any model got slower (or used more memory) than the allowed threshold.
+The other benchmarks in this folder store and compare their results in the same way, using the
+helpers in `bench_common.py`.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from bench_common import add_common_arguments, store_and_compare_results
+
+from as2fm.jani_generator.synthetic_model_generator import (
+    SyntheticModelConfig,
+    generate_synthetic_model,
+)
+
+REPO_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+MODELS_DIRS = [
+    os.path.join(REPO_DIR, "test", "jani_generator", "_test_data"),
+    os.path.join(REPO_DIR, "examples"),
+]
+SYNTHETIC_PREFIX = "synthetic/nodes_"
+DEFAULT_SYNTHETIC_SIZES = [10, 50, 100]
+
+
+def find_roaml_models() -> List[str]:
+    """Find all RoAML main files in the models directories, relative to the repository root."""
+    roaml_files: List[str] = []
+    for models_dir in MODELS_DIRS:
+        for dir_path, _, file_names in os.walk(models_dir):
+            for file_name in file_names:
+                if not file_name.endswith(".xml"):
+                    continue
+                file_path = os.path.join(dir_path, file_name)
+                with open(file_path, "r", encoding="utf-8") as f:
+                    file_head = f.read(1000)
+                if "<roaml" in file_head or "<convince_mc_tc" in file_head:
+                    roaml_files.append(os.path.relpath(file_path, REPO_DIR))
+    return sorted(roaml_files)
+
+
+def run_conversion(roaml_xml: str) -> Dict[str, float]:
+    """Convert a single model (in the current process), measuring time and peak memory."""
+    from as2fm.jani_generator.scxml_helpers.top_level_interpreter import interpret_top_level_xml
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        jani_file = os.path.join(output_dir, "main.jani")
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            interpret_top_level_xml(roaml_xml, jani_file=jani_file)
+        elapsed_time = time.perf_counter() - start_time
+    return {
+        "time_s": elapsed_time,
+        # On Linux, ru_maxrss is expressed in kB
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10,
+    }
+
+
+def benchmark_model(roaml_xml: str, repeat: int) -> Dict[str, Any]:
+    """Convert a model `repeat` times, each in a new process, and get the median results."""
+    runs: List[Dict[str, float]] = []
+    for _ in range(repeat):
+        process_out = subprocess.run(
+            [sys.executable, __file__, "--run-single", roaml_xml],
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+        if process_out.returncode != 0:
+            error_lines = process_out.stderr.strip().splitlines()
+            return {"status": "error", "error": error_lines[-1] if error_lines else "unknown"}
+        runs.append(json.loads(process_out.stdout.strip().splitlines()[-1]))
+    return {
+        "status": "ok",
+        "time_s": statistics.median(run["time_s"] for run in runs),
+        "peak_rss_mb": statistics.median(run["peak_rss_mb"] for run in runs),
+    }
+
+
+def run_suite(
+    name_filter: Optional[str], synthetic_sizes: List[int], repeat: int
+) -> Dict[str, Dict[str, Any]]:
+    """Run all selected benchmarks, printing the results while they become available."""
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as synthetic_dir:
+        cases: List[Tuple[str, str]] = [(model, model) for model in find_roaml_models()]
+        for n_nodes in synthetic_sizes:
+            case_name = f"{SYNTHETIC_PREFIX}{n_nodes}"
+            model_dir = os.path.join(synthetic_dir, case_name)
+            model_config = SyntheticModelConfig(n_nodes=n_nodes, n_topics=n_nodes)
+            cases.append((case_name, generate_synthetic_model(model_config, model_dir)))
+        for case_name, roaml_xml in cases:
+            if name_filter is not None and name_filter not in case_name:
+                continue
+            results[case_name] = benchmark_model(os.path.join(REPO_DIR, roaml_xml), repeat)
+            print(f"{case_name}: {_format_result(results[case_name])}", flush=True)
+    return results
+
+
+def _format_result(result: Dict[str, Any]) -> str:
+    if result["status"] != "ok":
+        return f"error ({result['error']})"
+    return f"{result['time_s']:8.3f} s, peak RSS {result['peak_rss_mb']:7.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    add_common_arguments(parser, default_repeat=3)
+    parser.add_argument("--filter", type=str, help="Only run the models containing this string.")
+    parser.add_argument(
+        "--synthetic-sizes",
+        type=int,
+        nargs="*",
+        default=DEFAULT_SYNTHETIC_SIZES,
+        help="Amount of nodes of the generated synthetic models.",
+    )
+    parser.add_argument("--run-single", type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run_single is not None:
+        print(json.dumps(run_conversion(args.run_single)))
+        return
+    assert args.repeat > 0, f"The amount of repetitions must be positive, found {args.repeat}."
+    results = run_suite(args.filter, args.synthetic_sizes, args.repeat)
+    store_and_compare_results(results, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the ECMAScript subset parser and printer against `esprima` and `escodegen`.
+
+The expressions are collected from the `expr` and `cond` attributes of all models in
+`test` and `examples`. Each expression is parsed as done by `parse_expression_to_ast` (i.e.
+`value = <expr>`), without using the parsing cache. Before timing, the benchmark checks that the
+subset parser and printer generate the same AST and code as `esprima` and `escodegen`.
+
+Usage: python benchmarks/bench_ecmascript_parsing.py [--repeat N] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import escodegen
+import esprima
+from lxml import etree
+
+from as2fm.as2fm_common.ecmascript_fast_parser import (
+    UnsupportedEcmascriptSyntax,
+    parse_script_subset,
+    print_expression_subset,
+)
+
+REPO_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+MODELS_DIRS = [os.path.join(REPO_DIR, "test"), os.path.join(REPO_DIR, "examples")]
+MODELS_EXTENSIONS = (".scxml", ".ascxml", ".xml")
+EXPRESSION_ATTRIBUTES = ("expr", "cond")
+
+
+def collect_expressions() -> List[str]:
+    """Collect the unique expressions found in the models, sorted alphabetically."""
+    expressions = set()
+    for models_dir in MODELS_DIRS:
+        for dir_path, _, file_names in os.walk(models_dir):
+            for file_name in file_names:
+                if not file_name.endswith(MODELS_EXTENSIONS):
+                    continue
+                try:
+                    xml_tree = etree.parse(os.path.join(dir_path, file_name))
+                except etree.XMLSyntaxError:
+                    continue
+                for xml_elem in xml_tree.iter():
+                    for attribute in EXPRESSION_ATTRIBUTES:
+                        expr = xml_elem.get(attribute)
+                        if expr is not None and len(expr.strip()) > 0:
+                            expressions.add(expr)
+    return sorted(expressions)
+
+
+def _escodegen_print(node: esprima.nodes.Node) -> str:
+    return escodegen.generate(node, options={"format": {"newline": "", "indent": {"style": ""}}})
+
+
+def check_equivalence(expressions: List[str]) -> Dict[str, List[str]]:
+    """
+    Compare the output of the subset parser and printer with the one of esprima and escodegen.
+
+    :return: The expressions that are not supported and the ones with a different result.
+    """
+    results: Dict[str, List[str]] = {"unsupported": [], "mismatch": []}
+    for expr in expressions:
+        script = f"value = {expr}"
+        try:
+            reference_ast = esprima.parseScript(script)
+        except esprima.error_handler.Error:
+            # Not valid ECMAScript, will be reported by esprima in any case
+            continue
+        try:
+            subset_ast = parse_script_subset(script)
+        except UnsupportedEcmascriptSyntax:
+            results["unsupported"].append(expr)
+            continue
+        if subset_ast.toDict() != reference_ast.toDict():
+            results["mismatch"].append(expr)
+            continue
+        expr_node = reference_ast.body[0].expression.right
+        try:
+            if print_expression_subset(expr_node) != _escodegen_print(expr_node):
+                results["mismatch"].append(expr)
+        except UnsupportedEcmascriptSyntax:
+            pass
+    return results
+
+
+def _time_calls(function: Callable[[Any], Any], inputs: List[Any], repeat: int) -> float:
+    """Get the lowest time required to call the function on all inputs, over `repeat` runs."""
+    best_time = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for entry in inputs:
+            function(entry)
+        best_time = min(best_time, time.perf_counter() - start)
+    return best_time
+
+
+def run_benchmark(expressions: List[str], repeat: int) -> Dict[str, Any]:
+    """Time parsing and printing of the supported expressions with both implementations."""
+    scripts = []
+    for expr in expressions:
+        try:
+            parse_script_subset(f"value = {expr}")
+        except UnsupportedEcmascriptSyntax:
+            continue
+        scripts.append(f"value = {expr}")
+    nodes = []
+    for script in scripts:
+        expr_node = esprima.parseScript(script).body[0].expression.right
+        try:
+            print_expression_subset(expr_node)
+        except UnsupportedEcmascriptSyntax:
+            continue
+        nodes.append(expr_node)
+    timings = {
+        "esprima_parse_s": _time_calls(esprima.parseScript, scripts, repeat),
+        "subset_parse_s": _time_calls(parse_script_subset, scripts, repeat),
+        "escodegen_print_s": _time_calls(_escodegen_print, nodes, repeat),
+        "subset_print_s": _time_calls(print_expression_subset, nodes, repeat),
+    }
+    return {"n_parsed_expressions": len(scripts), "n_printed_expressions": len(nodes), **timings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--repeat", type=int, default=5, help="Runs over all the expressions.")
+    parser.add_argument("--output", type=str, help="JSON file where to store the results.")
+    args = parser.parse_args()
+
+    expressions = collect_expressions()
+    equivalence = check_equivalence(expressions)
+    print(f"Found {len(expressions)} unique expressions.")
+    print(f"Unsupported by the subset parser: {len(equivalence['unsupported'])}.")
+    for expr in equivalence["mismatch"]:
+        print(f"Mismatch with esprima/escodegen: {expr}")
+    results = run_benchmark(expressions, args.repeat)
+    print(
+        f"Parsing {results['n_parsed_expressions']} expressions: "
+        f"esprima {results['esprima_parse_s'] * 1000:.1f} ms, "
+        f"subset {results['subset_parse_s'] * 1000:.1f} ms "
+        f"(x{results['esprima_parse_s'] / results['subset_parse_s']:.1f})."
+    )
+    print(
+        f"Printing {results['n_printed_expressions']} expressions: "
+        f"escodegen {results['escodegen_print_s'] * 1000:.1f} ms, "
+        f"subset {results['subset_print_s'] * 1000:.1f} ms "
+        f"(x{results['escodegen_print_s'] / results['subset_print_s']:.1f})."
+    )
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({**results, **equivalence}, f, indent=2)
+    if len(equivalence["mismatch"]) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
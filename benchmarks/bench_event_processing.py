@@ -0,0 +1,132 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the processing of the SCXML events on a large, synthetic JANI model.
+
+The benchmark generates N automata, as obtained from the SCXML conversion of a synthetic system:
+- node automata, each one publishing a topic received by S other nodes, and waiting for an action
+  feedback that is never sent (whose edges are removed while processing the events),
+- service handler automata, each one with an empty self-loop that gets removed.
+
+It times the stages following the conversion of the single automata:
+- the implementation of the events as syncs (`implement_scxml_events_as_jani_syncs`),
+- the removal of the self-loops in the interface handlers,
+- the lookup of every automaton by name.
+
+Usage: python benchmarks/bench_event_processing.py [--automata N] [--subscribers S] [--repeat N]
+
+The results are stored and compared with a baseline as in the other benchmarks: see
+`bench_common.py` for the related options.
+"""
+
+import argparse
+from typing import Any, Dict, List, Tuple
+
+from bench_common import (
+    add_common_arguments,
+    keep_best_run,
+    store_and_compare_results,
+    time_call,
+)
+
+from as2fm.jani_generator.jani_entries import JaniAutomaton, JaniEdge, JaniModel
+from as2fm.jani_generator.ros_helpers.ros_communication_handler import (
+    remove_empty_self_loops_from_interface_handlers_in_jani,
+)
+from as2fm.jani_generator.scxml_helpers.scxml_event import Event, EventsHolder
+from as2fm.jani_generator.scxml_helpers.scxml_event_processor import (
+    implement_scxml_events_as_jani_syncs,
+)
+
+# One automaton out of this amount is a service handler, all others are nodes
+HANDLERS_RATIO = 5
+
+
+def _generate_edge(location: str, action: str) -> JaniEdge:
+    return JaniEdge(
+        {"location": location, "action": action, "destinations": [{"location": location}]}
+    )
+
+
+def generate_model(n_automata: int, n_subscribers: int) -> Tuple[JaniModel, EventsHolder]:
+    """Generate the automata and the events connecting them."""
+    jani_model = JaniModel()
+    events_holder = EventsHolder()
+    node_names: List[str] = []
+    for automaton_idx in range(n_automata):
+        automaton = JaniAutomaton()
+        automaton.add_location("idle", is_initial=True)
+        if automaton_idx % HANDLERS_RATIO == 0:
+            automaton.set_name(f"srv_handler_{automaton_idx}")
+            automaton.add_edge(_generate_edge("idle", f"srv_{automaton_idx}_loop"))
+        else:
+            automaton.set_name(f"node_{automaton_idx}")
+            node_names.append(automaton.get_name())
+        jani_model.add_jani_automaton(automaton)
+    for node_idx, node_name in enumerate(node_names):
+        node = jani_model.get_automaton(node_name)
+        topic_event = Event(f"topic_{node_idx}")
+        topic_event.add_sender_edge(node_name, f"{topic_event.name}_on_send")
+        node.add_edge(_generate_edge("idle", f"{topic_event.name}_on_send"))
+        for sub_offset in range(1, n_subscribers + 1):
+            subscriber_name = node_names[(node_idx + sub_offset) % len(node_names)]
+            topic_event.add_receiver(subscriber_name, f"{topic_event.name}_on_receive")
+            jani_model.get_automaton(subscriber_name).add_edge(
+                _generate_edge("idle", f"{topic_event.name}_on_receive")
+            )
+        events_holder.add_event(topic_event)
+        feedback_event = Event(f"action_{node_idx}_feedback")
+        feedback_event.add_receiver(node_name, f"{feedback_event.name}_on_receive")
+        node.add_edge(_generate_edge("idle", f"{feedback_event.name}_on_receive"))
+        events_holder.add_event(feedback_event)
+    return jani_model, events_holder
+
+
+def measure_event_processing(n_automata: int, n_subscribers: int) -> Dict[str, Any]:
+    """Process the events of a newly generated model, timing each stage."""
+    jani_model, events_holder = generate_model(n_automata, n_subscribers)
+    automata_names = [automaton.get_name() for automaton in jani_model.get_automata()]
+    events_time = time_call(implement_scxml_events_as_jani_syncs, events_holder, 0, jani_model)
+    self_loops_time = time_call(remove_empty_self_loops_from_interface_handlers_in_jani, jani_model)
+    lookup_time = time_call(lambda: [jani_model.get_automaton(name) for name in automata_names])
+    return {
+        "n_automata": len(jani_model.get_automata()),
+        "events_to_syncs_s": events_time,
+        "self_loops_removal_s": self_loops_time,
+        "automata_lookup_s": lookup_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--automata", type=int, default=500, help="Amount of automata.")
+    parser.add_argument("--subscribers", type=int, default=3, help="Subscribers per topic.")
+    add_common_arguments(parser, default_repeat=5)
+    args = parser.parse_args()
+
+    results = keep_best_run(
+        lambda: measure_event_processing(args.automata, args.subscribers), args.repeat
+    )
+    print(f"{args.automata} automata ({results['n_automata']} after processing the events):")
+    print(f"  events to syncs:     {results['events_to_syncs_s'] * 1000:.1f} ms")
+    print(f"  self-loops removal:  {results['self_loops_removal_s'] * 1000:.1f} ms")
+    print(f"  automata lookup:     {results['automata_lookup_s'] * 1000:.2f} ms")
+    case_name = f"automata_{args.automata}_subscribers_{args.subscribers}"
+    store_and_compare_results({case_name: results}, args)
+
+
+if __name__ == "__main__":
+    main()
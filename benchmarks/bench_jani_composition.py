@@ -0,0 +1,111 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the generation of the composition (i.e. the syncs) of a large JANI model.
+
+The benchmark generates N automata, each one with E edges, and a composition where each sync
+connects the actions of two automata, as done for the SCXML events. Some actions are left out of
+the composition, so that `JaniModel` needs to generate the missing syncs.
+It times the generation of the syncs, the completion of the missing ones and the serialization.
+
+Usage: python benchmarks/bench_jani_composition.py [--automata N] [--syncs S] [--repeat N]
+
+The results are stored and compared with a baseline as in the other benchmarks: see
+`bench_common.py` for the related options.
+"""
+
+import argparse
+from typing import Any, Dict
+
+from bench_common import (
+    add_common_arguments,
+    keep_best_run,
+    store_and_compare_results,
+    time_call,
+)
+
+from as2fm.jani_generator.jani_entries import JaniAutomaton, JaniComposition, JaniEdge, JaniModel
+
+
+def _generate_automaton(automaton_idx: int, n_actions: int) -> JaniAutomaton:
+    automaton = JaniAutomaton()
+    automaton.set_name(f"automaton_{automaton_idx}")
+    automaton.add_location("idle", is_initial=True)
+    for action_idx in range(n_actions):
+        automaton.add_edge(
+            JaniEdge(
+                {
+                    "location": "idle",
+                    "action": f"action_{automaton_idx}_{action_idx}",
+                    "destinations": [{"location": "idle"}],
+                }
+            )
+        )
+    return automaton
+
+
+def run_benchmark(n_automata: int, n_syncs: int) -> Dict[str, Any]:
+    """Build the composition of the generated automata, timing each step."""
+    # Each automaton has an action per sync it is involved in, plus one not synchronized
+    n_actions = 2 * n_syncs // n_automata + 1
+    jani_model = JaniModel()
+    for automaton_idx in range(n_automata):
+        jani_model.add_jani_automaton(_generate_automaton(automaton_idx, n_actions))
+    composition = JaniComposition()
+
+    def generate_syncs():
+        for automaton_idx in range(n_automata):
+            composition.add_element(f"automaton_{automaton_idx}")
+        for sync_idx in range(n_syncs):
+            sender_idx = sync_idx % n_automata
+            receiver_idx = (sync_idx + 1) % n_automata
+            action_idx = sync_idx // n_automata
+            composition.add_sync(
+                f"sync_{sync_idx}",
+                {
+                    f"automaton_{sender_idx}": f"action_{sender_idx}_{2 * action_idx}",
+                    f"automaton_{receiver_idx}": f"action_{receiver_idx}_{2 * action_idx + 1}",
+                },
+            )
+
+    syncs_time = time_call(generate_syncs)
+    missing_syncs_time = time_call(jani_model.add_system_sync, composition)
+    as_dict_time = time_call(composition.as_dict)
+    return {
+        "n_syncs": len(composition.as_dict()["syncs"]),
+        "syncs_s": syncs_time,
+        "missing_syncs_s": missing_syncs_time,
+        "as_dict_s": as_dict_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--automata", type=int, default=300, help="Amount of automata.")
+    parser.add_argument("--syncs", type=int, default=20000, help="Amount of explicit syncs.")
+    add_common_arguments(parser, default_repeat=3)
+    args = parser.parse_args()
+
+    results = keep_best_run(lambda: run_benchmark(args.automata, args.syncs), args.repeat)
+    print(f"{args.automata} automata, {results['n_syncs']} syncs in total:")
+    print(f"  explicit syncs generation: {results['syncs_s'] * 1000:.1f} ms")
+    print(f"  missing syncs generation:  {results['missing_syncs_s'] * 1000:.1f} ms")
+    print(f"  as_dict:                   {results['as_dict_s'] * 1000:.1f} ms")
+    store_and_compare_results({f"automata_{args.automata}_syncs_{args.syncs}": results}, args)
+
+
+if __name__ == "__main__":
+    main()
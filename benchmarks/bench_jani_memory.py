@@ -0,0 +1,155 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the memory retained by the JANI models generated (or loaded) by AS2FM.
+
+The benchmark measures the Python memory still allocated once the `JaniModel` is available (i.e.
+after the garbage collection of all temporary objects), and counts the instances of the classes
+in `as2fm.jani_generator.jani_entries`. Each model is processed in a separate process.
+
+The models can be provided as:
+- RoAML files (`main.xml`), converted to JANI. By default, `uc2_assembly` and a synthetic model.
+- JANI files (`*.jani`), loaded with `JaniModel.from_dict`.
+
+Usage: python benchmarks/bench_jani_memory.py [path/to/main.xml | path/to/model.jani ...]
+
+The results are stored and compared with a baseline as in the other benchmarks: see
+`bench_common.py` for the related options.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict
+
+from bench_common import add_common_arguments, keep_best_run, store_and_compare_results
+
+TEST_DATA_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "test", "jani_generator", "_test_data"
+)
+DEFAULT_MODELS = [os.path.join(TEST_DATA_DIR, "uc2_assembly", "main.xml"), "synthetic"]
+# The synthetic model used by default
+SYNTHETIC_MODEL_CONFIG = {
+    "n_nodes": 20,
+    "n_topics": 20,
+    "subscribers_per_topic": 3,
+    "bt_depth": 2,
+    "bt_width": 3,
+    "n_services": 2,
+    "n_actions": 2,
+    "array_size": 5,
+}
+JANI_ENTRIES_MODULE = "as2fm.jani_generator.jani_entries"
+
+
+def _load_jani_model(model_path: str) -> Any:
+    """Generate the JaniModel out of a RoAML or a JANI file."""
+    from as2fm.jani_generator.jani_entries import JaniModel
+
+    if model_path.endswith(".jani"):
+        with open(model_path, "r", encoding="utf-8") as jani_file:
+            return JaniModel.from_dict(json.load(jani_file))
+    from as2fm.jani_generator.scxml_helpers.roaml_model import RoamlMain
+    from as2fm.jani_generator.scxml_helpers.scxml_to_jani import convert_multiple_scxmls_to_jani
+    from as2fm.jani_generator.scxml_helpers.top_level_interpreter import (
+        generate_plain_scxml_models_and_timers,
+    )
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = RoamlMain(model_path).get_loaded_model()
+        plain_scxml_models = generate_plain_scxml_models_and_timers(model)
+        return convert_multiple_scxmls_to_jani(plain_scxml_models, model.max_array_size)
+
+
+def measure_model(model_path: str) -> Dict[str, Any]:
+    """Measure the memory retained by the JaniModel generated from the provided file."""
+    with tempfile.TemporaryDirectory() as synthetic_dir:
+        if model_path == "synthetic":
+            from as2fm.jani_generator.synthetic_model_generator import (
+                SyntheticModelConfig,
+                generate_synthetic_model,
+            )
+
+            model_path = generate_synthetic_model(
+                SyntheticModelConfig(**SYNTHETIC_MODEL_CONFIG), synthetic_dir
+            )
+        # Import all modules before measuring
+        _load_jani_model(model_path)
+        gc.collect()
+        tracemalloc.start()
+        jani_model = _load_jani_model(model_path)
+        gc.collect()
+        retained_memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    instances = Counter(
+        type(obj).__name__
+        for obj in gc.get_objects()
+        if str(type(obj).__dict__.get("__module__", "")).startswith(JANI_ENTRIES_MODULE)
+    )
+    del jani_model
+    return {"retained_mb": retained_memory / 2**20, "instances": dict(instances.most_common())}
+
+
+def measure_model_in_process(model_path: str) -> Dict[str, Any]:
+    """Run `measure_model` in a new process, not to count the memory of previous models."""
+    process_out = subprocess.run(
+        [sys.executable, __file__, "--single", model_path],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    if process_out.returncode != 0:
+        error_lines = process_out.stderr.strip().splitlines()
+        return {"status": "error", "error": error_lines[-1] if error_lines else "unknown"}
+    return json.loads(process_out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "models", nargs="*", default=DEFAULT_MODELS, help="RoAML or JANI files, or 'synthetic'."
+    )
+    add_common_arguments(parser, default_repeat=1)
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.single:
+        print(json.dumps(measure_model(args.models[0])))
+        return
+    all_results: Dict[str, Dict[str, Any]] = {}
+    for model_path in args.models:
+        model_name = model_path if model_path == "synthetic" else os.path.normpath(model_path)
+        results = keep_best_run(lambda: measure_model_in_process(model_path), args.repeat)
+        all_results[model_name] = results
+        print(f"Model: {model_name}")
+        if results["status"] != "ok":
+            print(f"  error ({results['error']})")
+            continue
+        print(f"  retained memory: {results['retained_mb']:.2f} MB")
+        for class_name, n_instances in results["instances"].items():
+            print(f"  {class_name:>20}: {n_instances}")
+    store_and_compare_results(all_results, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the repeated serialization of a JANI model, e.g. when writing one file per properties.
+
+Each JANI file is loaded with `JaniModel.from_dict`, then the benchmark times:
+- the first call to `JaniModel.as_dict`,
+- a second call, without changes in the model,
+- a third call, after changing the guard of one edge.
+
+Usage: python benchmarks/bench_jani_serialization.py [path/to/model.jani ...] [--repeat N]
+
+The results are stored and compared with a baseline as in the other benchmarks: see
+`bench_common.py` for the related options.
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict
+
+from bench_common import (
+    add_common_arguments,
+    keep_best_run,
+    store_and_compare_results,
+    time_call,
+)
+
+from as2fm.jani_generator.jani_entries import JaniExpression, JaniGuard, JaniModel
+
+DEFAULT_MODELS = [
+    os.path.join(
+        os.path.dirname(__file__),
+        "..",
+        "examples",
+        "tutorial_fetch_and_carry",
+        "sample_solutions_and_outputs",
+        "reference_main_probabilistic_extended_bt.jani",
+    )
+]
+
+
+def measure_model(model_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Load the model from its dictionary, and time each serialization step."""
+    jani_model = JaniModel.from_dict(model_dict)
+    timings = {"first_s": time_call(jani_model.as_dict)}
+    timings["unchanged_s"] = time_call(jani_model.as_dict)
+    changed_edge = next(
+        edge for automaton in jani_model.get_automata() for edge in automaton.get_edges()
+    )
+    changed_edge.guard = JaniGuard(JaniExpression(False))
+    timings["one_edge_changed_s"] = time_call(jani_model.as_dict)
+    n_edges = sum(len(automaton.get_edges()) for automaton in jani_model.get_automata())
+    return {"n_edges": n_edges, **timings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("models", nargs="*", default=DEFAULT_MODELS, help="JANI files.")
+    add_common_arguments(parser, default_repeat=20)
+    args = parser.parse_args()
+
+    all_results: Dict[str, Dict[str, Any]] = {}
+    for model_path in args.models:
+        with open(model_path, "r", encoding="utf-8") as jani_file:
+            model_dict = json.load(jani_file)
+        results = keep_best_run(lambda: measure_model(model_dict), args.repeat)
+        model_name = os.path.normpath(model_path)
+        all_results[model_name] = results
+        print(f"Model: {model_name} ({results['n_edges']} edges)")
+        print(f"  first as_dict:     {results['first_s'] * 1000:.2f} ms")
+        print(f"  unchanged as_dict: {results['unchanged_s'] * 1000:.2f} ms")
+        print(f"  one edge changed:  {results['one_edge_changed_s'] * 1000:.2f} ms")
+    store_and_compare_results(all_results, args)
+
+
+if __name__ == "__main__":
+    main()
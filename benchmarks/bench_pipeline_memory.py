@@ -0,0 +1,144 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the memory used for exporting the plain SCXML models and converting them to JANI.
+
+Each variant runs in a separate process, to get comparable peak RSS values:
+
+- `pipeline`: the current implementation, copying one SCXML model at a time.
+- `whole-copy`: additionally keeps a copy of all plain SCXML models (XML origins included)
+  alive during the export and the conversion, as done before copies were restricted to the
+  model being processed.
+
+Usage: python benchmarks/bench_pipeline_memory.py [path/to/main.xml ...]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from copy import deepcopy
+from typing import Any, Dict, List
+
+from lxml.etree import _Element as XmlElement
+
+DEFAULT_MODEL = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "test",
+    "jani_generator",
+    "_test_data",
+    "uc1_mission",
+    "main.xml",
+)
+VARIANTS = ("pipeline", "whole-copy")
+
+
+def _copy_with_xml_origins(scxml_models: List[Any]) -> List[Any]:
+    """Copy the SCXML models, including a copy of the XML (sub-)tree of each entry."""
+    copied_models = deepcopy(scxml_models)
+    memo: Dict[int, Any] = {}
+    pending_objects: List[Any] = list(copied_models)
+    while len(pending_objects) > 0:
+        current_obj = pending_objects.pop()
+        if id(current_obj) in memo:
+            continue
+        memo[id(current_obj)] = current_obj
+        if isinstance(current_obj, (list, tuple)):
+            pending_objects.extend(current_obj)
+        elif hasattr(current_obj, "__dict__"):
+            for attr_name, attr_value in vars(current_obj).items():
+                if isinstance(attr_value, XmlElement):
+                    setattr(current_obj, attr_name, deepcopy(attr_value))
+                else:
+                    pending_objects.append(attr_value)
+    return copied_models
+
+
+def run_variant(roaml_xml: str, variant: str) -> Dict[str, float]:
+    """Run the export and conversion of the provided model, measuring time and memory."""
+    from as2fm.jani_generator.scxml_helpers.roaml_model import RoamlMain
+    from as2fm.jani_generator.scxml_helpers.scxml_to_jani import convert_multiple_scxmls_to_jani
+    from as2fm.jani_generator.scxml_helpers.top_level_interpreter import (
+        export_plain_scxml_models,
+        generate_plain_scxml_models_and_timers,
+    )
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = RoamlMain(roaml_xml).get_loaded_model()
+        plain_scxml_models = generate_plain_scxml_models_and_timers(model)
+
+    def export_and_convert():
+        with tempfile.TemporaryDirectory() as scxml_dir, contextlib.redirect_stdout(io.StringIO()):
+            models_copy = (
+                _copy_with_xml_origins(plain_scxml_models) if variant == "whole-copy" else []
+            )
+            export_plain_scxml_models(scxml_dir, plain_scxml_models)
+            convert_multiple_scxmls_to_jani(plain_scxml_models, model.max_array_size)
+            del models_copy
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start_time = time.perf_counter()
+    export_and_convert()
+    elapsed_time = time.perf_counter() - start_time
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Trace the Python allocations in a second run, not to affect the time measurement
+    tracemalloc.start()
+    export_and_convert()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "time_s": elapsed_time,
+        "traced_peak_mb": traced_peak / 2**20,
+        # On Linux, ru_maxrss is expressed in kB
+        "peak_rss_increase_mb": (rss_after - rss_before) / 2**10,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("roaml_xml", nargs="*", default=[DEFAULT_MODEL], help="RoAML files.")
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.variant is not None:
+        print(json.dumps(run_variant(args.roaml_xml[0], args.variant)))
+        return
+    for roaml_xml in args.roaml_xml:
+        print(f"Model: {os.path.normpath(roaml_xml)}")
+        for variant in VARIANTS:
+            process_out = subprocess.run(
+                [sys.executable, __file__, "--variant", variant, roaml_xml],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            results = json.loads(process_out.stdout.strip().splitlines()[-1])
+            print(
+                f"  {variant:>10}: {results['time_s']:7.3f} s, "
+                f"traced peak {results['traced_peak_mb']:7.1f} MB, "
+                f"peak RSS increase {results['peak_rss_increase_mb']:7.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
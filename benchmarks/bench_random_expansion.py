@@ -0,0 +1,134 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the expansion of the random numbers (distributions) in a JANI model.
+
+The benchmark generates an automaton with a single edge using N random numbers, either:
+- in N separate assignments (`Math.random()` assigned to N variables), or
+- in a single assignment (the sum of N `Math.random()` calls).
+
+For each case, it times `expand_random_variables_in_jani_model` and the generation of the
+dictionary of the expanded model, and counts the resulting edges and destinations.
+
+Usage: python benchmarks/bench_random_expansion.py [--randoms 1 2 4] [--samples 100]
+
+The results are stored and compared with a baseline as in the other benchmarks: see
+`bench_common.py` for the related options.
+"""
+
+import argparse
+from typing import Any, Dict
+
+from bench_common import (
+    add_common_arguments,
+    keep_best_run,
+    store_and_compare_results,
+    time_call,
+)
+
+from as2fm.jani_generator.jani_entries import (
+    JaniAutomaton,
+    JaniComposition,
+    JaniEdge,
+    JaniModel,
+    JaniVariable,
+    generate_jani_expression,
+)
+from as2fm.jani_generator.jani_entries.jani_helpers import expand_random_variables_in_jani_model
+
+UNIFORM_DISTRIBUTION = {"distribution": "Uniform", "args": [0.0, 1.0]}
+
+
+def generate_model(n_randoms: int, single_assignment: bool) -> JaniModel:
+    """Generate a model with one edge, using the provided amount of random numbers."""
+    automaton = JaniAutomaton()
+    automaton.set_name("random_user")
+    automaton.add_location("idle", is_initial=True)
+    for var_idx in range(n_randoms):
+        automaton.add_variable(JaniVariable(f"x_{var_idx}", float, 0.0))
+    if single_assignment:
+        random_sum: Any = UNIFORM_DISTRIBUTION
+        for _ in range(n_randoms - 1):
+            random_sum = {"op": "+", "left": random_sum, "right": UNIFORM_DISTRIBUTION}
+        assignments = [{"ref": "x_0", "value": generate_jani_expression(random_sum)}]
+    else:
+        assignments = [
+            {"ref": f"x_{var_idx}", "value": generate_jani_expression(UNIFORM_DISTRIBUTION)}
+            for var_idx in range(n_randoms)
+        ]
+    automaton.add_edge(
+        JaniEdge(
+            {
+                "location": "idle",
+                "action": "sample",
+                "destinations": [{"location": "idle", "assignments": assignments}],
+            }
+        )
+    )
+    composition = JaniComposition()
+    composition.add_element(automaton.get_name())
+    composition.add_sync("sample", {automaton.get_name(): "sample"})
+    jani_model = JaniModel()
+    jani_model.add_jani_automaton(automaton)
+    jani_model.add_system_sync(composition)
+    return jani_model
+
+
+def measure_expansion(n_randoms: int, single_assignment: bool, n_samples: int) -> Dict[str, Any]:
+    """Expand the random numbers in the generated model, measuring time and resulting size."""
+    jani_model = generate_model(n_randoms, single_assignment)
+    expansion_time = time_call(
+        lambda: expand_random_variables_in_jani_model(jani_model, n_options=n_samples)
+    )
+    as_dict_time = time_call(jani_model.as_dict)
+    edges = jani_model.as_dict()["automata"][0]["edges"]
+    return {
+        "expansion_s": expansion_time,
+        "as_dict_s": as_dict_time,
+        "n_edges": len(edges),
+        "n_destinations": sum(len(edge["destinations"]) for edge in edges),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--randoms", type=int, nargs="+", default=[1, 2, 4], help="Random numbers per edge."
+    )
+    parser.add_argument("--samples", type=int, default=100, help="Values per random number.")
+    add_common_arguments(parser, default_repeat=3)
+    args = parser.parse_args()
+
+    all_results: Dict[str, Dict[str, Any]] = {}
+    for single_assignment in (False, True):
+        case_name = "single_assignment" if single_assignment else "separate_assignments"
+        for n_randoms in args.randoms:
+            results = keep_best_run(
+                lambda: measure_expansion(n_randoms, single_assignment, args.samples),
+                args.repeat,
+            )
+            all_results[f"{case_name}_{n_randoms}"] = results
+            print(
+                f"{case_name}, {n_randoms} random numbers: "
+                f"expansion {results['expansion_s'] * 1000:.1f} ms, "
+                f"as_dict {results['as_dict_s'] * 1000:.1f} ms, "
+                f"{results['n_edges']} edges, {results['n_destinations']} destinations."
+            )
+    store_and_compare_results(all_results, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the conversion of a state with many guarded transitions triggered by the same event.
+
+The generated SCXML model has a single state, with one transition for each value the received
+event data can have, plus a final transition without condition. By default, each transition
+guard must negate the conditions of all previous transitions, while with priority chains each
+condition is checked in its own location. The benchmark reports, for both conversion modes, the
+conversion time and the size of the generated guards, both as amount of distinct expressions and
+as amount of JSON nodes written to the Jani file.
+
+Usage: python benchmarks/bench_transition_guards.py [--transitions N] [--repeat N]
+
+The results are stored and compared with a baseline as in the other benchmarks: see
+`bench_common.py` for the related options.
+"""
+
+import argparse
+import json
+from typing import Any, Dict, Set
+
+import lxml.etree as ET
+from bench_common import (
+    add_common_arguments,
+    keep_best_run,
+    store_and_compare_results,
+    time_call,
+)
+
+from as2fm.jani_generator.jani_entries import JaniExpression
+from as2fm.jani_generator.scxml_helpers.scxml_event import EventsHolder
+from as2fm.jani_generator.scxml_helpers.scxml_to_jani import convert_scxml_root_to_jani_automaton
+from as2fm.scxml_converter.scxml_entries import ScxmlRoot
+
+
+def generate_scxml_model(n_transitions: int) -> str:
+    """Generate a SCXML model with n guarded transitions on the same event."""
+    transitions = "\n".join(
+        f'<transition event="tick" cond="_event.data.value == {idx}" target="idle">'
+        f'<assign location="x" expr="{idx}" /></transition>'
+        for idx in range(n_transitions)
+    )
+    return f"""
+    <scxml version="1.0" name="ManyGuards" initial="idle">
+        <datamodel>
+            <data id="x" expr="0" type="int32" />
+        </datamodel>
+        <state id="idle">
+            {transitions}
+            <transition event="tick" target="idle" />
+        </state>
+    </scxml>"""
+
+
+def _count_distinct_expressions(expression: JaniExpression, visited: Set[int]) -> None:
+    """Collect the ids of all the distinct expressions in the expression DAG."""
+    if id(expression) in visited:
+        return
+    visited.add(id(expression))
+    for operand in expression.operands.values():
+        for entry in operand if isinstance(operand, tuple) else (operand,):
+            _count_distinct_expressions(entry, visited)
+
+
+def _count_json_nodes(entry: Any) -> int:
+    """Count the entries of the JSON structure, as written to the Jani file."""
+    if isinstance(entry, dict):
+        return 1 + sum(_count_json_nodes(value) for value in entry.values())
+    if isinstance(entry, list):
+        return 1 + sum(_count_json_nodes(value) for value in entry)
+    return 1
+
+
+def run_benchmark(n_transitions: int, priority_chains: bool) -> Dict[str, Any]:
+    """Convert the generated model, and measure the generated guards."""
+    scxml_root = ScxmlRoot.from_xml_tree(ET.fromstring(generate_scxml_model(n_transitions)), [])
+    converted_automata = []
+    conversion_time = time_call(
+        lambda: converted_automata.append(
+            convert_scxml_root_to_jani_automaton(
+                scxml_root, EventsHolder(), max_array_size=100, priority_chains=priority_chains
+            )
+        )
+    )
+    jani_automaton = converted_automata[0]
+    guards = [
+        edge.guard.get_expression()
+        for edge in jani_automaton.get_edges()
+        if edge.guard is not None and edge.guard.get_expression() is not None
+    ]
+    distinct_expressions: Set[int] = set()
+    for guard in guards:
+        _count_distinct_expressions(guard, distinct_expressions)
+    return {
+        "n_transitions": n_transitions,
+        "priority_chains": priority_chains,
+        "conversion_s": conversion_time,
+        "n_guards": len(guards),
+        "n_distinct_guard_expressions": len(distinct_expressions),
+        "n_guard_json_nodes": sum(_count_json_nodes(guard.as_dict()) for guard in guards),
+        "n_locations": len(jani_automaton.get_locations()),
+        "jani_automaton_bytes": len(json.dumps(jani_automaton.as_dict())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--transitions", type=int, default=200, help="Transitions on the event.")
+    add_common_arguments(parser, default_repeat=3)
+    args = parser.parse_args()
+
+    all_results: Dict[str, Dict[str, Any]] = {}
+    for priority_chains in (False, True):
+        results = keep_best_run(
+            lambda: run_benchmark(args.transitions, priority_chains), args.repeat
+        )
+        mode_name = "with priority chains" if priority_chains else "with exclusive guards"
+        print(f"Converted {results['n_transitions']} guarded transitions, {mode_name}:")
+        print(f"  conversion time: {results['conversion_s'] * 1000:.1f} ms")
+        print(f"  guards: {results['n_guards']}")
+        print(f"  distinct guard expressions: {results['n_distinct_guard_expressions']}")
+        print(f"  guard JSON nodes: {results['n_guard_json_nodes']}")
+        print(f"  locations: {results['n_locations']}")
+        print(f"  automaton JSON size: {results['jani_automaton_bytes'] / 1024:.1f} KiB")
+        case_suffix = "_priority_chains" if priority_chains else ""
+        all_results[f"transitions_{args.transitions}{case_suffix}"] = results
+    store_and_compare_results(all_results, args)
+
+
+if __name__ == "__main__":
+    main()
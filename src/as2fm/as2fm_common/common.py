@@ -30,6 +30,44 @@ from as2fm.as2fm_common.types import ValidJaniTypes, ValidPlainScxmlTypes
 EPSILON = 1e-3
 
 
+def _raise_read_only(self, *_args, **_kwargs):
+    raise TypeError(f"'{type(self).__name__}' instances are read-only.")
+
+
+class ReadOnlyDict(dict):
+    """
+    A dictionary that cannot be modified after its generation, to be shared by multiple users.
+
+    It is a `dict` instance, so that it can be used as input of any function expecting one (e.g.
+    to serialize it to JSON).
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _raise_read_only
+    clear = pop = popitem = setdefault = update = _raise_read_only
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+class ReadOnlyList(list):
+    """
+    A list that cannot be modified after its generation, to be shared by multiple users.
+
+    It is a `list` instance, so that it can be used as input of any function expecting one (e.g.
+    to serialize it to JSON).
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _raise_read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _raise_read_only
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+
 def remove_namespace(tag: str) -> str:
     """
     If a tag has a namespace, remove it.
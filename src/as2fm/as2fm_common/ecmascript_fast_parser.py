@@ -0,0 +1,472 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Parser and printer for the subset of ECMAScript supported by AS2FM.
+
+The subset contains literals, identifiers, member and array accesses, unary, binary and logical
+operators, function calls, array and object literals, and the plain assignment. The generated
+AST is identical to the one from `esprima`, and the printed code to the one from `escodegen`.
+Everything outside of the subset raises an `UnsupportedEcmascriptSyntax`: in that case (and for
+invalid code) the caller is expected to fall back to `esprima` and `escodegen`.
+"""
+
+import math
+import re
+from typing import List, Tuple
+
+import esprima
+from esprima.nodes import (
+    ArrayExpression,
+    AssignmentExpression,
+    BinaryExpression,
+    CallExpression,
+    ComputedMemberExpression,
+    Directive,
+    ExpressionStatement,
+    Identifier,
+    Literal,
+    ObjectExpression,
+    Property,
+    Script,
+    StaticMemberExpression,
+    UnaryExpression,
+)
+from esprima.syntax import Syntax
+
+
+class UnsupportedEcmascriptSyntax(Exception):
+    """Exception type thrown when the code is not part of the subset handled by this module."""
+
+    pass
+
+
+# Same precedence values used by esprima: higher values bind tighter
+BINARY_OPERATORS_PRECEDENCE = {
+    "||": 1,
+    "&&": 2,
+    "|": 3,
+    "^": 4,
+    "&": 5,
+    "==": 6,
+    "!=": 6,
+    "===": 6,
+    "!==": 6,
+    "<": 7,
+    ">": 7,
+    "<=": 7,
+    ">=": 7,
+    "<<": 8,
+    ">>": 8,
+    ">>>": 8,
+    "+": 9,
+    "-": 9,
+    "*": 11,
+    "/": 11,
+    "%": 11,
+}
+
+UNARY_OPERATORS = ("!", "-", "+", "~")
+
+LITERAL_KEYWORDS = {"true": True, "false": False, "null": None}
+
+# Words that cannot be used as identifiers, or that introduce syntax outside of the subset
+RESERVED_WORDS = frozenset(
+    (
+        "async await break case catch class const continue debugger default delete do else "
+        "enum export extends finally for function if import in instanceof let new return "
+        "static super switch this throw try typeof var void while with yield"
+    ).split()
+)
+
+# Punctuators are sorted by length, to match the longest one first
+_TOKEN_REGEX = re.compile(
+    r"""[ \t\n\r]*(?:
+    (?P<number>(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?)
+    |(?P<name>[A-Za-z_$][A-Za-z0-9_$]*)
+    |(?P<string>'[^'\\\n\r\u2028\u2029]*'|"[^"\\\n\r\u2028\u2029]*")
+    |(?P<punct>===|!==|>>>|\+\+|--|==|!=|<=|>=|&&|\|\||<<|>>|[-+*/%<>!~&|^()[\]{}.,:;=])
+    )""",
+    re.VERBOSE,
+)
+
+_END_REGEX = re.compile(r"[ \t\n\r]*\Z")
+
+_IDENTIFIER_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$")
+
+# A token is a (kind, text) tuple
+_Token = Tuple[str, str]
+_END_TOKEN: _Token = ("end", "")
+
+
+def _tokenize(code: str) -> List[_Token]:
+    """Split the code in tokens, ending with an `_END_TOKEN`."""
+    tokens: List[_Token] = []
+    position = 0
+    code_len = len(code)
+    while _END_REGEX.match(code, position) is None:
+        match = _TOKEN_REGEX.match(code, position)
+        if match is None:
+            raise UnsupportedEcmascriptSyntax(f"Unexpected character at {position}.")
+        kind = match.lastgroup
+        assert kind is not None, "Error: token kind not found."
+        text = match.group(kind)
+        position = match.end()
+        if kind == "number":
+            # Numbers like `1a`, `0x1F` and legacy octals are left to esprima
+            if position < code_len and code[position] in _IDENTIFIER_CHARS:
+                raise UnsupportedEcmascriptSyntax(f"Unexpected number format at {position}.")
+            if len(text) > 1 and text[0] == "0" and text[1].isdigit():
+                raise UnsupportedEcmascriptSyntax(f"Unexpected number format at {position}.")
+        elif kind == "punct" and text in ("++", "--"):
+            raise UnsupportedEcmascriptSyntax(f"Update operators are not supported: {text}.")
+        tokens.append((kind, text))
+    tokens.append(_END_TOKEN)
+    return tokens
+
+
+def _make_number_literal(text: str) -> Literal:
+    """Generate a number literal, with the same value esprima would generate."""
+    value = float(text)
+    return Literal(int(value) if value.is_integer() else value, text)
+
+
+class _SubsetParser:
+    """Top-down operator precedence (Pratt) parser for the supported ECMAScript subset."""
+
+    def __init__(self, code: str):
+        self._tokens = _tokenize(code)
+        self._idx = 0
+
+    def _peek(self) -> _Token:
+        return self._tokens[self._idx]
+
+    def _next(self) -> _Token:
+        token = self._tokens[self._idx]
+        self._idx += 1
+        return token
+
+    def _is_punct(self, text: str) -> bool:
+        return self._tokens[self._idx] == ("punct", text)
+
+    def _expect_punct(self, text: str) -> None:
+        if self._next() != ("punct", text):
+            raise UnsupportedEcmascriptSyntax(f"Expected '{text}'.")
+
+    def parse_script(self) -> Script:
+        if self._is_punct("{"):
+            # At statement level, this would be a block, not an object
+            raise UnsupportedEcmascriptSyntax("Block statements are not supported.")
+        first_kind, first_text = self._peek()
+        expression = self._parse_assignment()
+        if self._is_punct(";"):
+            self._next()
+        if self._peek() != _END_TOKEN:
+            raise UnsupportedEcmascriptSyntax("Only a single expression statement is supported.")
+        # As in esprima, a statement starting with a string literal may be a directive prologue
+        if first_kind == "string" and expression.type == Syntax.Literal and len(first_text) > 2:
+            return Script([Directive(expression, first_text[1:-1])])
+        return Script([ExpressionStatement(expression)])
+
+    def _parse_assignment(self) -> esprima.nodes.Node:
+        left = self._parse_binary(0)
+        if not self._is_punct("="):
+            return left
+        if left.type not in (Syntax.Identifier, Syntax.MemberExpression):
+            raise UnsupportedEcmascriptSyntax("Invalid assignment target.")
+        self._next()
+        return AssignmentExpression("=", left, self._parse_assignment())
+
+    def _parse_binary(self, min_precedence: int) -> esprima.nodes.Node:
+        left = self._parse_unary()
+        while True:
+            kind, text = self._peek()
+            precedence = BINARY_OPERATORS_PRECEDENCE.get(text) if kind == "punct" else None
+            if precedence is None or precedence < min_precedence:
+                return left
+            self._next()
+            left = BinaryExpression(text, left, self._parse_binary(precedence + 1))
+
+    def _parse_unary(self) -> esprima.nodes.Node:
+        kind, text = self._peek()
+        if kind == "punct" and text in UNARY_OPERATORS:
+            self._next()
+            return UnaryExpression(text, self._parse_unary())
+        return self._parse_postfix(self._parse_primary())
+
+    def _parse_postfix(self, node: esprima.nodes.Node) -> esprima.nodes.Node:
+        while True:
+            if self._is_punct("."):
+                self._next()
+                kind, text = self._next()
+                if kind != "name":
+                    raise UnsupportedEcmascriptSyntax("Expected a member name.")
+                node = StaticMemberExpression(node, Identifier(text))
+            elif self._is_punct("["):
+                self._next()
+                index = self._parse_binary(0)
+                self._expect_punct("]")
+                node = ComputedMemberExpression(node, index)
+            elif self._is_punct("("):
+                self._next()
+                node = CallExpression(node, self._parse_list(")", allow_trailing_comma=False))
+            else:
+                return node
+
+    def _parse_list(self, closing: str, allow_trailing_comma: bool) -> List[esprima.nodes.Node]:
+        """Parse a comma separated list of expressions, up to the closing punctuator."""
+        entries: List[esprima.nodes.Node] = []
+        while not self._is_punct(closing):
+            entries.append(self._parse_binary(0))
+            if self._is_punct(","):
+                self._next()
+                if self._is_punct(closing) and not allow_trailing_comma:
+                    raise UnsupportedEcmascriptSyntax("Trailing commas are not supported here.")
+            elif not self._is_punct(closing):
+                raise UnsupportedEcmascriptSyntax(f"Expected ',' or '{closing}'.")
+        self._next()
+        return entries
+
+    def _parse_primary(self) -> esprima.nodes.Node:
+        kind, text = self._next()
+        if kind == "number":
+            return _make_number_literal(text)
+        if kind == "string":
+            return Literal(text[1:-1], text)
+        if kind == "name":
+            if text in LITERAL_KEYWORDS:
+                return Literal(LITERAL_KEYWORDS[text], text)
+            if text in RESERVED_WORDS:
+                raise UnsupportedEcmascriptSyntax(f"Keyword '{text}' is not supported.")
+            return Identifier(text)
+        if kind == "punct":
+            if text == "(":
+                if self._is_punct(")"):
+                    raise UnsupportedEcmascriptSyntax("Arrow functions are not supported.")
+                node = self._parse_binary(0)
+                self._expect_punct(")")
+                return node
+            if text == "[":
+                if self._is_punct(","):
+                    raise UnsupportedEcmascriptSyntax("Array holes are not supported.")
+                return ArrayExpression(self._parse_list("]", allow_trailing_comma=True))
+            if text == "{":
+                return self._parse_object()
+        raise UnsupportedEcmascriptSyntax(f"Unexpected token '{text}'.")
+
+    def _parse_object(self) -> ObjectExpression:
+        properties: List[Property] = []
+        while not self._is_punct("}"):
+            kind, text = self._next()
+            if kind == "name":
+                key: esprima.nodes.Node = Identifier(text)
+            elif kind == "string":
+                key = Literal(text[1:-1], text)
+            elif kind == "number":
+                key = _make_number_literal(text)
+            else:
+                raise UnsupportedEcmascriptSyntax(f"Unexpected object key '{text}'.")
+            self._expect_punct(":")
+            properties.append(Property("init", key, False, self._parse_binary(0), False, False))
+            if self._is_punct(","):
+                self._next()
+            elif not self._is_punct("}"):
+                raise UnsupportedEcmascriptSyntax("Expected ',' or '}'.")
+        self._next()
+        return ObjectExpression(properties)
+
+
+def parse_script_subset(code: str) -> Script:
+    """
+    Parse an ECMAScript script made of a single expression statement.
+
+    :param code: The ECMAScript code to parse.
+    :return: The same AST esprima would generate.
+    :raises UnsupportedEcmascriptSyntax: if the code is not in the supported subset.
+    """
+    return _SubsetParser(code).parse_script()
+
+
+# Same precedence values used by escodegen
+_PRECEDENCE_SEQUENCE = 0
+_PRECEDENCE_ASSIGNMENT = 1
+_PRECEDENCE_UNARY = 15
+_PRECEDENCE_CALL = 18
+_PRECEDENCE_MEMBER = 21
+_PRINT_BINARY_PRECEDENCE = {
+    "||": 4,
+    "&&": 5,
+    "|": 6,
+    "^": 7,
+    "&": 8,
+    "==": 9,
+    "!=": 9,
+    "===": 9,
+    "!==": 9,
+    "<": 10,
+    ">": 10,
+    "<=": 10,
+    ">=": 10,
+    "<<": 11,
+    ">>": 11,
+    ">>>": 11,
+    "+": 12,
+    "-": 12,
+    "*": 13,
+    "/": 13,
+    "%": 13,
+}
+
+
+def _print_string(value: str) -> str:
+    """Print a string literal, if it does not require escaping any character."""
+    for char in value:
+        if not " " <= char <= "~" or char in "'\"\\":
+            raise UnsupportedEcmascriptSyntax("Strings requiring escapes are not supported.")
+    return f"'{value}'"
+
+
+def _print_node(node: esprima.nodes.Node, precedence: int) -> str:
+    """Print an AST node, adding parenthesis if its precedence is lower than the provided one."""
+    node_type = node.type
+    if node_type == Syntax.Identifier:
+        return node.name
+    if node_type == Syntax.Literal:
+        value = node.value
+        if value is None:
+            return "null"
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, str):
+            return _print_string(value)
+        if isinstance(value, (int, float)) and value >= 0 and math.isfinite(value):
+            return str(value)
+        raise UnsupportedEcmascriptSyntax(f"Unsupported literal value {value}.")
+    if node_type in (Syntax.BinaryExpression, Syntax.LogicalExpression):
+        node_precedence = _PRINT_BINARY_PRECEDENCE.get(node.operator)
+        if node_precedence is None:
+            raise UnsupportedEcmascriptSyntax(f"Unsupported operator {node.operator}.")
+        text = (
+            f"{_print_node(node.left, node_precedence)} {node.operator} "
+            f"{_print_node(node.right, node_precedence + 1)}"
+        )
+    elif node_type == Syntax.UnaryExpression:
+        if node.operator not in UNARY_OPERATORS:
+            raise UnsupportedEcmascriptSyntax(f"Unsupported operator {node.operator}.")
+        node_precedence = _PRECEDENCE_UNARY
+        argument = _print_node(node.argument, _PRECEDENCE_UNARY)
+        # Avoid generating `--a` and `++a` out of two unary operators
+        separator = " " if node.operator in "+-" and argument[0] == node.operator else ""
+        text = f"{node.operator}{separator}{argument}"
+    elif node_type == Syntax.MemberExpression:
+        node_precedence = _PRECEDENCE_MEMBER
+        obj = _print_node(node.object, _PRECEDENCE_CALL)
+        if node.computed:
+            text = f"{obj}[{_print_node(node.property, _PRECEDENCE_SEQUENCE)}]"
+        elif node.object.type == Syntax.Literal or node.property.type != Syntax.Identifier:
+            raise UnsupportedEcmascriptSyntax("Unsupported member access.")
+        else:
+            text = f"{obj}.{node.property.name}"
+    elif node_type == Syntax.CallExpression:
+        node_precedence = _PRECEDENCE_CALL
+        args = ", ".join(_print_node(arg, _PRECEDENCE_ASSIGNMENT) for arg in node.arguments)
+        text = f"{_print_node(node.callee, _PRECEDENCE_CALL)}({args})"
+    elif node_type == Syntax.ArrayExpression:
+        if any(entry is None for entry in node.elements):
+            raise UnsupportedEcmascriptSyntax("Array holes are not supported.")
+        return f"[{','.join(_print_node(e, _PRECEDENCE_ASSIGNMENT) for e in node.elements)}]"
+    else:
+        raise UnsupportedEcmascriptSyntax(f"Unsupported node type {node_type}.")
+    if node_precedence < precedence:
+        return f"({text})"
+    return text
+
+
+def print_expression_subset(node: esprima.nodes.Node) -> str:
+    """
+    Generate the code of an AST expression, formatted as escodegen does with no newlines.
+
+    :param node: The AST expression to print.
+    :return: The code of the expression.
+    :raises UnsupportedEcmascriptSyntax: if the expression is not in the supported subset.
+    """
+    return _print_node(node, _PRECEDENCE_SEQUENCE)
+
+
+_NAME_REGEX = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*\Z")
+
+
+def _check_printed_name(name: str) -> None:
+    if _NAME_REGEX.match(name) is None:
+        raise UnsupportedEcmascriptSyntax(f"Name '{name}' would not be parsed back as it is.")
+
+
+def get_printed_expression_ast(node: esprima.nodes.Node) -> esprima.nodes.Node:
+    """
+    Generate the AST the parser returns for the code printed out of the provided AST expression.
+
+    An AST generated by a conversion might differ from the one of its printed code: identifiers
+    can contain member accesses (e.g. `_event.data.x`) and literals keep their original raw text.
+
+    :param node: The AST expression to print.
+    :return: The same AST `parse_script_subset` would generate from `print_expression_subset`.
+    :raises UnsupportedEcmascriptSyntax: if the expression is not in the supported subset.
+    """
+    node_type = node.type
+    if node_type == Syntax.Identifier:
+        names = node.name.split(".")
+        for name in names:
+            _check_printed_name(name)
+        if names[0] in LITERAL_KEYWORDS or names[0] in RESERVED_WORDS:
+            raise UnsupportedEcmascriptSyntax(f"Keyword '{names[0]}' is not supported.")
+        new_node: esprima.nodes.Node = Identifier(names[0])
+        for name in names[1:]:
+            new_node = StaticMemberExpression(new_node, Identifier(name))
+        return new_node
+    if node_type == Syntax.Literal:
+        text = _print_node(node, _PRECEDENCE_SEQUENCE)
+        if isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return _make_number_literal(text)
+        return Literal(node.value, text)
+    if node_type in (Syntax.BinaryExpression, Syntax.LogicalExpression):
+        if node.operator not in _PRINT_BINARY_PRECEDENCE:
+            raise UnsupportedEcmascriptSyntax(f"Unsupported operator {node.operator}.")
+        return BinaryExpression(
+            node.operator,
+            get_printed_expression_ast(node.left),
+            get_printed_expression_ast(node.right),
+        )
+    if node_type == Syntax.UnaryExpression:
+        if node.operator not in UNARY_OPERATORS:
+            raise UnsupportedEcmascriptSyntax(f"Unsupported operator {node.operator}.")
+        return UnaryExpression(node.operator, get_printed_expression_ast(node.argument))
+    if node_type == Syntax.MemberExpression:
+        obj = get_printed_expression_ast(node.object)
+        if node.computed:
+            return ComputedMemberExpression(obj, get_printed_expression_ast(node.property))
+        if node.object.type == Syntax.Literal or node.property.type != Syntax.Identifier:
+            raise UnsupportedEcmascriptSyntax("Unsupported member access.")
+        _check_printed_name(node.property.name)
+        return StaticMemberExpression(obj, Identifier(node.property.name))
+    if node_type == Syntax.CallExpression:
+        return CallExpression(
+            get_printed_expression_ast(node.callee),
+            [get_printed_expression_ast(arg) for arg in node.arguments],
+        )
+    if node_type == Syntax.ArrayExpression:
+        if any(entry is None for entry in node.elements):
+            raise UnsupportedEcmascriptSyntax("Array holes are not supported.")
+        return ArrayExpression([get_printed_expression_ast(entry) for entry in node.elements])
+    raise UnsupportedEcmascriptSyntax(f"Unsupported node type {node_type}.")
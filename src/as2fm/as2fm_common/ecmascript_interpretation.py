@@ -17,13 +17,21 @@
 Module for interpreting ecmascript.
 """
 
-from typing import Dict, List, Optional, Union
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple, Type, TypeVar, Union
 
 import escodegen
 import esprima
 from esprima.syntax import Syntax
 from lxml.etree import _Element as XmlElement
 
+from as2fm.as2fm_common.ecmascript_fast_parser import (
+    UnsupportedEcmascriptSyntax,
+    get_printed_expression_ast,
+    parse_script_subset,
+    print_expression_subset,
+)
 from as2fm.as2fm_common.ecmascript_interpretation_functions import (
     ValidECMAScriptTypes,
     get_ast_expression_type,
@@ -49,22 +57,134 @@ class MemberAccessCheckException(Exception):
     pass
 
 
+# The max. amount of parsed ECMAScript expressions kept in memory
+ECMASCRIPT_PARSE_CACHE_SIZE = 8192
+
+
+class FrozenAstModificationError(AttributeError):
+    """Exception type thrown when trying to modify an AST shared by the parsing cache."""
+
+    pass
+
+
+class _FrozenNode:
+    """Mixin making an esprima node read-only. Use `get_mutable_ast` to get a modifiable copy."""
+
+    def __setattr__(self, name: str, _):
+        raise FrozenAstModificationError(f"Cannot set '{name}' of a frozen {self.type} node.")
+
+    def __delattr__(self, name: str):
+        raise FrozenAstModificationError(f"Cannot delete '{name}' of a frozen {self.type} node.")
+
+    def __reduce__(self):
+        return (_make_frozen_node, (type(self).__bases__[1], dict(self.__dict__)))
+
+
+# Frozen variant of each esprima node class, generated at the first use
+_FROZEN_NODE_CLASSES: Dict[Type[esprima.nodes.Node], Type[esprima.nodes.Node]] = {}
+
+
+def _make_frozen_node(
+    node_class: Type[esprima.nodes.Node], node_fields: Dict[str, Any]
+) -> esprima.nodes.Node:
+    """Generate a frozen instance of the provided esprima node class, with the provided fields."""
+    frozen_class = _FROZEN_NODE_CLASSES.get(node_class)
+    if frozen_class is None:
+        frozen_class = type(f"Frozen{node_class.__name__}", (_FrozenNode, node_class), {})
+        _FROZEN_NODE_CLASSES[node_class] = frozen_class
+    frozen_node = object.__new__(frozen_class)
+    frozen_node.__dict__.update(node_fields)
+    return frozen_node
+
+
+def _freeze_ast_value(value: Any) -> Any:
+    """Make an AST node and its children read-only. Lists of nodes are converted to tuples."""
+    if isinstance(value, _FrozenNode):
+        return value
+    if isinstance(value, esprima.nodes.Node):
+        return _make_frozen_node(
+            type(value), {k: _freeze_ast_value(v) for k, v in value.__dict__.items()}
+        )
+    if isinstance(value, list):
+        return tuple(_freeze_ast_value(entry) for entry in value)
+    return value
+
+
+def get_mutable_ast(node: esprima.nodes.Node) -> esprima.nodes.Node:
+    """Generate a modifiable copy of an AST, as the ones returned by the parser are read-only."""
+    return _thaw_ast_value(node)
+
+
+def _thaw_ast_value(value: Any) -> Any:
+    """Recursive implementation of `get_mutable_ast` functionality."""
+    if isinstance(value, esprima.nodes.Node):
+        node_class = type(value)
+        if isinstance(value, _FrozenNode):
+            node_class = node_class.__bases__[1]
+        mutable_node = object.__new__(node_class)
+        mutable_node.__dict__.update({k: _thaw_ast_value(v) for k, v in value.__dict__.items()})
+        return mutable_node
+    if isinstance(value, (list, tuple)):
+        return [_thaw_ast_value(entry) for entry in value]
+    return value
+
+
+@lru_cache(maxsize=ECMASCRIPT_PARSE_CACHE_SIZE)
+def _parse_script_cached(script: str) -> esprima.nodes.Script:
+    """Parse an ECMAScript script, sharing the resulting (read-only) AST across all callers."""
+    try:
+        ast = parse_script_subset(script)
+    except UnsupportedEcmascriptSyntax:
+        # Let esprima handle (or report) everything outside of the common subset
+        ast = esprima.parseScript(script)
+    return _freeze_ast_value(ast)
+
+
+def parse_ecmascript_script(script: str, elem: Optional[XmlElement]) -> esprima.nodes.Script:
+    """
+    Parse the string using `esprima`, reusing the result of previous calls with the same string.
+
+    The returned AST is shared by all callers, hence it is read-only: modifying it raises a
+    `FrozenAstModificationError`. Use `get_mutable_ast` to get a copy that can be modified.
+
+    :param script: The ECMAScript code to parse.
+    :param elem: The xml element associated to the script, for error logging.
+    :return: The AST of the whole script.
+    """
+    try:
+        return _parse_script_cached(script)
+    except esprima.error_handler.Error as e:
+        raise RuntimeError(get_error_msg(elem, f"Failed parsing ecmascript: {script}. Error: {e}."))
+
+
+def get_ecmascript_parse_cache_info() -> Dict[str, int]:
+    """Get the hits, misses and size of the cache of parsed ECMAScript expressions."""
+    cache_info = _parse_script_cached.cache_info()
+    return {
+        "hits": cache_info.hits,
+        "misses": cache_info.misses,
+        "size": cache_info.currsize,
+        "max_size": cache_info.maxsize,
+    }
+
+
+def clear_ecmascript_parse_cache() -> None:
+    """Remove all the parsed and analyzed ECMAScript expressions, and reset the cache counters."""
+    _parse_script_cached.cache_clear()
+    _get_analyzed_expression.cache_clear()
+
+
 def parse_expression_to_ast(expression: str, elem: XmlElement) -> esprima.nodes.Node:
     """
     Parse the string using `esprima`. Return the AST of it's main body.
 
-    AST = Abstract Syntax Tree
+    AST = Abstract Syntax Tree. The returned AST is read-only, see `parse_ecmascript_script`.
     """
     assert isinstance(expression, str), f"Provided esprima expr is {type(expression)} != string."
 
     # Adding a variable, because bare object declarations don't seem to work.
     expression = f"value = {expression}"
-    try:
-        ast = esprima.parseScript(expression)
-    except esprima.error_handler.Error as e:
-        raise RuntimeError(
-            get_error_msg(elem, f"Failed parsing ecmascript: {expression}. Error: {e}.")
-        )
+    ast = parse_ecmascript_script(expression, elem)
 
     check_assertion(
         len(ast.body) == 1, elem, "The ecmascript body must contain exactly one element."
@@ -95,8 +215,7 @@ def parse_ecmascript_expr_to_type(
     expr: str, variables: Dict[str, ValidECMAScriptTypes], elem: Optional[XmlElement] = None
 ):
     """Interpret a string of ecmacript expression and get the type that is evaluates to."""
-    ast_node = parse_expression_to_ast(expr, elem)
-    return get_ast_expression_type(ast_node, variables)
+    return analyze_expression(expr, elem).get_type(variables, elem)
 
 
 def make_ast_array_expression(in_array: List) -> esprima.nodes.ArrayExpression:
@@ -106,7 +225,11 @@ def make_ast_array_expression(in_array: List) -> esprima.nodes.ArrayExpression:
 
 def get_array_expr_as_list(expr: str, elem: Optional[XmlElement] = None) -> List:
     """Reads a string as an EcmaScript expression and returns it as an ArrayExpression."""
-    ast_node = parse_expression_to_ast(expr, elem)
+    return analyze_expression(expr, elem).get_array_as_list(elem)
+
+
+def _get_array_expr_as_list(expr: str, ast_node: esprima.nodes.Node) -> List:
+    """Implementation of `get_array_expr_as_list` functionality."""
     if ast_node.type == Syntax.ArrayExpression:
         # We expect no variable reference in an array expression, hence the '{}'
         return get_list_from_array_expr(ast_node)
@@ -130,12 +253,7 @@ def has_array_access(expr: str, elem: Optional[XmlElement]) -> bool:
     Note: This works only if the expression evaluates to a variable (base type, custom struct or
     array).
     """
-    ast = parse_expression_to_ast(expr, elem)
-    try:
-        return _has_member_or_array_access(ast, True)
-    except MemberAccessCheckException as e:
-        print(get_error_msg(elem, e.args[0]))
-        raise e
+    return analyze_expression(expr, elem).has_array_access(elem)
 
 
 def has_member_access(expr: str, elem: Optional[XmlElement]) -> bool:
@@ -144,26 +262,19 @@ def has_member_access(expr: str, elem: Optional[XmlElement]) -> bool:
     Note: This works only if the expression evaluates to a variable (base type, custom struct or
     array).
     """
-    ast = parse_expression_to_ast(expr, elem)
-    try:
-        return _has_member_or_array_access(ast, False)
-    except MemberAccessCheckException as e:
-        print(get_error_msg(elem, e.args[0]))
-        raise e
+    return analyze_expression(expr, elem).has_member_access(elem)
 
 
 def has_operators(expr: str, elem: Optional[XmlElement]) -> bool:
     """
     Evaluate if an ECMAscript expression contains unary, binary, logical or function operators.
     """
-    ast = parse_expression_to_ast(expr, elem)
-    return _has_operators(ast, elem)
+    return analyze_expression(expr, elem).has_operators(elem)
 
 
 def is_literal(expr: str, elem: Optional[XmlElement]) -> bool:
     """Evaluate if the expression contains only a literal (or an array expression)."""
-    ast = parse_expression_to_ast(expr, elem)
-    return ast.type in (Syntax.Literal, Syntax.ArrayExpression)
+    return analyze_expression(expr, elem).is_literal(elem)
 
 
 def _has_member_or_array_access(ast: esprima.nodes.Node, array_access: bool) -> bool:
@@ -211,12 +322,7 @@ def split_by_access(expr: str, elem: Optional[XmlElement]) -> List[Union[str, Ar
     `a.b` => `['a', 'b']
     `a[3].b` => `['a', ArrayAccess, 'b']`
     """
-    ast = parse_expression_to_ast(expr, elem)
-    try:
-        return _split_by_access(ast)
-    except MemberAccessCheckException as e:
-        print(get_error_msg(elem, e.args[0]))
-        raise e
+    return analyze_expression(expr, elem).get_access_path(elem)
 
 
 def _split_by_access(ast: esprima.nodes.Node) -> List:
@@ -234,6 +340,216 @@ def _split_by_access(ast: esprima.nodes.Node) -> List:
 
 def ast_expression_to_string(ast_node: esprima.nodes.Node) -> str:
     """Generate a string starting from an AST node"""
+    try:
+        return print_expression_subset(ast_node)
+    except UnsupportedEcmascriptSyntax:
+        pass
     return escodegen.generate(
         ast_node, options={"format": {"newline": "", "indent": {"style": ""}}}
     )
+
+
+# The type of the values derived from an expression by the users of `AnalyzedExpression`
+DerivedT = TypeVar("DerivedT")
+
+# Placeholder for missing values in the memoized results
+_NOT_COMPUTED = object()
+
+
+class AnalyzedExpression:
+    """
+    All the information extracted from an ECMAScript expression, each computed at most once.
+
+    The expression is parsed at the first request. The following information is stored from the
+    first successful computation and reused afterwards: failures are re-evaluated (and reported
+    with the provided XML element) at each request. Use `analyze_expression` to get the instance
+    shared by all the users of the same expression.
+    """
+
+    def __init__(self, expression: str):
+        assert isinstance(expression, str), f"Provided expression is {type(expression)} != string."
+        self._expression = expression
+        self._ast: Optional[esprima.nodes.Node] = None
+        self._variable_names: Optional[Tuple[str, ...]] = None
+        # The type of the expression, for each combination of the variables types it refers to
+        self._types: Dict[Tuple[str, ...], ValidECMAScriptTypes] = {}
+        self._facts: Dict[Hashable, Any] = {}
+
+    def _get_fact(
+        self, key: Hashable, compute: Callable[[], DerivedT], elem: Optional[XmlElement]
+    ) -> DerivedT:
+        """Get a memoized information, reporting the failures with the provided XML element."""
+        value = self._facts.get(key, _NOT_COMPUTED)
+        if value is _NOT_COMPUTED:
+            try:
+                value = compute()
+            except MemberAccessCheckException as e:
+                print(get_error_msg(elem, e.args[0]))
+                raise e
+            self._facts[key] = value
+        return value
+
+    def get_expression(self) -> str:
+        return self._expression
+
+    def get_ast(self, elem: Optional[XmlElement] = None) -> esprima.nodes.Node:
+        """Get the read-only AST of the expression."""
+        if self._ast is None:
+            self._ast = parse_expression_to_ast(self._expression, elem)
+        return self._ast
+
+    def get_variable_names(self, elem: Optional[XmlElement] = None) -> Tuple[str, ...]:
+        """Get the names that might be looked up in the variables, when evaluating the type."""
+        if self._variable_names is None:
+            names: Set[str] = set()
+            _collect_variable_names(self.get_ast(elem), names)
+            self._variable_names = tuple(sorted(names))
+        return self._variable_names
+
+    def get_type(
+        self, variables: Dict[str, ValidECMAScriptTypes], elem: Optional[XmlElement] = None
+    ) -> ValidECMAScriptTypes:
+        """Get the type the expression evaluates to, given the types of the variables."""
+        context_key = tuple(
+            repr(variables.get(var_name, _NOT_COMPUTED))
+            for var_name in self.get_variable_names(elem)
+        )
+        expr_type = self._types.get(context_key, _NOT_COMPUTED)
+        if expr_type is _NOT_COMPUTED:
+            expr_type = get_ast_expression_type(self.get_ast(elem), variables)
+            self._types[context_key] = expr_type
+        # The callers might modify the returned types (e.g. ArrayInfo)
+        return deepcopy(expr_type)
+
+    def has_array_access(self, elem: Optional[XmlElement] = None) -> bool:
+        """Check if the expression, evaluating to a variable, contains an array access."""
+        return self._get_fact(
+            "has_array_access", lambda: _has_member_or_array_access(self.get_ast(elem), True), elem
+        )
+
+    def has_member_access(self, elem: Optional[XmlElement] = None) -> bool:
+        """Check if the expression, evaluating to a variable, contains a member access."""
+        return self._get_fact(
+            "has_member_access",
+            lambda: _has_member_or_array_access(self.get_ast(elem), False),
+            elem,
+        )
+
+    def has_operators(self, elem: Optional[XmlElement] = None) -> bool:
+        """Check if the expression contains unary, binary, logical or function operators."""
+        return self._get_fact(
+            "has_operators", lambda: _has_operators(self.get_ast(elem), elem), elem
+        )
+
+    def is_literal(self, elem: Optional[XmlElement] = None) -> bool:
+        """Check if the expression contains only a literal (or an array expression)."""
+        return self.get_ast(elem).type in (Syntax.Literal, Syntax.ArrayExpression)
+
+    def get_access_path(self, elem: Optional[XmlElement] = None) -> List[Union[str, ArrayAccess]]:
+        """Get the member and array accesses of the expression, see `split_by_access`."""
+        access_path = self._get_fact(
+            "access_path", lambda: _split_by_access(self.get_ast(elem)), elem
+        )
+        return list(access_path)
+
+    def get_array_as_list(self, elem: Optional[XmlElement] = None) -> List:
+        """Get the values of an array expression, see `get_array_expr_as_list`."""
+        array_list = self._get_fact(
+            "array_as_list",
+            lambda: _get_array_expr_as_list(self._expression, self.get_ast(elem)),
+            elem,
+        )
+        return deepcopy(array_list)
+
+    def to_string(self, elem: Optional[XmlElement] = None) -> str:
+        """Get the expression in its normalized form."""
+        return self._get_fact(
+            "to_string", lambda: ast_expression_to_string(self.get_ast(elem)), elem
+        )
+
+    def set_ast(self, ast_node: esprima.nodes.Node) -> None:
+        """
+        Provide the AST of the expression, in case it is already available to the caller.
+
+        :param ast_node: An AST that parsing the expression would generate. It will be frozen.
+        """
+        if self._ast is None:
+            self._ast = _freeze_ast_value(ast_node)
+
+    def get_derived(
+        self,
+        key: Hashable,
+        compute: Callable[["AnalyzedExpression"], DerivedT],
+        elem: Optional[XmlElement] = None,
+    ) -> DerivedT:
+        """
+        Get an information derived from the expression by another module, computed only once.
+
+        The returned value is shared by all callers, hence it must not be modified.
+
+        :param key: A unique identifier of the information to derive.
+        :param compute: The function generating the information from this expression.
+        :param elem: The xml element associated to the expression, for error logging.
+        """
+        return self._get_fact(("derived", key), lambda: compute(self), elem)
+
+
+def _collect_variable_names(ast: Any, names: Set[str]) -> None:
+    """Collect the identifiers and member access names an AST expression might refer to."""
+    if isinstance(ast, (list, tuple)):
+        for entry in ast:
+            _collect_variable_names(entry, names)
+    elif isinstance(ast, esprima.nodes.Node):
+        if ast.type == Syntax.Identifier:
+            names.add(ast.name)
+        elif ast.type == Syntax.MemberExpression and not ast.computed:
+            member_names: List[str] = []
+            curr_ast = ast
+            while curr_ast.type == Syntax.MemberExpression and not curr_ast.computed:
+                member_names.append(curr_ast.property.name)
+                curr_ast = curr_ast.object
+            _collect_variable_names(curr_ast, names)
+            if curr_ast.type == Syntax.Identifier:
+                for n_members in range(1, len(member_names) + 1):
+                    names.add(".".join([curr_ast.name] + member_names[::-1][:n_members]))
+        else:
+            for value in ast.__dict__.values():
+                _collect_variable_names(value, names)
+
+
+@lru_cache(maxsize=ECMASCRIPT_PARSE_CACHE_SIZE)
+def _get_analyzed_expression(expression: str) -> AnalyzedExpression:
+    return AnalyzedExpression(expression)
+
+
+def analyze_expression(expression: str, elem: Optional[XmlElement] = None) -> AnalyzedExpression:
+    """
+    Get the analysis of an ECMAScript expression, shared by all users of the same expression.
+
+    :param expression: The ECMAScript expression to analyze.
+    :param elem: The xml element associated to the expression, for error logging.
+    """
+    check_assertion(
+        isinstance(expression, str), elem, f"Provided expression is {type(expression)} != string."
+    )
+    return _get_analyzed_expression(expression)
+
+
+def generate_expression_from_ast(ast_node: esprima.nodes.Node) -> str:
+    """
+    Generate the string of an AST expression, attaching the AST to the analysis of the string.
+
+    This way, the users analyzing the generated string (e.g. the conversion to JANI) get the AST
+    without parsing the string again. If the AST does not match the one of its printed string,
+    the latter is parsed on request, as usual.
+
+    :param ast_node: The AST of the expression. It will not be modified.
+    :return: The string of the expression, as `ast_expression_to_string`.
+    """
+    try:
+        expression = print_expression_subset(ast_node)
+        printed_ast = get_printed_expression_ast(ast_node)
+    except UnsupportedEcmascriptSyntax:
+        return ast_expression_to_string(ast_node)
+    _get_analyzed_expression(expression).set_ast(printed_ast)
+    return expression
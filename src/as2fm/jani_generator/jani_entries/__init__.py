@@ -12,7 +12,7 @@ from .jani_variable import JaniVariable  # noqa: F401
 from .jani_assignment import JaniAssignment  # noqa: F401
 from .jani_guard import JaniGuard  # noqa: F401
 from .jani_edge import JaniEdge  # noqa: F401
-from .jani_automaton import JaniAutomaton  # noqa: F401
+from .jani_automaton import JaniAutomaton, SpilledJaniAutomaton  # noqa: F401
 from .jani_composition import JaniComposition  # noqa: F401
 from .jani_property import JaniProperty  # noqa: F401
 
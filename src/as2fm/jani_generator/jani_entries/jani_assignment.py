@@ -17,9 +17,10 @@
 Assignment in Jani
 """
 
-from typing import Dict
+from typing import Any, Dict, Optional
 
-from as2fm.jani_generator.jani_entries import JaniConstant, JaniExpression, generate_jani_expression
+from as2fm.as2fm_common.common import ReadOnlyDict
+from as2fm.jani_generator.jani_entries import JaniExpression, generate_jani_expression
 from as2fm.jani_generator.jani_entries.jani_expression_support import expand_expression
 
 
@@ -28,6 +29,8 @@ class JaniAssignment:
     Assignment in Jani.
     """
 
+    __slots__ = ("_var_name", "_value", "_index", "_dict", "_destination")
+
     def __init__(self, assignment_dict: dict):
         """Initialize the assignment from a dictionary"""
         self._var_name = generate_jani_expression(assignment_dict["ref"])
@@ -35,6 +38,10 @@ class JaniAssignment:
         self._index = 0
         if "index" in assignment_dict:
             self._index = assignment_dict["index"]
+        # The serialized assignment, generated on request
+        self._dict: Optional[Dict[str, Any]] = None
+        # The edge destination containing the assignment, to be notified when it changes
+        self._destination = None
 
     def get_target(self):
         """Return the variable storing the expression result."""
@@ -46,16 +53,24 @@ class JaniAssignment:
 
     def set_expression(self, expr: JaniExpression):
         self._value = expr
+        self._dict = None
+        if self._destination is not None:
+            self._destination.invalidate_dict()
 
     def get_index(self) -> int:
         """Returns the index, i.e. the number that defines the order of execution in Jani."""
         return self._index
 
-    def as_dict(self, constants: Dict[str, JaniConstant]):
-        """Transform the assignment to a dictionary"""
-        expanded_value = expand_expression(self._value, constants)
-        return {
-            "ref": self._var_name.as_dict(),
-            "value": expanded_value.as_dict(),
-            "index": self._index,
-        }
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Transform the assignment to a dictionary.
+
+        The dictionary is generated once and shared across the calls, hence it is read-only.
+        """
+        if self._dict is None:
+            self._dict = ReadOnlyDict(
+                ref=self._var_name.as_dict(),
+                value=expand_expression(self._value, {}).as_dict(),
+                index=self._index,
+            )
+        return self._dict
@@ -15,11 +15,32 @@
 
 """An automaton for jani."""
 
-from typing import Any, Dict, List, Optional, Set
+import pickle
+from typing import AbstractSet, Any, Dict, List, Optional, Set
 
+from as2fm.as2fm_common.common import ReadOnlyDict, ReadOnlyList
 from as2fm.jani_generator.jani_entries import JaniConstant, JaniEdge, JaniVariable
 
 
+def _remove_from_index(
+    edges_index: Dict[str, List[JaniEdge]], keys: Set[str], removed_ids: Set[int]
+) -> None:
+    """Remove the edges with the provided ids from the index entries with the provided keys."""
+    for key in keys:
+        kept_edges = [edge for edge in edges_index[key] if id(edge) not in removed_ids]
+        if len(kept_edges) > 0:
+            edges_index[key] = kept_edges
+        else:
+            del edges_index[key]
+
+
+def _detach_edges(automaton: "JaniAutomaton", edges: List[JaniEdge]) -> None:
+    """Stop notifying the automaton about changes of the provided (removed) edges."""
+    for edge in edges:
+        if edge._automaton is automaton:
+            edge._automaton = None
+
+
 class JaniAutomaton:
     @staticmethod
     def from_dict(automaton_dict: dict) -> "JaniAutomaton":
@@ -30,8 +51,13 @@ class JaniAutomaton:
         self._initial_locations: Set[str] = set()
         self._local_variables: Dict[str, JaniVariable] = {}
         self._edges: List[JaniEdge] = []
+        # Indexes of the edges, by action and by source location
+        self._edges_by_action: Dict[str, List[JaniEdge]] = {}
+        self._edges_by_location: Dict[str, List[JaniEdge]] = {}
         # Id to autogenerate edge action name if not provided
         self._edge_id = 0
+        # The serialized automaton, generated on request and discarded on changes
+        self._dict: Optional[Dict[str, Any]] = None
         if automaton_dict is None:
             return
         self._name = automaton_dict["name"]
@@ -44,11 +70,25 @@ class JaniAutomaton:
 
     def set_name(self, name: str):
         self._name = name
+        self._dict = None
 
     def add_location(self, location_name: str, is_initial: bool = False):
         self._locations.add(location_name)
         if is_initial:
             self._initial_locations.add(location_name)
+        self._dict = None
+
+    def get_locations(self) -> Set[str]:
+        return self._locations
+
+    def remove_location(self, location_name: str):
+        """Remove a location, that must not be the source of any edge in the automaton."""
+        assert (
+            location_name not in self._edges_by_location
+        ), f"Location {location_name} is still the source of some edges"
+        self._locations.discard(location_name)
+        self._initial_locations.discard(location_name)
+        self._dict = None
 
     def get_initial_locations(self) -> Set[str]:
         return self._initial_locations
@@ -58,6 +98,7 @@ class JaniAutomaton:
             location_name in self._locations
         ), f"Location {location_name} must exist in the automaton"
         self._initial_locations.add(location_name)
+        self._dict = None
 
     def unset_initial(self, location_name: str):
         assert (
@@ -65,35 +106,84 @@ class JaniAutomaton:
         ), f"Location {location_name} must exist in the automaton"
         assert location_name in self._initial_locations, f"Location {location_name} must be initial"
         self._initial_locations.remove(location_name)
+        self._dict = None
 
     def add_variable(self, variable: JaniVariable):
         self._local_variables.update({variable.name(): variable})
+        self._dict = None
 
     def get_variables(self) -> Dict[str, JaniVariable]:
         return self._local_variables
 
     def add_edge(self, edge: JaniEdge):
         if edge.get_action() is None:
-            edge.set_action(f"{self._name}_action_{self._edge_id}")
+            edge._set_action(f"{self._name}_action_{self._edge_id}")
             self._edge_id += 1
         self._edges.append(edge)
+        self._edges_by_action.setdefault(edge.get_action(), []).append(edge)
+        self._edges_by_location.setdefault(edge.location, []).append(edge)
+        # An edge belongs to a single automaton: the last one it was added to
+        edge._automaton = self
+        self._dict = None
 
     def set_edges(self, new_edges: List[JaniEdge]) -> None:
         """Replace the edges in the Automaton."""
+        _detach_edges(self, self._edges)
         self._edges = []
+        self._edges_by_action = {}
+        self._edges_by_location = {}
         for edge in new_edges:
             self.add_edge(edge)
 
     def get_edges(self) -> List[JaniEdge]:
         return self._edges
 
+    def get_edges_with_action(self, action_name: str) -> List[JaniEdge]:
+        """Get the edges with the provided action, in the order they were added."""
+        return self._edges_by_action.get(action_name, [])
+
+    def get_edges_from_location(self, location_name: str) -> List[JaniEdge]:
+        """
+        Get the edges starting from the provided location, in the order they were added.
+
+        The source location of an edge must not change, once the edge is in the automaton.
+        """
+        return self._edges_by_location.get(location_name, [])
+
+    def set_edge_action(self, edge: JaniEdge, action_name: str):
+        """Change the action of an edge in the automaton, keeping the edges index up to date."""
+        assert edge._automaton is self, "The edge must belong to the automaton."
+        old_action_edges = self._edges_by_action[edge.get_action()]
+        old_action_edges.remove(edge)
+        if len(old_action_edges) == 0:
+            del self._edges_by_action[edge.get_action()]
+        edge._set_action(action_name)
+        self._edges_by_action.setdefault(action_name, []).append(edge)
+
     def remove_edges_with_action_name(self, action_name: str):
         assert isinstance(action_name, str), "Action name must be a string"
-        self._edges = [edge for edge in self._edges if edge.get_action() != action_name]
+        removed_edges = self._edges_by_action.get(action_name)
+        if removed_edges is not None:
+            self.remove_edges(removed_edges)
 
     def remove_empty_self_loop_edges(self):
         """Remove all self-loop edges from the automaton."""
-        self._edges = [edge for edge in self._edges if not edge.is_empty_self_loop()]
+        self.remove_edges([edge for edge in self._edges if edge.is_empty_self_loop()])
+
+    def remove_edges(self, removed_edges: List[JaniEdge]):
+        """Remove the provided edges from the automaton and from its indexes."""
+        if len(removed_edges) == 0:
+            return
+        removed_ids = {id(edge) for edge in removed_edges}
+        self._edges = [edge for edge in self._edges if id(edge) not in removed_ids]
+        _detach_edges(self, removed_edges)
+        self._dict = None
+        _remove_from_index(
+            self._edges_by_action, {edge.get_action() for edge in removed_edges}, removed_ids
+        )
+        _remove_from_index(
+            self._edges_by_location, {edge.location for edge in removed_edges}, removed_ids
+        )
 
     def _generate_locations(
         self, location_list: List[Dict[str, Any]], initial_locations: List[str]
@@ -113,30 +203,93 @@ class JaniAutomaton:
             jani_edge = JaniEdge(edge)
             self.add_edge(jani_edge)
 
-    def get_actions(self) -> Set[str]:
-        actions = set()
-        for edge in self._edges:
-            action = edge.get_action()
-            if action is not None:
-                actions.add(action)
-        return actions
+    def get_actions(self) -> AbstractSet[str]:
+        """Get a (read-only) view of the actions of the automaton's edges."""
+        return self._edges_by_action.keys()
 
     def merge(self, other: "JaniAutomaton"):
         assert self._name == other.get_name(), "Automaton names must match"
         self._locations.update(other._locations)
         self._initial_locations.update(other._initial_locations)
         self._local_variables.update(other._local_variables)
-        self._edges.extend(other._edges)
-
-    def as_dict(self, constant: Dict[str, JaniConstant]):
-        automaton_dict = {
-            "name": self._name,
-            "locations": [{"name": location} for location in sorted(self._locations)],
-            "initial-locations": sorted(list(self._initial_locations)),
-            "edges": [edge.as_dict(constant) for edge in self._edges],
-        }
-        if len(self._local_variables) > 0:
-            automaton_dict.update(
-                {"variables": [jani_var.as_dict() for jani_var in self._local_variables.values()]}
-            )
-        return automaton_dict
+        for edge in other._edges:
+            self.add_edge(edge)
+        self._dict = None
+
+    def invalidate_dict(self):
+        """Discard the serialized automaton, e.g. after one of its edges changed."""
+        self._dict = None
+
+    def as_dict(self, constant: Optional[Dict[str, JaniConstant]] = None):
+        """
+        Get the automaton as a dictionary.
+
+        The dictionary is shared across the calls until the automaton changes, hence it is
+        read-only. Only the changed edges are serialized again.
+
+        :param constant: Unused: the automata are serialized without evaluating the constants.
+        """
+        if self._dict is None:
+            automaton_dict = {
+                "name": self._name,
+                "locations": ReadOnlyList(
+                    ReadOnlyDict(name=location) for location in sorted(self._locations)
+                ),
+                "initial-locations": ReadOnlyList(sorted(self._initial_locations)),
+                "edges": ReadOnlyList([edge.as_dict() for edge in self._edges]),
+            }
+            if len(self._local_variables) > 0:
+                automaton_dict["variables"] = ReadOnlyList(
+                    ReadOnlyDict(jani_var.as_dict()) for jani_var in self._local_variables.values()
+                )
+            self._dict = ReadOnlyDict(automaton_dict)
+        return self._dict
+
+
+class SpilledJaniAutomaton:
+    """
+    Placeholder for a JaniAutomaton stored in a file, to reduce the memory usage of large models.
+
+    Only the information required for composing the automata (i.e. name and actions) is kept in
+    memory: the complete automaton is loaded each time it needs to be modified or exported.
+    """
+
+    def __init__(self, automaton: JaniAutomaton, spill_file: str):
+        """
+        Write the automaton to the provided file, keeping only its metadata in memory.
+
+        :param automaton: The automaton to store. It should not be used afterwards.
+        :param spill_file: The path to the file where the automaton is stored.
+        """
+        self._spill_file = spill_file
+        self._name: str = automaton.get_name()
+        self._actions: Set[str] = set()
+        self.store(automaton)
+
+    def get_name(self) -> str:
+        return self._name
+
+    def get_actions(self) -> Set[str]:
+        return self._actions
+
+    def load(self) -> JaniAutomaton:
+        """Load the complete automaton from file."""
+        with open(self._spill_file, "rb") as f:
+            return pickle.load(f)
+
+    def store(self, automaton: JaniAutomaton) -> None:
+        """Replace the stored automaton with the provided one (e.g. after modifying it)."""
+        assert automaton.get_name() == self._name, "Automaton names must match"
+        with open(self._spill_file, "wb") as f:
+            pickle.dump(automaton, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._actions = set(automaton.get_actions())
+
+    def remove_edges_with_action_name(self, action_name: str):
+        assert isinstance(action_name, str), "Action name must be a string"
+        if action_name in self._actions:
+            automaton = self.load()
+            automaton.remove_edges_with_action_name(action_name)
+            self.store(automaton)
+
+    def as_dict(self, constant: Optional[Dict[str, JaniConstant]] = None):
+        return self.load().as_dict(constant)
@@ -11,73 +11,102 @@
 # distributed under the License is distributed on an "AS IS" BASIS,
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
-# limitations under the License.from typing import List
+# limitations under the License.
 
 """This allows the composition of multiple automata in jani."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 
 class JaniComposition:
+    """
+    The composition of the automata in a Jani model, i.e. the synchronization of their actions.
+
+    Each sync only stores the automata taking part in it, and each automaton keeps the syncs
+    its actions are used in. The dense lists of the Jani format are only generated in `as_dict`.
+    """
+
     @staticmethod
     def from_dict(composition_dict: dict) -> "JaniComposition":
         return JaniComposition(composition_dict=composition_dict)
 
     def __init__(self, composition_dict: Optional[Dict[str, Any]] = None):
+        self._elements: List[str] = []
+        self._element_to_id: Dict[str, int] = {}
+        # Each sync is made of its result and the action executed by each involved automaton.
+        # Removed syncs are replaced by None, to keep the ids of the following ones.
+        self._syncs: List[Optional[Dict[str, Any]]] = []
+        # For each automaton, the ids of the syncs each of its actions is involved in
+        self._element_syncs: Dict[str, Dict[str, List[int]]] = {}
         if composition_dict is None:
-            self._elements = []
-            self._syncs = []
-            self._element_to_id = {}
             return
-        self._elements = self._generate_elements(composition_dict["elements"])
-        self._syncs = self._generate_syncs(composition_dict["syncs"])
-        self._element_to_id = {element: idx for idx, element in enumerate(self._elements)}
+        for element in self._generate_elements(composition_dict["elements"]):
+            self.add_element(element)
+        self._generate_syncs(composition_dict["syncs"])
         assert self.is_valid(), "Invalid composition from dict."
 
     def add_element(self, element: str):
         """Append a new automaton name in the composition."""
-        assert element not in self._elements, f"Element {element} already exists in the composition"
+        assert (
+            element not in self._element_to_id
+        ), f"Element {element} already exists in the composition"
         self._elements.append(element)
         self._element_to_id[element] = len(self._elements) - 1
-        for sync in self._syncs:
-            assert (
-                len(sync["synchronise"]) == len(self._elements) - 1
-            ), "Unexpected number of syncs found in the composition during the update"
-            sync["synchronise"].append(None)
+        self._element_syncs[element] = {}
 
     def get_elements(self):
         """Get the elements of the composition."""
         return self._elements
 
-    def add_sync(self, sync_name: str, syncs: Dict[str, str]):
+    def add_sync(self, sync_name: Optional[str], syncs: Dict[str, str]):
         """Add a new synchronization between the elements.
 
         :param sync_name: The name of the synchronization action
         :param syncs: A dictionary relating each automaton to the action to be executed in the sync
         """
-        # Generate the synchronize list
-        sync_list: List[Optional[str]] = [None] * len(self._elements)
+        sync_id = len(self._syncs)
         for automata, action in syncs.items():
             assert (
                 automata in self._element_to_id
             ), f"Automaton {automata} does not exist in the composition"
-            sync_list[self._element_to_id[automata]] = action
-        self._syncs.append({"result": sync_name, "synchronise": sync_list})
+            self._element_syncs[automata].setdefault(action, []).append(sync_id)
+        self._syncs.append({"result": sync_name, "synchronise": dict(syncs)})
 
-    def get_syncs_for_element(self, element: str) -> List[str]:
-        """Get the existing syncs for a specific element (=automaton)."""
+    def get_syncs_for_element(self, element: str) -> Set[str]:
+        """Get the actions of a specific element (=automaton) used in the existing syncs."""
         assert (
             element in self._element_to_id
         ), f"Element {element} does not exist in the composition"
-        syncs_w_none = [sync["synchronise"][self._element_to_id[element]] for sync in self._syncs]
-        return [sync for sync in syncs_w_none if sync is not None]
+        return set(self._element_syncs[element])
+
+    def is_silent_action(self, element: str, action: str) -> bool:
+        """Check if the action of the element is used in syncs not involving other elements."""
+        sync_ids = self._element_syncs[element].get(action)
+        if sync_ids is None:
+            return False
+        for sync_id in sync_ids:
+            sync = self._syncs[sync_id]
+            assert sync is not None  # MyPy check
+            if len(sync["synchronise"]) > 1:
+                return False
+        return True
+
+    def remove_silent_syncs(self, element: str, action: str):
+        """Remove the syncs of an action of the element, not involving other elements."""
+        assert self.is_silent_action(
+            element, action
+        ), f"Action {action} of {element} is synchronized with other elements"
+        for sync_id in self._element_syncs[element].pop(action):
+            self._syncs[sync_id] = None
 
     def is_valid(self) -> bool:
         if len(self._elements) == 0:
             print("Found empty elements (automata) list.")
             return False
         for sync in self._syncs:
-            if len(sync["synchronise"]) != len(self._elements):
+            if sync is not None and not all(
+                element in self._element_to_id for element in sync["synchronise"]
+            ):
                 print("Found invalid syncs entry.")
                 return False
         return True
@@ -89,21 +118,32 @@ class JaniComposition:
         return elements
 
     def _generate_syncs(self, syncs_list):
-        generated_syncs = []
         for sync in syncs_list:
             assert len(self._elements) == len(
                 sync["synchronise"]
             ), "The number of elements and synchronise should be the same"
-            sync_dict = {"synchronise": sync["synchronise"], "result": None}
-            if "result" in sync:
-                sync_dict["result"] = sync["result"]
-            generated_syncs.append(sync_dict)
-        return generated_syncs
+            self.add_sync(
+                sync.get("result"),
+                {
+                    element: action
+                    for element, action in zip(self._elements, sync["synchronise"])
+                    if action is not None
+                },
+            )
+
+    def _get_dense_sync(self, sync: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate the Jani sync, with the action (or None) for each element."""
+        synchronise: List[Optional[str]] = [None] * len(self._elements)
+        for element, action in sync["synchronise"].items():
+            synchronise[self._element_to_id[element]] = action
+        return {"result": sync["result"], "synchronise": synchronise}
 
     def as_dict(self):
         # Sort the syncs before return
-        self._syncs = sorted(self._syncs, key=lambda x: x["result"])
+        sorted_syncs = sorted(
+            (sync for sync in self._syncs if sync is not None), key=lambda x: x["result"]
+        )
         return {
             "elements": [{"automaton": element} for element in self._elements],
-            "syncs": self._syncs,
+            "syncs": [self._get_dense_sync(sync) for sync in sorted_syncs],
         }
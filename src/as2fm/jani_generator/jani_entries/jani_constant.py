@@ -23,6 +23,8 @@ ValidTypes = Union[bool, int, float]
 
 
 class JaniConstant:
+    __slots__ = ("_name", "_type", "_value")
+
     @staticmethod
     def from_dict(constant_dict: dict) -> "JaniConstant":
         constant_name = constant_dict["name"]
@@ -15,27 +15,108 @@
 
 """And edge defining the possible transition from one state to another in jani."""
 
-from typing import Any, Dict, List, Optional
-
-from as2fm.jani_generator.jani_entries import (
-    JaniAssignment,
-    JaniConstant,
-    JaniExpression,
-    JaniGuard,
-)
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from as2fm.as2fm_common.common import ReadOnlyDict, ReadOnlyList
+from as2fm.jani_generator.jani_entries import JaniAssignment, JaniExpression, JaniGuard
 from as2fm.jani_generator.jani_entries.jani_expression_support import expand_expression
 
 
+class JaniDestination:
+    """
+    A destination of a JaniEdge: the target location, its probability and assignments.
+
+    Each change of the destination is notified to its edge, to serialize it again.
+    """
+
+    __slots__ = ("_location", "_probability", "_assignments", "_edge")
+
+    def __init__(
+        self,
+        location: Optional[str],
+        probability: Optional[JaniExpression],
+        assignments: Iterable[JaniAssignment],
+    ):
+        self._edge: Optional[JaniEdge] = None
+        self._location = location
+        self._probability = probability
+        self._assignments: Tuple[JaniAssignment, ...] = ()
+        self.assignments = assignments
+
+    @property
+    def location(self) -> Optional[str]:
+        return self._location
+
+    @location.setter
+    def location(self, location: Optional[str]):
+        self._location = location
+        self.invalidate_dict()
+
+    @property
+    def probability(self) -> Optional[JaniExpression]:
+        return self._probability
+
+    @probability.setter
+    def probability(self, probability: Optional[JaniExpression]):
+        self._probability = probability
+        self.invalidate_dict()
+
+    @property
+    def assignments(self) -> Tuple[JaniAssignment, ...]:
+        """The assignments executed when reaching the destination. Set them to change them."""
+        return self._assignments
+
+    @assignments.setter
+    def assignments(self, assignments: Iterable[JaniAssignment]):
+        # An assignment belongs to a single destination: the last one it was assigned to
+        for assignment in self._assignments:
+            if assignment._destination is self:
+                assignment._destination = None
+        self._assignments = tuple(assignments)
+        for assignment in self._assignments:
+            assignment._destination = self
+        self.invalidate_dict()
+
+    def invalidate_dict(self):
+        """Notify the edge containing the destination that it needs to be serialized again."""
+        if self._edge is not None:
+            self._edge.invalidate_dict()
+
+    def _as_dict(self) -> Dict[str, Any]:
+        assignments = ReadOnlyList([assignment.as_dict() for assignment in self._assignments])
+        if self._probability is None:
+            return ReadOnlyDict(location=self._location, assignments=assignments)
+        prob_exp = expand_expression(self._probability, {})
+        return ReadOnlyDict(
+            location=self._location,
+            probability=ReadOnlyDict(exp=prob_exp.as_dict()),
+            assignments=assignments,
+        )
+
+
 class JaniEdge:
+    """
+    An edge of a JaniAutomaton.
+
+    Each change of the edge (including its guard and destinations) is notified to its automaton,
+    to serialize it again.
+    """
+
+    __slots__ = ("_location", "_action", "_guard", "_destinations", "_dict", "_automaton")
+
     def __init__(self, edge_dict: dict):
-        self.location = edge_dict["location"]
-        self.action: Optional[str] = None
+        # The serialized edge, generated on request
+        self._dict: Optional[Dict[str, Any]] = None
+        # The automaton containing the edge, set by JaniAutomaton.add_edge
+        self._automaton = None
+        self._location: str = edge_dict["location"]
+        self._action: Optional[str] = None
         if "action" in edge_dict:
-            self.action = edge_dict["action"]
-        self.guard = None
+            self._action = edge_dict["action"]
+        self._guard: Optional[JaniGuard] = None
         if "guard" in edge_dict:
             self.guard = JaniGuard(edge_dict["guard"])
-        self.destinations: List[Dict[str, Any]] = []
+        self._destinations: Tuple[JaniDestination, ...] = ()
         if "destinations" not in edge_dict:
             return
         for dest in edge_dict["destinations"]:
@@ -55,9 +136,37 @@ class JaniEdge:
                 location=dest["location"], probability=prob, assignments=assignments
             )
 
+    @property
+    def location(self) -> str:
+        """The source location of the edge. It cannot change, once the edge is in an automaton."""
+        return self._location
+
+    @property
+    def action(self) -> Optional[str]:
+        return self._action
+
+    @property
+    def guard(self) -> Optional[JaniGuard]:
+        return self._guard
+
+    @guard.setter
+    def guard(self, guard: Optional[JaniGuard]):
+        # A guard belongs to a single edge: the last one it was assigned to
+        if self._guard is not None and self._guard._edge is self:
+            self._guard._edge = None
+        self._guard = guard
+        if guard is not None:
+            guard._edge = self
+        self.invalidate_dict()
+
+    @property
+    def destinations(self) -> Tuple[JaniDestination, ...]:
+        """The destinations of the edge. Use `append_destination` to add more."""
+        return self._destinations
+
     def get_action(self) -> Optional[str]:
         """Get the action name, if set."""
-        return self.action
+        return self._action
 
     def append_destination(
         self,
@@ -74,48 +183,58 @@ class JaniEdge:
         assert assignments is None or all(
             isinstance(assign, JaniAssignment) for assign in assignments
         )
-        jani_destination = {
-            "location": location,
-            "probability": probability,
-            "assignments": [] if assignments is None else assignments,
-        }
-        self.destinations.append(jani_destination)
+        destination = JaniDestination(
+            location, probability, () if assignments is None else assignments
+        )
+        destination._edge = self
+        self._destinations = self._destinations + (destination,)
+        self.invalidate_dict()
 
     def is_empty_self_loop(self) -> bool:
         """Check if the edge is an empty self loop (i.e. has no assignments)."""
         return (
-            len(self.destinations) == 1
-            and self.location == self.destinations[0]["location"]
-            and len(self.destinations[0]["assignments"]) == 0
+            len(self._destinations) == 1
+            and self._location == self._destinations[0].location
+            and len(self._destinations[0].assignments) == 0
         )
 
     def set_action(self, action_name: str):
-        """Set the action name."""
-        self.action = action_name
-
-    def as_dict(self, constants: Dict[str, JaniConstant]):
-        edge_dict = {"location": self.location, "destinations": []}
-        if self.action is not None:
-            edge_dict.update({"action": self.action})
-        if self.guard is not None:
-            extracted_guard = self.guard.as_dict(constants)
-            if len(extracted_guard) > 0:
-                edge_dict.update({"guard": self.guard.as_dict(constants)})
-        for dest in self.destinations:
-            single_destination = {
-                "location": dest["location"],
+        """Set the action name, updating the index of the automaton containing the edge."""
+        if self._automaton is not None:
+            self._automaton.set_edge_action(self, action_name)
+        else:
+            self._set_action(action_name)
+
+    def _set_action(self, action_name: str):
+        """Set the action name, without updating the index of the automaton."""
+        self._action = action_name
+        self.invalidate_dict()
+
+    def invalidate_dict(self):
+        """Discard the serialized edge, and notify the automaton containing it."""
+        self._dict = None
+        if self._automaton is not None:
+            self._automaton.invalidate_dict()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the edge as a dictionary.
+
+        The dictionary is shared across the calls until the edge changes, hence it is read-only.
+        """
+        if self._dict is None:
+            edge_dict: Dict[str, Any] = {
+                "location": self._location,
+                "destinations": ReadOnlyList([dest._as_dict() for dest in self._destinations]),
             }
-            if "probability" in dest:
-                if dest["probability"] is not None:
-                    prob_exp = expand_expression(dest["probability"], constants)
-                    single_destination.update({"probability": {"exp": prob_exp.as_dict()}})
-            if "assignments" in dest:
-                expanded_assignments = []
-                for assignment in dest["assignments"]:
-                    expanded_assignments.append(assignment.as_dict(constants))
-                single_destination.update({"assignments": expanded_assignments})
-            edge_dict["destinations"].append(single_destination)
-        return edge_dict
+            if self._action is not None:
+                edge_dict["action"] = self._action
+            if self._guard is not None:
+                guard_dict = self._guard.as_dict()
+                if len(guard_dict) > 0:
+                    edge_dict["guard"] = guard_dict
+            self._dict = ReadOnlyDict(edge_dict)
+        return self._dict
 
 
 def _sort_assignments_by_index(assignments: List[JaniAssignment]) -> None:
@@ -18,9 +18,11 @@ Expressions in Jani
 """
 
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Union, get_args
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Tuple, Type, Union, get_args
+from weakref import WeakValueDictionary
 
-from as2fm.as2fm_common.common import is_valid_variable_name
+from as2fm.as2fm_common.common import ReadOnlyDict, ReadOnlyList, is_valid_variable_name
 from as2fm.jani_generator.jani_entries import JaniValue
 from as2fm.scxml_converter.scxml_entries.utils import (
     MEMBER_ACCESS_SUBSTITUTION,
@@ -31,6 +33,12 @@ SupportedExp = Union[str, int, float, bool, dict]
 
 JaniExprOrList = Union["JaniExpression", List["JaniExpression"]]
 
+# How the operands are stored in an expression: lists of operands are stored as tuples
+JaniOperand = Union["JaniExpression", Tuple["JaniExpression", ...]]
+
+# The operands of identifiers, literals and distributions, shared by all of them
+_NO_OPERANDS: Mapping[str, JaniOperand] = MappingProxyType({})
+
 
 class JaniExpressionType(Enum):
     """Enumeration of the different types of Jani expressions."""
@@ -51,60 +59,150 @@ class JaniExpression:
     - value: a JaniValue object (literal expression)
     or
     - op: a string representing an operator
-    - operands: a dictionary of operands, related to the specified operator
+    - operands: a read-only mapping of operands, related to the specified operator. Lists of
+    operands (e.g. the elements of an 'av' operator) are stored as tuples.
+
+    Expressions are immutable and interned: generating an expression equal to an existing one
+    returns the existing instance. Hence, identical sub-expressions are shared, and equality and
+    hashing take constant time.
     """
 
-    def __init__(self, expression: Union[SupportedExp, "JaniExpression", JaniValue]):
-        self.identifier: Optional[str] = None
-        self.value: Optional[JaniValue] = None
-        self.op: Optional[str] = None
-        self.operands: Dict[str, JaniExprOrList] = {}
-        self.comment: Optional[str] = None
+    __slots__ = (
+        "identifier",
+        "value",
+        "op",
+        "operands",
+        "comment",
+        "_hash",
+        "_dict",
+        "_reads_event_data",
+        "_has_distribution",
+        "__weakref__",
+    )
+
+    def __new__(cls, expression: Union[SupportedExp, "JaniExpression", JaniValue]):
         if isinstance(expression, JaniExpression):
-            self.reset(expression)
-        elif isinstance(expression, JaniValue):
-            self.value = expression
-        else:
-            assert isinstance(
-                expression, get_args(SupportedExp)
-            ), f"Unexpected expression type: {type(expression)} should be a dict or a base type."
-            if isinstance(expression, str):
-                # self._init_expression_from_string(expression)
-                assert is_valid_variable_name(
-                    expression
-                ), f"Expression string {expression} is not a valid variable name."
-                # If it is a reference to a constant or variable, we do not need to expand further
-                self.identifier = expression
-            elif JaniValue(expression).is_valid():
-                # If it is a value, then we don't need to expand further
-                self.value = JaniValue(expression)
-            else:
-                # If it isn't a value or an identifier, it must be a dictionary providing op and
-                # related operands
-                # Operands need to be expanded further, until we encounter a value expression
-                assert isinstance(expression, dict), "Expected a dictionary"
-                assert "op" in expression, "Expected either a value or an operator"
-                self.comment = expression.get("comment")
-                self.op = expression["op"]
-                self.operands = self._get_operands(expression)
-
-    def reset(self, new_expr: "JaniExpression"):
-        """Replace the current expression instance with the provided one."""
-        assert (
-            new_expr.get_expression_type() != JaniExpressionType.DISTRIBUTION
-        ), "Cannot convert a JaniDistribution to a JaniExpression explicitly."
-        self.identifier = new_expr.identifier
-        self.value = new_expr.value
-        self.op = new_expr.op
-        self.operands = new_expr.operands
-        self.comment = new_expr.comment
+            assert (
+                expression.get_expression_type() != JaniExpressionType.DISTRIBUTION
+            ), "Cannot convert a JaniDistribution to a JaniExpression explicitly."
+            return expression
+        if isinstance(expression, JaniValue):
+            return cls._intern(None, expression, None, {}, None)
+        assert isinstance(
+            expression, get_args(SupportedExp)
+        ), f"Unexpected expression type: {type(expression)} should be a dict or a base type."
+        if isinstance(expression, str):
+            assert is_valid_variable_name(
+                expression
+            ), f"Expression string {expression} is not a valid variable name."
+            # If it is a reference to a constant or variable, we do not need to expand further
+            return cls._intern(expression, None, None, {}, None)
+        if JaniValue(expression).is_valid():
+            # If it is a value, then we don't need to expand further
+            return cls._intern(None, JaniValue(expression), None, {}, None)
+        # If it isn't a value or an identifier, it must be a dictionary providing op and
+        # related operands
+        # Operands need to be expanded further, until we encounter a value expression
+        assert isinstance(expression, dict), "Expected a dictionary"
+        assert "op" in expression, "Expected either a value or an operator"
+        op = expression["op"]
+        operands = JaniExpression._get_operands(op, expression)
+        return cls._intern(None, None, op, operands, expression.get("comment"))
+
+    def __init__(self, expression: Union[SupportedExp, "JaniExpression", JaniValue]):
+        # The expression content is set once, in `__new__`
+        pass
+
+    @classmethod
+    def _intern(
+        cls,
+        identifier: Optional[str],
+        value: Optional[JaniValue],
+        op: Optional[str],
+        operands: Mapping[str, Union[JaniExprOrList, JaniOperand]],
+        comment: Optional[str],
+    ) -> "JaniExpression":
+        """Get the instance with the provided content, generating it if it doesn't exist yet."""
+        value_key = None if value is None else _get_value_key(value)
+        operands_key = tuple(
+            (op_key, op_value if isinstance(op_value, JaniExpression) else tuple(op_value))
+            for op_key, op_value in operands.items()
+        )
+        return cls._get_interned(
+            (cls, identifier, value_key, op, comment, operands_key),
+            {
+                "identifier": identifier,
+                "value": value,
+                "op": op,
+                "operands": (
+                    _NO_OPERANDS if len(operands) == 0 else MappingProxyType(dict(operands_key))
+                ),
+                "comment": comment,
+            },
+        )
+
+    @classmethod
+    def _get_interned(cls, expr_key: Hashable, fields: Dict[str, Any]) -> "JaniExpression":
+        """Get the instance associated to the key, generating it from the fields if needed."""
+        jani_expr = _INTERNED_EXPRESSIONS.get(expr_key)
+        if jani_expr is None:
+            jani_expr = object.__new__(cls)
+            for field_name, field_value in fields.items():
+                object.__setattr__(jani_expr, field_name, field_value)
+            object.__setattr__(jani_expr, "_hash", hash(expr_key))
+            object.__setattr__(jani_expr, "_dict", None)
+            object.__setattr__(jani_expr, "_reads_event_data", _reads_event_data(fields))
+            object.__setattr__(jani_expr, "_has_distribution", _has_distribution(fields))
+            _INTERNED_EXPRESSIONS[expr_key] = jani_expr
+        return jani_expr
+
+    def __setattr__(self, name: str, _):
+        raise AttributeError(f"Cannot set '{name}': JaniExpression instances are immutable.")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"Cannot delete '{name}': JaniExpression instances are immutable.")
+
+    def __reduce__(self):
+        return (
+            _intern_jani_expression,
+            (type(self), self.identifier, self.value, self.op, dict(self.operands), self.comment),
+        )
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, _):
+        return self
+
+    def with_operands(
+        self, operands: Mapping[str, Union[JaniExprOrList, JaniOperand]], op: Optional[str] = None
+    ) -> "JaniExpression":
+        """
+        Get the expression with the same comment and the provided operands.
+
+        :param operands: The operands of the new expression.
+        :param op: The operator of the new expression. If None, the current one is kept.
+        :return: The new expression (self, if nothing changed).
+        """
+        assert self.op is not None, "Only operator expressions have operands."
+        new_op = self.op if op is None else op
+        if new_op == self.op and operands == dict(self.operands):
+            return self
+        return JaniExpression._intern(None, None, new_op, operands, self.comment)
+
+    def with_comment(self, comment: Optional[str]) -> "JaniExpression":
+        """Get the same expression, with the provided comment (operator expressions only)."""
+        if self.op is None or self.comment == comment:
+            return self
+        return JaniExpression._intern(None, None, self.op, self.operands, comment)
 
+    @staticmethod
     def _get_operands(
-        self, expression_dict: dict
+        op: str, expression_dict: dict
     ) -> Dict[str, Union["JaniExpression", List["JaniExpression"]]]:
         """Generate the expressions operands from a raw dictionary, after validating  it."""
-        assert self.op is not None, "Operator not set"
-        if self.op in ("intersect", "distance"):
+        assert op is not None, "Operator not set"
+        if op in ("intersect", "distance"):
             # intersect: returns a value in [0.0, 1.0], indicating where on the robot trajectory
             # the intersection occurs.
             #            0.0 means no intersection occurs (destination reached), 1.0 means the
@@ -114,14 +212,14 @@ class JaniExpression:
                 "robot": generate_jani_expression(expression_dict["robot"]),
                 "barrier": generate_jani_expression(expression_dict["barrier"]),
             }
-        if self.op in ("distance_to_point"):
+        if op in ("distance_to_point"):
             # distance between robot outer radius and point x-y coords
             return {
                 "robot": generate_jani_expression(expression_dict["robot"]),
                 "x": generate_jani_expression(expression_dict["x"]),
                 "y": generate_jani_expression(expression_dict["y"]),
             }
-        if self.op in (
+        if op in (
             "&&",
             "||",
             "and",
@@ -154,7 +252,7 @@ class JaniExpression:
                 "left": generate_jani_expression(expression_dict["left"]),
                 "right": generate_jani_expression(expression_dict["right"]),
             }
-        if self.op in (
+        if op in (
             "!",
             "¬",
             "sin",
@@ -168,40 +266,40 @@ class JaniExpression:
             "to_rad",
         ):
             return {"exp": generate_jani_expression(expression_dict["exp"])}
-        if self.op in ("ite"):
+        if op in ("ite"):
             return {
                 "if": generate_jani_expression(expression_dict["if"]),
                 "then": generate_jani_expression(expression_dict["then"]),
                 "else": generate_jani_expression(expression_dict["else"]),
             }
         # Array-specific expressions
-        if self.op == "ac":
+        if op == "ac":
             return {
                 "var": generate_jani_expression(expression_dict["var"]),
                 "length": generate_jani_expression(expression_dict["length"]),
                 "exp": generate_jani_expression(expression_dict["exp"]),
             }
-        if self.op == "aa":
+        if op == "aa":
             return {
                 "exp": generate_jani_expression(expression_dict["exp"]),
                 "index": generate_jani_expression(expression_dict["index"]),
             }
-        if self.op == "av":
+        if op == "av":
             return {"elements": generate_jani_expression(expression_dict["elements"])}
         # Convince specific expressions
-        if self.op in ("norm2d"):
+        if op in ("norm2d"):
             return {
                 "x": generate_jani_expression(expression_dict["x"]),
                 "y": generate_jani_expression(expression_dict["y"]),
             }
-        if self.op in ("dot2d", "cross2d"):
+        if op in ("dot2d", "cross2d"):
             return {
                 "x1": generate_jani_expression(expression_dict["x1"]),
                 "y1": generate_jani_expression(expression_dict["y1"]),
                 "x2": generate_jani_expression(expression_dict["x2"]),
                 "y2": generate_jani_expression(expression_dict["y2"]),
             }
-        assert False, f'Unknown operator "{self.op}" found.'
+        assert False, f'Unknown operator "{op}" found.'
 
     def get_expression_type(self) -> JaniExpressionType:
         """Get the type of the expression."""
@@ -222,25 +320,30 @@ class JaniExpression:
         event.
 
         :param replacement: The string to replace `PLAIN_SCXML_EVENT_DATA_PREFIX` with.
-        :return self: for the convenience of chain-ability
+        :return: The expression with the replaced prefix (self, if nothing needs to be replaced).
         """
-        if replacement is None:
+        if replacement is None or not self._reads_event_data:
             # No replacement needed!
             return self
-        if self.identifier is not None and self.identifier.startswith(
-            PLAIN_SCXML_EVENT_DATA_PREFIX
-        ):
-            self.identifier = (
+        if self.identifier is not None:
+            return JaniExpression(
                 f"{replacement}{MEMBER_ACCESS_SUBSTITUTION}"
                 + f"{self.identifier.removeprefix(PLAIN_SCXML_EVENT_DATA_PREFIX)}"
             )
-            return self
-        if self.value is not None:
-            return self
-        for operand in self.operands.values():
-            if isinstance(operand, JaniExpression):
-                operand.replace_event(replacement)
-        return self
+        return self.with_operands(
+            {
+                op_key: (
+                    operand.replace_event(replacement)
+                    if isinstance(operand, JaniExpression)
+                    else operand
+                )
+                for op_key, operand in self.operands.items()
+            }
+        )
+
+    def has_distribution(self) -> bool:
+        """Check if the expression samples a distribution, i.e. it needs to be expanded."""
+        return self._has_distribution
 
     def is_valid(self) -> bool:
         """Expression validity check."""
@@ -256,7 +359,7 @@ class JaniExpression:
         assert self.is_valid(), "Expression is not valid"
         return self.identifier
 
-    def as_operator(self) -> Tuple[Optional[str], Optional[Dict[str, JaniExprOrList]]]:
+    def as_operator(self) -> Tuple[Optional[str], Optional[Mapping[str, JaniOperand]]]:
         """Provide the expression as an operator, if possible. (None, None) otherwise."""
         assert self.is_valid(), "Expression is not valid"
         if self.op is None:
@@ -264,12 +367,18 @@ class JaniExpression:
         return (self.op, self.operands)
 
     def as_dict(self) -> Union[str, int, float, bool, dict]:
-        """Convert the expression to a dictionary, ready to be converted to JSON."""
-        assert hasattr(self, "identifier"), f"Identifier not set for {self.__dict__}"
+        """
+        Convert the expression to a dictionary, ready to be converted to JSON.
+
+        The dictionary is generated once and shared by all callers, hence it is read-only.
+        """
+        assert hasattr(self, "identifier"), "Identifier not set."
         if self.identifier is not None:
             return self.identifier
         if self.value is not None:
             return self.value.as_dict()
+        if self._dict is not None:
+            return self._dict
         op_dict: Dict[str, Any] = {}
         if self.comment is not None:
             op_dict.update({"comment": self.comment})
@@ -277,17 +386,21 @@ class JaniExpression:
         for op_key, op_value in self.operands.items():
             if isinstance(op_value, JaniExpression):
                 op_dict.update({op_key: op_value.as_dict()})
-            elif isinstance(op_value, list):
-                list_of_dicts = [single_val.as_dict() for single_val in op_value]
+            elif isinstance(op_value, tuple):
+                list_of_dicts = ReadOnlyList(single_val.as_dict() for single_val in op_value)
                 op_dict.update({op_key: list_of_dicts})
             else:
                 raise TypeError(f"Unexpected operand {op_key} value type {type(op_value)}.")
-        return op_dict
+        read_only_dict = ReadOnlyDict(op_dict)
+        object.__setattr__(self, "_dict", read_only_dict)
+        return read_only_dict
 
     def __eq__(self, value):
-        """Equality operator between two JaniExpressions."""
-        assert isinstance(value, JaniExpression)
-        return self.as_dict() == value.as_dict()
+        """Equality operator between two JaniExpressions: equal expressions are the same object."""
+        return self is value
+
+    def __hash__(self):
+        return self._hash
 
     def __str__(self):
         return f"JaniExpression({self.as_dict()})"
@@ -300,16 +413,38 @@ class JaniDistribution(JaniExpression):
     At the moment, this is only meant to support Uniform distributions between 0.0 and 1.0
     """
 
-    def __init__(self, expression: dict):
-        self._distribution = expression.get("distribution")
-        self._args = expression.get("args")
+    __slots__ = ("_distribution", "_args")
+
+    def __new__(cls, expression: dict):
+        distribution = expression.get("distribution")
+        args = expression.get("args")
         assert (
-            self._distribution == "Uniform"
-        ), f"Expected distribution to be Uniform, found {self._distribution}."
+            distribution == "Uniform"
+        ), f"Expected distribution to be Uniform, found {distribution}."
         assert (
-            isinstance(self._args, list) and len(self._args) == 2
-        ), f"Unexpected arguments for Uniform distribution expression: {self._args}."
-        assert self.is_valid(), "Invalid arguments provided: expected args[0] <= args[1]."
+            isinstance(args, list) and len(args) == 2
+        ), f"Unexpected arguments for Uniform distribution expression: {args}."
+        jani_dist = cls._get_interned(
+            (cls, distribution, tuple((type(arg), arg) for arg in args)),
+            {
+                "identifier": None,
+                "value": None,
+                "op": None,
+                "operands": _NO_OPERANDS,
+                "comment": None,
+                "_distribution": distribution,
+                "_args": tuple(args),
+            },
+        )
+        assert jani_dist.is_valid(), "Invalid arguments provided: expected args[0] <= args[1]."
+        return jani_dist
+
+    def __init__(self, expression: dict):
+        # The distribution content is set once, in `__new__`
+        pass
+
+    def __reduce__(self):
+        return (JaniDistribution, (self.as_dict(),))
 
     def is_valid(self):
         """Distribution validity check."""
@@ -345,12 +480,68 @@ class JaniDistribution(JaniExpression):
 
     def get_dist_args(self) -> List[Union[int, float]]:
         """Return the config. arguments of the distribution."""
-        return self._args
+        return list(self._args)
 
     def as_dict(self) -> Dict[str, Any]:
         """Convert the distribution to a dictionary, ready to be converted to JSON."""
         assert self.is_valid(), "Expected distribution to be valid."
-        return {"distribution": self._distribution, "args": self._args}
+        return {"distribution": self._distribution, "args": list(self._args)}
+
+
+# All the existing expressions, indexed by their content: identical expressions are shared
+_INTERNED_EXPRESSIONS: "WeakValueDictionary[Hashable, JaniExpression]" = WeakValueDictionary()
+
+
+def _get_value_key(value: JaniValue) -> Hashable:
+    """Generate the key of a literal value, keeping apart values of different types (1, 1.0)."""
+    raw_value = value.as_dict()
+    if isinstance(raw_value, dict):
+        return tuple(sorted(raw_value.items()))
+    if isinstance(raw_value, float):
+        # 0.0 and -0.0 are equal, but they must be serialized differently
+        return (float, repr(raw_value))
+    return (type(raw_value), raw_value)
+
+
+def _reads_event_data(expression_fields: Dict[str, Any]) -> bool:
+    """Check if the expression with the provided fields reads the data of the SCXML event."""
+    identifier = expression_fields["identifier"]
+    if identifier is not None:
+        return identifier.startswith(PLAIN_SCXML_EVENT_DATA_PREFIX)
+    return any(
+        (
+            operand._reads_event_data
+            if isinstance(operand, JaniExpression)
+            else any(entry._reads_event_data for entry in operand)
+        )
+        for operand in expression_fields["operands"].values()
+    )
+
+
+def _has_distribution(expression_fields: Dict[str, Any]) -> bool:
+    """Check if the expression with the provided fields is or contains a distribution."""
+    if "_distribution" in expression_fields:
+        return True
+    return any(
+        (
+            operand._has_distribution
+            if isinstance(operand, JaniExpression)
+            else any(entry._has_distribution for entry in operand)
+        )
+        for operand in expression_fields["operands"].values()
+    )
+
+
+def _intern_jani_expression(
+    cls: Type[JaniExpression],
+    identifier: Optional[str],
+    value: Optional[JaniValue],
+    op: Optional[str],
+    operands: Dict[str, JaniExprOrList],
+    comment: Optional[str],
+) -> JaniExpression:
+    """Get the interned expression with the provided content, used for unpickling."""
+    return cls._intern(identifier, value, op, operands, comment)
 
 
 def generate_jani_expression(expr: SupportedExp) -> JaniExprOrList:
@@ -15,15 +15,18 @@
 
 """Expand expressions into jani."""
 
-from copy import deepcopy
-from typing import Callable, Dict, List, Union
+from itertools import product
+from math import ceil, floor, isfinite
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 
 from as2fm.jani_generator.jani_entries import (
     JaniConstant,
     JaniDistribution,
     JaniExpression,
     JaniExpressionType,
+    JaniValue,
 )
+from as2fm.jani_generator.jani_entries.jani_expression import JaniExprOrList
 from as2fm.jani_generator.jani_entries.jani_expression_generator import (
     abs_operator,
     ceil_operator,
@@ -87,13 +90,6 @@ def random_operator() -> JaniDistribution:
     return distribution_expression("Uniform", [0.0, 1.0])
 
 
-def __substitute_expression_op(expression: JaniExpression) -> JaniExpression:
-    assert isinstance(expression, JaniExpression), "The input must be a JaniExpression"
-    assert expression.op in OPERATORS_TO_JANI_MAP, f"The operator {expression.op} is not supported"
-    expression.op = OPERATORS_TO_JANI_MAP[expression.op]
-    return expression
-
-
 def expand_expression(
     expression: Union[JaniExpression, List[JaniExpression]], jani_constants: Dict[str, JaniConstant]
 ) -> Union[JaniExpression, List[JaniExpression]]:
@@ -101,7 +97,7 @@ def expand_expression(
     Given an expression (or a list of them), expand all operators to use only plain features.
     """
     # Given a CONVINCE JaniExpression, expand it to a plain JaniExpression
-    if isinstance(expression, list):
+    if isinstance(expression, (list, tuple)):
         assert all(
             isinstance(entry, JaniExpression) for entry in expression
         ), "Expected a list of expressions, found something else."
@@ -126,10 +122,12 @@ def expand_expression(
         # It is either a variable/constant identifier or a value
         return expression
     # If the expressions is neither of the above, we expand the operands and return them
-    for key, value in expression.operands.items():
-        expression.operands[key] = expand_expression(value, jani_constants)
+    expanded_operands = {
+        key: expand_expression(value, jani_constants) for key, value in expression.operands.items()
+    }
     # The remaining operators are the basic ones, and they only need the operand to be substituted
-    return __substitute_expression_op(expression)
+    assert expression.op in OPERATORS_TO_JANI_MAP, f"The operator {expression.op} is not supported"
+    return expression.with_operands(expanded_operands, OPERATORS_TO_JANI_MAP[expression.op])
 
 
 def expand_distribution_expressions(
@@ -148,38 +146,29 @@ def expand_distribution_expressions(
         expression, JaniExpression
     ), f"Unexpected expression type: {type(expression)} != (JaniExpression, JaniDistribution)."
     assert expression.is_valid(), f"Invalid expression found: {expression}."
+    if not expression.has_distribution():
+        return [expression]
     expr_type = expression.get_expression_type()
     if expr_type == JaniExpressionType.OPERATOR:
         # Generate all possible expressions, if expansion returns many expressions for an operand
-        expanded_expressions: List[JaniExpression] = [deepcopy(expression)]
-        for key, value in expression.operands.items():
+        operands_options: List[List[Union[JaniExpression, List[JaniExpression]]]] = []
+        for value in expression.operands.values():
             if isinstance(value, JaniExpression):
                 # Normal case, operand value is a JaniExpression
-                expanded_operand = expand_distribution_expressions(value, n_options=n_options)
-                base_expressions = expanded_expressions
-                expanded_expressions = []
-                for expr in base_expressions:
-                    for key_value in expanded_operand:
-                        expr.operands[key] = key_value
-                        expanded_expressions.append(deepcopy(expr))
+                operands_options.append(expand_distribution_expressions(value, n_options=n_options))
             else:
-                assert isinstance(value, list), f"Unexpected value type {type(value)}."
+                assert isinstance(value, tuple), f"Unexpected value type {type(value)}."
                 # Here we expect an array of JaniExpressions
-                for value_idx, value_entry in enumerate(value):
-                    base_expressions = expanded_expressions
-                    expanded_expressions = []
-                    expanded_operand_entries = expand_distribution_expressions(
-                        value_entry, n_options=n_options
-                    )
-                    for expr in base_expressions:
-                        for expanded_entry in expanded_operand_entries:
-                            expr_operand = expr.operands[key]
-                            assert isinstance(
-                                expr_operand, list
-                            ), f"Unexpected type of {expr=} and {key=}: should be a list."
-                            expr_operand[value_idx] = expanded_entry
-                            expanded_expressions.append(deepcopy(expr))
-        return expanded_expressions
+                entries_options = [
+                    expand_distribution_expressions(value_entry, n_options=n_options)
+                    for value_entry in value
+                ]
+                operands_options.append([list(entries) for entries in product(*entries_options)])
+        operands_keys = list(expression.operands.keys())
+        return [
+            expression.with_operands(dict(zip(operands_keys, operands)))
+            for operands in product(*operands_options)
+        ]
     elif expr_type == JaniExpressionType.DISTRIBUTION:
         # Here we need to substitute the distribution with a number of constants
         assert isinstance(expression, JaniDistribution) and expression.is_valid()
@@ -192,6 +181,257 @@ def expand_distribution_expressions(
     return [expression]
 
 
+def extract_distributions(
+    expression: JaniExpression, get_sample_name: Callable[[int], str]
+) -> Tuple[JaniExpression, List[JaniDistribution]]:
+    """
+    Substitute each distribution in the expression with a variable storing a sample of it.
+
+    Each occurrence of a distribution is an independent sample, even if the same (shared)
+    distribution instance is found multiple times.
+
+    :param expression: The expression containing the distributions.
+    :param get_sample_name: Provides the variable name to use for the n-th distribution found.
+    :return: The expression reading the samples and the distributions, in the same order.
+    """
+    distributions: List[JaniDistribution] = []
+
+    def _extract(sub_expression: JaniExpression) -> JaniExpression:
+        if not sub_expression.has_distribution():
+            return sub_expression
+        if isinstance(sub_expression, JaniDistribution):
+            distributions.append(sub_expression)
+            return JaniExpression(get_sample_name(len(distributions) - 1))
+        return sub_expression.with_operands(
+            {
+                op_key: (
+                    _extract(operand)
+                    if isinstance(operand, JaniExpression)
+                    else [_extract(entry) for entry in operand]
+                )
+                for op_key, operand in sub_expression.operands.items()
+            }
+        )
+
+    return _extract(expression), distributions
+
+
+def collect_identifiers(expression: JaniExpression) -> Set[str]:
+    """Get the names of all variables and constants the expression refers to."""
+    identifiers: Set[str] = set()
+    expressions_to_visit: List[JaniExpression] = [expression]
+    while len(expressions_to_visit) > 0:
+        sub_expression = expressions_to_visit.pop()
+        if sub_expression.identifier is not None:
+            identifiers.add(sub_expression.identifier)
+        elif sub_expression.op is not None:
+            for operand in sub_expression.operands.values():
+                if isinstance(operand, JaniExpression):
+                    expressions_to_visit.append(operand)
+                else:
+                    expressions_to_visit.extend(operand)
+    return identifiers
+
+
+# Binary operators evaluated on numeric literals, returning None if the result is not foldable
+_NUMERIC_FOLDING: Dict[
+    str, Callable[[Union[int, float], Union[int, float]], Optional[JaniValue]]
+] = {
+    "+": lambda left, right: JaniValue(left + right),
+    "-": lambda left, right: JaniValue(left - right),
+    "*": lambda left, right: JaniValue(left * right),
+    # In Jani, the division always results in a real number
+    "/": lambda left, right: None if right == 0 else JaniValue(float(left) / right),
+    # Only fold the modulo on positive values, to avoid relying on its definition for negatives
+    "%": lambda left, right: (
+        JaniValue(left % right)
+        if isinstance(left, int) and isinstance(right, int) and left >= 0 and right > 0
+        else None
+    ),
+    "min": lambda left, right: JaniValue(min(left, right)),
+    "max": lambda left, right: JaniValue(max(left, right)),
+    "<": lambda left, right: JaniValue(left < right),
+    "≤": lambda left, right: JaniValue(left <= right),
+    ">": lambda left, right: JaniValue(left > right),
+    "≥": lambda left, right: JaniValue(left >= right),
+    "=": lambda left, right: JaniValue(left == right),
+    "≠": lambda left, right: JaniValue(left != right),
+}
+
+# Unary operators evaluated on numeric literals
+_UNARY_NUMERIC_FOLDING: Dict[str, Callable[[Union[int, float]], JaniValue]] = {
+    "abs": lambda exp: JaniValue(abs(exp)),
+    "floor": lambda exp: JaniValue(int(floor(exp))),
+    "ceil": lambda exp: JaniValue(int(ceil(exp))),
+}
+
+
+def _get_literal_value(expression: JaniExprOrList) -> Optional[Union[int, float, bool]]:
+    """Get the value of a literal expression (excluding the constants e and π), None otherwise."""
+    if not isinstance(expression, JaniExpression) or expression.value is None:
+        return None
+    value = expression.value.as_dict()
+    return value if isinstance(value, (int, float)) else None
+
+
+def _is_numeric(value: Optional[Union[int, float, bool]]) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_int_literal(expression: JaniExprOrList, int_value: int) -> bool:
+    """Check if the expression is an integer literal with the provided value."""
+    value = _get_literal_value(expression)
+    return type(value) is int and value == int_value
+
+
+def _fold_literals(op: str, operands: Dict[str, JaniExprOrList]) -> Optional[JaniExpression]:
+    """Evaluate an operator applied to literals only, if possible."""
+    values = {key: _get_literal_value(operand) for key, operand in operands.items()}
+    if any(value is None for value in values.values()):
+        return None
+    folded_value: Optional[JaniValue] = None
+    if op in _NUMERIC_FOLDING and all(_is_numeric(value) for value in values.values()):
+        folded_value = _NUMERIC_FOLDING[op](values["left"], values["right"])
+    elif op in _UNARY_NUMERIC_FOLDING and _is_numeric(values["exp"]):
+        folded_value = _UNARY_NUMERIC_FOLDING[op](values["exp"])
+    elif op in ("=", "≠") and all(isinstance(value, bool) for value in values.values()):
+        folded_value = JaniValue((values["left"] == values["right"]) == (op == "="))
+    elif op == "¬" and isinstance(values["exp"], bool):
+        folded_value = JaniValue(not values["exp"])
+    if folded_value is None:
+        return None
+    if isinstance(folded_value.value(), float) and not isfinite(folded_value.value()):
+        return None
+    return JaniExpression(folded_value)
+
+
+def _collect_operands(
+    expression: JaniExpression, op: str, simplified: Dict[JaniExpression, JaniExpression]
+) -> List[JaniExpression]:
+    """Simplify and collect the operands of a chain of the same associative operator."""
+    collected: List[JaniExpression] = []
+    for operand in expression.operands.values():
+        assert isinstance(operand, JaniExpression), f"Unexpected operand in {op} operator."
+        # The simplified operands are chains of simplified entries already
+        pending_operands = [_simplify_expression(operand, simplified)]
+        while len(pending_operands) > 0:
+            entry = pending_operands.pop()
+            if entry.op is not None and OPERATORS_TO_JANI_MAP.get(entry.op) == op:
+                pending_operands.extend(reversed(entry.operands.values()))
+            else:
+                collected.append(entry)
+    return collected
+
+
+def _simplify_logic_chain(
+    expression: JaniExpression, op: str, simplified: Dict[JaniExpression, JaniExpression]
+) -> JaniExpression:
+    """Simplify a chain of conjunctions or disjunctions."""
+    # The neutral element of the operator, and the absorbing one is its negation
+    neutral_value = op == "∧"
+    chain_operands: Dict[JaniExpression, None] = {}
+    for operand in _collect_operands(expression, op, simplified):
+        literal_value = _get_literal_value(operand)
+        if literal_value is neutral_value:
+            continue
+        if literal_value is (not neutral_value):
+            return JaniExpression(not neutral_value)
+        # Keep the first occurrence of each operand, in the original order
+        chain_operands.setdefault(operand)
+    if len(chain_operands) == 0:
+        return JaniExpression(neutral_value)
+    chain_entries = list(chain_operands)
+    simple_chain = chain_entries[0]
+    for operand in chain_entries[1:]:
+        simple_chain = JaniExpression({"op": op, "left": simple_chain, "right": operand})
+    return simple_chain.with_comment(expression.comment)
+
+
+def _simplify_operator(
+    expression: JaniExpression, simplified: Dict[JaniExpression, JaniExpression]
+) -> JaniExpression:
+    """Simplify an expression with an operator, once its operands are simplified."""
+    op = OPERATORS_TO_JANI_MAP.get(expression.op, expression.op)
+    if op in ("∧", "∨"):
+        return _simplify_logic_chain(expression, op, simplified)
+    operands: Dict[str, JaniExprOrList] = {}
+    for key, operand in expression.operands.items():
+        if isinstance(operand, JaniExpression):
+            operands[key] = _simplify_expression(operand, simplified)
+        else:
+            operands[key] = [_simplify_expression(entry, simplified) for entry in operand]
+    folded_expression = _fold_literals(op, operands)
+    if folded_expression is not None:
+        return folded_expression
+    if op == "¬":
+        # Double negation
+        inner_op, inner_operands = operands["exp"].as_operator()
+        if inner_op is not None and OPERATORS_TO_JANI_MAP.get(inner_op) == "¬":
+            return inner_operands["exp"]
+    elif op == "⇒":
+        left_value = _get_literal_value(operands["left"])
+        right_value = _get_literal_value(operands["right"])
+        if left_value is False or right_value is True:
+            return JaniExpression(True)
+        if left_value is True:
+            return operands["right"]
+        if right_value is False:
+            return _simplify_expression(
+                JaniExpression({"op": "¬", "exp": operands["left"]}), simplified
+            )
+    elif op == "ite":
+        condition_value = _get_literal_value(operands["if"])
+        if isinstance(condition_value, bool):
+            return operands["then"] if condition_value else operands["else"]
+        if operands["then"] is operands["else"]:
+            return operands["then"]
+    elif op in ("+", "-") and _is_int_literal(operands["right"], 0):
+        return operands["left"]
+    elif op == "+" and _is_int_literal(operands["left"], 0):
+        return operands["right"]
+    elif op == "*" and _is_int_literal(operands["right"], 1):
+        return operands["left"]
+    elif op == "*" and _is_int_literal(operands["left"], 1):
+        return operands["right"]
+    return expression.with_operands(operands)
+
+
+def _simplify_expression(
+    expression: JaniExpression, simplified: Dict[JaniExpression, JaniExpression]
+) -> JaniExpression:
+    """Simplify the expression, reusing the results of the already simplified sub-expressions."""
+    simple_expression = simplified.get(expression)
+    if simple_expression is None:
+        if expression.op is None:
+            # Identifiers, literals and distributions cannot be simplified
+            simple_expression = expression
+        else:
+            simple_expression = _simplify_operator(expression, simplified)
+        simplified[expression] = simple_expression
+    return simple_expression
+
+
+def simplify_expression(
+    expression: JaniExpression,
+    simplified: Optional[Dict[JaniExpression, JaniExpression]] = None,
+) -> JaniExpression:
+    """
+    Get an equivalent, simpler version of the expression.
+
+    This evaluates the operators applied to literals only, removes the neutral elements and
+    reduces the absorbing ones (e.g. `x ∧ true` and `x ∨ true`), drops the duplicated entries in
+    chains of conjunctions and disjunctions and removes double negations.
+    Real numbers are folded using double precision.
+
+    :param expression: The expression to simplify.
+    :param simplified: Optional map from the already simplified expressions to their result,
+        to share across many calls. It is extended with the expressions simplified here.
+    :return: The simplified expression (the input one, if nothing can be simplified).
+    """
+    assert isinstance(expression, JaniExpression), f"Unexpected expression {type(expression)}."
+    return _simplify_expression(expression, {} if simplified is None else simplified)
+
+
 # Map each function name to the corresponding Expression generator
 CALLABLE_OPERATORS_MAP: Dict[str, Callable] = {
     "abs": abs_operator,
@@ -18,12 +18,14 @@ Guards in Jani
 """
 
 
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Union
 
+from as2fm.as2fm_common.common import ReadOnlyDict
 from as2fm.jani_generator.jani_entries.jani_expression import JaniExpression
 
 
 class JaniGuard:
+    __slots__ = ("_expression", "_dict", "_edge")
 
     def __init__(self, guard_exp: Optional[Union["JaniGuard", JaniExpression, dict]]):
         """
@@ -46,21 +48,35 @@ class JaniGuard:
                 f"Unexpected guard_exp type {type(guard_exp)}. "
                 "Should be None, JaniExpression or Dict."
             )
+        # The serialized guard, generated on request
+        self._dict: Optional[Dict[str, Any]] = None
+        # The edge containing the guard, to be notified when the guard changes
+        self._edge = None
 
     def set_expression(self, expr: JaniExpression):
         """Overwrite the expression in the guard."""
         assert isinstance(expr, JaniExpression), f"Unexpected type of input expr.: {type(expr)}."
         self._expression = expr
+        self._dict = None
+        if self._edge is not None:
+            self._edge.invalidate_dict()
 
     def get_expression(self) -> Optional[JaniExpression]:
         return self._expression
 
-    def as_dict(self, _: Optional[dict] = None):
-        d = {}
-        if self._expression:
-            exp = self._expression.as_dict()
-            if isinstance(exp, dict) and list(exp.keys()) == ["exp"]:
-                d["exp"] = exp["exp"]
-            else:
-                d["exp"] = exp
-        return d
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the guard as a dictionary.
+
+        The dictionary is generated once and shared across the calls, hence it is read-only.
+        """
+        if self._dict is None:
+            guard_dict = {}
+            if self._expression:
+                exp = self._expression.as_dict()
+                if isinstance(exp, dict) and list(exp.keys()) == ["exp"]:
+                    guard_dict["exp"] = exp["exp"]
+                else:
+                    guard_dict["exp"] = exp
+            self._dict = ReadOnlyDict(guard_dict)
+        return self._dict
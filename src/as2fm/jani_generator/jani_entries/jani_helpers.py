@@ -13,11 +13,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List, Union
+from dataclasses import dataclass
+from math import log10
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
 
-from as2fm.jani_generator.jani_entries import JaniAssignment, JaniEdge, JaniExpression, JaniModel
+from as2fm.jani_generator.jani_entries import (
+    JaniAssignment,
+    JaniAutomaton,
+    JaniComposition,
+    JaniEdge,
+    JaniExpression,
+    JaniModel,
+    JaniVariable,
+)
+from as2fm.jani_generator.jani_entries.jani_edge import JaniDestination
 from as2fm.jani_generator.jani_entries.jani_expression_support import (
+    collect_identifiers,
     expand_distribution_expressions,
+    extract_distributions,
+    simplify_expression,
 )
 
 
@@ -27,27 +41,56 @@ def _generate_new_edge_for_random_assignments(
     assignment_var: Union[str, JaniExpression],
     assignment_possibilities: List[JaniExpression],
 ) -> JaniEdge:
-    probability = 1.0 / len(assignment_possibilities)
-    return JaniEdge(
-        {
-            "location": edge_location,
-            "destinations": [
-                {
-                    "location": edge_target,
-                    "probability": {"exp": probability},
-                    "assignments": [{"ref": assignment_var, "value": assignment_value}],
-                }
-                for assignment_value in assignment_possibilities
-            ],
-        }
-    )
+    probability = JaniExpression(1.0 / len(assignment_possibilities))
+    assignment_var = JaniExpression(assignment_var)
+    random_edge = JaniEdge({"location": edge_location})
+    for assignment_value in assignment_possibilities:
+        random_edge.append_destination(
+            location=edge_target,
+            probability=probability,
+            assignments=[JaniAssignment({"ref": assignment_var, "value": assignment_value})],
+        )
+    return random_edge
+
+
+def _get_assigned_variable(assignment_target: JaniExpression) -> Optional[str]:
+    """Get the name of the variable (or array) written by an assignment, if available."""
+    op, operands = assignment_target.as_operator()
+    if op == "aa":
+        assert operands is not None  # MyPy check
+        return _get_assigned_variable(operands["exp"])
+    return assignment_target.as_identifier()
 
 
-def _expand_random_variables_in_edge(jani_edge: JaniEdge, *, n_options: int) -> List[JaniEdge]:
+def _get_n_options(
+    assignment: JaniAssignment, n_options: int, n_options_per_variable: Mapping[str, int]
+) -> int:
+    """Get the amount of options to use for sampling the distributions in an assignment."""
+    assigned_var = _get_assigned_variable(assignment.get_target())
+    n_var_options = n_options_per_variable.get(assigned_var, n_options)
+    assert n_var_options > 0, f"Invalid amount of random samples for {assigned_var}."
+    return n_var_options
+
+
+def _expand_random_variables_in_edge(
+    jani_edge: JaniEdge,
+    automaton: JaniAutomaton,
+    *,
+    n_options: int,
+    n_options_per_variable: Mapping[str, int],
+) -> List[JaniEdge]:
     """
     If there are random variables in the input JaniEdge, generate new edges to handle it.
 
+    Each assignment containing distributions is moved to a chain of new edges, sampling one
+    distribution each. If an assignment contains more than one distribution, each of them is
+    sampled in an additional automaton variable, so n_distributions * n_options destinations are
+    generated, in place of n_options^n_distributions.
+
     :param jani_edge: The edge to expand
+    :param automaton: The automaton containing the edge, to add the sampling variables to.
+    :param n_options: How many options to generate for each distribution, by default.
+    :param n_options_per_variable: The amount of options to use for specific (assigned) variables.
     :return: All the edges resulting from the input.
     """
     generated_edges: List[JaniEdge] = [jani_edge]
@@ -57,69 +100,409 @@ def _expand_random_variables_in_edge(jani_edge: JaniEdge, *, n_options: int) ->
     edge_id = f"{edge_location}_{edge_action}"
 
     for dest_id, dest_val in enumerate(jani_edge.destinations):
-        jani_assignments: List[JaniAssignment] = dest_val["assignments"]
-        curr_assign_idx = 0
-        while curr_assign_idx < len(jani_assignments):
-            expanded_assignments = expand_distribution_expressions(
-                jani_assignments[curr_assign_idx].get_expression(), n_options=n_options
-            )
-            if len(expanded_assignments) > 1:
-                # In this case, we expanded the assignments, and we need to generate new edges
-                original_target_loc = dest_val["location"]
-                expanded_edge_loc = f"{edge_id}_dest_{dest_id}_expanded_assign_{curr_assign_idx}"
-                next_target_edge_loc = f"{edge_id}_dest_{dest_id}_after_assign_{curr_assign_idx}"
-                expanded_edge = _generate_new_edge_for_random_assignments(
+        jani_assignments: Sequence[JaniAssignment] = dest_val.assignments
+        curr_assign_idx = next(
+            (
+                assign_idx
+                for assign_idx, assignment in enumerate(jani_assignments)
+                if assignment.get_expression().has_distribution()
+            ),
+            None,
+        )
+        if curr_assign_idx is None:
+            continue
+        # In this case, we need to expand the assignment, and we need to generate new edges
+        random_assignment = jani_assignments[curr_assign_idx]
+        assign_options = _get_n_options(random_assignment, n_options, n_options_per_variable)
+        original_target_loc = dest_val.location
+        expanded_edge_loc = f"{edge_id}_dest_{dest_id}_expanded_assign_{curr_assign_idx}"
+        next_target_edge_loc = f"{edge_id}_dest_{dest_id}_after_assign_{curr_assign_idx}"
+        sample_var_prefix = f"{edge_id}_dest_{dest_id}_assign_{curr_assign_idx}_sample_"
+        sampled_expression, distributions = extract_distributions(
+            random_assignment.get_expression(), lambda dist_idx: f"{sample_var_prefix}{dist_idx}"
+        )
+        next_assign_idx = curr_assign_idx + 1
+        continuation_assignments = jani_assignments[next_assign_idx:]
+        if len(distributions) == 1:
+            generated_edges.append(
+                _generate_new_edge_for_random_assignments(
                     expanded_edge_loc,
                     next_target_edge_loc,
-                    jani_assignments[curr_assign_idx].get_target(),
-                    expanded_assignments,
+                    random_assignment.get_target(),
+                    expand_distribution_expressions(
+                        random_assignment.get_expression(), n_options=assign_options
+                    ),
                 )
-                next_assign_idx = curr_assign_idx + 1
-                continuation_edge = JaniEdge(
-                    {
-                        "location": next_target_edge_loc,
-                        "action": "act",  # Keep it simple, due to the location naming scheme
-                        "destinations": [
-                            {
-                                "location": original_target_loc,
-                                "assignments": jani_assignments[next_assign_idx:],
-                            }
-                        ],
-                    }
+            )
+        else:
+            # Sample each distribution independently, on consecutive edges
+            sampling_locs = [expanded_edge_loc]
+            sampling_locs.extend(
+                f"{expanded_edge_loc}_{idx}" for idx in range(1, len(distributions))
+            )
+            sampling_locs.append(next_target_edge_loc)
+            sample_assignments: List[JaniAssignment] = []
+            for dist_idx, distribution in enumerate(distributions):
+                sample_var = f"{sample_var_prefix}{dist_idx}"
+                automaton.add_variable(JaniVariable(sample_var, float, 0.0))
+                generated_edges.append(
+                    _generate_new_edge_for_random_assignments(
+                        sampling_locs[dist_idx],
+                        sampling_locs[dist_idx + 1],
+                        sample_var,
+                        expand_distribution_expressions(distribution, n_options=assign_options),
+                    )
                 )
-                dest_val["location"] = expanded_edge_loc
-                dest_val["assignments"] = dest_val["assignments"][0:curr_assign_idx]
-                generated_edges.append(expanded_edge)
-                generated_edges.extend(
-                    _expand_random_variables_in_edge(continuation_edge, n_options=n_options)
+                # Reset the samples together with the assignment, to keep the state space small
+                sample_assignments.append(
+                    JaniAssignment(
+                        {"ref": sample_var, "value": 0.0, "index": random_assignment.get_index()}
+                    )
                 )
-                break
-            curr_assign_idx += 1
+            continuation_assignments = [
+                JaniAssignment(
+                    {
+                        "ref": random_assignment.get_target(),
+                        "value": sampled_expression,
+                        "index": random_assignment.get_index(),
+                    }
+                ),
+                *sample_assignments,
+                *continuation_assignments,
+            ]
+        continuation_edge = JaniEdge(
+            {
+                "location": next_target_edge_loc,
+                "action": "act",  # Keep it simple, due to the location naming scheme
+                "destinations": [
+                    {"location": original_target_loc, "assignments": continuation_assignments}
+                ],
+            }
+        )
+        dest_val.location = expanded_edge_loc
+        dest_val.assignments = jani_assignments[0:curr_assign_idx]
+        generated_edges.extend(
+            _expand_random_variables_in_edge(
+                continuation_edge,
+                automaton,
+                n_options=n_options,
+                n_options_per_variable=n_options_per_variable,
+            )
+        )
     return generated_edges
 
 
-def expand_random_variables_in_jani_model(model: JaniModel, *, n_options: int) -> None:
-    """Find all expression containing the 'distribution' expression and expand them."""
+def expand_random_variables_in_jani_model(
+    model: JaniModel,
+    *,
+    n_options: int,
+    n_options_per_variable: Optional[Mapping[str, int]] = None,
+) -> None:
+    """
+    Find all expression containing the 'distribution' expression and expand them.
+
+    :param model: The Jani model to process. It is modified in place.
+    :param n_options: How many options to generate for each distribution, by default.
+    :param n_options_per_variable: The amount of options to use, indexed by the assigned variable.
+    """
+    if n_options_per_variable is None:
+        n_options_per_variable = {}
+    assert n_options > 0, f"Invalid amount of random samples: {n_options}."
     # Check that no global variable has a random value (not supported)
     for g_var_name, g_var in model.get_variables().items():
+        g_var_init = g_var.get_init_expr()
         assert (
-            len(expand_distribution_expressions(g_var.get_init_expr(), n_options=100)) == 1
+            g_var_init is None or not g_var_init.has_distribution()
         ), f"Global variable {g_var_name} is init using a random value. This is unsupported."
-    for automaton in model.get_automata():
+    for automaton in model.iter_automata_for_update():
         # Also for automaton, check variables initialization
         for aut_var_name, aut_var in automaton.get_variables().items():
-            assert (
-                len(expand_distribution_expressions(aut_var.get_init_expr(), n_options=100)) == 1
-            ), (
+            aut_var_init = aut_var.get_init_expr()
+            assert aut_var_init is None or not aut_var_init.has_distribution(), (
                 f"Variable {aut_var_name} in automaton {automaton.get_name()} is init using random "
-                f"values: init expr = '{aut_var.get_init_expr().as_dict()}'. This is unsupported."
+                f"values: init expr = '{aut_var_init.as_dict()}'. This is unsupported."
             )
         # Edges created to handle random distributions
         new_edges: List[JaniEdge] = []
         for edge in automaton.get_edges():
-            generated_edges = _expand_random_variables_in_edge(edge, n_options=n_options)
+            generated_edges = _expand_random_variables_in_edge(
+                edge,
+                automaton,
+                n_options=n_options,
+                n_options_per_variable=n_options_per_variable,
+            )
             for gen_edge in generated_edges:
                 automaton.add_location(gen_edge.location)
             new_edges.extend(generated_edges)
         automaton.set_edges(new_edges)
     model._generate_missing_syncs()
+
+
+def simplify_expressions_in_jani_model(model: JaniModel) -> None:
+    """
+    Simplify the guards, probabilities and assignments in the automata of the model.
+
+    Guards that are always true are removed, as well as the assignments of a variable to itself.
+    See `simplify_expression` for the simplifications applied to each expression.
+    """
+    # Shared across all automata, since many expressions are common among them
+    simplified: Dict[JaniExpression, JaniExpression] = {}
+    for automaton in model.iter_automata_for_update():
+        for edge in automaton.get_edges():
+            if edge.guard is not None and edge.guard.get_expression() is not None:
+                guard_exp = simplify_expression(edge.guard.get_expression(), simplified)
+                if guard_exp.as_literal() is not None and guard_exp.as_literal().value() is True:
+                    edge.guard = None
+                else:
+                    edge.guard.set_expression(guard_exp)
+            for destination in edge.destinations:
+                if destination.probability is not None:
+                    destination.probability = simplify_expression(
+                        destination.probability, simplified
+                    )
+                simple_assignments: List[JaniAssignment] = []
+                for assignment in destination.assignments:
+                    assignment_exp = simplify_expression(assignment.get_expression(), simplified)
+                    if assignment_exp is assignment.get_target():
+                        continue
+                    assignment.set_expression(assignment_exp)
+                    simple_assignments.append(assignment)
+                destination.assignments = simple_assignments
+
+
+@dataclass
+class LocationsReduction:
+    """The size of the automata, before and after `reduce_locations_in_jani_model`."""
+
+    n_locations_before: int = 0
+    n_locations_after: int = 0
+    n_edges_before: int = 0
+    n_edges_after: int = 0
+    # Sum of log10(n. of locations) over all automata: the locations part of the state space
+    log10_locations_space_before: float = 0.0
+    log10_locations_space_after: float = 0.0
+
+    def add_automaton(self, automaton: JaniAutomaton, *, reduced: bool) -> None:
+        """Add the size of an automaton, before or after its reduction."""
+        n_locations = len(automaton.get_locations())
+        n_edges = len(automaton.get_edges())
+        log10_locations = log10(n_locations) if n_locations > 0 else 0.0
+        if reduced:
+            self.n_locations_after += n_locations
+            self.n_edges_after += n_edges
+            self.log10_locations_space_after += log10_locations
+        else:
+            self.n_locations_before += n_locations
+            self.n_edges_before += n_edges
+            self.log10_locations_space_before += log10_locations
+
+    def get_summary(self) -> str:
+        """Describe the reduction in a human readable way."""
+        space_reduction = self.log10_locations_space_before - self.log10_locations_space_after
+        return (
+            f"Jani locations: {self.n_locations_before} -> {self.n_locations_after}, "
+            f"edges: {self.n_edges_before} -> {self.n_edges_after}, "
+            f"locations state space reduced by a factor of 10^{space_reduction:.2f}."
+        )
+
+
+def _is_deterministic(edge: JaniEdge) -> bool:
+    """Check if the edge has a single destination, taken with probability 1."""
+    if len(edge.destinations) != 1:
+        return False
+    probability = edge.destinations[0].probability
+    return probability is None or (
+        probability.as_literal() is not None and probability.as_literal().value() == 1
+    )
+
+
+def _is_local_and_unguarded(edge: JaniEdge, local_identifiers: Set[str]) -> bool:
+    """Check if the edge is always enabled, and only reads and writes the provided identifiers."""
+    if edge.guard is not None and edge.guard.get_expression() is not None:
+        guard_value = edge.guard.get_expression().as_literal()
+        if guard_value is None or guard_value.value() is not True:
+            return False
+    for destination in edge.destinations:
+        for assignment in destination.assignments:
+            for expression in (assignment.get_target(), assignment.get_expression()):
+                if expression.has_distribution() or not collect_identifiers(expression).issubset(
+                    local_identifiers
+                ):
+                    return False
+    return True
+
+
+def _remove_edges_in_composition(
+    automaton: JaniAutomaton, composition: JaniComposition, edges: List[JaniEdge]
+) -> List[JaniEdge]:
+    """
+    Remove the provided edges from the automaton, and the syncs of the actions left without edges.
+
+    The last edges with an action synchronized with other automata are kept, since the action
+    would otherwise be undefined in the composition.
+
+    :return: The edges that could not be removed.
+    """
+    automaton_name = automaton.get_name()
+    edges_by_action: Dict[str, List[JaniEdge]] = {}
+    for edge in edges:
+        edges_by_action.setdefault(edge.get_action(), []).append(edge)
+    removed_edges: List[JaniEdge] = []
+    kept_edges: List[JaniEdge] = []
+    emptied_silent_actions: List[str] = []
+    for action, action_edges in edges_by_action.items():
+        is_silent = composition.is_silent_action(automaton_name, action)
+        if len(action_edges) < len(automaton.get_edges_with_action(action)):
+            removed_edges.extend(action_edges)
+        elif is_silent or action not in composition.get_syncs_for_element(automaton_name):
+            removed_edges.extend(action_edges)
+            if is_silent:
+                emptied_silent_actions.append(action)
+        else:
+            kept_edges.extend(action_edges)
+    automaton.remove_edges(removed_edges)
+    for action in emptied_silent_actions:
+        composition.remove_silent_syncs(automaton_name, action)
+    return kept_edges
+
+
+def _remove_false_guard_edges(
+    automaton: JaniAutomaton,
+    composition: JaniComposition,
+    simplified: Dict[JaniExpression, JaniExpression],
+) -> None:
+    """Remove the edges whose guard simplifies to false, since they can never be taken."""
+    false_edges: List[JaniEdge] = []
+    for edge in automaton.get_edges():
+        if edge.guard is not None and edge.guard.get_expression() is not None:
+            guard_value = simplify_expression(edge.guard.get_expression(), simplified).as_literal()
+            if guard_value is not None and guard_value.value() is False:
+                false_edges.append(edge)
+    _remove_edges_in_composition(automaton, composition, false_edges)
+
+
+def _append_edge_to_destination(destination: JaniDestination, appended_edge: JaniEdge) -> None:
+    """Move the destination to the one of the appended edge, executing its assignments as well."""
+    appended_destination = appended_edge.destinations[0]
+    # The appended assignments are executed after all the existing ones
+    index_offset = 0
+    if len(destination.assignments) > 0:
+        index_offset = max(assignment.get_index() for assignment in destination.assignments) + 1
+    # Each destination gets its own copy of the assignments, since they can be modified
+    appended_assignments = [
+        JaniAssignment(
+            {
+                "ref": assignment.get_target(),
+                "value": assignment.get_expression(),
+                "index": assignment.get_index() + index_offset,
+            }
+        )
+        for assignment in appended_destination.assignments
+    ]
+    destination.assignments = (*destination.assignments, *appended_assignments)
+    destination.location = appended_destination.location
+
+
+def _merge_silent_chains(
+    automaton: JaniAutomaton, composition: JaniComposition, constants: Set[str]
+) -> None:
+    """
+    Merge the chains of silent edges, removing their intermediate locations.
+
+    A location is merged in the edges reaching it if it is not initial and it is left by a single
+    edge that is silent, deterministic, always enabled and only accesses the local variables of
+    the automaton. This way, the intermediate state is not visible from other automata (nor
+    properties), and the merged edge does not depend on their execution.
+    """
+    automaton_name = automaton.get_name()
+    local_identifiers = set(automaton.get_variables()) | constants
+    incoming_destinations: Dict[str, List[Tuple[JaniEdge, JaniDestination]]] = {}
+    for edge in automaton.get_edges():
+        for destination in edge.destinations:
+            incoming_destinations.setdefault(destination.location, []).append((edge, destination))
+    merged_edges: List[JaniEdge] = []
+    merged_locations: List[str] = []
+    for location in sorted(automaton.get_locations() - automaton.get_initial_locations()):
+        outgoing_edges = automaton.get_edges_from_location(location)
+        if len(outgoing_edges) != 1:
+            continue
+        merged_edge = outgoing_edges[0]
+        location_incoming_destinations = incoming_destinations.pop(location, [])
+        if (
+            any(edge is merged_edge for edge, _ in location_incoming_destinations)
+            or not _is_deterministic(merged_edge)
+            or not composition.is_silent_action(automaton_name, merged_edge.get_action())
+            or not _is_local_and_unguarded(merged_edge, local_identifiers)
+        ):
+            incoming_destinations[location] = location_incoming_destinations
+            continue
+        for _, destination in location_incoming_destinations:
+            _append_edge_to_destination(destination, merged_edge)
+        # The merged destinations take the place of the removed edge, in the following location
+        next_location = merged_edge.destinations[0].location
+        next_incoming_destinations = [
+            (edge, destination)
+            for edge, destination in incoming_destinations[next_location]
+            if edge is not merged_edge
+        ]
+        incoming_destinations[next_location] = (
+            next_incoming_destinations + location_incoming_destinations
+        )
+        merged_edges.append(merged_edge)
+        merged_locations.append(location)
+    kept_edges = _remove_edges_in_composition(automaton, composition, merged_edges)
+    assert len(kept_edges) == 0, "Silent edges are expected to be always removable."
+    for location in merged_locations:
+        automaton.remove_location(location)
+
+
+def _remove_unreachable_locations(automaton: JaniAutomaton, composition: JaniComposition) -> None:
+    """Remove the locations (and their edges) that cannot be reached from the initial ones."""
+    reachable_locations = set(automaton.get_initial_locations())
+    locations_to_visit = list(reachable_locations)
+    while len(locations_to_visit) > 0:
+        for edge in automaton.get_edges_from_location(locations_to_visit.pop()):
+            for destination in edge.destinations:
+                if destination.location not in reachable_locations:
+                    reachable_locations.add(destination.location)
+                    locations_to_visit.append(destination.location)
+    unreachable_locations = automaton.get_locations() - reachable_locations
+    unreachable_edges = [
+        edge
+        for location in sorted(unreachable_locations)
+        for edge in automaton.get_edges_from_location(location)
+    ]
+    kept_edges = _remove_edges_in_composition(automaton, composition, unreachable_edges)
+    # The locations referenced by the edges that were kept are still needed
+    for edge in kept_edges:
+        unreachable_locations.discard(edge.location)
+        for destination in edge.destinations:
+            unreachable_locations.discard(destination.location)
+    for location in unreachable_locations:
+        automaton.remove_location(location)
+
+
+def reduce_locations_in_jani_model(model: JaniModel) -> LocationsReduction:
+    """
+    Reduce the amount of locations and edges in the automata of the model.
+
+    For each automaton, this removes the edges whose guard simplifies to false, merges the
+    chains of silent (i.e. not synchronized) edges and removes the unreachable locations.
+    The silent edges are the ones whose action is not synchronized with other automata: they are
+    generated, e.g., for the executable content between two `<send>` entries in SCXML.
+
+    :param model: The Jani model to process. It is modified in place.
+    :return: The size of the model, before and after the reduction.
+    """
+    composition = model.get_system_sync()
+    assert composition is not None, "The composition of the automata is required."
+    constants = set(model.get_constants())
+    simplified: Dict[JaniExpression, JaniExpression] = {}
+    reduction = LocationsReduction()
+    for automaton in model.iter_automata_for_update():
+        reduction.add_automaton(automaton, reduced=False)
+        _remove_false_guard_edges(automaton, composition, simplified)
+        _merge_silent_chains(automaton, composition, constants)
+        _remove_unreachable_locations(automaton, composition)
+        reduction.add_automaton(automaton, reduced=True)
+    return reduction
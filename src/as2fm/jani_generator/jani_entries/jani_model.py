@@ -18,7 +18,7 @@ Complete Jani Model
 """
 
 
-from typing import Dict, List, Optional, Type, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
 
 from as2fm.as2fm_common.array_type import ArrayInfo
 from as2fm.jani_generator.jani_entries import (
@@ -29,9 +29,11 @@ from as2fm.jani_generator.jani_entries import (
     JaniProperty,
     JaniValue,
     JaniVariable,
+    SpilledJaniAutomaton,
 )
 
 ValidValue = Union[int, float, bool, dict, JaniExpression]
+ModelAutomaton = Union[JaniAutomaton, SpilledJaniAutomaton]
 
 
 class JaniModel:
@@ -63,7 +65,8 @@ class JaniModel:
         self._features: List[str] = []
         self._variables: Dict[str, JaniVariable] = {}
         self._constants: Dict[str, JaniConstant] = {}
-        self._automata: List[JaniAutomaton] = []
+        self._automata: List[ModelAutomaton] = []
+        self._automata_by_name: Dict[str, ModelAutomaton] = {}
         # The list of actions can be generated later on from the automata
         self._system: Optional[JaniComposition] = None
         self._properties: List[JaniProperty] = []
@@ -130,38 +133,85 @@ class JaniModel:
                 JaniConstant(constant_name, constant_type, JaniExpression(constant_value))
             )
 
-    def add_jani_automaton(self, automaton: JaniAutomaton):
+    def add_jani_automaton(self, automaton: ModelAutomaton):
+        automaton_name = automaton.get_name()
+        assert (
+            automaton_name not in self._automata_by_name
+        ), f"Automaton {automaton_name} already exists in the model"
         self._automata.append(automaton)
+        self._automata_by_name[automaton_name] = automaton
 
-    def get_automata(self) -> List[JaniAutomaton]:
+    def get_automata(self) -> List[ModelAutomaton]:
+        """
+        Get all automata in the model. Spilled automata only provide their name and actions.
+
+        Use `iter_automata_for_update` to access the complete automata.
+        """
         return self._automata
 
+    def iter_automata_for_update(
+        self, automata_names: Optional[Iterable[str]] = None
+    ) -> Iterator[JaniAutomaton]:
+        """
+        Iterate over the complete automata in the model, to modify them.
+
+        Spilled automata are loaded one at a time, and stored back once the next one is requested.
+
+        :param automata_names: If provided, iterate only over the automata with these names, in
+            the provided order. Names not matching any automaton are ignored.
+        """
+        if automata_names is None:
+            selected_automata: Iterable[ModelAutomaton] = self._automata
+        else:
+            selected_automata = self._get_automata_by_names(automata_names)
+        for automaton in selected_automata:
+            if isinstance(automaton, SpilledJaniAutomaton):
+                loaded_automaton = automaton.load()
+                yield loaded_automaton
+                automaton.store(loaded_automaton)
+            else:
+                yield automaton
+
     def get_constants(self) -> Dict[str, JaniConstant]:
         return self._constants
 
     def get_variables(self) -> Dict[str, JaniVariable]:
         return self._variables
 
-    def get_automaton(self, automaton_name: str) -> Optional[JaniAutomaton]:
-        for automaton in self._automata:
-            if automaton._name == automaton_name:
-                return automaton
-        return None
+    def get_automaton(self, automaton_name: str) -> Optional[ModelAutomaton]:
+        return self._automata_by_name.get(automaton_name)
 
     def add_system_sync(self, system: JaniComposition):
         """Specify how the different automata are composed together."""
         self._system = system
         self._generate_missing_syncs()
 
-    def remove_edges_with_action(self, action: str):
+    def get_system_sync(self) -> Optional[JaniComposition]:
+        """Get the composition of the automata, if already set."""
+        return self._system
+
+    def remove_edges_with_action(self, action: str, automata_names: Optional[Iterable[str]] = None):
         """Remove the edges in all automaton with the action name provided.
 
         :param action: The name of the action to remove.
+        :param automata_names: If provided, only remove the edges in the automata with these names.
         """
         assert isinstance(action, str), "Action name must be a string"
-        for automaton in self._automata:
+        if automata_names is None:
+            selected_automata: Iterable[ModelAutomaton] = self._automata
+        else:
+            selected_automata = self._get_automata_by_names(automata_names)
+        for automaton in selected_automata:
             automaton.remove_edges_with_action_name(action)
 
+    def _get_automata_by_names(self, automata_names: Iterable[str]) -> List[ModelAutomaton]:
+        """Get the automata with the provided names, ignoring the names without automaton."""
+        return [
+            self._automata_by_name[automaton_name]
+            for automaton_name in dict.fromkeys(automata_names)
+            if automaton_name in self._automata_by_name
+        ]
+
     def _generate_missing_syncs(self):
         """Automatically generate the syncs that are not explicitly defined."""
         assert len(self._automata) == len(
@@ -181,37 +231,46 @@ class JaniModel:
         """Get all the properties in the model."""
         return self._properties
 
-    def as_dict(self):
-        assert self._system is not None, "The system composition is not set"
-        model_dict = {}
-        # The available actions need to be stored explicitly in jani:
-        # we extract them from all the automaton in the model
+    def clear_properties(self):
+        """Remove all the properties from the model, to add a different set afterwards."""
+        self._properties = []
+
+    def get_actions(self) -> List[str]:
+        """Get the sorted list of all actions used in the model's automata."""
         available_actions = set()
         for automaton in self._automata:
             available_actions.update(automaton.get_actions())
-        model_dict.update(
-            {
-                "jani-version": 1,
-                "name": self._name,
-                "type": self._type,
-                "features": self._features,
-                "metadata": {
-                    "description": "Autogenerated with CONVINCE toolchain",
-                },
-                "variables": [
-                    jani_variable.as_dict() for jani_variable in self._variables.values()
-                ],
-                "constants": [
-                    jani_constant.as_dict() for jani_constant in self._constants.values()
-                ],
-                "actions": [{"name": action} for action in sorted(list(available_actions))],
-                "automata": [
-                    jani_automaton.as_dict(self._constants) for jani_automaton in self._automata
-                ],
-                "system": self._system.as_dict(),
-                "properties": [
-                    jani_property.as_dict(self._constants) for jani_property in self._properties
-                ],
-            }
+        return sorted(list(available_actions))
+
+    def iter_dict_entries(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Generate the entries of the model's dictionary one by one, in the expected order.
+
+        The automata are provided as an iterator, generating one automaton's dictionary at a time:
+        this way, the model can be written to file without keeping all dictionaries in memory.
+        The automata's dictionaries are cached by the automata, hence they are read-only.
+        """
+        assert self._system is not None, "The system composition is not set"
+        yield "jani-version", 1
+        yield "name", self._name
+        yield "type", self._type
+        yield "features", self._features
+        yield "metadata", {"description": "Autogenerated with CONVINCE toolchain"}
+        yield "variables", [jani_variable.as_dict() for jani_variable in self._variables.values()]
+        yield "constants", [jani_constant.as_dict() for jani_constant in self._constants.values()]
+        # The available actions need to be stored explicitly in jani:
+        # we extract them from all the automaton in the model
+        yield "actions", [{"name": action} for action in self.get_actions()]
+        yield "automata", (
+            jani_automaton.as_dict(self._constants) for jani_automaton in self._automata
         )
-        return model_dict
+        yield "system", self._system.as_dict()
+        yield "properties", [
+            jani_property.as_dict(self._constants) for jani_property in self._properties
+        ]
+
+    def as_dict(self):
+        return {
+            entry_key: list(entry_value) if isinstance(entry_value, Iterator) else entry_value
+            for entry_key, entry_value in self.iter_dict_entries()
+        }
@@ -15,7 +15,7 @@
 
 """Collection of various utilities for Jani entries."""
 
-from typing import List, MutableSequence, Optional, Tuple, Type, Union
+from typing import List, Mapping, MutableSequence, Optional, Tuple, Type, Union
 
 from as2fm.as2fm_common.array_type import ArrayInfo, is_array_type
 from as2fm.as2fm_common.common import get_default_expression_for_type
@@ -53,7 +53,7 @@ def get_array_access_name_and_indexes(expr: JaniExpression) -> Tuple[str, List[i
     """
     expr_operator, expr_operand = expr.as_operator()
     assert expr_operator == "aa", f"Unexpected array operator: '{expr_operator}' != 'aa'."
-    assert isinstance(expr_operand, dict)
+    assert isinstance(expr_operand, Mapping)
     aa_exp = expr_operand["exp"]
     assert isinstance(aa_exp, JaniExpression)
     aa_idx_expr = expr_operand["index"]
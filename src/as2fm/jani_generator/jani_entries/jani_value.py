@@ -24,6 +24,8 @@ from typing import Type, Union
 class JaniValue:
     """Class containing Jani Constant Values"""
 
+    __slots__ = ("_value",)
+
     def __init__(self, value: Union[int, float, bool, dict]):
         self._value = value
 
@@ -26,6 +26,8 @@ from as2fm.jani_generator.jani_entries.jani_expression import SupportedExp
 
 
 class JaniVariable:
+    __slots__ = ("_name", "_type", "_array_info", "_transient", "_init_expr")
+
     @staticmethod
     def from_dict(variable_dict: dict) -> "JaniVariable":
         variable_name = variable_dict["name"]
@@ -0,0 +1,101 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Write Jani models to file, one automaton at a time.
+
+The indented output matches the one of `json.dump(model.as_dict(), indent=2, ensure_ascii=False)`.
+"""
+
+import gzip
+import json
+from typing import Any, Callable, Iterable, Iterator, TextIO
+
+from as2fm.as2fm_common.logging import get_warn_msg
+from as2fm.jani_generator.jani_entries.jani_model import JaniModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def is_fast_json_available() -> bool:
+    """Check whether the fast JSON backend (orjson) is installed."""
+    return orjson is not None
+
+
+def _get_json_encoder(compact: bool, fast_json: bool) -> Callable[[Any], Iterable[str]]:
+    """Get the function converting a single JSON entry to a sequence of strings."""
+    if fast_json:
+        if orjson is not None:
+            orjson_options = 0 if compact else orjson.OPT_INDENT_2
+            return lambda entry: (orjson.dumps(entry, option=orjson_options).decode("utf-8"),)
+        print(get_warn_msg(None, "The fast JSON backend (orjson) is not available: using json."))
+    if compact:
+        return json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).iterencode
+    return json.JSONEncoder(ensure_ascii=False, indent=2).iterencode
+
+
+def _write_dict_entries(
+    out_stream: TextIO, dict_entries: Iterator, compact: bool, fast_json: bool
+) -> None:
+    """Write the model's dictionary entries, expanding the iterators one element at a time."""
+    encode_entry = _get_json_encoder(compact, fast_json)
+    # The separators and indentation used by json.dump at the first and second nesting level
+    key_sep = ":" if compact else ": "
+    first_nl, second_nl = ("", "") if compact else ("\n  ", "\n    ")
+
+    def write_entry(entry: Any, new_line: str):
+        for entry_chunk in encode_entry(entry):
+            out_stream.write(entry_chunk.replace("\n", new_line) if new_line else entry_chunk)
+
+    out_stream.write("{")
+    for entry_idx, (entry_key, entry_value) in enumerate(dict_entries):
+        if entry_idx > 0:
+            out_stream.write(",")
+        out_stream.write(f"{first_nl}{json.dumps(entry_key)}{key_sep}")
+        if not isinstance(entry_value, Iterator):
+            write_entry(entry_value, first_nl)
+            continue
+        out_stream.write("[")
+        n_elements = 0
+        for element in entry_value:
+            if n_elements > 0:
+                out_stream.write(",")
+            out_stream.write(second_nl)
+            write_entry(element, second_nl)
+            n_elements += 1
+        out_stream.write(f"{first_nl}]" if n_elements > 0 else "]")
+    out_stream.write("\n}" if not compact else "}")
+
+
+def write_jani_model(
+    jani_model: JaniModel, output_path: str, *, compact: bool = False, fast_json: bool = False
+) -> None:
+    """
+    Write a Jani model to file, keeping at most one automaton's dictionary in memory.
+
+    :param jani_model: The model to write.
+    :param output_path: The path to the output file. If it ends with `.gz`, it is compressed.
+    :param compact: Whether to skip the indentation (and the newlines) in the output file.
+    :param fast_json: Whether to use the orjson backend, if installed, for serializing the entries.
+    """
+    if output_path.endswith(".gz"):
+        with gzip.open(output_path, "wt", encoding="utf-8") as f:
+            _write_dict_entries(f, jani_model.iter_dict_entries(), compact, fast_json)
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            _write_dict_entries(f, jani_model.iter_dict_entries(), compact, fast_json)
@@ -16,11 +16,59 @@
 # limitations under the License.
 
 import argparse
+import glob
+import itertools
 import os
-from typing import Optional, Sequence
+import re
+from typing import Any, Dict, List, Optional, Sequence
 
 from as2fm.as2fm_common.logging import get_warn_msg
-from as2fm.jani_generator.scxml_helpers.top_level_interpreter import interpret_top_level_xml
+from as2fm.jani_generator.scxml_helpers.roaml_model import RoamlParameters
+from as2fm.jani_generator.scxml_helpers.top_level_interpreter import (
+    SWEEPABLE_PARAMETERS,
+    RoamlModelWatcher,
+    interpret_top_level_xml,
+    interpret_top_level_xml_batch,
+    interpret_top_level_xml_variants,
+)
+from as2fm.jani_generator.synthetic_model_generator import (
+    SyntheticModelConfig,
+    generate_synthetic_model,
+)
+
+
+def _parse_sweep_value(param_name: str, param_value: str) -> Any:
+    """Convert a value from the command line to the type of the related FullModel parameter."""
+    if param_name == "max_time":
+        time_match = re.fullmatch(r"(\d+)(s|ms|us|ns)", param_value)
+        assert time_match is not None, f"Invalid max_time {param_value}: expected e.g. '100s'."
+        return RoamlParameters.time_to_ns(int(time_match.group(1)), time_match.group(2))
+    if param_name == "bt_tick_rate":
+        return float(param_value)
+    return int(param_value)
+
+
+def parse_parameter_sweeps(sweep_args: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Generate all parameter sets from the sweeps provided from command line.
+
+    :param sweep_args: Entries in the format `name=value1,value2,...`.
+    :return: One dictionary for each combination of the provided values.
+    """
+    sweep_values: Dict[str, List[Any]] = {}
+    for sweep_arg in sweep_args:
+        param_name, _, param_values = sweep_arg.partition("=")
+        assert (
+            param_name in SWEEPABLE_PARAMETERS
+        ), f"Cannot sweep '{param_name}': expected one of {SWEEPABLE_PARAMETERS}."
+        assert len(param_values) > 0, f"No values provided for the parameter '{param_name}'."
+        sweep_values[param_name] = [
+            _parse_sweep_value(param_name, value) for value in param_values.split(",")
+        ]
+    return [
+        dict(zip(sweep_values.keys(), values))
+        for values in itertools.product(*sweep_values.values())
+    ]
 
 
 def roaml_to_jani(_args: Optional[Sequence[str]] = None) -> None:
@@ -46,7 +94,76 @@ def roaml_to_jani(_args: Optional[Sequence[str]] = None) -> None:
         help="Path to the folder containing the generated plain-SCXML files.",
     )
     parser.add_argument(
-        "--jani-out-file", type=str, default="", help="Path to the generated jani file."
+        "--jani-out-file",
+        type=str,
+        default="",
+        help="Path to the generated jani file. If it ends with '.gz', the file is compressed.",
+    )
+    parser.add_argument(
+        "--jani-compact",
+        action="store_true",
+        help="Write the jani file without indentation, to reduce its size.",
+    )
+    parser.add_argument(
+        "--fast-json",
+        action="store_true",
+        help="Use the orjson library (if installed) to speed up writing the jani file.",
+    )
+    parser.add_argument(
+        "--jani-simplify",
+        action="store_true",
+        help="Simplify the expressions and automata in the jani file, e.g. by evaluating "
+        "constant operations and merging chains of internal edges.",
+    )
+    parser.add_argument(
+        "--jani-priority-chains",
+        action="store_true",
+        help="Check the conditions of the transitions triggered by the same event one at a time, "
+        "in intermediate locations, instead of negating the previous conditions in each guard.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes used to convert the SCXML models to JANI automata.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="",
+        help="Path to the folder where intermediate results are cached, to speed up rebuilds. "
+        "The least recently used results are removed beyond 1 GiB; delete the folder to clear it.",
+    )
+    parser.add_argument(
+        "--out-of-core",
+        action="store_true",
+        help="Keep the generated automata in temporary files, to limit memory for large models.",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default="",
+        help="Path to a JSON file reporting time and memory used by each conversion stage.",
+    )
+    parser.add_argument(
+        "--sweep",
+        type=str,
+        action="append",
+        default=[],
+        help="Generate a jani file for each value of a parameter, e.g. 'bt_tick_rate=1.0,2.0'. "
+        f"Supported parameters: {', '.join(SWEEPABLE_PARAMETERS)}. Time values need a unit "
+        "(e.g. 'max_time=10s,20s'). When repeated, all combinations are generated.",
+    )
+    parser.add_argument(
+        "--split-properties",
+        action="store_true",
+        help="Generate a separate jani file for each properties file in the RoAML model. "
+        "This is always done when sweeping parameters.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running, and regenerate the output files each time an input file changes.",
     )
     parser.add_argument("roaml_xml", type=str, help="The path to the RoAML XML file to interpret.")
     args = parser.parse_args(_args)
@@ -60,11 +177,161 @@ def roaml_to_jani(_args: Optional[Sequence[str]] = None) -> None:
     scxml_out_dir = None if len(scxml_out_dir) == 0 else scxml_out_dir
     jani_out_file = args.jani_out_file
     jani_out_file = None if len(jani_out_file) == 0 else jani_out_file
+    cache_dir = args.cache_dir
+    cache_dir = None if len(cache_dir) == 0 else cache_dir
+    profile_file = args.profile
+    profile_file = None if len(profile_file) == 0 else profile_file
+    assert args.jobs > 0, f"The amount of jobs must be positive, found {args.jobs}."
 
     # Proceed with the conversion
     print("AS2FM - RoAML to JANI.\n")
     print(f"Loading model from {main_xml_file}.")
-    interpret_top_level_xml(main_xml_file, jani_file=jani_out_file, scxmls_dir=scxml_out_dir)
+    if len(args.sweep) > 0 or args.split_properties:
+        assert jani_out_file is not None, "Batch conversion requires the '--jani-out-file' arg."
+        assert not args.watch, "Batch conversion is not available in watch mode."
+        generated_files, locations_reductions = interpret_top_level_xml_variants(
+            main_xml_file,
+            jani_out_file,
+            parse_parameter_sweeps(args.sweep),
+            jobs=args.jobs,
+            cache_dir=cache_dir,
+            compact_jani=args.jani_compact,
+            fast_json=args.fast_json,
+            simplify_jani=args.jani_simplify,
+            priority_chains=args.jani_priority_chains,
+        )
+        for locations_reduction in locations_reductions:
+            print(locations_reduction.get_summary())
+        print(f"Generated {len(generated_files)} jani files.")
+        return
+    if args.watch:
+        RoamlModelWatcher(
+            main_xml_file,
+            jani_file=jani_out_file,
+            scxmls_dir=scxml_out_dir,
+            jobs=args.jobs,
+            cache_dir=cache_dir,
+            compact_jani=args.jani_compact,
+            fast_json=args.fast_json,
+            simplify_jani=args.jani_simplify,
+            priority_chains=args.jani_priority_chains,
+            out_of_core=args.out_of_core,
+            profile_file=profile_file,
+        ).run()
+        return
+    locations_reduction = interpret_top_level_xml(
+        main_xml_file,
+        jani_file=jani_out_file,
+        scxmls_dir=scxml_out_dir,
+        jobs=args.jobs,
+        cache_dir=cache_dir,
+        compact_jani=args.jani_compact,
+        fast_json=args.fast_json,
+        simplify_jani=args.jani_simplify,
+        priority_chains=args.jani_priority_chains,
+        out_of_core=args.out_of_core,
+        profile_file=profile_file,
+    )
+    if locations_reduction is not None:
+        print(locations_reduction.get_summary())
+
+
+def read_batch_manifest(manifest_path: str) -> List[str]:
+    """
+    Read the paths to the RoAML files listed in a manifest file.
+
+    The manifest contains one path (or glob pattern) per line, relative to the manifest location.
+    Empty lines and lines starting with '#' are ignored.
+    """
+    manifest_dir = os.path.dirname(manifest_path)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return [
+            os.path.join(manifest_dir, line.strip())
+            for line in f
+            if len(line.strip()) > 0 and not line.strip().startswith("#")
+        ]
+
+
+def roaml_to_jani_batch(_args: Optional[Sequence[str]] = None) -> None:
+    """
+    Convert many RoAML models in a single run, sharing the loaded files across them.
+
+    Each JANI model is written next to its RoAML file, with the same name (e.g. main.jani).
+
+    :param args: The arguments to parse. If None, sys.argv is used.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Convert many RoAML models to JANI models.")
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default="",
+        help="Path to a file listing the RoAML files to convert, one per line.",
+    )
+    parser.add_argument(
+        "--jani-compact",
+        action="store_true",
+        help="Write the jani files without indentation, to reduce their size.",
+    )
+    parser.add_argument(
+        "--fast-json",
+        action="store_true",
+        help="Use the orjson library (if installed) to speed up writing the jani files.",
+    )
+    parser.add_argument(
+        "--jani-simplify",
+        action="store_true",
+        help="Simplify the expressions and automata in the jani files, e.g. by evaluating "
+        "constant operations and merging chains of internal edges.",
+    )
+    parser.add_argument(
+        "--jani-priority-chains",
+        action="store_true",
+        help="Check the conditions of the transitions triggered by the same event one at a time, "
+        "in intermediate locations, instead of negating the previous conditions in each guard.",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Number of processes used to convert the models."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="",
+        help="Path to the folder where intermediate results are cached, to speed up rebuilds. "
+        "The least recently used results are removed beyond 1 GiB; delete the folder to clear it.",
+    )
+    parser.add_argument(
+        "roaml_xmls",
+        type=str,
+        nargs="*",
+        help="The paths (or glob patterns) to the RoAML XML files to interpret.",
+    )
+    args = parser.parse_args(_args)
+
+    input_patterns: List[str] = list(args.roaml_xmls)
+    if len(args.manifest) > 0:
+        input_patterns.extend(read_batch_manifest(args.manifest))
+    roaml_xmls: List[str] = []
+    for input_pattern in input_patterns:
+        matching_files = sorted(glob.glob(input_pattern, recursive=True))
+        assert len(matching_files) > 0, f"No file matching {input_pattern}."
+        roaml_xmls.extend(f for f in matching_files if f not in roaml_xmls)
+    assert len(roaml_xmls) > 0, "No RoAML files to convert."
+    assert args.jobs > 0, f"The amount of jobs must be positive, found {args.jobs}."
+
+    print(f"AS2FM - RoAML to JANI: converting {len(roaml_xmls)} models.\n")
+    results = interpret_top_level_xml_batch(
+        roaml_xmls,
+        jobs=args.jobs,
+        cache_dir=None if len(args.cache_dir) == 0 else args.cache_dir,
+        compact_jani=args.jani_compact,
+        fast_json=args.fast_json,
+        simplify_jani=args.jani_simplify,
+        priority_chains=args.jani_priority_chains,
+    )
+    failed_xmls = [xml for xml, success in zip(roaml_xmls, results) if not success]
+    print(f"Converted {len(roaml_xmls) - len(failed_xmls)} of {len(roaml_xmls)} models.")
+    assert len(failed_xmls) == 0, f"Failed converting: {', '.join(failed_xmls)}."
 
 
 def main_scxml_to_jani(_args: Optional[Sequence[str]] = None) -> None:
@@ -77,6 +344,89 @@ def main_scxml_to_jani(_args: Optional[Sequence[str]] = None) -> None:
     roaml_to_jani(_args)
 
 
+def main_generate_synthetic_model(_args: Optional[Sequence[str]] = None) -> None:
+    """
+    Generate a synthetic RoAML model, to measure how the conversion scales with the model size.
+
+    :param args: The arguments to parse. If None, sys.argv is used.
+    :return: None
+    """
+    default_config = SyntheticModelConfig()
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic RoAML model with configurable size."
+    )
+    parser.add_argument(
+        "--nodes", type=int, default=default_config.n_nodes, help="Number of ROS nodes."
+    )
+    parser.add_argument(
+        "--topics", type=int, default=default_config.n_topics, help="Number of ROS topics."
+    )
+    parser.add_argument(
+        "--subscribers-per-topic",
+        type=int,
+        default=default_config.subscribers_per_topic,
+        help="Number of nodes subscribing to each topic.",
+    )
+    parser.add_argument(
+        "--bt-depth",
+        type=int,
+        default=default_config.bt_depth,
+        help="Levels of control nodes in the Behavior Tree. If 0, no BT is generated.",
+    )
+    parser.add_argument(
+        "--bt-width",
+        type=int,
+        default=default_config.bt_width,
+        help="Number of children of each BT control node.",
+    )
+    parser.add_argument(
+        "--services", type=int, default=default_config.n_services, help="Number of ROS services."
+    )
+    parser.add_argument(
+        "--actions", type=int, default=default_config.n_actions, help="Number of ROS actions."
+    )
+    parser.add_argument(
+        "--action-threads",
+        type=int,
+        default=default_config.n_action_threads,
+        help="Number of threads of each action server.",
+    )
+    parser.add_argument(
+        "--array-size",
+        type=int,
+        default=default_config.array_size,
+        help="Size of the array stored in each node. If 0, no array is generated.",
+    )
+    parser.add_argument(
+        "--timers", type=int, default=default_config.n_timers, help="Number of ROS timers."
+    )
+    parser.add_argument(
+        "--timer-rates",
+        type=float,
+        nargs="+",
+        default=default_config.timer_rates,
+        help="Rates of the timers in Hz, assigned to the timers in round robin.",
+    )
+    parser.add_argument("output_dir", type=str, help="The folder where to write the model.")
+    args = parser.parse_args(_args)
+
+    model_config = SyntheticModelConfig(
+        n_nodes=args.nodes,
+        n_topics=args.topics,
+        subscribers_per_topic=args.subscribers_per_topic,
+        bt_depth=args.bt_depth,
+        bt_width=args.bt_width,
+        n_services=args.services,
+        n_actions=args.actions,
+        n_action_threads=args.action_threads,
+        array_size=args.array_size,
+        n_timers=args.timers,
+        timer_rates=args.timer_rates,
+    )
+    main_xml_file = generate_synthetic_model(model_config, args.output_dir)
+    print(f"Generated synthetic model in {main_xml_file}.")
+
+
 if __name__ == "__main__":
     # for testing purposes only
     import sys
@@ -204,9 +204,11 @@ def remove_empty_self_loops_from_interface_handlers_in_jani(jani_model: JaniMode
     handlers_prefixes = [
         handler.get_interface_prefix() for handler in RosCommunicationHandler.__subclasses__()
     ]
-    for automaton in jani_model.get_automata():
+    handler_names = [
+        automaton.get_name()
+        for automaton in jani_model.get_automata()
+        if any(automaton.get_name().startswith(prefix) for prefix in handlers_prefixes)
+    ]
+    for automaton in jani_model.iter_automata_for_update(handler_names):
         # Modify the automaton in place
-        for prefix in handlers_prefixes:
-            if automaton.get_name().startswith(prefix):
-                automaton.remove_empty_self_loop_edges()
-                break
+        automaton.remove_empty_self_loop_edges()
@@ -0,0 +1,345 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Content-addressed cache for the intermediate results of the RoAML to JANI conversion.
+
+Entries are identified by the hash of all the inputs affecting them (file contents and
+conversion parameters), plus a fingerprint of the AS2FM sources: this way, stale entries are
+never loaded, neither after changing the input model nor after updating AS2FM.
+Since the keys change with the inputs, the outdated entries are never removed by lookups: the
+cache evicts the least recently used entries once their size (or, for the shared objects, their
+amount) exceeds a bound, and it can be emptied with `ConversionCache.clear` (or by deleting the
+cache folder).
+"""
+
+import io
+import os
+import pickle
+import shutil
+from functools import cache
+from hashlib import sha256
+from importlib.resources import files as resource_files
+from tempfile import NamedTemporaryFile
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from lxml import etree as ET
+from lxml.etree import _Element as XmlElement
+
+from as2fm.as2fm_common.logging import INTERNAL_FILEPATH_ATTR
+
+# The default bound on the size of the stored entries, in bytes
+DEFAULT_MAX_CACHE_SIZE = 1024 * 1024 * 1024
+
+# The default bound on the amount of shared objects kept in memory
+DEFAULT_MAX_SHARED_OBJECTS = 256
+
+
+def _restore_xml_origin(tag: str, filepath: Optional[str], sourceline: Optional[int]):
+    """Generate a placeholder for a cached XML element, providing only its location info."""
+    xml_origin = ET.Element(tag)
+    if filepath is not None:
+        xml_origin.set(INTERNAL_FILEPATH_ATTR, filepath)
+    if sourceline is not None:
+        xml_origin.sourceline = sourceline
+    return xml_origin
+
+
+class _CachePickler(pickle.Pickler):
+    """
+    Pickler able to store the objects generated from XML files.
+
+    The XML elements (used to generate error messages) cannot be pickled: we only keep the
+    information related to their location in the original file.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, XmlElement):
+            tag = obj.tag if isinstance(obj.tag, str) else "comment"
+            filepath = obj.get(INTERNAL_FILEPATH_ATTR) if isinstance(obj.tag, str) else None
+            return _restore_xml_origin, (tag, filepath, obj.sourceline)
+        return NotImplemented
+
+
+def dump_to_bytes(entry: Any) -> bytes:
+    """Serialize an entry (possibly containing XML elements) to bytes."""
+    buffer = io.BytesIO()
+    _CachePickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(entry)
+    return buffer.getvalue()
+
+
+@cache
+def get_as2fm_fingerprint() -> str:
+    """Get a hash of all the source and resource files of the AS2FM package."""
+    hasher = sha256()
+    pending_dirs = [resource_files("as2fm")]
+    while len(pending_dirs) > 0:
+        for entry in sorted(pending_dirs.pop().iterdir(), key=lambda e: e.name):
+            if entry.is_dir():
+                if entry.name != "__pycache__":
+                    pending_dirs.append(entry)
+            elif not entry.name.endswith(".pyc"):
+                hasher.update(entry.name.encode())
+                hasher.update(entry.read_bytes())
+    return hasher.hexdigest()
+
+
+class ConversionCache:
+    """Store and retrieve intermediate conversion results, either in a folder or in memory."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size: Optional[int] = DEFAULT_MAX_CACHE_SIZE,
+        max_shared_objects: Optional[int] = DEFAULT_MAX_SHARED_OBJECTS,
+    ):
+        """
+        Initialize the cache.
+
+        :param cache_dir: The folder where the cached entries are stored. Created if missing.
+            If None, the entries are kept in memory (e.g. for rebuilding in the same process).
+        :param max_size: The size in bytes above which the least recently used entries are
+            evicted when storing new ones. If None, the cache grows without bound.
+        :param max_shared_objects: The amount of shared objects above which the least recently
+            used ones are evicted when storing new ones. If None, they are never evicted.
+        """
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+        self._max_shared_objects = max_shared_objects
+        # Entries in memory, from the least to the most recently used
+        self._memory_entries: Dict[Tuple[str, str], bytes] = {}
+        # The size of the stored entries, computed when needed for the first time
+        self._stored_size: Optional[int] = None
+        # Parsed input files, shared as they are (never copied nor written to file), from the
+        # least to the most recently used
+        self._shared_objects: Dict[Tuple[str, str], Any] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(*key_entries: Any) -> str:
+        """
+        Generate a key from the provided entries and the current version of AS2FM.
+
+        :param key_entries: The entries identifying the cached value. Bytes are hashed directly,
+            all other objects are hashed by their string representation.
+        """
+        hasher = sha256(get_as2fm_fingerprint().encode())
+        for key_entry in key_entries:
+            entry_bytes = key_entry if isinstance(key_entry, bytes) else repr(key_entry).encode()
+            # Add the length, to make sure different entries sequences generate different hashes
+            hasher.update(len(entry_bytes).to_bytes(8, "little"))
+            hasher.update(entry_bytes)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def hash_files(
+        file_paths: Iterable[str], in_memory_files: Optional[Mapping[str, str]] = None
+    ) -> str:
+        """
+        Generate a single hash, based on the name and content of the provided files.
+
+        :param file_paths: The paths to the files to hash.
+        :param in_memory_files: Optional content of the files, to use in place of reading them.
+        """
+        hasher = sha256()
+        for file_path in file_paths:
+            hasher.update(os.path.basename(file_path).encode())
+            if in_memory_files is not None and file_path in in_memory_files:
+                hasher.update(sha256(in_memory_files[file_path].encode()).digest())
+                continue
+            with open(file_path, "rb") as f:
+                hasher.update(sha256(f.read()).digest())
+        return hasher.hexdigest()
+
+    def _get_entry_path(self, category: str, key: str) -> str:
+        assert self._cache_dir is not None, "Unexpected access to files of in-memory cache."
+        return os.path.join(self._cache_dir, category, f"{key}.pickle")
+
+    def _load_entry_bytes(self, category: str, key: str) -> Optional[bytes]:
+        if self._cache_dir is None:
+            entry_bytes = self._memory_entries.pop((category, key), None)
+            if entry_bytes is not None:
+                # Move the entry to the end, as the most recently used
+                self._memory_entries[(category, key)] = entry_bytes
+            return entry_bytes
+        entry_path = self._get_entry_path(category, key)
+        try:
+            with open(entry_path, "rb") as f:
+                entry_bytes = f.read()
+            # The modification time marks the last use, for the eviction of old entries
+            os.utime(entry_path)
+        except OSError:
+            return None
+        return entry_bytes
+
+    def _list_entry_files(self) -> List[Tuple[float, int, str]]:
+        """List the files of the stored entries, as (last use time, size, path)."""
+        assert self._cache_dir is not None, "Unexpected access to files of in-memory cache."
+        entry_files: List[Tuple[float, int, str]] = []
+        for category_entry in os.scandir(self._cache_dir):
+            if not category_entry.is_dir():
+                continue
+            for file_entry in os.scandir(category_entry.path):
+                if not file_entry.name.endswith(".pickle"):
+                    continue
+                try:
+                    file_stat = file_entry.stat()
+                except OSError:
+                    # Removed by a concurrent process
+                    continue
+                entry_files.append((file_stat.st_mtime, file_stat.st_size, file_entry.path))
+        return entry_files
+
+    def _get_stored_size(self) -> int:
+        if self._stored_size is None:
+            if self._cache_dir is None:
+                self._stored_size = sum(len(entry) for entry in self._memory_entries.values())
+            else:
+                self._stored_size = sum(size for _, size, _ in self._list_entry_files())
+        return self._stored_size
+
+    def load(self, category: str, key: str) -> Optional[Any]:
+        """
+        Load an entry from the cache.
+
+        :param category: The kind of entry to load, e.g. "jani_automata".
+        :param key: The key of the entry, generated using `make_key`.
+        :return: The cached entry, or None if it is not available.
+        """
+        entry_bytes = self._load_entry_bytes(category, key)
+        cached_entry = None
+        if entry_bytes is not None:
+            try:
+                cached_entry = pickle.loads(entry_bytes)
+            except (EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+                # Unreadable entry: it will be regenerated
+                cached_entry = None
+        if cached_entry is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return cached_entry
+
+    def store(self, category: str, key: str, entry: Any) -> None:
+        """
+        Store an entry in the cache.
+
+        :param category: The kind of entry to store, e.g. "jani_automata".
+        :param key: The key of the entry, generated using `make_key`.
+        :param entry: The object to store.
+        """
+        entry_bytes = dump_to_bytes(entry)
+        if self._max_size is not None:
+            # Only the entries stored by this process are counted: the ones of concurrent
+            # processes are only found when pruning, where the actual size is computed
+            self._stored_size = self._get_stored_size() + len(entry_bytes)
+        if self._cache_dir is None:
+            replaced_bytes = self._memory_entries.pop((category, key), b"")
+            if self._stored_size is not None:
+                self._stored_size -= len(replaced_bytes)
+            self._memory_entries[(category, key)] = entry_bytes
+        else:
+            entry_path = self._get_entry_path(category, key)
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            # Write to a temporary file first, so concurrent runs never read a partial entry
+            with NamedTemporaryFile(dir=os.path.dirname(entry_path), delete=False) as f:
+                f.write(entry_bytes)
+            os.replace(f.name, entry_path)
+        if self._max_size is not None and self._get_stored_size() > self._max_size:
+            self.prune(self._max_size)
+
+    def prune(self, max_size: int) -> None:
+        """
+        Remove the least recently used entries, until the stored ones fit in the provided size.
+
+        Only the entries created with `store` are considered: the shared objects are not
+        serialized, hence their size is unknown (their amount is bounded instead).
+
+        :param max_size: The maximum size of the stored entries, in bytes.
+        """
+        if self._cache_dir is None:
+            stored_size = sum(len(entry) for entry in self._memory_entries.values())
+            while stored_size > max_size:
+                # Dicts keep the insertion order: the first entry is the least recently used
+                stored_size -= len(self._memory_entries.pop(next(iter(self._memory_entries))))
+            self._stored_size = stored_size
+            return
+        entry_files = self._list_entry_files()
+        stored_size = sum(size for _, size, _ in entry_files)
+        for _, size, file_path in sorted(entry_files):
+            if stored_size <= max_size:
+                break
+            try:
+                os.remove(file_path)
+            except OSError:
+                # Already removed by a concurrent process
+                pass
+            stored_size -= size
+        self._stored_size = stored_size
+
+    def clear(self) -> None:
+        """Remove all the entries and shared objects, from memory and from the cache folder."""
+        self._memory_entries.clear()
+        self._shared_objects.clear()
+        self._stored_size = 0
+        if self._cache_dir is None:
+            return
+        for category_entry in os.scandir(self._cache_dir):
+            if category_entry.is_dir():
+                shutil.rmtree(category_entry.path, ignore_errors=True)
+
+    def load_shared(self, category: str, key: str) -> Optional[Any]:
+        """
+        Load an object stored with `store_shared`. The object must not be modified.
+
+        :param category: The kind of object to load, e.g. "bt_plugin_templates".
+        :param key: The key of the object, generated using `make_key`.
+        :return: The same object that was stored, or None if it is not available.
+        """
+        shared_object = self._shared_objects.pop((category, key), None)
+        if shared_object is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+            # Move the object to the end, as the most recently used
+            self._shared_objects[(category, key)] = shared_object
+        return shared_object
+
+    def store_shared(self, category: str, key: str, shared_object: Any) -> None:
+        """
+        Keep an object in memory, to share it across conversions in the same process.
+
+        Unlike `store`, the object is not copied: this is meant for parsed inputs that are
+        only read during the conversion, and that would be expensive to load from a copy.
+        Since the size of the objects is unknown, their amount is bounded instead: the least
+        recently used ones are evicted beyond `max_shared_objects`.
+
+        :param category: The kind of object to store, e.g. "bt_plugin_templates".
+        :param key: The key of the object, generated using `make_key`.
+        :param shared_object: The object to store.
+        """
+        self._shared_objects.pop((category, key), None)
+        self._shared_objects[(category, key)] = shared_object
+        if self._max_shared_objects is not None:
+            while len(self._shared_objects) > self._max_shared_objects:
+                # Dicts keep the insertion order: the first object is the least recently used
+                del self._shared_objects[next(iter(self._shared_objects))]
+
+    def get_stats(self) -> Tuple[int, int]:
+        """Get the amount of cache hits and misses since the cache creation."""
+        return self._hits, self._misses
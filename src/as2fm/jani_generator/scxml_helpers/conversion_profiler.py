@@ -0,0 +1,173 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Collect timing and memory information about the stages of the RoAML to JANI conversion.
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+from as2fm.as2fm_common.ecmascript_interpretation import get_ecmascript_parse_cache_info
+from as2fm.jani_generator.jani_entries import JaniAutomaton
+
+
+@dataclass
+class StageProfile:
+    """Resources used by a conversion stage, summed over all its executions."""
+
+    name: str
+    calls: int = 0
+    wall_time_s: float = 0.0
+    cpu_time_s: float = 0.0
+    # Highest amount of memory allocated by Python while running the stage
+    peak_traced_memory_mb: float = 0.0
+
+
+@dataclass
+class AutomatonProfile:
+    """Time required to generate a single Jani automaton, and its size after the conversion."""
+
+    name: str
+    cached: bool
+    wall_time_s: Optional[float]
+    cpu_time_s: Optional[float]
+    n_edges: int
+    n_locations: int
+    n_variables: int
+
+    @staticmethod
+    def from_automaton(
+        automaton: JaniAutomaton,
+        wall_time_s: Optional[float] = None,
+        cpu_time_s: Optional[float] = None,
+    ) -> "AutomatonProfile":
+        """
+        Generate the profile of a converted automaton.
+
+        :param automaton: The automaton generated from an SCXML model.
+        :param wall_time_s: The time spent to generate it, or None if it was loaded from cache.
+        :param cpu_time_s: The CPU time spent to generate it, or None if it was loaded from cache.
+        """
+        return AutomatonProfile(
+            name=automaton.get_name(),
+            cached=wall_time_s is None,
+            wall_time_s=wall_time_s,
+            cpu_time_s=cpu_time_s,
+            n_edges=len(automaton.get_edges()),
+            n_locations=len(automaton.get_locations()),
+            n_variables=len(automaton.get_variables()),
+        )
+
+
+class ConversionProfiler:
+    """
+    Measure the wall time, CPU time and peak traced memory of the conversion stages.
+
+    Stages can be nested: the memory peak of a stage includes the one of its sub-stages.
+    The memory allocations are traced while the profiler is used as a context manager. Tracing
+    slows down the conversion, so the reported times are only meaningful relative to each other.
+    The hits and misses of the ECMAScript parsing cache are counted from the profiler creation,
+    in the current process only.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, StageProfile] = {}
+        self._automata: List[AutomatonProfile] = []
+        # The highest memory peak found in each currently running stage's sub-stages
+        self._open_stages_peaks: List[int] = []
+        self._started_tracing = False
+        self._initial_parse_cache_info = get_ecmascript_parse_cache_info()
+
+    def __enter__(self) -> "ConversionProfiler":
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, stage_name: str) -> Iterator[None]:
+        """Context manager measuring the resources used by the enclosed code."""
+        if len(self._open_stages_peaks) > 0:
+            # Store the peak reached so far by the outer stage, before resetting it
+            self._open_stages_peaks[-1] = max(
+                self._open_stages_peaks[-1], tracemalloc.get_traced_memory()[1]
+            )
+        tracemalloc.reset_peak()
+        self._open_stages_peaks.append(0)
+        stage_profile = self._stages.setdefault(stage_name, StageProfile(stage_name))
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start_wall
+            cpu_time = time.process_time() - start_cpu
+            stage_peak = max(self._open_stages_peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if len(self._open_stages_peaks) > 0:
+                self._open_stages_peaks[-1] = max(self._open_stages_peaks[-1], stage_peak)
+            tracemalloc.reset_peak()
+            stage_profile.calls += 1
+            stage_profile.wall_time_s += wall_time
+            stage_profile.cpu_time_s += cpu_time
+            stage_profile.peak_traced_memory_mb = max(
+                stage_profile.peak_traced_memory_mb, stage_peak / 2**20
+            )
+
+    def add_automaton(self, automaton_profile: AutomatonProfile) -> None:
+        """Store the profile of a converted automaton."""
+        self._automata.append(automaton_profile)
+
+    def get_stages(self) -> List[StageProfile]:
+        """Get the profile of all executed stages, sorted by their first execution."""
+        return list(self._stages.values())
+
+    def get_automata(self) -> List[AutomatonProfile]:
+        return self._automata
+
+    def get_parse_cache_stats(self) -> Dict[str, int]:
+        """Get the hits and misses of the ECMAScript parsing cache, and its current size."""
+        cache_info = get_ecmascript_parse_cache_info()
+        for counter in ("hits", "misses"):
+            cache_info[counter] -= self._initial_parse_cache_info[counter]
+        return cache_info
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "stages": [asdict(stage) for stage in self._stages.values()],
+            "automata": [asdict(automaton) for automaton in self._automata],
+            "ecmascript_parse_cache": self.get_parse_cache_stats(),
+        }
+
+    def write(self, output_path: str) -> None:
+        """Write the collected profile to a JSON file."""
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+
+def profile_stage(profiler: Optional[ConversionProfiler], stage_name: str) -> ContextManager:
+    """Measure the enclosed code as a stage of the provided profiler, if any."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(stage_name)
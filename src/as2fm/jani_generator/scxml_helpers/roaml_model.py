@@ -38,6 +38,10 @@ class FullModel:
     max_time: Optional[int] = None
     # Max size of "dynamic" arrays defined in the SCXML models
     max_array_size: int = field(default=100)
+    # Amount of equally likely values used to represent each random number (e.g. Math.random())
+    random_samples: int = field(default=100)
+    # Amount of values representing the random numbers assigned to specific variables
+    random_samples_per_variable: Dict[str, int] = field(default_factory=dict)
     # Tick rate for the loaded BT in Hz
     bt_tick_rate: float = field(default=1.0)
     # Whether to keep ticking the BT after it returns SUCCESS / FAILURE
@@ -87,6 +91,8 @@ class RoamlParameters:
     def __init__(self, params_element: Optional[XmlElement]):
         self._max_time: Optional[int] = None
         self._max_array_size: int = 100
+        self._random_samples: int = 100
+        self._random_samples_per_variable: Dict[str, int] = {}
         self._bt_tick_rate: float = 1.0
         self._bt_tick_when_not_running: bool = False
 
@@ -101,6 +107,8 @@ class RoamlParameters:
                 self._max_time = self._parse_time_element(param)
             elif param_tag == "max_array_size":
                 self._max_array_size = int(param.attrib["value"])
+            elif param_tag == "random_samples":
+                self._parse_random_samples(param)
             elif param_tag == "bt_tick_rate":
                 self._bt_tick_rate = float(param.attrib["value"])
             elif param_tag == "bt_tick_if_not_running":
@@ -111,6 +119,20 @@ class RoamlParameters:
         if self._max_time is None:
             raise ValueError(get_error_msg(params_element, "`max_time` must be defined."))
 
+    def _parse_random_samples(self, random_samples_element: XmlElement) -> None:
+        """Interpret the amount of samples for random numbers, for the model or a variable."""
+        n_samples = int(random_samples_element.attrib["value"])
+        check_assertion(
+            n_samples > 0,
+            random_samples_element,
+            f"Expected a positive amount of random samples, found {n_samples}.",
+        )
+        variable_name = random_samples_element.attrib.get("variable")
+        if variable_name is None:
+            self._random_samples = n_samples
+        else:
+            self._random_samples_per_variable[variable_name] = n_samples
+
     @staticmethod
     def _parse_time_element(time_element: XmlElement) -> int:
         """
@@ -119,10 +141,22 @@ class RoamlParameters:
         :param time_element: The time element to interpret.
         :return: The interpreted time in nanoseconds.
         """
+        return RoamlParameters.time_to_ns(
+            int(time_element.attrib["value"]), time_element.attrib["unit"]
+        )
+
+    @staticmethod
+    def time_to_ns(time_value: int, time_unit: str) -> int:
+        """
+        Convert a time value to nanoseconds.
+
+        :param time_value: The time value, expressed in the provided unit.
+        :param time_unit: The unit of the time value: one of 's', 'ms', 'us' and 'ns'.
+        :return: The time in nanoseconds.
+        """
         TIME_MULTIPLIERS = {"s": 1_000_000_000, "ms": 1_000_000, "us": 1_000, "ns": 1}
-        time_unit = time_element.attrib["unit"]
         assert time_unit in TIME_MULTIPLIERS, f"Invalid time unit: {time_unit}"
-        return int(time_element.attrib["value"]) * TIME_MULTIPLIERS[time_unit]
+        return time_value * TIME_MULTIPLIERS[time_unit]
 
     def get_max_time(self) -> Optional[int]:
         return self._max_time
@@ -130,6 +164,12 @@ class RoamlParameters:
     def get_max_array_size(self) -> int:
         return self._max_array_size
 
+    def get_random_samples(self) -> int:
+        return self._random_samples
+
+    def get_random_samples_per_variable(self) -> Dict[str, int]:
+        return self._random_samples_per_variable
+
     def get_bt_tick_rate(self) -> float:
         return self._bt_tick_rate
 
@@ -377,10 +417,8 @@ class RoamlProperties:
 
             self._properties.append(os.path.join(folder_path, jani_property.attrib["src"]))
 
-        if len(self._properties) != 1:
-            raise ValueError(
-                get_error_msg(props_element, "Only exactly one Jani property is supported.")
-            )
+        if len(self._properties) == 0:
+            raise ValueError(get_error_msg(props_element, "At least one Jani property is needed."))
 
     def get_properties(self) -> List[str]:
         return self._properties
@@ -433,6 +471,10 @@ class RoamlMain:
         loaded_model = FullModel()
         loaded_model.max_time = self._roaml_params.get_max_time()
         loaded_model.max_array_size = self._roaml_params.get_max_array_size()
+        loaded_model.random_samples = self._roaml_params.get_random_samples()
+        loaded_model.random_samples_per_variable = (
+            self._roaml_params.get_random_samples_per_variable()
+        )
         loaded_model.bt_tick_rate = self._roaml_params.get_bt_tick_rate()
         loaded_model.bt_tick_when_not_running = self._roaml_params.get_tick_when_not_running()
         loaded_model.data_declarations = self._roaml_data.get_data_declarations()
@@ -208,6 +208,26 @@ class EventsHolder:
         assert event.name not in self._events, f"Event {event.name} must not be added twice."
         self._events[event.name] = event
 
+    def merge(self, other: "EventsHolder"):
+        """
+        Merge the events collected in another holder (e.g. from a single automaton) into this one.
+
+        New events are appended in the same order they have in `other`, so that merging the
+        holders of multiple automata in sequence results in the same events order we would get
+        by converting all automata using a single holder.
+
+        :param other: The holder whose events shall be added to this one.
+        """
+        for event_name, other_event in other.get_events().items():
+            if not self.has_event(event_name):
+                self.add_event(other_event)
+                continue
+            existing_event = self.get_event(event_name)
+            if other_event.data_struct is not None:
+                existing_event.set_data_structure(other_event.data_struct)
+            existing_event.senders.update(other_event.senders)
+            existing_event.receivers.update(other_event.receivers)
+
 
 def is_event_synched(event_name: str) -> bool:
     """
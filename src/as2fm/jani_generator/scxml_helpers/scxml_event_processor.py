@@ -153,24 +153,24 @@ def _preprocess_global_timer_automaton(timer_automaton: JaniAutomaton):
     - The {GLOBAL_TIMER_TICK_EVENT}_on_send action is treated as a non-sync action.
     - The {GLOBAL_TIMER_TICK_EVENT}_on_receive action the global timer step, and is renamed.
     """
-    global_timer_edges = timer_automaton.get_edges()
-    for jani_edge in global_timer_edges:
-        action_name = jani_edge.get_action()
-        if action_name is not None:
-            if action_name.startswith(ROS_TIMER_RATE_EVENT_PREFIX):
+    for action_name in list(timer_automaton.get_actions()):
+        if action_name.startswith(ROS_TIMER_RATE_EVENT_PREFIX):
+            for jani_edge in timer_automaton.get_edges_with_action(action_name):
                 assert (
                     len(jani_edge.destinations) == 1
                 ), f"Unexpected n. of destination for timer edge '{action_name}'"
                 assert (
-                    len(jani_edge.destinations[0]["assignments"]) == 1
+                    len(jani_edge.destinations[0].assignments) == 1
                 ), f"Unexpected n. of assignments for timer edge '{action_name}'"
                 # Get rid of the assignment
-                jani_edge.destinations[0]["assignments"] = []
-            elif action_name == f"{GLOBAL_TIMER_TICK_EVENT}_on_receive":
-                jani_edge.set_action(GLOBAL_TIMER_TICK_ACTION)
-            elif action_name == f"{GLOBAL_TIMER_TICK_EVENT}_on_send":
-                jani_edge.set_action(GLOBAL_TIMER_TICK_EVENT)
-                jani_edge.destinations[0]["assignments"] = []
+                jani_edge.destinations[0].assignments = []
+        elif action_name == f"{GLOBAL_TIMER_TICK_EVENT}_on_receive":
+            for jani_edge in list(timer_automaton.get_edges_with_action(action_name)):
+                timer_automaton.set_edge_action(jani_edge, GLOBAL_TIMER_TICK_ACTION)
+        elif action_name == f"{GLOBAL_TIMER_TICK_EVENT}_on_send":
+            for jani_edge in list(timer_automaton.get_edges_with_action(action_name)):
+                timer_automaton.set_edge_action(jani_edge, GLOBAL_TIMER_TICK_EVENT)
+                jani_edge.destinations[0].assignments = []
 
 
 def _process_event(
@@ -190,7 +190,10 @@ def _process_event(
     event_send_action, event_receive_action = _generate_event_action_names(event_obj)
     if event_automaton is None:
         # This action was skipped: ensure all receivers in the model are removed
-        jani_model.remove_edges_with_action(event_receive_action)
+        jani_model.remove_edges_with_action(
+            event_receive_action,
+            [receiver_ev.automaton_name for receiver_ev in event_obj.get_receivers()],
+        )
         return None
     automaton_name = event_automaton.get_name()
     jani_model.add_jani_automaton(event_automaton)
@@ -266,10 +269,11 @@ def _get_composition_from_automata(
         automaton_name = automaton.get_name()
         if automaton_name == GLOBAL_TIMER_AUTOMATON:
             has_automata.timer_automata = True
-            _preprocess_global_timer_automaton(automaton)
         if automaton_name == BT_BLACKBOARD_MODEL:
             has_automata.bt_blackboard_automata = True
         jc.add_element(automaton_name)
+    for timer_automaton in jani_model.iter_automata_for_update([GLOBAL_TIMER_AUTOMATON]):
+        _preprocess_global_timer_automaton(timer_automaton)
     return jc, has_automata
 
 
@@ -25,6 +25,7 @@ import esprima
 from esprima.syntax import Syntax
 from lxml.etree import _Element as XmlElement
 
+from as2fm.as2fm_common.ecmascript_interpretation import AnalyzedExpression, analyze_expression
 from as2fm.as2fm_common.ecmascript_interpretation_functions import (
     get_ast_expression_type,
     get_list_from_array_expr,
@@ -93,36 +94,32 @@ def __convert_array_access_to_length_access(
 
 
 def parse_ecmascript_to_jani_expression(
-    ecmascript: str,
+    ecmascript: Union[str, AnalyzedExpression],
     elem: Optional[XmlElement],
     target_array_info: Optional[ArrayInfo] = None,
 ) -> JaniExpression:
     """
     Parse ecmascript to jani expression.
 
-    :param ecmascript: The ecmascript to parse.
+    :param ecmascript: The ecmascript to parse, or its analysis.
     :param elem: The xml element associated to the expression, for error logging.
     :param target_array_info: The array info required by the target variable (if any).
 
     :return: The jani expression.
     """
-    check_assertion(isinstance(ecmascript, str), elem, f"Unexpected type {type(ecmascript)}.")
-    try:
-        ast = esprima.parseScript(ecmascript)
-    except esprima.error_handler.Error as e:
-        raise RuntimeError(
-            get_error_msg(elem, f"Failed parsing ecmascript: {ecmascript}. Error: {e}.")
-        )
-    assert len(ast.body) == 1, get_error_msg(
-        elem, "The ecmascript must contain exactly one expression."
-    )
-    ast = ast.body[0]
+    if isinstance(ecmascript, AnalyzedExpression):
+        analyzed_expr = ecmascript
+    else:
+        check_assertion(isinstance(ecmascript, str), elem, f"Unexpected type {type(ecmascript)}.")
+        analyzed_expr = analyze_expression(ecmascript, elem)
+    ast = analyzed_expr.get_ast(elem)
+    expr_str = analyzed_expr.get_expression()
     try:
         jani_expression = _parse_ecmascript_to_jani_expression(ast, target_array_info)
     except NotImplementedError as e:
-        raise RuntimeError(get_error_msg(elem, f"Unsupported ecmascript '{ecmascript}': {e}"))
+        raise RuntimeError(get_error_msg(elem, f"Unsupported ecmascript '{expr_str}': {e}"))
     except AssertionError as e:
-        raise RuntimeError(get_error_msg(elem, f"Assertion from ecmascript '{ecmascript}': {e}"))
+        raise RuntimeError(get_error_msg(elem, f"Assertion from ecmascript '{expr_str}': {e}"))
     return jani_expression
 
 
@@ -19,17 +19,22 @@ Functions for the conversion from SCXML to Jani.
 The main entrypoint is `convert_scxml_root_to_jani_automaton`.
 """
 
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
-from typing import Any, Dict, List, Optional
+from itertools import repeat
+from multiprocessing import get_all_start_methods, get_context
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
 
 from as2fm.as2fm_common.logging import log_error
 from as2fm.jani_generator.jani_entries import (
-    JaniAssignment,
     JaniAutomaton,
     JaniExpression,
     JaniExpressionType,
     JaniModel,
     JaniVariable,
+    SpilledJaniAutomaton,
 )
 from as2fm.jani_generator.jani_entries.jani_expression_generator import (
     and_operator,
@@ -37,6 +42,7 @@ from as2fm.jani_generator.jani_entries.jani_expression_generator import (
     equal_operator,
 )
 from as2fm.jani_generator.jani_entries.jani_helpers import expand_random_variables_in_jani_model
+from as2fm.jani_generator.jani_entries.jani_model import ModelAutomaton
 from as2fm.jani_generator.jani_entries.jani_utils import (
     get_array_access_name_and_indexes,
     is_expression_array,
@@ -45,6 +51,12 @@ from as2fm.jani_generator.jani_entries.jani_utils import (
 from as2fm.jani_generator.ros_helpers.ros_communication_handler import (
     remove_empty_self_loops_from_interface_handlers_in_jani,
 )
+from as2fm.jani_generator.scxml_helpers.conversion_cache import ConversionCache
+from as2fm.jani_generator.scxml_helpers.conversion_profiler import (
+    AutomatonProfile,
+    ConversionProfiler,
+    profile_stage,
+)
 from as2fm.jani_generator.scxml_helpers.scxml_event import EventsHolder
 from as2fm.jani_generator.scxml_helpers.scxml_event_processor import (
     implement_scxml_events_as_jani_syncs,
@@ -58,6 +70,7 @@ def convert_scxml_root_to_jani_automaton(
     scxml_root: ScxmlRoot,
     events_holder: EventsHolder,
     max_array_size: int,
+    priority_chains: bool = False,
 ) -> JaniAutomaton:
     """
     Convert an SCXML element to a Jani automaton.
@@ -66,50 +79,210 @@ def convert_scxml_root_to_jani_automaton(
     :param jani_automaton: The Jani automaton to write the converted element to.
     :param events_holder: The holder for the events to be implemented as Jani syncs.
     :param max_array_size: The max size of the arrays in the model.
+    :param priority_chains: Whether to check the conditions of the transitions triggered by the
+        same event one at a time, using intermediate locations.
     """
     jani_automaton = JaniAutomaton()
     BaseTag.from_element(
-        scxml_root, [], (jani_automaton, events_holder), max_array_size
+        scxml_root, [], (jani_automaton, events_holder), max_array_size, priority_chains
     ).write_model()
     return jani_automaton
 
 
-def convert_multiple_scxmls_to_jani(scxmls: List[ScxmlRoot], max_array_size: int) -> JaniModel:
+def _convert_plain_scxml_to_jani_fragment(
+    input_scxml: ScxmlRoot, max_array_size: int, priority_chains: bool
+) -> Tuple[JaniAutomaton, EventsHolder]:
+    """
+    Convert a single plain SCXML model to a Jani automaton, collecting its events separately.
+
+    :param input_scxml: The plain SCXML model to convert. It will be modified in place.
+    :param max_array_size: The max size of the arrays in the model.
+    :param priority_chains: Whether to check the transition conditions in intermediate locations.
+    :return: The generated Jani automaton and the events sent and received by it.
+    """
+    assert isinstance(input_scxml, ScxmlRoot)
+    assert (
+        input_scxml.is_plain_scxml()
+    ), f"Input model {input_scxml.get_name()} does not contain a plain SCXML model."
+    automaton_events = EventsHolder()
+    try:
+        input_scxml.replace_strings_types_with_integer_arrays()
+        automaton = convert_scxml_root_to_jani_automaton(
+            input_scxml, automaton_events, max_array_size, priority_chains
+        )
+    except Exception as e:
+        log_error(
+            input_scxml.get_xml_origin(),
+            f"Error while converting SCXML model {input_scxml.get_name()}.",
+        )
+        raise e
+    return automaton, automaton_events
+
+
+def _convert_and_time_plain_scxml(
+    input_scxml: ScxmlRoot, max_array_size: int, priority_chains: bool
+) -> Tuple[Tuple[JaniAutomaton, EventsHolder], float, float]:
+    """
+    Same as `_convert_plain_scxml_to_jani_fragment`, additionally measuring the conversion time.
+
+    :return: The generated Jani fragment, the wall time and the CPU time (in seconds).
+    """
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    jani_fragment = _convert_plain_scxml_to_jani_fragment(
+        input_scxml, max_array_size, priority_chains
+    )
+    return (
+        jani_fragment,
+        time.perf_counter() - start_wall,
+        time.process_time() - start_cpu,
+    )
+
+
+# The SCXML models to be converted by the worker processes. They are inherited by forking the
+# main process, since the XML elements they refer to cannot be pickled.
+_SCXMLS_FOR_WORKERS: List[ScxmlRoot] = []
+
+
+def _convert_scxml_in_worker(
+    scxml_idx: int, max_array_size: int, priority_chains: bool
+) -> Tuple[Tuple[JaniAutomaton, EventsHolder], float, float]:
+    """Entrypoint for the worker processes: convert the SCXML model at the provided index."""
+    return _convert_and_time_plain_scxml(
+        _SCXMLS_FOR_WORKERS[scxml_idx], max_array_size, priority_chains
+    )
+
+
+def _convert_scxmls_in_parallel(
+    scxmls: List[ScxmlRoot], max_array_size: int, priority_chains: bool, jobs: int
+) -> Iterator[Tuple[Tuple[JaniAutomaton, EventsHolder], float, float]]:
+    """Convert each SCXML model in a separate process, keeping the order of the input models."""
+    global _SCXMLS_FOR_WORKERS
+    _SCXMLS_FOR_WORKERS = scxmls
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=get_context("fork")) as executor:
+            yield from executor.map(
+                _convert_scxml_in_worker,
+                range(len(scxmls)),
+                repeat(max_array_size),
+                repeat(priority_chains),
+            )
+    finally:
+        _SCXMLS_FOR_WORKERS = []
+
+
+def _convert_scxmls_to_jani_fragments(
+    scxmls: List[ScxmlRoot], max_array_size: int, priority_chains: bool, jobs: int
+) -> Iterator[Tuple[Tuple[JaniAutomaton, EventsHolder], float, float]]:
+    """
+    Convert the SCXML models to Jani automata, using multiple processes if requested.
+
+    The input SCXML models are not modified: the worker processes operate on their own memory,
+    while the sequential conversion copies one model at a time.
+    The fragments are generated one at a time, in the order of the input models, together with
+    the wall and CPU time required for their conversion.
+    """
+    if jobs > 1 and len(scxmls) > 1 and "fork" in get_all_start_methods():
+        return _convert_scxmls_in_parallel(scxmls, max_array_size, priority_chains, jobs)
+    return (
+        _convert_and_time_plain_scxml(deepcopy(input_scxml), max_array_size, priority_chains)
+        for input_scxml in scxmls
+    )
+
+
+def _spill_automaton(
+    automaton: JaniAutomaton, spill_dir: Optional[str], automaton_idx: int
+) -> ModelAutomaton:
+    """Move the automaton to a file in the spill directory, if provided."""
+    if spill_dir is None:
+        return automaton
+    spill_file = os.path.join(spill_dir, f"automaton_{automaton_idx}.pickle")
+    return SpilledJaniAutomaton(automaton, spill_file)
+
+
+def convert_multiple_scxmls_to_jani(
+    scxmls: List[ScxmlRoot],
+    max_array_size: int,
+    *,
+    jobs: int = 1,
+    cache: Optional[ConversionCache] = None,
+    spill_dir: Optional[str] = None,
+    profiler: Optional[ConversionProfiler] = None,
+    random_samples: int = 100,
+    random_samples_per_variable: Optional[Mapping[str, int]] = None,
+    priority_chains: bool = False,
+) -> JaniModel:
     """
     Assemble automata from multiple SCXML files into a Jani model.
 
     :param scxmls: List of SCXML Root objects (or file paths) to be included in the Jani model.
-    :param timers: List of ROS timers to be included in the Jani model.
-    :param max_time_ns: The maximum time in nanoseconds.
     :param max_array_size: The max size of the arrays in the model.
+    :param jobs: The amount of processes to use for converting the SCXML models to automata.
+    :param cache: Optional cache, to skip the conversion of the unchanged SCXML models.
+    :param spill_dir: Optional existing directory, where the converted automata are moved to
+        as soon as they are generated. Must be kept until the Jani model is not used anymore.
+    :param profiler: Optional profiler, collecting the resources used by each conversion stage.
+    :param random_samples: The amount of equally likely values representing each random number.
+    :param random_samples_per_variable: The amount of values to use for the random numbers
+        assigned to specific variables, overriding `random_samples`.
+    :param priority_chains: Whether to check the conditions of the transitions triggered by the
+        same event one at a time, using intermediate locations. This keeps the guards small for
+        long sequences of conditions, at the cost of additional steps in the Jani model.
     :return: The Jani model containing the converted automata.
     """
+    assert jobs > 0, f"The amount of jobs must be positive, found {jobs}."
     base_model = JaniModel()
     base_model.add_feature("arrays")
     base_model.add_feature("trigonometric-functions")
     events_holder = EventsHolder()
-    # Not really needed, added for consistency
-    processed_scxmls = deepcopy(scxmls)
-    for input_scxml in processed_scxmls:
-        assert isinstance(input_scxml, ScxmlRoot)
-        assert (
-            input_scxml.is_plain_scxml()
-        ), f"Input model {input_scxml.get_name()} does not contain a plain SCXML model."
-        try:
-            input_scxml.replace_strings_types_with_integer_arrays()
-            automaton = convert_scxml_root_to_jani_automaton(
-                input_scxml, events_holder, max_array_size
-            )
-        except Exception as e:
-            log_error(
-                input_scxml.get_xml_origin(),
-                f"Error while converting SCXML model {input_scxml.get_name()}.",
-            )
-            raise e
-        base_model.add_jani_automaton(automaton)
-    implement_scxml_events_as_jani_syncs(events_holder, max_array_size, base_model)
-    remove_empty_self_loops_from_interface_handlers_in_jani(base_model)
-    expand_random_variables_in_jani_model(base_model, n_options=100)
+    jani_fragments: List[Optional[Tuple[ModelAutomaton, EventsHolder]]] = [None] * len(scxmls)
+    automata_profiles: List[Optional[AutomatonProfile]] = [None] * len(scxmls)
+    fragment_keys: List[str] = []
+    with profile_stage(profiler, "automata_conversion"):
+        if cache is not None:
+            for idx, input_scxml in enumerate(scxmls):
+                # The plain SCXML text fully describes the input of the automaton conversion
+                fragment_keys.append(
+                    ConversionCache.make_key(
+                        input_scxml.as_xml_string(), max_array_size, priority_chains
+                    )
+                )
+                cached_fragment = cache.load("jani_automata", fragment_keys[idx])
+                if cached_fragment is not None:
+                    automaton, automaton_events = cached_fragment
+                    automata_profiles[idx] = AutomatonProfile.from_automaton(automaton)
+                    jani_fragments[idx] = (
+                        _spill_automaton(automaton, spill_dir, idx),
+                        automaton_events,
+                    )
+        missing_idxs = [idx for idx, fragment in enumerate(jani_fragments) if fragment is None]
+        new_fragments = _convert_scxmls_to_jani_fragments(
+            [scxmls[idx] for idx in missing_idxs], max_array_size, priority_chains, jobs
+        )
+        for idx, (new_fragment, wall_time, cpu_time) in zip(missing_idxs, new_fragments):
+            if cache is not None:
+                cache.store("jani_automata", fragment_keys[idx], new_fragment)
+            automaton, automaton_events = new_fragment
+            automata_profiles[idx] = AutomatonProfile.from_automaton(automaton, wall_time, cpu_time)
+            jani_fragments[idx] = (_spill_automaton(automaton, spill_dir, idx), automaton_events)
+    # Merge the fragments in the input order, to get a deterministic output
+    for jani_fragment, automaton_profile in zip(jani_fragments, automata_profiles):
+        assert jani_fragment is not None and automaton_profile is not None  # MyPy check
+        model_automaton, automaton_events = jani_fragment
+        base_model.add_jani_automaton(model_automaton)
+        events_holder.merge(automaton_events)
+        if profiler is not None:
+            profiler.add_automaton(automaton_profile)
+    with profile_stage(profiler, "events_to_syncs"):
+        implement_scxml_events_as_jani_syncs(events_holder, max_array_size, base_model)
+    with profile_stage(profiler, "self_loops_removal"):
+        remove_empty_self_loops_from_interface_handlers_in_jani(base_model)
+    with profile_stage(profiler, "random_variables_expansion"):
+        expand_random_variables_in_jani_model(
+            base_model,
+            n_options=random_samples,
+            n_options_per_variable=random_samples_per_variable,
+        )
     return base_model
 
 
@@ -120,7 +293,7 @@ def preprocess_jani_expressions(jani_model: JaniModel):
     In the current state, this ensures that array comparison is expanded to evaluate each element.
     """
     global_variables = jani_model.get_variables()
-    for jani_automaton in jani_model.get_automata():
+    for jani_automaton in jani_model.iter_automata_for_update():
         context_variables = global_variables | jani_automaton.get_variables()
         for jani_edge in jani_automaton.get_edges():
             if jani_edge.guard is not None:
@@ -130,15 +303,26 @@ def preprocess_jani_expressions(jani_model: JaniModel):
                         _preprocess_jani_expression(guard_exp, context_variables)
                     )
             for jani_destination in jani_edge.destinations:
-                assignments: List[JaniAssignment] = jani_destination["assignments"]
-                for assignment in assignments:
+                for assignment in jani_destination.assignments:
                     assignment.set_expression(
                         _preprocess_jani_expression(assignment.get_expression(), context_variables)
                     )
+    preprocess_jani_properties(jani_model)
+
+
+def preprocess_jani_properties(jani_model: JaniModel):
+    """
+    Preprocess the JANI expressions in the model's properties only.
+
+    This is part of `preprocess_jani_expressions`, and can be used on properties added later on.
+    """
+    global_variables = jani_model.get_variables()
     for property in jani_model.get_properties():
         property_operands = property.get_property_operands()
-        for property_exp in property_operands.values():
-            property_exp.reset(_preprocess_jani_expression(property_exp, global_variables))
+        for operand_name, property_exp in property_operands.items():
+            property_operands[operand_name] = _preprocess_jani_expression(
+                property_exp, global_variables
+            )
 
 
 def _preprocess_jani_expression(
@@ -155,14 +339,12 @@ def _preprocess_jani_expression(
             exp_operator == "="
         ), "Array operators can be only used for assignments and comparisons."
         return _preprocess_array_comparison(jani_expression, context_vars)
-    new_expr_dict: Dict[str, Any] = {"op": exp_operator}
-    for operand_name, operand_expr in exp_operands.items():
-        new_expr_dict.update(
-            {operand_name: _preprocess_jani_expression(operand_expr, context_vars)}
-        )
-    new_expr = JaniExpression(new_expr_dict)
-    new_expr.comment = jani_expression.comment
-    return new_expr
+    return jani_expression.with_operands(
+        {
+            operand_name: _preprocess_jani_expression(operand_expr, context_vars)
+            for operand_name, operand_expr in exp_operands.items()
+        }
+    )
 
 
 def _preprocess_array_comparison(
@@ -208,9 +390,9 @@ def _preprocess_array_comparison(
             # Here we expect to find a constant array
             array_operator, array_operands = operand.as_operator()
             assert array_operator == "av", f"Expected {operand.as_dict()} has op=='av'."
-            assert isinstance(array_operands, dict), "Expect array_operands to be a dict."
-            assert isinstance(array_operands["elements"], list), "Invalid 'av' operator's content."
-            array_elements = array_operands["elements"]
+            assert isinstance(array_operands, Mapping), "Expect array_operands to be a mapping."
+            assert isinstance(array_operands["elements"], tuple), "Invalid 'av' operator's content."
+            array_elements = list(array_operands["elements"])
             assert all(
                 array_entry.get_expression_type() == JaniExpressionType.LITERAL
                 for array_entry in array_elements
@@ -232,5 +414,4 @@ def _preprocess_array_comparison(
             equal_operator(array_elements[idx], array_access_operator(array_var_expr, idx)),
         )
     # Preserve the comment in the JANI file
-    last_expr.comment = jani_expression.comment
-    return last_expr
+    return last_expr.with_comment(jani_expression.comment)
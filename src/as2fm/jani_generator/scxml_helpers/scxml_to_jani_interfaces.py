@@ -17,14 +17,12 @@
 Interface classes between SCXML tags and related JANI output.
 """
 
+from collections import Counter
 from typing import Any, Dict, List, MutableSequence, Optional, Set, Tuple, Type
 
 from as2fm.as2fm_common.array_type import ArrayInfo, get_array_type_and_sizes, get_padded_array
 from as2fm.as2fm_common.common import EPSILON
-from as2fm.as2fm_common.ecmascript_interpretation import (
-    get_array_expr_as_list,
-    parse_ecmascript_expr_to_type,
-)
+from as2fm.as2fm_common.ecmascript_interpretation import analyze_expression
 from as2fm.as2fm_common.logging import check_assertion
 from as2fm.jani_generator.jani_entries import (
     JaniAutomaton,
@@ -40,11 +38,12 @@ from as2fm.jani_generator.scxml_helpers.scxml_expression import (
     parse_ecmascript_to_jani_expression,
 )
 from as2fm.jani_generator.scxml_helpers.scxml_to_jani_interfaces_helpers import (
+    ExclusiveConditionsChain,
+    PriorityConditionsChain,
     append_scxml_body_to_jani_automaton,
     append_scxml_body_to_jani_edge,
     check_valid_data_declaration,
     hash_element,
-    merge_conditions,
 )
 from as2fm.scxml_converter.bt_converter import is_bt_root_scxml
 from as2fm.scxml_converter.data_types.type_utils import (
@@ -68,12 +67,26 @@ SupportedMutableSequence = (MutableSequence[int], MutableSequence[float])
 ModelTupleType = Tuple[JaniAutomaton, EventsHolder]
 
 
+def _add_event_receiver(events_holder: EventsHolder, automaton_name: str, event_name: str) -> str:
+    """Register the automaton as a receiver of the event, and get the related action name."""
+    action_name = f"{event_name}_on_receive"
+    if not events_holder.has_event(event_name):
+        # The data structure can't be deducted here
+        events_holder.add_event(Event(event_name))
+    events_holder.get_event(event_name).add_receiver(automaton_name, action_name)
+    return action_name
+
+
 class BaseTag:
     """Base class for all SCXML tags to interface."""
 
     @staticmethod
     def from_element(
-        element: ScxmlBase, call_trace: List[ScxmlBase], model: ModelTupleType, max_array_size: int
+        element: ScxmlBase,
+        call_trace: List[ScxmlBase],
+        model: ModelTupleType,
+        max_array_size: int,
+        priority_chains: bool = False,
     ) -> "BaseTag":
         """Return the correct tag object based on the xml element.
 
@@ -81,11 +94,15 @@ class BaseTag:
         :param call_trace: The call trace of the element, to access the parents.
         :param model: The model to write the tag to.
         :param max_array_size: The maximum index of the arrays in the model.
+        :param priority_chains: Whether to check the conditions of the transitions triggered by
+            the same event one at a time, instead of negating the previous ones in each guard.
         :return: The corresponding tag object.
         """
         if type(element) not in CLASS_BY_TYPE:
             raise NotImplementedError(f"Support for SCXML type >{type(element)}< not implemented.")
-        return CLASS_BY_TYPE[type(element)](element, call_trace, model, max_array_size)
+        return CLASS_BY_TYPE[type(element)](
+            element, call_trace, model, max_array_size, priority_chains
+        )
 
     def generate_tag_element(self, child: ScxmlBase) -> "BaseTag":
         """
@@ -96,6 +113,7 @@ class BaseTag:
             self.call_trace + [self.element],
             (self.automaton, self.events_holder),
             self.max_array_size,
+            self.priority_chains,
         )
 
     def __init__(
@@ -104,6 +122,7 @@ class BaseTag:
         call_trace: List[ScxmlBase],
         model: ModelTupleType,
         max_array_size: int,
+        priority_chains: bool = False,
     ) -> None:
         """Initialize the ScxmlTag object from an xml element.
 
@@ -111,9 +130,12 @@ class BaseTag:
         :param call_trace: The call trace of the element, to access the parents.
         :param model: The model to write the tag to.
         :param max_array_size: The maximum index of the arrays in the model.
+        :param priority_chains: Whether to check the conditions of the transitions triggered by
+            the same event one at a time, see `PriorityConditionsChain`.
         """
         self.model_variables: Optional[Dict[str, Any]] = None
         self.max_array_size = max_array_size
+        self.priority_chains = priority_chains
         self.element = element
         self.automaton, self.events_holder = model
         self.call_trace = call_trace
@@ -182,11 +204,10 @@ class DatamodelTag(BaseTag):
                     f"Unexpected type {data_type_str} found in scxml data.",
                 )
                 declared_data_type = get_data_type_from_string(data_type_str)
+            data_expr = analyze_expression(scxml_data.get_expr(), scxml_origin)
             # Explicitly prevent the data expr. from referring to existing variables by using '{}'
             # Required to enforce data expressions to be constant (expression with only literals)
-            evaluated_expr_type = parse_ecmascript_expr_to_type(
-                scxml_data.get_expr(), {}, scxml_origin
-            )
+            evaluated_expr_type = data_expr.get_type({}, scxml_origin)
             # TODO: This special casing is needed since JavaScript typing is funny
             if declared_data_type is float and evaluated_expr_type is int:
                 evaluated_expr_type = float
@@ -198,7 +219,7 @@ class DatamodelTag(BaseTag):
                 data_array_info = declared_data_type
                 data_array_info.substitute_unbounded_dims(self.max_array_size)
             jani_data_init_expr = parse_ecmascript_to_jani_expression(
-                scxml_data.get_expr(), scxml_origin, data_array_info
+                data_expr, scxml_origin, data_array_info
             )
             jani_type = (
                 MutableSequence if isinstance(declared_data_type, ArrayInfo) else declared_data_type
@@ -217,7 +238,7 @@ class DatamodelTag(BaseTag):
             if data_array_info is not None:
                 # Add the array-length values in the model
                 # TODO: The length variable NEEDS to be bounded in jani, between 0 and max_length
-                data_expr_as_list = get_array_expr_as_list(scxml_data.get_expr(), scxml_origin)
+                data_expr_as_list = data_expr.get_array_as_list(scxml_origin)
                 _, array_sizes = get_array_type_and_sizes(data_expr_as_list)
                 for level in range(data_array_info.array_dimensions):
                     var_len_name = get_array_length_var_name(scxml_data.get_name(), level + 1)
@@ -337,10 +358,9 @@ class StateTag(BaseTag):
 
     def get_handled_events(self) -> Set[str]:
         """Return the events that are handled by the state."""
-        transition_events = set(self._events_no_condition)
-        for event_name in self._event_to_conditions.keys():
-            transition_events.add(event_name)
-        return transition_events
+        return set(self._events_no_condition).union(
+            self._event_to_guards.keys(), self._event_to_chain.keys()
+        )
 
     def get_guard_exp_for_prev_conditions(self, event_name: str) -> Optional[JaniExpression]:
         """Return the guard negating all previous conditions for a specific event.
@@ -352,14 +372,10 @@ class StateTag(BaseTag):
         condition(s), to cover the case where the self-loop is not met:
         <transition event="a" cond="_event.X <= 5" target="self" />
         """
-        previous_expressions = [
-            parse_ecmascript_to_jani_expression(cond, None)
-            for cond in self._event_to_conditions.get(event_name, [])
-        ]
-        if len(previous_expressions) > 0:
-            return merge_conditions(previous_expressions)
-        else:
+        event_guards = self._event_to_guards.get(event_name)
+        if event_guards is None or not event_guards.has_conditions():
             return None
+        return event_guards.get_fallback_guard()
 
     def add_unhandled_transitions(self, transitions_set: Set[str]):
         """Add self-loops for transitions that weren't handled yet."""
@@ -391,13 +407,66 @@ class StateTag(BaseTag):
             self.automaton.add_edge(edges[0])
             self._events_no_condition.append(event_name)
 
+    def _get_priority_chain_events(self) -> Set[str]:
+        """Get the events whose transition conditions are checked one at a time, if any."""
+        if not self.priority_chains or is_bt_root_scxml(self.call_trace[0].get_name()):
+            return set()
+        n_conditions: Counter = Counter()
+        for child in self.children:
+            transition_events = child.element.get_events()
+            if len(transition_events) == 1 and child.element.get_condition() is not None:
+                n_conditions[transition_events[0]] += 1
+        # A single condition does not need to be negated in other guards.
+        # Synched events must not be received at all, if none of the conditions holds.
+        return {
+            event
+            for event, n_event_conds in n_conditions.items()
+            if n_event_conds > 1 and not is_event_synched(event)
+        }
+
+    def _start_priority_chain(self, event_name: str) -> PriorityConditionsChain:
+        """Generate the chain checking the conditions of the transitions triggered by the event."""
+        state_name = self.element.get_id()
+        priority_chain = PriorityConditionsChain(self.automaton, f"{state_name}-{event_name}-check")
+        receive_action = _add_event_receiver(
+            self.events_holder, self.automaton.get_name(), event_name
+        )
+        receive_edge = JaniEdge({"location": state_name, "action": receive_action, "guard": None})
+        receive_edge.append_destination(location=priority_chain.get_entry_location())
+        self.automaton.add_edge(receive_edge)
+        return priority_chain
+
+    def _end_priority_chain(self, event_name: str):
+        """Go back to the state from the chain of the event, if none of the conditions holds."""
+        state_name = self.element.get_id()
+        fallback_location, fallback_guard = self._event_to_chain[event_name].get_fallback()
+        edges, locations = append_scxml_body_to_jani_automaton(
+            self.automaton,
+            self.events_holder,
+            self.model_variables,
+            [],
+            fallback_location,
+            state_name,
+            "",
+            fallback_guard,
+            None,
+            event_name,
+            self.max_array_size,
+        )
+        assert len(locations) == 0 and len(edges) == 1, f"Expected one edge, got {len(edges)}."
+        self.automaton.add_edge(edges[0])
+        self._events_no_condition.append(event_name)
+
     def write_model(self):
         # Whether we should auto-generate empty self-loops for unhandled events
         has_event_transition: bool = False
         state_name = self.element.get_id()
         self.automaton.add_location(state_name)
-        # Dictionary tracking the conditional trigger-based transitions
-        self._event_to_conditions: Dict[str, List[str]] = {}
+        # The guards of the transitions triggered by each event, in order of definition
+        self._event_to_guards: Dict[str, ExclusiveConditionsChain] = {}
+        # The events whose transition conditions are checked one at a time, after receiving them
+        self._event_to_chain: Dict[str, PriorityConditionsChain] = {}
+        priority_chain_events = self._get_priority_chain_events()
         # List of events that trigger transitions without conditions
         self._events_no_condition: List[str] = []
         for child in self.children:
@@ -413,20 +482,36 @@ class StateTag(BaseTag):
                 f"{self.element.get_id()} that has already a base exit condition."
             )
             transition_condition = child.element.get_condition()
-            # Add previous conditions matching the same event trigger to the current child state
-            child.set_previous_siblings_conditions(
-                self._event_to_conditions.get(transition_event, [])
-            )
-            # Write the model BEFORE appending the new condition to the events' conditions list
+            # Each condition is parsed once, and negated in the guards of the next transitions
+            condition_expr = None
+            if transition_condition is not None:
+                condition_expr = parse_ecmascript_to_jani_expression(
+                    transition_condition, child.element.get_xml_origin()
+                )
+                if len(transition_event) > 0:
+                    condition_expr = condition_expr.replace_event(transition_event)
+            if transition_event in priority_chain_events:
+                if transition_event not in self._event_to_chain:
+                    self._event_to_chain[transition_event] = self._start_priority_chain(
+                        transition_event
+                    )
+                check_location, transition_guard = self._event_to_chain[
+                    transition_event
+                ].add_condition(condition_expr)
+                child.set_guard(transition_guard, check_location)
+            else:
+                if transition_event not in self._event_to_guards:
+                    self._event_to_guards[transition_event] = ExclusiveConditionsChain()
+                child.set_guard(
+                    self._event_to_guards[transition_event].add_condition(condition_expr)
+                )
             child.write_model()
             if transition_condition is None:
                 # Base condition for transitioning, when all previous aren't verified
                 self._events_no_condition.append(transition_event)
-            else:
-                # Update the list of conditions related to a transition trigger
-                if transition_event not in self._event_to_conditions:
-                    self._event_to_conditions[transition_event] = []
-                self._event_to_conditions[transition_event].append(transition_condition)
+        for event_name in self._event_to_chain:
+            if event_name not in self._events_no_condition:
+                self._end_priority_chain(event_name)
         # if "" in self._events_no_condition, then we can transition to new states without events
         assert not (has_event_transition and "" in self._events_no_condition), (
             f"Model {self.call_trace[0].get_name()} at state {self.element.get_id()} can always "
@@ -444,9 +529,19 @@ class TransitionTag(BaseTag):
     def get_children(self) -> List[ScxmlBase]:
         return []
 
-    def set_previous_siblings_conditions(self, conditions_scripts: List[str]):
-        """Add conditions from previous transitions with same event trigger."""
-        self._previous_conditions = conditions_scripts
+    def set_guard(self, guard: JaniExpression, check_location: Optional[str] = None):
+        """
+        Set the guard of the transition.
+
+        It includes the negated conditions of the previous transitions with the same event trigger,
+        unless the transition starts from a location of a `PriorityConditionsChain`.
+
+        :param guard: The guard of the edge generated by the transition.
+        :param check_location: The chain location where the transition condition is checked, if
+            any. The event triggering the transition was received when entering the chain.
+        """
+        self._guard = guard
+        self._check_location = check_location
 
     def _get_event(self) -> Optional[str]:
         event_name = self.element.get_events()
@@ -458,9 +553,7 @@ class TransitionTag(BaseTag):
         return event_name[0]
 
     def write_model(self):
-        assert hasattr(
-            self, "_previous_conditions"
-        ), "Make sure 'set_previous_siblings_conditions' was called before."
+        assert hasattr(self, "_guard"), "Make sure 'set_guard' was called before."
         # Current state
         scxml_root: ScxmlRoot = self.call_trace[0]
         current_state: ScxmlState = self.call_trace[-1]
@@ -468,44 +561,26 @@ class TransitionTag(BaseTag):
         # Event processing (true for the whole transition)
         current_condition = self.element.get_condition()
         trigger_event = self._get_event()
-        if trigger_event is not None:
-            action_name = f"{trigger_event}_on_receive"
-            if not self.events_holder.has_event(trigger_event):
-                self.events_holder.add_event(
-                    Event(
-                        trigger_event
-                        # The data structure can't be deducted here
-                    )
-                )
-            existing_event = self.events_holder.get_event(trigger_event)
-            existing_event.add_receiver(self.automaton.get_name(), action_name)
+        if self._check_location is not None:
+            check_result = "else" if current_condition is None else "match"
+            action_name = f"{self._check_location}-{check_result}"
+        elif trigger_event is not None:
+            action_name = _add_event_receiver(
+                self.events_holder, self.automaton.get_name(), trigger_event
+            )
         else:
             eventless_hash = hash_element([current_state_id, current_condition])
             action_name = f"transition-{current_state_id}-eventless-{eventless_hash}"
         transition_targets: List[ScxmlTransitionTarget] = self.element.get_targets()
-        # Transition condition (guard) processing
-        previous_conditions_expr = [
-            parse_ecmascript_to_jani_expression(cond, self.element.get_xml_origin())
-            for cond in self._previous_conditions
-        ]
-        current_condition_expr = None
-        if current_condition is not None:
-            current_condition_expr = parse_ecmascript_to_jani_expression(
-                current_condition, self.element.get_xml_origin()
-            )
-        if trigger_event is not None:
-            for single_cond_expr in previous_conditions_expr:
-                single_cond_expr.replace_event(trigger_event)
-            if current_condition_expr is not None:
-                current_condition_expr.replace_event(trigger_event)
-        jani_guard = merge_conditions(previous_conditions_expr, current_condition_expr)
         # Transition targets processing
         assert len(transition_targets) > 0, f"Transition with no target in {scxml_root.get_name()}."
         transition_edge = JaniEdge(
             {
-                "location": current_state_id,
+                "location": (
+                    current_state_id if self._check_location is None else self._check_location
+                ),
                 "action": action_name,
-                "guard": jani_guard,
+                "guard": self._guard,
             }
         )
         # Accumulate the various targets probabilities here
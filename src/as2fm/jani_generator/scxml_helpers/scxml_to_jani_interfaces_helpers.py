@@ -25,8 +25,9 @@ from lxml.etree import _Element as XmlElement
 
 from as2fm.as2fm_common.array_type import ArrayInfo, get_array_type_and_sizes
 from as2fm.as2fm_common.ecmascript_interpretation import (
+    AnalyzedExpression,
     ValidECMAScriptTypes,
-    get_array_expr_as_list,
+    analyze_expression,
     parse_ecmascript_expr_to_type,
 )
 from as2fm.as2fm_common.logging import check_assertion, get_error_msg, log_warning
@@ -182,7 +183,7 @@ def __assign_array_dimensions_from_expression(
     target_variable_name: str,
     target_variable_indexes: List[int],
     target_variable_array_info: ArrayInfo,
-    assign_expression_str: str,
+    assign_expression: AnalyzedExpression,
     assignment_index: int,
     elem_xml: XmlElement,
 ) -> List[JaniAssignment]:
@@ -201,7 +202,7 @@ def __assign_array_dimensions_from_expression(
         elem_xml, f"Trying to assign an array to a base type on {target_variable_name}."
     )
     new_assignments: List[JaniAssignment] = []
-    assign_expr_as_list = get_array_expr_as_list(assign_expression_str, elem_xml)
+    assign_expr_as_list = assign_expression.get_array_as_list(elem_xml)
     _, assign_expression_sizes = get_array_type_and_sizes(assign_expr_as_list)
     for next_level in range(1, remaining_levels + 1):
         target_curr_level = target_used_levels + next_level
@@ -244,6 +245,7 @@ def generate_jani_assignments(
     :param elem_xml: The XML element this assignment originates from.
     """
     assignments: List[JaniAssignment] = []
+    analyzed_assign_expr = analyze_expression(assign_expr, elem_xml)
     if isinstance(target_expr, JaniExpression):
         target_expr_type = target_expr.get_expression_type()
     else:
@@ -258,7 +260,7 @@ def generate_jani_assignments(
         target_array_name, target_array_indexes = __get_array_access_name_and_indexes(target_expr)
         # Generate the expression to assign to the target
         assignment_value = parse_ecmascript_to_jani_expression(
-            assign_expr, elem_xml, None
+            analyzed_assign_expr, elem_xml, None
         ).replace_event(event_substitution)
         # Assign the content to the target
         assignments.append(
@@ -328,7 +330,7 @@ def generate_jani_assignments(
                             target_array_name,
                             target_array_indexes,
                             target_array_info,
-                            assign_expr,
+                            analyzed_assign_expr,
                             assign_index,
                             elem_xml,
                         )
@@ -355,7 +357,7 @@ def generate_jani_assignments(
 
         target_array_info = assignment_target_var.get_array_info()
         assignment_value = parse_ecmascript_to_jani_expression(
-            assign_expr, elem_xml, target_array_info
+            analyzed_assign_expr, elem_xml, target_array_info
         ).replace_event(event_substitution)
         assignments.append(
             JaniAssignment(
@@ -377,7 +379,7 @@ def generate_jani_assignments(
                             assignment_target_name,
                             [],
                             target_array_info,
-                            assign_expr,
+                            analyzed_assign_expr,
                             assign_index,
                             elem_xml,
                         )
@@ -470,27 +472,111 @@ def _interpret_scxml_assign(
     )
 
 
-def merge_conditions(
-    previous_conditions: Optional[List[JaniExpression]],
-    new_condition: Optional[JaniExpression] = None,
-) -> JaniExpression:
-    """This merges negated conditions of previous if-clauses with the condition of the current
-    if-clause. This is necessary to properly implement the if-else semantics of SCXML by parallel
-    outgoing transitions in Jani.
+class ExclusiveConditionsChain:
+    """
+    Generate the guards of a sequence of mutually exclusive conditions, e.g. if-elseif-else blocks.
 
-    :param previous_conditions: The conditions of the previous if-clauses. (not yet negated)
-    :param new_condition: The condition of the current if-clause.
-    :return: The merged condition.
+    This is necessary to properly implement the if-else semantics of SCXML by parallel outgoing
+    edges in Jani: each guard requires its own condition to hold, and all previous ones not to.
+    The negation of the previous conditions is extended once for each new condition, and shared
+    by all the following guards. Hence, generating the guards takes linear time in the amount of
+    conditions, instead of rebuilding the negation of all previous conditions for each guard.
+    """
+
+    def __init__(self) -> None:
+        # The conjunction of the negated conditions added so far, None if there are none
+        self._no_previous_match: Optional[JaniExpression] = None
+
+    def add_condition(self, condition: Optional[JaniExpression]) -> JaniExpression:
+        """
+        Get the guard of the next entry in the sequence, and add its condition to the chain.
+
+        :param condition: The condition of the entry, None if it has no condition (e.g. else).
+        :return: The guard holding if the condition holds and none of the previous ones does.
+        """
+        if condition is None:
+            return self.get_fallback_guard()
+        negated_condition = not_operator(condition)
+        if self._no_previous_match is None:
+            self._no_previous_match = negated_condition
+            return condition
+        guard = and_operator(condition, self._no_previous_match)
+        self._no_previous_match = and_operator(self._no_previous_match, negated_condition)
+        return guard
+
+    def has_conditions(self) -> bool:
+        """Check if any condition was added to the chain."""
+        return self._no_previous_match is not None
+
+    def get_fallback_guard(self) -> JaniExpression:
+        """Get the guard holding if none of the conditions added so far holds."""
+        if self._no_previous_match is None:
+            return JaniExpression(True)
+        return self._no_previous_match
+
+
+class PriorityConditionsChain:
+    """
+    Check a sequence of mutually exclusive conditions one at a time, using intermediate locations.
+
+    Alternative to `ExclusiveConditionsChain` for long sequences of conditions: each condition is
+    checked in its own location, with a silent edge moving to the location checking the next one
+    if it does not hold. This way, each guard contains a single condition, and the size of the
+    guards grows linearly with the amount of conditions instead of quadratically. On the other
+    hand, each condition that does not hold requires an additional step in the Jani model.
     """
-    if new_condition is not None:
-        joint_condition = new_condition
-    else:
-        joint_condition = JaniExpression(True)
-    if previous_conditions is not None:
-        for pc in previous_conditions:
-            negated_pc = not_operator(pc)
-            joint_condition = and_operator(joint_condition, negated_pc)
-    return joint_condition
+
+    def __init__(self, jani_automaton: JaniAutomaton, location_prefix: str) -> None:
+        """
+        Initialize the chain, adding its first location to the automaton.
+
+        :param jani_automaton: The automaton where the locations and edges of the chain are added.
+        :param location_prefix: The unique prefix of the locations of the chain.
+        """
+        self._automaton = jani_automaton
+        self._location_prefix = location_prefix
+        self._n_locations = 1
+        self._automaton.add_location(self.get_entry_location())
+        # The location and guard reached if none of the conditions added so far holds
+        self._no_previous_match: Optional[Tuple[str, JaniExpression]] = None
+
+    def get_entry_location(self) -> str:
+        """Get the location where the first condition is checked."""
+        return f"{self._location_prefix}-0"
+
+    def add_condition(self, condition: Optional[JaniExpression]) -> Tuple[str, JaniExpression]:
+        """
+        Get the source location and guard of the next entry in the sequence, and add its condition.
+
+        :param condition: The condition of the entry, None if it has no condition (e.g. else).
+        :return: The location and the guard, holding if the condition holds there.
+        """
+        if condition is None:
+            return self.get_fallback()
+        if self._no_previous_match is None:
+            check_location = self.get_entry_location()
+        else:
+            prev_location, prev_guard = self._no_previous_match
+            check_location = f"{self._location_prefix}-{self._n_locations}"
+            self._n_locations += 1
+            self._automaton.add_location(check_location)
+            next_check_edge = JaniEdge(
+                {
+                    "location": prev_location,
+                    "action": f"{prev_location}-next",
+                    "guard": JaniGuard(prev_guard),
+                }
+            )
+            next_check_edge.append_destination(location=check_location)
+            self._automaton.add_edge(next_check_edge)
+        self._no_previous_match = (check_location, not_operator(condition))
+        return check_location, condition
+
+    def get_fallback(self) -> Tuple[str, JaniExpression]:
+        """Get the location and guard reached if none of the conditions added so far holds."""
+        if self._no_previous_match is None:
+            return self.get_entry_location(), JaniExpression(True)
+        return self._no_previous_match
 
 
 def append_scxml_body_to_jani_edge(
@@ -532,13 +618,14 @@ def append_scxml_body_to_jani_edge(
         intermediate_location = f"{original_source}-{hash_str}-{i}"
         element_origin = ec.get_xml_origin()
         if isinstance(ec, ScxmlAssign):
-            assign_idx = len(last_edge.destinations[-1]["assignments"])
+            last_destination = last_edge.destinations[-1]
+            assign_idx = len(last_destination.assignments)
             jani_assigns = _interpret_scxml_assign(ec, jani_automaton, data_event, assign_idx)
-            last_edge.destinations[-1]["assignments"].extend(jani_assigns)
+            last_destination.assignments = (*last_destination.assignments, *jani_assigns)
         elif isinstance(ec, ScxmlSend):
             event_name = ec.get_event()
             event_send_action_name = event_name + "_on_send"
-            last_edge.destinations[-1]["location"] = intermediate_location
+            last_edge.destinations[-1].location = intermediate_location
             last_edge = JaniEdge(
                 {
                     "location": intermediate_location,
@@ -609,13 +696,11 @@ def append_scxml_body_to_jani_edge(
         elif isinstance(ec, ScxmlIf):
             interm_loc_before = f"{intermediate_location}_before_if"
             interm_loc_after = f"{intermediate_location}_after_if"
-            last_edge.destinations[-1]["location"] = interm_loc_before
-            previous_conditions: List[JaniExpression] = []
+            last_edge.destinations[-1].location = interm_loc_before
+            if_conditions = ExclusiveConditionsChain()
             for if_idx, (cond_str, conditional_body) in enumerate(ec.get_conditional_executions()):
                 current_cond = parse_ecmascript_to_jani_expression(cond_str, element_origin)
-                jani_cond = merge_conditions(previous_conditions, current_cond).replace_event(
-                    data_event
-                )
+                jani_cond = if_conditions.add_condition(current_cond.replace_event(data_event))
                 sub_edges, sub_locs = append_scxml_body_to_jani_automaton(
                     jani_automaton,
                     events_holder,
@@ -632,12 +717,11 @@ def append_scxml_body_to_jani_edge(
                 )
                 additional_edges.extend(sub_edges)
                 additional_locations.extend(sub_locs)
-                previous_conditions.append(current_cond)
             # Add else branch: if no else is provided, we assume an empty else body!
             else_execution_body = ec.get_else_execution()
             else_execution_id = str(len(ec.get_conditional_executions()))
             else_execution_body = [] if else_execution_body is None else else_execution_body
-            jani_cond = merge_conditions(previous_conditions).replace_event(data_event)
+            jani_cond = if_conditions.add_condition(None)
             sub_edges, sub_locs = append_scxml_body_to_jani_automaton(
                 jani_automaton,
                 events_holder,
@@ -666,7 +750,7 @@ def append_scxml_body_to_jani_edge(
             additional_edges.append(last_edge)
             additional_locations.append(interm_loc_before)
             additional_locations.append(interm_loc_after)
-    last_edge.destinations[-1]["location"] = target
+    last_edge.destinations[-1].location = target
     return additional_edges, additional_locations
 
 
@@ -706,7 +790,7 @@ def append_scxml_body_to_jani_automaton(
     )
 
     if guard_exp is not None:
-        guard_exp.replace_event(data_event)
+        guard_exp = guard_exp.replace_event(data_event)
     # First edge. Has to evaluate guard and trigger event of original transition.
     start_edge = JaniEdge(
         {
@@ -19,11 +19,43 @@ Module reading the top level xml file containing the whole model to check.
 
 import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from copy import deepcopy
-from typing import Dict, List, Optional
+from dataclasses import replace
+from itertools import repeat
+from multiprocessing import get_all_start_methods, get_context
+from tempfile import TemporaryDirectory
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+import lxml.etree as ET
 
-from as2fm.as2fm_common.logging import get_error_msg
+from as2fm.as2fm_common.common import remove_namespace
+from as2fm.as2fm_common.logging import (
+    get_error_msg,
+    log_error,
+    set_filepath_for_all_sub_elements,
+)
 from as2fm.jani_generator.jani_entries import JaniModel, JaniProperty
+from as2fm.jani_generator.jani_entries.jani_helpers import (
+    LocationsReduction,
+    reduce_locations_in_jani_model,
+    simplify_expressions_in_jani_model,
+)
+from as2fm.jani_generator.jani_entries.jani_writer import write_jani_model
 from as2fm.jani_generator.ros_helpers.ros_action_handler import RosActionHandler
 from as2fm.jani_generator.ros_helpers.ros_communication_handler import (
     RosCommunicationHandler,
@@ -33,6 +65,11 @@ from as2fm.jani_generator.ros_helpers.ros_communication_handler import (
 )
 from as2fm.jani_generator.ros_helpers.ros_service_handler import RosServiceHandler
 from as2fm.jani_generator.ros_helpers.ros_timer import RosTimer, make_global_timer_scxml
+from as2fm.jani_generator.scxml_helpers.conversion_cache import ConversionCache
+from as2fm.jani_generator.scxml_helpers.conversion_profiler import (
+    ConversionProfiler,
+    profile_stage,
+)
 from as2fm.jani_generator.scxml_helpers.roaml_model import (
     FullModel,
     RoamlDataStructures,
@@ -41,7 +78,9 @@ from as2fm.jani_generator.scxml_helpers.roaml_model import (
 from as2fm.jani_generator.scxml_helpers.scxml_to_jani import (
     convert_multiple_scxmls_to_jani,
     preprocess_jani_expressions,
+    preprocess_jani_properties,
 )
+from as2fm.scxml_converter.ascxml_extensions.bt_entries import AscxmlRootBT
 from as2fm.scxml_converter.ascxml_extensions.ros_entries import (
     AscxmlRootROS,
     RosActionClient,
@@ -49,11 +88,17 @@ from as2fm.scxml_converter.ascxml_extensions.ros_entries import (
     RosServiceClient,
     RosServiceServer,
     RosTimeRate,
+    RosTopicPublisher,
+    RosTopicSubscriber,
 )
+from as2fm.scxml_converter.ascxml_extensions.ros_entries.ros_utils import get_ros_type_definition
 from as2fm.scxml_converter.bt_converter import (
-    bt_converter,
+    BT_ROOT_CHILD_TICK_IDX,
+    bt_children_converter,
     generate_blackboard_scxml,
+    generate_bt_root_scxml,
     get_blackboard_variables_from_models,
+    get_bt_name,
 )
 from as2fm.scxml_converter.data_types.struct_definition import StructDefinition
 from as2fm.scxml_converter.scxml_entries import (
@@ -65,43 +110,303 @@ from as2fm.scxml_converter.scxml_entries import (
     ScxmlTransition,
 )
 
+# In-memory content of the model files, indexed by the path used in the FullModel.
+# Each entry is either the file content, an already loaded ASCXML model or the properties dict.
+ModelSources = Mapping[str, Union[str, GenericScxmlRoot, Dict[str, Any]]]
+
+# The FullModel parameters that can be changed across the variants of the same model
+SWEEPABLE_PARAMETERS = ("max_time", "bt_tick_rate", "max_array_size", "random_samples")
+
+# The kind of ROS interface (msg, srv or action) of the type in each ROS declaration
+_ROS_DECLARATIONS_INTERFACE = {
+    RosTopicPublisher.get_tag_name(): "msg",
+    RosTopicSubscriber.get_tag_name(): "msg",
+    RosServiceServer.get_tag_name(): "srv",
+    RosServiceClient.get_tag_name(): "srv",
+    RosActionServer.get_tag_name(): "action",
+    RosActionClient.get_tag_name(): "action",
+}
+
+
+def _get_text_sources(sources: Optional[ModelSources]) -> Dict[str, str]:
+    """Get the sources provided as text, that are hashed in place of the related files."""
+    if sources is None:
+        return {}
+    return {path: content for path, content in sources.items() if isinstance(content, str)}
+
+
+def _has_object_sources(file_paths: List[str], sources: Optional[ModelSources]) -> bool:
+    """Check if any of the files is provided as an object, that cannot be hashed for caching."""
+    return sources is not None and any(
+        not isinstance(sources.get(path, ""), str) for path in file_paths
+    )
+
+
+def _load_ascxml_source(
+    ascxml_class: Type[GenericScxmlRoot],
+    fname: str,
+    sources: Optional[ModelSources],
+    custom_data_types: Dict[str, StructDefinition],
+) -> GenericScxmlRoot:
+    """Load an ASCXML model from its in-memory source if provided, from file otherwise."""
+    source = None if sources is None else sources.get(fname)
+    if source is None:
+        return ascxml_class.load_scxml_file(fname, custom_data_types)
+    if isinstance(source, str):
+        return ascxml_class.load_scxml_string(source, custom_data_types, fname)
+    assert isinstance(
+        source, ascxml_class
+    ), f"Expected a {ascxml_class.__name__} model for {fname}, found {type(source)}."
+    # The input models must not be modified: the conversion to plain SCXML preprocesses them
+    return deepcopy(source)
+
+
+def _get_structs_key(model: FullModel, sources: Optional[ModelSources]) -> str:
+    """Generate a cache key identifying the custom data types declared in the model."""
+    return ConversionCache.make_key(
+        [struct_format for struct_format, _ in model.data_declarations],
+        ConversionCache.hash_files(
+            [path for _, path in model.data_declarations], _get_text_sources(sources)
+        ),
+    )
+
+
+def _get_ros_interfaces_key(file_paths: List[str], text_sources: Mapping[str, str]) -> str:
+    """
+    Generate a cache key identifying the ROS interfaces declared in the provided ASCXML files.
+
+    The declared types are resolved as in the conversion, so the cached models are regenerated
+    when the related .msg, .srv or .action definitions change.
+    """
+    ros_types: Set[Tuple[str, str]] = set()
+    for file_path in file_paths:
+        try:
+            if file_path in text_sources:
+                xml_tree = ET.fromstring(text_sources[file_path].encode("utf-8"))
+            else:
+                xml_tree = ET.parse(file_path).getroot()
+        except (OSError, ET.XMLSyntaxError):
+            # The error is reported by the conversion
+            continue
+        for xml_entry in xml_tree.iter(tag=ET.Element):
+            ros_interface = _ROS_DECLARATIONS_INTERFACE.get(remove_namespace(xml_entry.tag))
+            interface_type = xml_entry.get("type")
+            if ros_interface is not None and interface_type is not None:
+                ros_types.add((ros_interface, interface_type))
+    return ConversionCache.make_key(
+        [
+            (ros_interface, interface_type, get_ros_type_definition(interface_type, ros_interface))
+            for ros_interface, interface_type in sorted(ros_types)
+        ]
+    )
+
 
-def generate_plain_scxml_models_and_timers(model: FullModel) -> List[ScxmlRoot]:
-    """Generate all plain SCXML models loaded from the full model dictionary."""
+def _load_custom_data_types(
+    model: FullModel,
+    sources: Optional[ModelSources],
+    cache: Optional[ConversionCache],
+    structs_key: str,
+) -> Dict[str, StructDefinition]:
+    """
+    Load and expand the custom data types declared in the model.
+
+    If a cache is provided, the same definitions are shared by all models declaring them.
+    """
+    if cache is not None:
+        shared_data_types = cache.load_shared("struct_definitions", structs_key)
+        if shared_data_types is not None:
+            return shared_data_types
     custom_data_types: Dict[str, StructDefinition] = {}
+    text_sources = _get_text_sources(sources)
     for struct_format, path in model.data_declarations:
         struct_definition_class = RoamlDataStructures.AVAILABLE_STRUCT_DEFINITIONS[struct_format]
-        loaded_structs = struct_definition_class.from_file(path)
+        if path in text_sources:
+            loaded_structs = struct_definition_class.from_string(text_sources[path], path)
+        else:
+            loaded_structs = struct_definition_class.from_file(path)
         custom_data_types.update(loaded_structs)
 
     for custom_struct_instance in custom_data_types.values():
         custom_struct_instance.expand_members(custom_data_types)
+    if cache is not None:
+        cache.store_shared("struct_definitions", structs_key, custom_data_types)
+    return custom_data_types
+
+
+def _load_bt_plugin_template(
+    plugin_path: str,
+    custom_data_types: Dict[str, StructDefinition],
+    cache: Optional[ConversionCache],
+    structs_key: str,
+) -> Union[str, AscxmlRootBT]:
+    """
+    Get the BT plugin to provide to the BT converter.
+
+    If a cache is provided, the plugin is parsed once and shared with all BTs using it: this is
+    safe, since the BT converter copies the plugins before instantiating them.
+    Otherwise, the plugin path is returned and the BT converter parses it.
+    """
+    if cache is None:
+        return plugin_path
+    template_key = ConversionCache.make_key(structs_key, ConversionCache.hash_files([plugin_path]))
+    plugin_template = cache.load_shared("bt_plugin_templates", template_key)
+    if plugin_template is None:
+        plugin_template = AscxmlRootBT.load_scxml_file(plugin_path, custom_data_types)
+        cache.store_shared("bt_plugin_templates", template_key, plugin_template)
+    return plugin_template
+
+
+def _load_bt_children_ascxml_models(
+    model: FullModel,
+    custom_data_types: Dict[str, StructDefinition],
+    sources: Optional[ModelSources],
+    cache: Optional[ConversionCache],
+    structs_key: str,
+) -> List[AscxmlRootBT]:
+    """Convert the BT nodes to ASCXML models, using the in-memory sources if any."""
+    assert model.bt is not None, "Expected a BT to be defined in the model."
+    sources = {} if sources is None else sources
+    bt_source = sources.get(model.bt)
+    bt_xml_tree = None
+    if bt_source is not None:
+        assert isinstance(bt_source, str), f"Expected the BT {model.bt} to be an XML string."
+        bt_xml_tree = ET.fromstring(bt_source.encode("utf-8"), ET.XMLParser(remove_comments=True))
+        set_filepath_for_all_sub_elements(bt_xml_tree, model.bt)
+    bt_plugins: List[Union[str, AscxmlRootBT]] = []
+    for plugin_path in model.plugins:
+        plugin_source = sources.get(plugin_path)
+        if isinstance(plugin_source, str):
+            plugin_source = AscxmlRootBT.load_scxml_string(
+                plugin_source, custom_data_types, plugin_path
+            )
+        assert plugin_source is None or isinstance(
+            plugin_source, AscxmlRootBT
+        ), f"Expected an AscxmlRootBT model for {plugin_path}, found {type(plugin_source)}."
+        if plugin_source is None:
+            bt_plugins.append(
+                _load_bt_plugin_template(plugin_path, custom_data_types, cache, structs_key)
+            )
+        else:
+            bt_plugins.append(plugin_source)
+    return bt_children_converter(model.bt, bt_plugins, custom_data_types, bt_xml_tree)
+
+
+def _convert_ascxml_models_to_plain_scxml(
+    ascxml_models: List[GenericScxmlRoot], profiler: Optional[ConversionProfiler]
+) -> List[Tuple[GenericScxmlRoot, List[ScxmlRoot]]]:
+    """Pair each ASCXML model with the plain SCXML models generated from it."""
+    ascxml_and_plain_models: List[Tuple[GenericScxmlRoot, List[ScxmlRoot]]] = []
+    for ascxml_entry in ascxml_models:
+        with profile_stage(profiler, "to_plain_scxml"):
+            plain_scxmls = ascxml_entry.to_plain_scxml()
+        for plain_scxml in plain_scxmls:
+            plain_scxml.set_xml_origin(ascxml_entry.get_xml_origin())
+        ascxml_and_plain_models.append((ascxml_entry, plain_scxmls))
+    return ascxml_and_plain_models
+
+
+def _load_ascxml_and_plain_models(
+    model: FullModel,
+    custom_data_types: Dict[str, StructDefinition],
+    cache: Optional[ConversionCache],
+    profiler: Optional[ConversionProfiler],
+    sources: Optional[ModelSources],
+    structs_key: str,
+) -> List[Tuple[GenericScxmlRoot, List[ScxmlRoot]]]:
+    """
+    Load all ASCXML models from the full model, together with the related plain SCXML models.
+
+    If a cache is provided, the models depending on unchanged input files are loaded from there.
+    The models provided as objects in the sources are always converted.
+    """
+    ascxml_and_plain_models: List[Tuple[GenericScxmlRoot, List[ScxmlRoot]]] = []
+    text_sources = _get_text_sources(sources)
     # Load the skills and components scxml files (ROS-SCXML)
     scxml_files_to_convert: list = model.skills + model.components
-    ros_ascxmls: List[GenericScxmlRoot] = []
     for fname in scxml_files_to_convert:
-        ros_ascxmls.append(AscxmlRootROS.load_scxml_file(fname, custom_data_types))
+        entry_key: Optional[str] = None
+        if cache is not None and not _has_object_sources([fname], sources):
+            entry_key = ConversionCache.make_key(
+                structs_key,
+                ConversionCache.hash_files([fname], text_sources),
+                _get_ros_interfaces_key([fname], text_sources),
+            )
+            cached_models = cache.load("plain_scxml", entry_key)
+            if cached_models is not None:
+                ascxml_and_plain_models.extend(cached_models)
+                continue
+        with profile_stage(profiler, "ascxml_load"):
+            ascxml_model = _load_ascxml_source(AscxmlRootROS, fname, sources, custom_data_types)
+        loaded_models = _convert_ascxml_models_to_plain_scxml([ascxml_model], profiler)
+        if entry_key is not None:
+            assert cache is not None  # MyPy check
+            cache.store("plain_scxml", entry_key, loaded_models)
+        ascxml_and_plain_models.extend(loaded_models)
     # Convert behavior tree and plugins to ROS-SCXML
     if model.bt is not None:
-        ros_ascxmls.extend(
-            bt_converter(
-                model.bt,
-                model.plugins,
+        # Only the BT root depends on the tick parameters: it is always regenerated (cheap)
+        with profile_stage(profiler, "bt_converter"):
+            bt_root = generate_bt_root_scxml(
+                get_bt_name(model.bt),
+                BT_ROOT_CHILD_TICK_IDX,
                 model.bt_tick_rate,
                 model.bt_tick_when_not_running,
-                custom_data_types,
             )
-        )
+        bt_root.set_custom_data_types({})
+        ascxml_and_plain_models.extend(_convert_ascxml_models_to_plain_scxml([bt_root], profiler))
+        bt_key: Optional[str] = None
+        bt_files = [model.bt] + model.plugins
+        if cache is not None and not _has_object_sources(bt_files, sources):
+            bt_key = ConversionCache.make_key(
+                structs_key,
+                ConversionCache.hash_files(bt_files, text_sources),
+                _get_ros_interfaces_key(model.plugins, text_sources),
+            )
+            cached_models = cache.load("plain_scxml", bt_key)
+            if cached_models is not None:
+                ascxml_and_plain_models.extend(cached_models)
+                return ascxml_and_plain_models
+        with profile_stage(profiler, "bt_converter"):
+            bt_ascxml_models = _load_bt_children_ascxml_models(
+                model, custom_data_types, sources, cache, structs_key
+            )
+        bt_models = _convert_ascxml_models_to_plain_scxml(bt_ascxml_models, profiler)
+        if bt_key is not None:
+            assert cache is not None  # MyPy check
+            cache.store("plain_scxml", bt_key, bt_models)
+        ascxml_and_plain_models.extend(bt_models)
+    return ascxml_and_plain_models
+
+
+def generate_plain_scxml_models_and_timers(
+    model: FullModel,
+    cache: Optional[ConversionCache] = None,
+    profiler: Optional[ConversionProfiler] = None,
+    sources: Optional[ModelSources] = None,
+) -> List[ScxmlRoot]:
+    """
+    Generate all plain SCXML models loaded from the full model dictionary.
+
+    :param model: The full model to convert.
+    :param cache: Optional cache, to skip the conversion of the unchanged ASCXML models.
+    :param profiler: Optional profiler, collecting the resources used by each conversion stage.
+    :param sources: Optional in-memory content of the model files, used in place of reading them.
+    :return: The plain SCXML models, including the autogenerated ones (timers, ROS services, ...).
+    """
+    structs_key = _get_structs_key(model, sources)
+    with profile_stage(profiler, "struct_expansion"):
+        custom_data_types = _load_custom_data_types(model, sources, cache, structs_key)
+    ascxml_and_plain_models = _load_ascxml_and_plain_models(
+        model, custom_data_types, cache, profiler, sources, structs_key
+    )
+    ros_ascxmls = [ascxml_entry for ascxml_entry, _ in ascxml_and_plain_models]
     # Convert the loaded entries to plain SCXML
     plain_scxml_models = []
     all_timers: List[RosTimer] = []
     all_services: Dict[str, RosCommunicationHandler] = {}
     all_actions: Dict[str, RosCommunicationHandler] = {}
     bt_blackboard_vars: Dict[str, str] = get_blackboard_variables_from_models(ros_ascxmls)
-    for ascxml_entry in ros_ascxmls:
-        plain_scxmls = ascxml_entry.to_plain_scxml()
-        for plain_scxml in plain_scxmls:
-            plain_scxml.set_xml_origin(ascxml_entry.get_xml_origin())
+    for ascxml_entry, plain_scxmls in ascxml_and_plain_models:
         for ascxml_declaration in ascxml_entry.get_declarations():
             # Handle ROS Timers
             if isinstance(ascxml_declaration, RosTimeRate):
@@ -136,101 +441,445 @@ def generate_plain_scxml_models_and_timers(model: FullModel) -> List[ScxmlRoot]:
         plain_scxml_models.extend(plain_scxmls)
     # Generate sync SCXML model for BT Blackboard (if needed)
     if len(bt_blackboard_vars) > 0:
-        plain_scxml_models.append(generate_blackboard_scxml(bt_blackboard_vars))
+        with profile_stage(profiler, "bt_blackboard_generation"):
+            plain_scxml_models.append(generate_blackboard_scxml(bt_blackboard_vars))
     # Generate sync SCXML models for services and actions
-    for plain_scxml in generate_plain_scxml_from_handlers(all_services | all_actions):
-        plain_scxml_models.append(plain_scxml)
+    with profile_stage(profiler, "ros_handlers_generation"):
+        for plain_scxml in generate_plain_scxml_from_handlers(all_services | all_actions):
+            plain_scxml_models.append(plain_scxml)
     assert model.max_time is not None, "Expected model.max_time to be defined here."
-    timer_scxml = make_global_timer_scxml(all_timers, model.max_time)
+    with profile_stage(profiler, "global_timer_generation"):
+        timer_scxml = make_global_timer_scxml(all_timers, model.max_time)
     if timer_scxml is not None:
         timer_scxml.set_custom_data_types(custom_data_types)
-        plain_scxmls = timer_scxml.to_plain_scxml()
+        with profile_stage(profiler, "to_plain_scxml"):
+            plain_scxmls = timer_scxml.to_plain_scxml()
         plain_scxml_models.extend(plain_scxmls)
     return plain_scxml_models
 
 
+def _flatten_probabilistic_transitions(scxml_model: ScxmlRoot) -> None:
+    """
+    Turn transitions with multiple targets and probabilities into (multiple) plain SCXML ones.
+
+    :param scxml_model: The SCXML model to process. It is modified in place.
+    """
+    rand_variable_id = "__RAND__"
+    rand_variable_declared = False
+    for state in scxml_model.get_states():
+        plain_scxml_transitions: List[ScxmlTransition] = []
+        randomize = False
+        for transition in state.get_body():
+            probability = 0.0
+            for target in transition.get_targets():
+                plain_scxml_condition = transition.get_condition()
+                target_probability = target.get_probability()
+                if target_probability is not None:
+                    # Every time a transition has a probability:
+                    # - Declare rand variable in datamodel (if not already done)
+                    # - Randomize variable on state entry (if not already done)
+                    # - Turn probability into a condition on the transition
+                    if rand_variable_declared is False:
+                        scxml_model.get_data_model().get_data_entries().append(
+                            ScxmlData(
+                                id_=rand_variable_id,
+                                expr="0.0",
+                                data_type="float64",
+                            )
+                        )
+                        rand_variable_declared = True
+                    if randomize is False:
+                        state.append_on_entry(
+                            ScxmlAssign(location=rand_variable_id, expr="Math.random()")
+                        )
+                        randomize = True
+                    if plain_scxml_condition is None:
+                        plain_scxml_condition = ""
+                    else:
+                        plain_scxml_condition = plain_scxml_condition + " && "
+                    plain_scxml_condition = (
+                        plain_scxml_condition + f"{probability} < {rand_variable_id}"
+                    )
+                    probability += target_probability
+                    plain_scxml_condition = (
+                        plain_scxml_condition + f" && {rand_variable_id} <= {probability}"
+                    )
+                plain_scxml_transitions.append(
+                    ScxmlTransition.make_single_target_transition(
+                        target=target._target_id,
+                        events=transition.get_events(),
+                        condition=plain_scxml_condition,
+                        body=target.get_body(),
+                    )
+                )
+        # Replace ASCXML transition with plain SCXML transition
+        state._body = plain_scxml_transitions
+
+
 def export_plain_scxml_models(
     generated_scxml_path: str,
     plain_scxml_models: List[ScxmlRoot],
 ):
     """Generate the plain SCXML files adding all compatibility entries to fit the SCXML standard."""
     os.makedirs(generated_scxml_path, exist_ok=True)
-    models_to_export = deepcopy(plain_scxml_models)
     # Compute the set of target automaton for each event
     event_targets: EventsToAutomata = {}
-    for scxml_model in models_to_export:
+    for scxml_model in plain_scxml_models:
         for event in scxml_model.get_transition_events():
             if event not in event_targets:
                 event_targets[event] = set()
             event_targets[event].add(scxml_model.get_name())
-        # Turn transitions with multiple targets and probabilities
-        # into (multiple) plain SCXML transitions
-        rand_variable_id = "__RAND__"
-        rand_variable_declared = False
-        for state in scxml_model.get_states():
-            plain_scxml_transitions: List[ScxmlTransition] = []
-            randomize = False
-            for transition in state.get_body():
-                probability = 0.0
-                for target in transition.get_targets():
-                    plain_scxml_condition = transition.get_condition()
-                    target_probability = target.get_probability()
-                    if target_probability is not None:
-                        # Every time a transition has a probability:
-                        # - Declare rand variable in datamodel (if not already done)
-                        # - Randomize variable on state entry (if not already done)
-                        # - Turn probability into a condition on the transition
-                        if rand_variable_declared is False:
-                            scxml_model.get_data_model().get_data_entries().append(
-                                ScxmlData(
-                                    id_=rand_variable_id,
-                                    expr="0.0",
-                                    data_type="float64",
-                                )
-                            )
-                            rand_variable_declared = True
-                        if randomize is False:
-                            state.append_on_entry(
-                                ScxmlAssign(location=rand_variable_id, expr="Math.random()")
-                            )
-                            randomize = True
-                        if plain_scxml_condition is None:
-                            plain_scxml_condition = ""
-                        else:
-                            plain_scxml_condition = plain_scxml_condition + " && "
-                        plain_scxml_condition = (
-                            plain_scxml_condition + f"{probability} < {rand_variable_id}"
-                        )
-                        probability += target_probability
-                        plain_scxml_condition = (
-                            plain_scxml_condition + f" && {rand_variable_id} <= {probability}"
-                        )
-                    plain_scxml_transitions.append(
-                        ScxmlTransition.make_single_target_transition(
-                            target=target._target_id,
-                            events=transition.get_events(),
-                            condition=plain_scxml_condition,
-                            body=target.get_body(),
-                        )
-                    )
-            # Replace ASCXML transition with plain SCXML transition
-            state._body = plain_scxml_transitions
-    # Add the target automaton to each event sent
-    for scxml_model in models_to_export:
-        scxml_model.add_target_to_event_send(event_targets)
-    # Export the models
-    for scxml_model in models_to_export:
+    for scxml_model in plain_scxml_models:
+        # The input models must not be modified: process a copy of one model at a time
+        model_to_export = deepcopy(scxml_model)
+        _flatten_probabilistic_transitions(model_to_export)
+        # Add the target automaton to each event sent
+        model_to_export.add_target_to_event_send(event_targets)
+        # Export the model
         with open(
-            os.path.join(generated_scxml_path, f"{scxml_model.get_name()}.scxml"),
+            os.path.join(generated_scxml_path, f"{model_to_export.get_name()}.scxml"),
             "w",
             encoding="utf-8",
         ) as f:
-            f.write(scxml_model.as_xml_string(data_type_as_attribute=False))
+            f.write(model_to_export.as_xml_string(data_type_as_attribute=False))
+
+
+def get_model_input_files(xml_path: str, model: FullModel) -> List[str]:
+    """
+    Get the list of all files the conversion of a RoAML model depends on.
+
+    :param xml_path: The path to the RoAML XML file.
+    :param model: The full model loaded from the RoAML XML file.
+    :return: The paths to the RoAML file and to all files it refers to.
+    """
+    input_files = [xml_path] + [path for _, path in model.data_declarations]
+    input_files.extend(model.skills + model.components)
+    if model.bt is not None:
+        input_files.append(model.bt)
+    input_files.extend(model.plugins + model.properties)
+    return [os.path.normpath(file_path) for file_path in input_files]
+
+
+def _load_jani_properties(
+    properties_path: str, sources: Optional[ModelSources]
+) -> List[Dict[str, Any]]:
+    """Load the properties from the in-memory sources if provided, from file otherwise."""
+    source = None if sources is None else sources.get(properties_path)
+    if source is None:
+        with open(properties_path, "r", encoding="utf-8") as f:
+            return json.load(f)["properties"]
+    if isinstance(source, str):
+        return json.loads(source)["properties"]
+    assert isinstance(
+        source, dict
+    ), f"Expected the properties {properties_path} to be a dict, found {type(source)}."
+    return source["properties"]
+
+
+def _build_jani_model(
+    model: FullModel,
+    plain_scxml_models: List[ScxmlRoot],
+    sources: Optional[ModelSources],
+    *,
+    jobs: int,
+    cache: Optional[ConversionCache],
+    spill_dir: Optional[str],
+    profiler: Optional[ConversionProfiler],
+    simplify_jani: bool,
+    priority_chains: bool,
+) -> Tuple[JaniModel, Optional[LocationsReduction]]:
+    """
+    Convert the plain SCXML models to a Jani model, and add the properties to check.
+
+    :return: The Jani model, and the reduction of its automata (None if not simplified).
+    """
+    jani_model: JaniModel = convert_multiple_scxmls_to_jani(
+        plain_scxml_models,
+        model.max_array_size,
+        jobs=jobs,
+        cache=cache,
+        spill_dir=spill_dir,
+        profiler=profiler,
+        random_samples=model.random_samples,
+        random_samples_per_variable=model.random_samples_per_variable,
+        priority_chains=priority_chains,
+    )
+    for properties_path in model.properties:
+        for property_dict in _load_jani_properties(properties_path, sources):
+            jani_model.add_jani_property(JaniProperty.from_dict(property_dict))
+
+    # Preprocess the JANI file, to remove non-standard artifacts
+    with profile_stage(profiler, "jani_expressions_preprocessing"):
+        preprocess_jani_expressions(jani_model)
+    locations_reduction = None
+    if simplify_jani:
+        with profile_stage(profiler, "jani_expressions_simplification"):
+            simplify_expressions_in_jani_model(jani_model)
+        with profile_stage(profiler, "jani_locations_reduction"):
+            locations_reduction = reduce_locations_in_jani_model(jani_model)
+    return jani_model, locations_reduction
+
+
+def convert_full_model_to_jani(
+    model: FullModel,
+    sources: Optional[ModelSources] = None,
+    *,
+    jobs: int = 1,
+    cache: Optional[ConversionCache] = None,
+    simplify_jani: bool = False,
+    priority_chains: bool = False,
+) -> JaniModel:
+    """
+    Convert a full model to a Jani model in memory, without writing any file.
+
+    The files referenced by the model are read from `sources` when available there, and from
+    disk otherwise. Models shared across many conversions can be loaded once and provided as
+    objects, or provided as text together with a cache, that is reused across the calls.
+
+    :param model: The full model to convert. The paths in it are used as keys in `sources`.
+    :param sources: The in-memory content of the model files. ASCXML models and BTs can be XML
+        strings, ASCXML models can also be pre-loaded `GenericScxmlRoot` objects (left unchanged).
+        The properties can be a JSON string or a dictionary, and the data declarations strings.
+    :param jobs: The amount of processes to use for the generation of the Jani automata.
+    :param cache: Optional cache, to skip the conversion of the unchanged models.
+    :param simplify_jani: Whether to simplify the expressions and automata of the Jani model.
+    :param priority_chains: Whether to check the conditions of the transitions triggered by
+        the same event one at a time, using intermediate locations.
+    :return: The generated Jani model, including the properties.
+    """
+    plain_scxml_models = generate_plain_scxml_models_and_timers(model, cache, sources=sources)
+    jani_model, _ = _build_jani_model(
+        model,
+        plain_scxml_models,
+        sources,
+        jobs=jobs,
+        cache=cache,
+        spill_dir=None,
+        profiler=None,
+        simplify_jani=simplify_jani,
+        priority_chains=priority_chains,
+    )
+    return jani_model
+
+
+def convert_full_model_variants(
+    model: FullModel,
+    parameter_sets: Sequence[Mapping[str, Any]] = ({},),
+    properties_paths: Optional[Sequence[str]] = None,
+    sources: Optional[ModelSources] = None,
+    *,
+    jobs: int = 1,
+    cache: Optional[ConversionCache] = None,
+    simplify_jani: bool = False,
+    priority_chains: bool = False,
+) -> Iterator[Tuple[Mapping[str, Any], str, JaniModel, Optional[LocationsReduction]]]:
+    """
+    Convert many variants of a full model, differing in their parameters and properties.
+
+    Each parameter set is converted once, and each properties file is spliced into the result.
+    A cache is shared across the parameter sets, so only the stages depending on the changed
+    parameters are executed again: the global timer for `max_time`, the BT root (and the global
+    timer) for `bt_tick_rate` and the conversion to Jani automata for `max_array_size`.
+    Sweeping `random_samples` only requires merging the cached automata again.
+
+    :param model: The full model to convert.
+    :param parameter_sets: The values to override in the model, one dictionary per variant.
+        Only the entries in `SWEEPABLE_PARAMETERS` are allowed.
+    :param properties_paths: The properties files to check, each one leading to a separate
+        Jani model. If None, the ones in the full model are used.
+    :param sources: The in-memory content of the model files, as in `convert_full_model_to_jani`.
+    :param jobs: The amount of processes to use for the generation of the Jani automata.
+    :param cache: Optional cache to use, e.g. to share it across many calls.
+    :param simplify_jani: Whether to simplify the expressions and automata of the Jani models.
+    :param priority_chains: Whether to check the conditions of the transitions triggered by
+        the same event one at a time, using intermediate locations.
+    :return: The parameter set, the properties path, the related Jani model and the reduction of
+        its automata (None if not simplified). The same Jani model is reused for all properties
+        of a parameter set: use it before the next iteration.
+    """
+    cache = ConversionCache() if cache is None else cache
+    if properties_paths is None:
+        properties_paths = model.properties
+    properties_dicts = {path: _load_jani_properties(path, sources) for path in properties_paths}
+    for parameter_set in parameter_sets:
+        unexpected_params = set(parameter_set).difference(SWEEPABLE_PARAMETERS)
+        assert len(unexpected_params) == 0, f"Unexpected sweep parameters {unexpected_params}."
+        variant_model = replace(model, **parameter_set)
+        plain_scxml_models = generate_plain_scxml_models_and_timers(
+            variant_model, cache, sources=sources
+        )
+        jani_model = convert_multiple_scxmls_to_jani(
+            plain_scxml_models,
+            variant_model.max_array_size,
+            jobs=jobs,
+            cache=cache,
+            random_samples=variant_model.random_samples,
+            random_samples_per_variable=variant_model.random_samples_per_variable,
+            priority_chains=priority_chains,
+        )
+        preprocess_jani_expressions(jani_model)
+        locations_reduction = None
+        if simplify_jani:
+            simplify_expressions_in_jani_model(jani_model)
+            locations_reduction = reduce_locations_in_jani_model(jani_model)
+        for properties_path, property_dicts in properties_dicts.items():
+            jani_model.clear_properties()
+            for property_dict in property_dicts:
+                jani_model.add_jani_property(JaniProperty.from_dict(property_dict))
+            preprocess_jani_properties(jani_model)
+            yield parameter_set, properties_path, jani_model, locations_reduction
+
+
+def get_variant_jani_path(
+    jani_file: str, parameter_set: Mapping[str, Any], properties_path: str
+) -> str:
+    """
+    Generate the path of the Jani file related to a model variant.
+
+    E.g. `main.jani` becomes `main__max_array_size_10__properties.jani`.
+    """
+    jani_base, jani_ext = os.path.splitext(jani_file)
+    if jani_ext == ".gz":
+        jani_base, inner_ext = os.path.splitext(jani_base)
+        jani_ext = inner_ext + jani_ext
+    variant_suffix = "".join(
+        f"__{param_name}_{param_value}" for param_name, param_value in parameter_set.items()
+    )
+    properties_name = os.path.splitext(os.path.basename(properties_path))[0]
+    return f"{jani_base}{variant_suffix}__{properties_name}{jani_ext}"
+
+
+def interpret_top_level_xml_variants(
+    xml_path: str,
+    jani_file: str,
+    parameter_sets: Sequence[Mapping[str, Any]] = ({},),
+    *,
+    jobs: int = 1,
+    cache_dir: Optional[str] = None,
+    compact_jani: bool = False,
+    fast_json: bool = False,
+    simplify_jani: bool = False,
+    priority_chains: bool = False,
+) -> Tuple[List[str], List[LocationsReduction]]:
+    """
+    Interpret the top-level XML file, writing a Jani file for each parameter set and property file.
+
+    See `convert_full_model_variants` for the stages that are shared across the variants.
+
+    :param xml_path: The path to the XML file to interpret.
+    :param jani_file: The path to the output Jani file, extended with the name of each variant.
+    :param parameter_sets: The values to override in the model, one dictionary per variant.
+    :param jobs: The amount of processes to use for the generation of the Jani automata.
+    :param cache_dir: The directory where to cache the intermediate conversion results.
+    :param compact_jani: Whether to write the Jani files without indentation.
+    :param fast_json: Whether to use the orjson library (if available) to write the Jani files.
+    :param simplify_jani: Whether to simplify the expressions and automata of the Jani models.
+    :param priority_chains: Whether to check the conditions of the transitions triggered by
+        the same event one at a time, using intermediate locations.
+    :return: The paths to the generated Jani files, and the reduction of the automata of each
+        parameter set (empty if not simplified).
+    """
+    model_dir = os.path.dirname(xml_path)
+    cache = ConversionCache(None if cache_dir is None else os.path.join(model_dir, cache_dir))
+    model = RoamlMain(xml_path).get_loaded_model()
+    generated_files: List[str] = []
+    locations_reductions: List[LocationsReduction] = []
+    variants = convert_full_model_variants(
+        model,
+        parameter_sets,
+        jobs=jobs,
+        cache=cache,
+        simplify_jani=simplify_jani,
+        priority_chains=priority_chains,
+    )
+    for parameter_set, properties_path, jani_model, locations_reduction in variants:
+        # The same reduction is provided for all the properties of a parameter set
+        if locations_reduction is not None and (
+            len(locations_reductions) == 0 or locations_reductions[-1] is not locations_reduction
+        ):
+            locations_reductions.append(locations_reduction)
+        output_path = os.path.join(
+            model_dir, get_variant_jani_path(jani_file, parameter_set, properties_path)
+        )
+        write_jani_model(jani_model, output_path, compact=compact_jani, fast_json=fast_json)
+        generated_files.append(output_path)
+    return generated_files, locations_reductions
+
+
+def _interpret_roaml_model(
+    xml_path: str,
+    cache: Optional[ConversionCache],
+    *,
+    jani_file: Optional[str],
+    scxmls_dir: Optional[str],
+    jobs: int,
+    compact_jani: bool,
+    fast_json: bool,
+    simplify_jani: bool,
+    priority_chains: bool,
+    out_of_core: bool,
+    profile_file: Optional[str],
+) -> Tuple[FullModel, Optional[LocationsReduction]]:
+    """
+    Convert the RoAML model and write the results to file, as in `interpret_top_level_xml`.
+
+    :return: The full model loaded from the RoAML XML file, and the reduction of the Jani
+        automata (None if not simplified).
+    """
+    model_dir = os.path.dirname(xml_path)
+    profiler = None if profile_file is None else ConversionProfiler()
+    with profiler if profiler is not None else nullcontext(), profile_stage(profiler, "total"):
+        # Complete Model handling
+        with profile_stage(profiler, "roaml_load"):
+            loaded_roaml = RoamlMain(xml_path)
+            model = loaded_roaml.get_loaded_model()
+
+        plain_scxml_models = generate_plain_scxml_models_and_timers(model, cache, profiler)
+
+        if scxmls_dir is not None:
+            plain_scxml_dir = os.path.join(model_dir, scxmls_dir)
+            with profile_stage(profiler, "plain_scxml_export"):
+                export_plain_scxml_models(plain_scxml_dir, plain_scxml_models)
+        locations_reduction = None
+        if jani_file is not None:
+            # The spilled automata are needed until the Jani model is written to file
+            with TemporaryDirectory(prefix="as2fm_automata_") as spill_dir:
+                jani_model, locations_reduction = _build_jani_model(
+                    model,
+                    plain_scxml_models,
+                    None,
+                    jobs=jobs,
+                    cache=cache,
+                    spill_dir=spill_dir if out_of_core else None,
+                    profiler=profiler,
+                    simplify_jani=simplify_jani,
+                    priority_chains=priority_chains,
+                )
+                output_path = os.path.join(model_dir, jani_file)
+                with profile_stage(profiler, "serialization"):
+                    write_jani_model(
+                        jani_model, output_path, compact=compact_jani, fast_json=fast_json
+                    )
+    if profiler is not None:
+        assert profile_file is not None  # MyPy check
+        profiler.write(os.path.join(model_dir, profile_file))
+    return model, locations_reduction
 
 
 def interpret_top_level_xml(
-    xml_path: str, *, jani_file: Optional[str] = None, scxmls_dir: Optional[str] = None
-):
+    xml_path: str,
+    *,
+    jani_file: Optional[str] = None,
+    scxmls_dir: Optional[str] = None,
+    jobs: int = 1,
+    cache_dir: Optional[str] = None,
+    compact_jani: bool = False,
+    fast_json: bool = False,
+    simplify_jani: bool = False,
+    priority_chains: bool = False,
+    out_of_core: bool = False,
+    profile_file: Optional[str] = None,
+) -> Optional[LocationsReduction]:
     """
     Interpret the top-level XML file as a Jani model. And write it to a file.
     The generated Jani model is written to the same directory as the input XML file under the
@@ -239,31 +888,227 @@ def interpret_top_level_xml(
     :param xml_path: The path to the XML file to interpret.
     :param jani_file: The path to the output Jani file.
     :param scxmls_dir: The directory to store the generated plain SCXML files.
+    :param jobs: The amount of processes to use for the generation of the Jani automata.
+    :param cache_dir: The directory where to cache the intermediate conversion results.
+    :param compact_jani: Whether to write the Jani file without indentation.
+    :param fast_json: Whether to use the orjson library (if available) to write the Jani file.
+    :param simplify_jani: Whether to simplify the expressions and automata before writing them.
+    :param priority_chains: Whether to check the conditions of the transitions triggered by
+        the same event one at a time, using intermediate locations.
+    :param out_of_core: Whether to keep the generated automata in temporary files instead of
+        memory, to convert very large models.
+    :param profile_file: The path to the JSON file reporting the resources used by each
+        conversion stage and the size of each generated automaton.
+    :return: The reduction of the Jani automata, if they were simplified and written to file.
     """
-    # Complete Model handling
     model_dir = os.path.dirname(xml_path)
-    loaded_roaml = RoamlMain(xml_path)
-    model = loaded_roaml.get_loaded_model()
+    cache = None if cache_dir is None else ConversionCache(os.path.join(model_dir, cache_dir))
+    _, locations_reduction = _interpret_roaml_model(
+        xml_path,
+        cache,
+        jani_file=jani_file,
+        scxmls_dir=scxmls_dir,
+        jobs=jobs,
+        compact_jani=compact_jani,
+        fast_json=fast_json,
+        simplify_jani=simplify_jani,
+        priority_chains=priority_chains,
+        out_of_core=out_of_core,
+        profile_file=profile_file,
+    )
+    return locations_reduction
+
+
+# The cache of the current process, shared across all models it converts in batch mode
+_BATCH_CACHE: Optional[ConversionCache] = None
+
+
+def _init_batch_process(cache_dir: Optional[str]) -> None:
+    """Initialize the cache shared by all the conversions in the current process."""
+    global _BATCH_CACHE
+    _BATCH_CACHE = ConversionCache(cache_dir)
+
 
-    plain_scxml_models = generate_plain_scxml_models_and_timers(model)
+def _interpret_batch_entry(xml_path: str, conversion_args: Dict[str, Any]) -> bool:
+    """Convert one of the models in the batch, reporting the failure instead of raising it."""
+    assert _BATCH_CACHE is not None, "The batch process was not initialized."
+    jani_file = os.path.splitext(os.path.basename(xml_path))[0] + ".jani"
+    try:
+        _interpret_roaml_model(xml_path, _BATCH_CACHE, jani_file=jani_file, **conversion_args)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        log_error(xml_path, f"Conversion failed: {e}")
+        return False
+    return True
 
-    if scxmls_dir is not None:
-        plain_scxml_dir = os.path.join(model_dir, scxmls_dir)
-        export_plain_scxml_models(plain_scxml_dir, plain_scxml_models)
-    if jani_file is not None:
-        jani_model: JaniModel = convert_multiple_scxmls_to_jani(
-            plain_scxml_models, model.max_array_size
+
+def interpret_top_level_xml_batch(
+    xml_paths: Sequence[str],
+    *,
+    jobs: int = 1,
+    cache_dir: Optional[str] = None,
+    compact_jani: bool = False,
+    fast_json: bool = False,
+    simplify_jani: bool = False,
+    priority_chains: bool = False,
+) -> List[bool]:
+    """
+    Interpret many top-level XML files, writing each Jani model next to the related XML file.
+
+    The Jani file has the same name as the XML file, e.g. `main.xml` generates `main.jani`.
+    The models are distributed across the worker processes, each one with its own cache: the
+    struct definitions, BT plugins, ASCXML models and ROS interfaces used by many models are
+    loaded only once per process.
+
+    :param xml_paths: The paths to the XML files to interpret.
+    :param jobs: The amount of processes converting the models.
+    :param cache_dir: The directory where to cache the intermediate conversion results. If None,
+        the results are only cached in memory.
+    :param compact_jani: Whether to write the Jani files without indentation.
+    :param fast_json: Whether to use the orjson library (if available) to write the Jani files.
+    :param simplify_jani: Whether to simplify the expressions and automata before writing them.
+    :param priority_chains: Whether to check the conditions of the transitions triggered by
+        the same event one at a time, using intermediate locations.
+    :return: Whether the conversion succeeded, for each model.
+    """
+    assert jobs > 0, f"The amount of jobs must be positive, found {jobs}."
+    conversion_args: Dict[str, Any] = {
+        "scxmls_dir": None,
+        "jobs": 1,
+        "compact_jani": compact_jani,
+        "fast_json": fast_json,
+        "simplify_jani": simplify_jani,
+        "priority_chains": priority_chains,
+        "out_of_core": False,
+        "profile_file": None,
+    }
+    if jobs > 1 and len(xml_paths) > 1 and "fork" in get_all_start_methods():
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=get_context("fork"),
+            initializer=_init_batch_process,
+            initargs=(cache_dir,),
+        ) as executor:
+            return list(executor.map(_interpret_batch_entry, xml_paths, repeat(conversion_args)))
+    _init_batch_process(cache_dir)
+    return [_interpret_batch_entry(xml_path, conversion_args) for xml_path in xml_paths]
+
+
+class RoamlModelWatcher:
+    """
+    Keep converting a RoAML model each time one of its input files changes.
+
+    The intermediate results are kept in memory (or in the provided cache directory), so that
+    only the models depending on the modified files are regenerated. The cache evicts the least
+    recently used results beyond its size bound, and the least recently used parsed inputs beyond
+    their amount bound, so long sessions do not grow without limit.
+    The ROS interface definitions are loaded once per process: the watcher must be restarted to
+    use updated .msg, .srv or .action definitions.
+    """
+
+    def __init__(
+        self,
+        xml_path: str,
+        *,
+        jani_file: Optional[str] = None,
+        scxmls_dir: Optional[str] = None,
+        jobs: int = 1,
+        cache_dir: Optional[str] = None,
+        compact_jani: bool = False,
+        fast_json: bool = False,
+        simplify_jani: bool = False,
+        priority_chains: bool = False,
+        out_of_core: bool = False,
+        profile_file: Optional[str] = None,
+    ):
+        """
+        Initialize the watcher. The arguments are the same as in `interpret_top_level_xml`.
+        """
+        self._xml_path = xml_path
+        self._conversion_args = {
+            "jani_file": jani_file,
+            "scxmls_dir": scxmls_dir,
+            "jobs": jobs,
+            "compact_jani": compact_jani,
+            "fast_json": fast_json,
+            "simplify_jani": simplify_jani,
+            "priority_chains": priority_chains,
+            "out_of_core": out_of_core,
+            "profile_file": profile_file,
+        }
+        model_dir = os.path.dirname(xml_path)
+        self._cache = ConversionCache(
+            None if cache_dir is None else os.path.join(model_dir, cache_dir)
         )
-        with open(model.properties[0], "r", encoding="utf-8") as f:
-            all_properties = json.load(f)["properties"]
-            for property_dict in all_properties:
-                jani_model.add_jani_property(JaniProperty.from_dict(property_dict))
+        # The files to watch, mapped to their last observed state
+        self._files_state: Dict[str, Optional[Tuple[int, int]]] = {}
 
-        # Preprocess the JANI file, to remove non-standard artifacts
-        preprocess_jani_expressions(jani_model)
+    @staticmethod
+    def _get_file_state(file_path: str) -> Optional[Tuple[int, int]]:
+        """Get the modification time and size of a file, or None if it is not available."""
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (file_stat.st_mtime_ns, file_stat.st_size)
+
+    def get_changed_files(self) -> List[str]:
+        """Get the input files that changed since the last conversion."""
+        return [
+            file_path
+            for file_path, file_state in self._files_state.items()
+            if self._get_file_state(file_path) != file_state
+        ]
+
+    def build(self) -> bool:
+        """
+        Convert the RoAML model, and update the list of files to watch.
+
+        :return: True if the conversion succeeded, False otherwise.
+        """
+        # Keep watching the previous files and the ones declared in the RoAML file, even if the
+        # conversion fails: the error might be fixed by changing any of them
+        watched_files = list(self._files_state) + [os.path.normpath(self._xml_path)]
+        try:
+            declared_model = RoamlMain(self._xml_path).get_loaded_model()
+            watched_files.extend(get_model_input_files(self._xml_path, declared_model))
+        except Exception:  # pylint: disable=broad-exception-caught
+            # The RoAML file cannot be loaded: the conversion reports the error
+            pass
+        # Get the files state before converting, not to miss changes happening in the meantime
+        files_state = {
+            file_path: self._get_file_state(file_path) for file_path in dict.fromkeys(watched_files)
+        }
+        try:
+            model, _ = _interpret_roaml_model(self._xml_path, self._cache, **self._conversion_args)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log_error(self._xml_path, f"Conversion failed: {e}")
+            self._files_state = files_state
+            return False
+        self._files_state = {
+            file_path: files_state.get(file_path, self._get_file_state(file_path))
+            for file_path in get_model_input_files(self._xml_path, model)
+        }
+        return True
+
+    def run(self, poll_period: float = 0.2):
+        """
+        Convert the model, then keep converting it after each change of the input files.
+
+        This runs until the process is interrupted (e.g. with Ctrl+C).
 
-        output_path = os.path.join(model_dir, jani_file)
-        with open(output_path, "w", encoding="utf-8") as f:
-            temp_dict = jani_model.as_dict()
-            # print(temp_dict)
-            json.dump(temp_dict, f, indent=2, ensure_ascii=False)
+        :param poll_period: Time in seconds between two consecutive checks for changed files.
+        """
+        self.build()
+        print(f"Watching {len(self._files_state)} files for changes. Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(poll_period)
+                changed_files = self.get_changed_files()
+                if len(changed_files) == 0:
+                    continue
+                print(f"Detected changes in {', '.join(changed_files)}: rebuilding.")
+                start_time = time.perf_counter()
+                if self.build():
+                    print(f"Model rebuilt in {time.perf_counter() - start_time:.3f} s.")
+        except KeyboardInterrupt:
+            print("Stop watching for changes.")
@@ -0,0 +1,542 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Generate synthetic RoAML models, whose size can be scaled along one dimension at a time.
+
+The generated system contains:
+
+* `n_nodes` ROS nodes exchanging `n_topics` topics. Topic `data_<t>` is published by the node
+  `t % n_nodes`, and received by the `subscribers_per_topic` nodes following it. Each node
+  publishes its topics on its timers' callbacks, and forwards the messages received from nodes
+  with a lower index (preventing infinite message loops).
+* `n_timers` timers, assigned to the nodes in round robin, with rates taken from `timer_rates`.
+* A server and a client node for each one of the `n_services` services and `n_actions` actions.
+  Each action server executes the goals using `n_action_threads` threads.
+* A Behavior Tree with `bt_depth` levels of control nodes, each one having `bt_width` children.
+  The leaves are instances of a generated BT plugin.
+* A dynamic array of size `array_size` in each node, storing the last received values.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+BT_CONTROL_NODES = ["Sequence", "Fallback", "ReactiveSequence", "ReactiveFallback"]
+BT_PLUGIN_NAME = "SyntheticBtAction"
+
+_ASCXML_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<ascxml initial="{initial}" version="1.0" name="{name}" model_src=""
+    xmlns="http://www.w3.org/2005/07/scxml">
+"""
+
+
+@dataclass
+class SyntheticModelConfig:
+    """The size of each dimension of the generated system."""
+
+    n_nodes: int = 2
+    n_topics: int = 1
+    subscribers_per_topic: int = 1
+    bt_depth: int = 0
+    bt_width: int = 2
+    n_services: int = 0
+    n_actions: int = 0
+    n_action_threads: int = 1
+    array_size: int = 0
+    n_timers: int = 1
+    timer_rates: List[float] = field(default_factory=lambda: [10.0])
+
+    def check_validity(self) -> None:
+        """Make sure the configuration describes a system that can be generated."""
+        for attr_name in (
+            "n_nodes",
+            "n_topics",
+            "subscribers_per_topic",
+            "bt_depth",
+            "n_services",
+            "n_actions",
+            "array_size",
+            "n_timers",
+        ):
+            assert getattr(self, attr_name) >= 0, f"The value of {attr_name} must be non-negative."
+        assert self.n_topics == 0 or self.n_nodes > 0, "Topics require at least one node."
+        assert (
+            self.n_topics == 0 or self.subscribers_per_topic < self.n_nodes
+        ), f"Each topic can have at most {self.n_nodes - 1} subscribers, with {self.n_nodes} nodes."
+        assert self.n_timers == 0 or self.n_nodes > 0, "Timers require at least one node."
+        assert self.bt_depth == 0 or self.bt_width > 0, "The BT width must be positive."
+        assert self.n_action_threads > 0, "The amount of action threads must be positive."
+        assert self.n_timers == 0 or len(self.timer_rates) > 0, "No timer rates provided."
+        assert all(rate > 0.0 for rate in self.timer_rates), "Timer rates must be positive."
+        assert (
+            self.n_topics + self.bt_depth + self.n_services + self.n_actions > 0
+        ), "The model must contain at least one topic, BT, service or action."
+
+
+def _if_chain(
+    branches: List[Tuple[str, List[str]]], indent: int, else_body: Optional[List[str]] = None
+) -> str:
+    """
+    Generate an if / elseif / else block.
+
+    :param branches: The condition and the executable entries of each branch, in order.
+    :param indent: The indentation of the if tag, in spaces.
+    :param else_body: The executable entries to run if no condition holds, if any.
+    :return: The block, starting with a newline.
+    """
+    tag_indent = "\n" + " " * indent
+    body_indent = tag_indent + "    "
+    block = ""
+    for idx, (condition, body) in enumerate(branches):
+        block += tag_indent + (
+            f'<if cond="{condition}">' if idx == 0 else f'<elseif cond="{condition}" />'
+        )
+        block += "".join(body_indent + entry for entry in body)
+    if else_body is not None:
+        block += tag_indent + "<else />" + "".join(body_indent + entry for entry in else_body)
+    return block + tag_indent + "</if>"
+
+
+def _get_topic_publisher(config: SyntheticModelConfig, topic_idx: int) -> int:
+    return topic_idx % config.n_nodes
+
+
+def _get_topic_subscribers(config: SyntheticModelConfig, topic_idx: int) -> List[int]:
+    publisher_idx = _get_topic_publisher(config, topic_idx)
+    return [
+        (publisher_idx + offset) % config.n_nodes
+        for offset in range(1, config.subscribers_per_topic + 1)
+    ]
+
+
+def _array_update(config: SyntheticModelConfig, value_expr: str) -> str:
+    """Store a value in the node's history array, overwriting the oldest one when it is full."""
+    if config.array_size == 0:
+        return ""
+    return _if_chain(
+        [
+            (
+                f"history.length &lt; {config.array_size}",
+                [f'<assign location="history[history.length]" expr="{value_expr}" />'],
+            )
+        ],
+        indent=12,
+        else_body=[
+            f'<assign location="history[counter % {config.array_size}]" expr="{value_expr}" />'
+        ],
+    )
+
+
+def _publish_all(topics: List[int]) -> str:
+    return "".join(
+        f"""
+            <ros_topic_publish name="data_{topic_idx}">
+                <field name="data" expr="counter" />
+            </ros_topic_publish>"""
+        for topic_idx in topics
+    )
+
+
+def _generate_node(config: SyntheticModelConfig, node_idx: int) -> str:
+    """Generate a ROS node publishing and receiving the topics assigned to it."""
+    published = [t for t in range(config.n_topics) if _get_topic_publisher(config, t) == node_idx]
+    subscribed = [
+        t for t in range(config.n_topics) if node_idx in _get_topic_subscribers(config, t)
+    ]
+    timers = [k for k in range(config.n_timers) if k % config.n_nodes == node_idx]
+    declarations = ""
+    for timer_idx in timers:
+        rate = config.timer_rates[timer_idx % len(config.timer_rates)]
+        declarations += f'    <ros_time_rate name="timer_{timer_idx}" rate_hz="{rate}" />\n'
+    for topic_idx in published:
+        declarations += (
+            f'    <ros_topic_publisher topic="data_{topic_idx}" type="std_msgs/Int32" />\n'
+        )
+    for topic_idx in subscribed:
+        declarations += (
+            f'    <ros_topic_subscriber topic="data_{topic_idx}" type="std_msgs/Int32" />\n'
+        )
+    callbacks = ""
+    for timer_idx in timers:
+        callbacks += f"""
+        <ros_rate_callback name="timer_{timer_idx}" target="idle">
+            <assign location="counter" expr="(counter + 1) % 100" />{_publish_all(published)}
+        </ros_rate_callback>"""
+    for topic_idx in subscribed:
+        is_forwarded = _get_topic_publisher(config, topic_idx) < node_idx
+        callbacks += f"""
+        <ros_topic_callback name="data_{topic_idx}" target="idle">
+            <assign location="counter" expr="(counter + _msg.data) % 100" />\
+{_array_update(config, "_msg.data")}{_publish_all(published) if is_forwarded else ""}
+        </ros_topic_callback>"""
+    history_data = (
+        '\n        <data id="history" type="int32[]" expr="[]" />' if config.array_size > 0 else ""
+    )
+    return (
+        _ASCXML_HEADER.format(initial="idle", name=f"SyntheticNode{node_idx}")
+        + f"""    <datamodel>
+        <data id="counter" type="int32" expr="0" />{history_data}
+    </datamodel>
+{declarations}
+    <state id="idle">{callbacks}
+    </state>
+</ascxml>
+"""
+    )
+
+
+def _generate_service_server(service_idx: int) -> str:
+    service_name = f"service_{service_idx}"
+    return (
+        _ASCXML_HEADER.format(initial="idle", name=f"SyntheticServiceServer{service_idx}")
+        + f"""    <ros_service_server service_name="{service_name}" \
+type="example_interfaces/AddTwoInts" />
+    <datamodel>
+        <data id="req_a" type="int64" expr="0" />
+        <data id="req_b" type="int64" expr="0" />
+    </datamodel>
+    <state id="idle">
+        <ros_service_handle_request name="{service_name}" target="idle">
+            <assign location="req_a" expr="_req.a" />
+            <assign location="req_b" expr="_req.b" />
+            <ros_service_send_response name="{service_name}">
+                <field name="sum" expr="req_a + req_b" />
+            </ros_service_send_response>
+        </ros_service_handle_request>
+    </state>
+</ascxml>
+"""
+    )
+
+
+def _generate_service_client(service_idx: int) -> str:
+    service_name = f"service_{service_idx}"
+    return (
+        _ASCXML_HEADER.format(initial="send_req", name=f"SyntheticServiceClient{service_idx}")
+        + f"""    <ros_service_client service_name="{service_name}" \
+type="example_interfaces/AddTwoInts" />
+    <ros_topic_publisher topic="{service_name}_done" type="std_msgs/Bool" />
+    <datamodel>
+        <data id="res_sum" type="int64" expr="0" />
+    </datamodel>
+    <state id="send_req">
+        <onentry>
+            <ros_service_send_request name="{service_name}">
+                <field name="a" expr="{service_idx}" />
+                <field name="b" expr="1" />
+            </ros_service_send_request>
+        </onentry>
+        <ros_service_handle_response name="{service_name}" target="done">
+            <assign location="res_sum" expr="_res.sum" />
+            <ros_topic_publish name="{service_name}_done">
+                <field name="data" expr="res_sum == {service_idx + 1}" />
+            </ros_topic_publish>
+        </ros_service_handle_response>
+    </state>
+    <state id="done" />
+</ascxml>
+"""
+    )
+
+
+def _generate_action_server(action_idx: int, n_threads: int) -> str:
+    """Generate an action server, assigning each goal to the first free thread."""
+    action_name = f"action_{action_idx}"
+    threads_data = "".join(
+        f'\n        <data id="thread_{i}_busy" type="bool" expr="true" />' for i in range(n_threads)
+    )
+    threads_free = _if_chain(
+        [
+            (f"free_thread_id == {i}", [f'<assign location="thread_{i}_busy" expr="false" />'])
+            for i in range(n_threads)
+        ],
+        indent=12,
+    )
+    threads_select = _if_chain(
+        [
+            (
+                f"thread_{i}_busy == false",
+                [
+                    f'<assign location="thread_{i}_busy" expr="true" />',
+                    f'<assign location="thread_to_start" expr="{i}" />',
+                ],
+            )
+            for i in range(n_threads)
+        ],
+        indent=12,
+        else_body=['<assign location="thread_to_start" expr="-1" />'],
+    )
+    return (
+        _ASCXML_HEADER.format(initial="idle", name=f"SyntheticActionServer{action_idx}")
+        + f"""    <ros_action_server name="{action_name}" action_name="{action_name}" \
+type="example_interfaces/Fibonacci" />
+    <ros_action_thread name="{action_name}" n_threads="{n_threads}" initial="idle">
+        <datamodel>
+            <data id="goal_id" type="int32" expr="-1" />
+            <data id="order" type="int32" expr="0" />
+            <data id="sequence" type="int32[]" expr="[]" />
+        </datamodel>
+        <state id="idle">
+            <onentry>
+                <assign location="goal_id" expr="-1" />
+                <ros_action_thread_free name="{action_name}" />
+            </onentry>
+            <ros_action_handle_thread_start name="{action_name}" target="execute">
+                <assign location="goal_id" expr="_action.goal_id" />
+                <assign location="order" expr="_goal.order" />
+            </ros_action_handle_thread_start>
+        </state>
+        <state id="execute">
+            <onentry>
+                <assign location="sequence[0]" expr="order" />
+            </onentry>
+            <transition target="idle">
+                <ros_action_succeed name="{action_name}" goal_id="goal_id">
+                    <field name="sequence" expr="sequence" />
+                </ros_action_succeed>
+            </transition>
+        </state>
+    </ros_action_thread>
+    <datamodel>
+        <data id="goal_id" type="int32" expr="0" />
+        <data id="order" type="int32" expr="0" />{threads_data}
+        <data id="thread_to_start" type="int32" expr="-1" />
+        <data id="free_thread_id" type="int32" expr="-1" />
+    </datamodel>
+    <state id="idle">
+        <onentry>
+            <assign location="thread_to_start" expr="-1" />
+        </onentry>
+        <ros_action_handle_goal name="{action_name}" target="check_goal">
+            <assign location="goal_id" expr="_action.goal_id" />
+            <assign location="order" expr="_goal.order" />
+        </ros_action_handle_goal>
+        <ros_action_handle_thread_free name="{action_name}" target="idle">
+            <assign location="free_thread_id" expr="_event.data.thread_id" />{threads_free}
+        </ros_action_handle_thread_free>
+    </state>
+    <state id="check_goal">
+        <onentry>{threads_select}
+        </onentry>
+        <transition target="idle">
+            <if cond="thread_to_start &gt;= 0">
+                <ros_action_accept_goal name="{action_name}" goal_id="goal_id" />
+                <ros_action_start_thread name="{action_name}" thread_id="thread_to_start" \
+goal_id="goal_id">
+                    <field name="order" expr="order" />
+                </ros_action_start_thread>
+            <else />
+                <ros_action_reject_goal name="{action_name}" goal_id="goal_id" />
+            </if>
+        </transition>
+    </state>
+</ascxml>
+"""
+    )
+
+
+def _generate_action_client(action_idx: int) -> str:
+    action_name = f"action_{action_idx}"
+    return (
+        _ASCXML_HEADER.format(initial="send_goal", name=f"SyntheticActionClient{action_idx}")
+        + f"""    <ros_action_client name="{action_name}" action_name="{action_name}" \
+type="example_interfaces/Fibonacci" />
+    <ros_topic_publisher topic="{action_name}_done" type="std_msgs/Bool" />
+    <datamodel>
+        <data id="result" type="int32[]" expr="[]" />
+    </datamodel>
+    <state id="send_goal">
+        <onentry>
+            <ros_action_send_goal name="{action_name}">
+                <field name="order" expr="{action_idx}" />
+            </ros_action_send_goal>
+        </onentry>
+        <ros_action_handle_goal_response name="{action_name}" accept="wait_result" \
+reject="send_goal" />
+    </state>
+    <state id="wait_result">
+        <ros_action_handle_success_result name="{action_name}" target="done">
+            <assign location="result" expr="_wrapped_result.result.sequence" />
+            <ros_topic_publish name="{action_name}_done">
+                <field name="data" expr="result[0] == {action_idx}" />
+            </ros_topic_publish>
+        </ros_action_handle_success_result>
+    </state>
+    <state id="done" />
+</ascxml>
+"""
+    )
+
+
+def _generate_bt_plugin() -> str:
+    """Generate a BT action cycling through the RUNNING, SUCCESS and FAILURE results."""
+    return (
+        _ASCXML_HEADER.format(initial="idle", name=BT_PLUGIN_NAME)
+        + """    <bt_declare_port_in key="topic" type="string" />
+    <datamodel>
+        <data id="counter" type="int32" expr="0" />
+    </datamodel>
+    <ros_topic_publisher name="tick_pub" type="std_msgs/Int32">
+        <topic>
+            <bt_get_input key="topic" />
+        </topic>
+    </ros_topic_publisher>
+    <state id="idle">
+        <bt_tick target="idle">
+            <assign location="counter" expr="(counter + 1) % 100" />
+            <ros_topic_publish name="tick_pub">
+                <field name="data" expr="counter" />
+            </ros_topic_publish>
+            <if cond="counter % 3 == 0">
+                <bt_return_status status="RUNNING" />
+            <elseif cond="counter % 3 == 1" />
+                <bt_return_status status="SUCCESS" />
+            <else />
+                <bt_return_status status="FAILURE" />
+            </if>
+        </bt_tick>
+        <bt_halt target="idle">
+            <bt_return_halted />
+        </bt_halt>
+    </state>
+</ascxml>
+"""
+    )
+
+
+def _generate_bt_subtree(config: SyntheticModelConfig, level: int, leaves: List[int]) -> str:
+    """Generate a subtree of the BT, appending the index of each generated leaf to `leaves`."""
+    indent = "    " * (level + 2)
+    if level == config.bt_depth:
+        leaf_idx = len(leaves)
+        leaves.append(leaf_idx)
+        return (
+            f'{indent}<Action ID="{BT_PLUGIN_NAME}" name="leaf_{leaf_idx}" '
+            f'topic="bt_leaf_{leaf_idx}" />\n'
+        )
+    control_node = BT_CONTROL_NODES[level % len(BT_CONTROL_NODES)]
+    children = "".join(
+        _generate_bt_subtree(config, level + 1, leaves) for _ in range(config.bt_width)
+    )
+    return f"{indent}<{control_node}>\n{children}{indent}</{control_node}>\n"
+
+
+def _generate_bt(config: SyntheticModelConfig) -> str:
+    subtree = _generate_bt_subtree(config, 0, [])
+    return (
+        '<root BTCPP_format="4">\n'
+        '    <BehaviorTree ID="MainTree">\n'
+        f"{subtree}"
+        "    </BehaviorTree>\n"
+        "</root>\n"
+    )
+
+
+def _get_observed_topic(config: SyntheticModelConfig) -> str:
+    """Get the topic used in the generated property."""
+    if config.n_topics > 0:
+        return "data_0"
+    if config.bt_depth > 0:
+        return "bt_leaf_0"
+    if config.n_services > 0:
+        return "service_0_done"
+    return "action_0_done"
+
+
+def _generate_properties(config: SyntheticModelConfig) -> Dict:
+    """Generate a property checking that the observed topic is eventually published."""
+    return {
+        "properties": [
+            {
+                "name": "topic_published",
+                "expression": {
+                    "op": "filter",
+                    "fun": "values",
+                    "values": {
+                        "op": "Pmin",
+                        "exp": {
+                            "op": "U",
+                            "left": True,
+                            "right": f"topic_{_get_observed_topic(config)}_msg.valid",
+                        },
+                    },
+                    "states": {"op": "initial"},
+                },
+            }
+        ]
+    }
+
+
+def generate_synthetic_model(config: SyntheticModelConfig, output_dir: str) -> str:
+    """
+    Write a synthetic RoAML model, including all ASCXML, BT and properties files it refers to.
+
+    :param config: The size of each dimension of the generated system.
+    :param output_dir: The folder where the model files are written.
+    :return: The path to the generated RoAML main file.
+    """
+    config.check_validity()
+    os.makedirs(output_dir, exist_ok=True)
+    model_files: Dict[str, str] = {}
+    for node_idx in range(config.n_nodes):
+        model_files[f"node_{node_idx}.ascxml"] = _generate_node(config, node_idx)
+    for service_idx in range(config.n_services):
+        model_files[f"service_server_{service_idx}.ascxml"] = _generate_service_server(service_idx)
+        model_files[f"service_client_{service_idx}.ascxml"] = _generate_service_client(service_idx)
+    for action_idx in range(config.n_actions):
+        model_files[f"action_server_{action_idx}.ascxml"] = _generate_action_server(
+            action_idx, config.n_action_threads
+        )
+        model_files[f"action_client_{action_idx}.ascxml"] = _generate_action_client(action_idx)
+    node_inputs = "".join(
+        f'        <input type="node-ascxml" src="./{file_name}" />\n' for file_name in model_files
+    )
+    bt_inputs = ""
+    if config.bt_depth > 0:
+        model_files["bt.xml"] = _generate_bt(config)
+        model_files["bt_plugin.ascxml"] = _generate_bt_plugin()
+        bt_inputs = (
+            "    <behavior_tree>\n"
+            '        <input type="bt.cpp-xml" src="./bt.xml" />\n'
+            '        <input type="bt-plugin-ascxml" src="./bt_plugin.ascxml" />\n'
+            "    </behavior_tree>\n"
+        )
+    model_files["properties.jani"] = json.dumps(_generate_properties(config), indent=2) + "\n"
+    max_array_size = (
+        f'        <max_array_size value="{config.array_size}" />\n' if config.array_size > 0 else ""
+    )
+    model_files["main.xml"] = (
+        "<roaml>\n"
+        "    <parameters>\n"
+        '        <max_time value="100" unit="s" />\n'
+        f"{max_array_size}"
+        '        <bt_tick_rate value="1.0" />\n'
+        '        <bt_tick_if_not_running value="true" />\n'
+        "    </parameters>\n"
+        f"{bt_inputs}"
+        "    <node_models>\n"
+        f"{node_inputs}"
+        "    </node_models>\n"
+        "    <properties>\n"
+        '        <input type="jani" src="./properties.jani" />\n'
+        "    </properties>\n"
+        "</roaml>\n"
+    )
+    for file_name, file_content in model_files.items():
+        with open(os.path.join(output_dir, file_name), "w", encoding="utf-8") as f:
+            f.write(file_content)
+    return os.path.join(output_dir, "main.xml")
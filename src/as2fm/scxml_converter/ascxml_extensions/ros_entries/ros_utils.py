@@ -111,10 +111,23 @@ def is_action_type_known(action_definition: str) -> bool:
     return is_ros_type_known(action_definition, "action")
 
 
+# The fields of the ROS types loaded so far, since they do not change within the same process
+_ROS_TYPE_FIELDS: Dict[Type[Any], Dict[str, str]] = {}
+
+
 def extract_params_from_ros_type(ros_interface_type: Type[Any]) -> Dict[str, str]:
     """
     Extract the data fields of a ROS message type as pairs of name and type objects.
+
+    :return: A new dictionary each time, that the caller is free to modify.
     """
+    if ros_interface_type not in _ROS_TYPE_FIELDS:
+        _ROS_TYPE_FIELDS[ros_interface_type] = _extract_params_from_ros_type(ros_interface_type)
+    return dict(_ROS_TYPE_FIELDS[ros_interface_type])
+
+
+def _extract_params_from_ros_type(ros_interface_type: Type[Any]) -> Dict[str, str]:
+    """Implementation of `extract_params_from_ros_type`, without caching."""
     fields: Dict[str, str] = ros_interface_type.get_fields_and_field_types()
     proc_fields: Dict[str, str] = {}
     for field_key, field_type in fields.items():
@@ -209,6 +222,28 @@ def get_action_type_params(
     return action_goal_fields, action_feedback_fields, action_result_fields
 
 
+def get_ros_type_definition(
+    type_definition: str, ros_interface: str
+) -> Optional[Tuple[Dict[str, str], ...]]:
+    """
+    Get the fields of a ROS definition (msg, srv or action), as used in the conversion.
+
+    :param type_definition: The type definition to resolve (e.g. std_msgs/Empty).
+    :param ros_interface: msg, srv or action.
+    :return: The fields of each message in the definition (e.g. the request and response of a
+        service), or None in case the interface does not exist.
+    """
+    if re.fullmatch(r"[^/]+/[^/]+", type_definition) is None:
+        return None
+    if import_ros_type(type_definition, ros_interface) is None:
+        return None
+    if ros_interface == "msg":
+        return (get_msg_type_params(type_definition),)
+    if ros_interface == "srv":
+        return get_srv_type_params(type_definition)
+    return get_action_type_params(type_definition)
+
+
 def get_action_goal_id_definition() -> Tuple[str, str]:
     """Provide the definition of the goal_id field in ROS actions."""
     return "goal_id", "int32"
@@ -20,7 +20,7 @@ Convert Behavior Trees (BT xml) to SCXML.
 import os
 from copy import deepcopy
 from importlib.resources import files as resource_files
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 from lxml import etree as ET
 from lxml.etree import _Element as XmlElement
@@ -63,6 +63,7 @@ from as2fm.scxml_converter.scxml_entries import (
 )
 
 BT_ROOT_PREFIX = "bt_root_fsm_"
+BT_ROOT_CHILD_TICK_IDX = 1000
 
 
 def get_blackboard_variables_from_models(ascxml_models: List[GenericScxmlRoot]) -> Dict[str, str]:
@@ -135,42 +136,93 @@ def is_bt_root_scxml(scxml_name: str) -> bool:
     return scxml_name.startswith(BT_ROOT_PREFIX)
 
 
+# The BT control nodes provided with AS2FM, loaded once per process. They only use basic data
+# types, hence they do not depend on the custom data types of the model.
+_INTERNAL_BT_PLUGINS: Dict[str, AscxmlRootBT] = {}
+
+
+def _get_internal_bt_plugins() -> Dict[str, AscxmlRootBT]:
+    """Get the BT control nodes provided with AS2FM, loading them the first time only."""
+    if len(_INTERNAL_BT_PLUGINS) == 0:
+        internal_bt_plugins_path = (
+            resource_files("as2fm").joinpath("resources").joinpath("bt_control_nodes")
+        )
+        for plugin_path in internal_bt_plugins_path.iterdir():
+            if plugin_path.is_file() and plugin_path.suffix == ".ascxml":  # type: ignore
+                bt_plugin_scxml = AscxmlRootBT.load_scxml_file(str(plugin_path), {})
+                _INTERNAL_BT_PLUGINS.update({bt_plugin_scxml.get_name(): bt_plugin_scxml})
+    return _INTERNAL_BT_PLUGINS
+
+
 def load_available_bt_plugins(
-    bt_plugins_scxml_paths: List[str], custom_data_types: Dict[str, StructDefinition]
+    bt_plugins_scxml_paths: List[Union[str, AscxmlRootBT]],
+    custom_data_types: Dict[str, StructDefinition],
 ) -> Dict[str, AscxmlRootBT]:
     available_bt_plugins: Dict[str, AscxmlRootBT] = {}
     for path in bt_plugins_scxml_paths:
-        assert os.path.exists(path), f"Cannot load BT plugin from non-existing path {path}."
-        bt_plugin_scxml = AscxmlRootBT.load_scxml_file(path, custom_data_types)
+        if isinstance(path, AscxmlRootBT):
+            # Already loaded plugin: it is copied before each instantiation, no need to copy here
+            bt_plugin_scxml = path
+        else:
+            assert os.path.exists(path), f"Cannot load BT plugin from non-existing path {path}."
+            bt_plugin_scxml = AscxmlRootBT.load_scxml_file(path, custom_data_types)
         available_bt_plugins.update({bt_plugin_scxml.get_name(): bt_plugin_scxml})
-    internal_bt_plugins_path = (
-        resource_files("as2fm").joinpath("resources").joinpath("bt_control_nodes")
-    )
-    for plugin_path in internal_bt_plugins_path.iterdir():
-        if plugin_path.is_file() and plugin_path.suffix == ".ascxml":  # type: ignore
-            bt_plugin_scxml = AscxmlRootBT.load_scxml_file(str(plugin_path), custom_data_types)
-            available_bt_plugins.update({bt_plugin_scxml.get_name(): bt_plugin_scxml})
+    available_bt_plugins.update(_get_internal_bt_plugins())
     return available_bt_plugins
 
 
+def get_bt_name(bt_xml_path: str) -> str:
+    """Get the name of the Behavior Tree, used for naming the generated models."""
+    return os.path.basename(bt_xml_path).replace(".xml", "")
+
+
 def bt_converter(
     bt_xml_path: str,
-    bt_plugins_scxml_paths: List[str],
+    bt_plugins_scxml_paths: List[Union[str, AscxmlRootBT]],
     bt_tick_rate: float,
     tick_if_not_running: bool,
     custom_data_types: Dict[str, StructDefinition],
+    bt_xml_tree: Optional[XmlElement] = None,
 ) -> List[AscxmlRootBT]:
     """
     Generate all Scxml files resulting from a Behavior Tree (BT) in XML format.
 
     :param bt_xml_path: Path to the xml file implementing the Behavior Tree.
-    :param bt_plugins_scxml_paths: Paths to the scxml files implementing the BT nodes (plugins).
+    :param bt_plugins_scxml_paths: Paths to the scxml files implementing the BT nodes (plugins),
+        or the plugins already loaded.
     :param bt_tick_rate: The rate at which the root of the input BT is ticked.
     :param tick_if_not_running: If true, keep ticking the BT root after it stops returning RUNNING.
+    :param bt_xml_tree: Optional, already parsed BT. If provided, the BT is not read from
+        `bt_xml_path`, that is only used for naming the generated models.
+    """
+    bt_scxml_root = generate_bt_root_scxml(
+        get_bt_name(bt_xml_path), BT_ROOT_CHILD_TICK_IDX, bt_tick_rate, tick_if_not_running
+    )
+    # No custom data types are required in the autogenerated BT-root
+    bt_scxml_root.set_custom_data_types({})
+    return [bt_scxml_root] + bt_children_converter(
+        bt_xml_path, bt_plugins_scxml_paths, custom_data_types, bt_xml_tree
+    )
+
+
+def bt_children_converter(
+    bt_xml_path: str,
+    bt_plugins_scxml_paths: List[Union[str, AscxmlRootBT]],
+    custom_data_types: Dict[str, StructDefinition],
+    bt_xml_tree: Optional[XmlElement] = None,
+) -> List[AscxmlRootBT]:
+    """
+    Generate the Scxml files of the BT nodes, excluding the BT root generated by `bt_converter`.
+
+    Unlike the BT root, these models do not depend on the BT tick rate and tick policy.
+    The arguments are the same as in `bt_converter`.
     """
     available_bt_plugins = load_available_bt_plugins(bt_plugins_scxml_paths, custom_data_types)
-    xml_tree: XmlElement = ET.parse(bt_xml_path, ET.XMLParser(remove_comments=True)).getroot()
-    set_filepath_for_all_sub_elements(xml_tree, bt_xml_path)
+    if bt_xml_tree is None:
+        xml_tree: XmlElement = ET.parse(bt_xml_path, ET.XMLParser(remove_comments=True)).getroot()
+        set_filepath_for_all_sub_elements(xml_tree, bt_xml_path)
+    else:
+        xml_tree = bt_xml_tree
     root_children = xml_tree.getchildren()
     assert len(root_children) == 1, f"Error: Expected one root element, found {len(root_children)}."
     assert (
@@ -180,17 +232,7 @@ def bt_converter(
     assert (
         len(bt_children) == 1
     ), f"Error: Expected one BehaviorTree child, found {len(bt_children)}."
-    root_child_tick_idx = 1000
-    bt_name = os.path.basename(bt_xml_path).replace(".xml", "")
-    bt_scxml_root = generate_bt_root_scxml(
-        bt_name, root_child_tick_idx, bt_tick_rate, tick_if_not_running
-    )
-    # No custom data types are required in the autogenerated BT-root
-    bt_scxml_root.set_custom_data_types({})
-    generated_scxmls = [bt_scxml_root] + generate_bt_children_scxmls(
-        bt_children[0], root_child_tick_idx, available_bt_plugins
-    )
-    return generated_scxmls
+    return generate_bt_children_scxmls(bt_children[0], BT_ROOT_CHILD_TICK_IDX, available_bt_plugins)
 
 
 def generate_bt_root_scxml(
@@ -51,6 +51,10 @@ class JsonStructDefinition(StructDefinition):
             json_def = json.loads(file.read())
             return JsonStructDefinition.from_dict(json_def, fname)
 
+    @staticmethod
+    def from_string(content: str, fname: str):
+        return JsonStructDefinition.from_dict(json.loads(content), fname)
+
     @staticmethod
     def _handle_property(root_obj: Dict[str, Any], prop_def: Dict[str, Any], fname: str) -> str:
         if REF in prop_def.keys():
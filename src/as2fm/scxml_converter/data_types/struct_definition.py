@@ -62,6 +62,16 @@ class StructDefinition:
         """
         raise NotImplementedError("This must be implemented in the child class.")
 
+    @staticmethod
+    def from_string(content: str, fname: str):
+        """
+        Same as `from_file`, but reading the type definitions from a string.
+
+        :param content: The content of the type definitions file.
+        :param fname: The name of the file, used for the error messages and the references.
+        """
+        raise NotImplementedError("This must be implemented in the child class.")
+
     def get_name(self) -> str:
         """Get the name of the custom struct."""
         return self._name
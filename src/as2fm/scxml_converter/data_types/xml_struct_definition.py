@@ -56,15 +56,26 @@ class XmlStructDefinition(StructDefinition):
 
         :param xml_path: Path of the XML file containing the top-level `types`-tag.
         """
-        declarations = {}
         parser_wo_comments = ET.XMLParser(remove_comments=True)
         with open(fname, "r", encoding="utf-8") as f:
             xml = ET.parse(f, parser=parser_wo_comments)
-        set_filepath_for_all_sub_elements(xml.getroot(), fname)
-        assert remove_namespace(xml.getroot().tag) == "types", get_error_msg(
-            xml.getroot(), "The top-level XML element must be types."
+        return XmlStructDefinition._from_types_element(xml.getroot(), fname)
+
+    @staticmethod
+    def from_string(content: str, fname: str) -> Dict[str, "XmlStructDefinition"]:
+        parser_wo_comments = ET.XMLParser(remove_comments=True)
+        xml_root = ET.fromstring(content.encode("utf-8"), parser=parser_wo_comments)
+        return XmlStructDefinition._from_types_element(xml_root, fname)
+
+    @staticmethod
+    def _from_types_element(xml_root: XmlElement, fname: str) -> Dict[str, "XmlStructDefinition"]:
+        """Load all struct definitions from the top-level `types` element."""
+        declarations = {}
+        set_filepath_for_all_sub_elements(xml_root, fname)
+        assert remove_namespace(xml_root.tag) == "types", get_error_msg(
+            xml_root, "The top-level XML element must be types."
         )
-        for first_level in xml.getroot():
+        for first_level in xml_root:
             assert remove_namespace(first_level.tag) == "struct", get_error_msg(
                 first_level,
                 "The children of the top-level XML element must be `struct`,"
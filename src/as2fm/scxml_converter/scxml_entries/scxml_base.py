@@ -18,7 +18,8 @@ Base SCXML class, defining the methods all SCXML entries shall implement.
 """
 
 from abc import abstractmethod
-from typing import Dict, List, Optional, Type
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Type
 
 from lxml.etree import _Element as XmlElement
 from typing_extensions import Self
@@ -75,6 +76,21 @@ class ScxmlBase:
         except AttributeError:
             return None
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Self:
+        """
+        Deep copy the SCXML entry, sharing the XML origin and the custom data types.
+
+        Both are never modified after loading the model, and copying the XML origin would
+        duplicate the whole XML (sub-)tree it refers to.
+        """
+        new_instance = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new_instance
+        for attr_name, attr_value in self.__dict__.items():
+            if attr_name not in ("xml_origin", "custom_data_types"):
+                attr_value = deepcopy(attr_value, memo)
+            new_instance.__dict__[attr_name] = attr_value
+        return new_instance
+
     @abstractmethod
     def check_validity(self) -> bool:
         """Check if the object is valid."""
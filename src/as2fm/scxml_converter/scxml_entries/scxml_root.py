@@ -97,20 +97,46 @@ class GenericScxmlRoot(ScxmlBase):
             xml_element = ET.parse(xml_file).getroot()
             set_filepath_for_all_sub_elements(xml_element, xml_file)
         elif xml_file.startswith("<?xml"):
-            raise NotImplementedError("Can only parse files, not strings.")
+            return cls.load_scxml_string(xml_file, custom_data_types)
         else:
             raise ValueError(f"Error: SCXML root: xml_file '{xml_file}' isn't a file / xml string.")
-        # Remove the namespace from all tags in the XML file
-        for child in xml_element.iter():
-            if is_comment(child):
-                continue
-            child.tag = remove_namespace(child.tag)
         # Do the conversion
         _, fext = splitext(xml_file)
         assert fext == cls.get_file_extension(), (
             f"Error loading file {xml_file}: ",
             f"the class {cls} expects the extension '{cls.get_file_extension()}'.",
         )
+        return cls._from_loaded_xml(xml_element, custom_data_types)
+
+    @classmethod
+    def load_scxml_string(
+        cls,
+        xml_string: str,
+        custom_data_types: Dict[str, StructDefinition],
+        origin_name: Optional[str] = None,
+    ) -> Self:
+        """
+        Create a `GenericScxmlRoot` instance from a string containing the ASCXML model.
+
+        :param xml_string: The ASCXML model content.
+        :param custom_data_types: The custom data types the model can refer to.
+        :param origin_name: Optional name reported in the error messages, in place of the path.
+        """
+        # lxml does not accept unicode strings containing an encoding declaration
+        xml_element = ET.fromstring(xml_string.encode("utf-8"))
+        if origin_name is not None:
+            set_filepath_for_all_sub_elements(xml_element, origin_name)
+        return cls._from_loaded_xml(xml_element, custom_data_types)
+
+    @classmethod
+    def _from_loaded_xml(
+        cls, xml_element: XmlElement, custom_data_types: Dict[str, StructDefinition]
+    ) -> Self:
+        """Remove the namespace from all tags of a parsed XML tree, and convert it."""
+        for child in xml_element.iter():
+            if is_comment(child):
+                continue
+            child.tag = remove_namespace(child.tag)
         return cls.from_xml_tree(xml_element, custom_data_types)
 
     @classmethod
@@ -26,10 +26,11 @@ from lxml.etree import _Element as XmlElement
 
 from as2fm.as2fm_common.ecmascript_interpretation import (
     MemberAccessCheckException,
+    analyze_expression,
     ast_expression_to_string,
-    has_array_access,
+    generate_expression_from_ast,
+    get_mutable_ast,
     parse_expression_to_ast,
-    split_by_access,
 )
 from as2fm.as2fm_common.logging import check_assertion, get_error_msg, log_error
 from as2fm.scxml_converter.data_types.type_utils import (
@@ -127,12 +128,13 @@ def _validate_event_prefixes(msg_expr: str, prefixes: List[str]) -> bool:
 
 def get_plain_variable_name(in_name: str, xml_origin: Optional[XmlElement]) -> str:
     """Given a variable or param name with member access, generate the plain version with '__'."""
+    analyzed_name = analyze_expression(in_name, xml_origin)
     check_assertion(
-        not has_array_access(in_name, xml_origin),
+        not analyzed_name.has_array_access(xml_origin),
         xml_origin,
         f"Provided variable {in_name} contains array accesses, too.",
     )
-    expanded_name = split_by_access(in_name, xml_origin)
+    expanded_name = analyzed_name.get_access_path(xml_origin)
     return MEMBER_ACCESS_SUBSTITUTION.join(expanded_name)
 
 
@@ -274,7 +276,9 @@ def _assemble_object_for_length_access(
         # not an object (a base type)
         return _reassemble_expression(ast_array, array_idxs)
     all_expanded_members = [k for k in data_type.get_expanded_members().keys()]
-    expanded_member_node = parse_expression_to_ast(f"{member_var}.{all_expanded_members[0]}", None)
+    expanded_member_node = get_mutable_ast(
+        parse_expression_to_ast(f"{member_var}.{all_expanded_members[0]}", None)
+    )
     return _reassemble_expression(expanded_member_node, array_idxs)
 
 
@@ -368,14 +372,29 @@ def convert_expression_with_object_arrays(
     e.g. `my_polygons.polygons[0].points[1].y` => `my_polygons__polygons__points__y[0][1]`.
     """
     try:
-        ast = parse_expression_to_ast(expr, elem)
-        obj, idxs = _split_array_indexes_out(ast, struct_declarations)
-        exp = _reassemble_expression(obj, idxs)
-        exp = _convert_non_computed_member_exprs_to_identifiers(exp, None)
+        analyzed_expr = analyze_expression(expr, elem)
+        if struct_declarations is None:
+            # Without struct declarations, the result depends on the expression only
+            return analyzed_expr.get_derived(
+                "object_arrays_expanded",
+                lambda analyzed: _expand_object_arrays(analyzed.get_ast(elem), None),
+                elem,
+            )
+        return _expand_object_arrays(analyzed_expr.get_ast(elem), struct_declarations)
     except Exception as e:
         log_error(elem, f"Failed to expand the provided expression '{expr}'.")
         raise e
-    return ast_expression_to_string(exp)
+
+
+def _expand_object_arrays(
+    ast: esprima.nodes.Node, struct_declarations: Optional[ScxmlStructDeclarationsContainer]
+) -> str:
+    """Implementation of `convert_expression_with_object_arrays`."""
+    # The AST gets modified in place
+    obj, idxs = _split_array_indexes_out(get_mutable_ast(ast), struct_declarations)
+    exp = _reassemble_expression(obj, idxs)
+    exp = _convert_non_computed_member_exprs_to_identifiers(exp, None)
+    return generate_expression_from_ast(exp)
 
 
 def convert_expression_with_string_literals(
@@ -388,12 +407,16 @@ def convert_expression_with_string_literals(
     e.g. `'as2fm'` => `[97, 115, 50, 102, 109]`
     """
     try:
-        ast = parse_expression_to_ast(expr, elem)
-        exp = _convert_string_literals_to_int_arrays(ast)
+        return analyze_expression(expr, elem).get_derived(
+            "string_literals_as_int_arrays",
+            lambda analyzed: generate_expression_from_ast(
+                _convert_string_literals_to_int_arrays(get_mutable_ast(analyzed.get_ast(elem)))
+            ),
+            elem,
+        )
     except MemberAccessCheckException as e:
         log_error(elem, "Failed to expand the provided expression.")
         raise e
-    return ast_expression_to_string(exp)
 
 
 # ------------ String-related utilities ------------
@@ -0,0 +1,164 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the parser and printer of the supported ECMAScript subset"""
+
+import escodegen
+import esprima
+import pytest
+
+from as2fm.as2fm_common.ecmascript_fast_parser import (
+    UnsupportedEcmascriptSyntax,
+    get_printed_expression_ast,
+    parse_script_subset,
+    print_expression_subset,
+)
+
+SUPPORTED_EXPRESSIONS = [
+    "a",
+    "1",
+    "1.0",
+    "2.5e2",
+    ".5",
+    "1e-7",
+    "123456789012345678901234",
+    "true",
+    "null",
+    "'as2fm'",
+    '"it\'s"',
+    "a.b.c[0][i + 1].length",
+    "a.true",
+    "a + b * c - d / e % f",
+    "(a + b) * c",
+    "a - (b - c)",
+    "a || b && c",
+    "(a || b) && c",
+    "a == b != c === d !== e",
+    "a < b <= c > d >= e",
+    "a << b >> c >>> d & e | f ^ g",
+    "-a",
+    "- -a",
+    "-(-a)",
+    "!!a",
+    "+a + +b",
+    "a - -b",
+    "~a",
+    "-(a + b)",
+    "-a.b",
+    "(-a).b",
+    "Math.max(a, Math.min(b, 2))",
+    "f()",
+    "f()[0]",
+    "[]",
+    "[1, 2, [3, -4]]",
+    "[1, 2,]",
+    "{}",
+    "{a: 1, 'b': [1, 2], 3: {c: true},}",
+    "\n  a\n  + b  ",
+]
+
+UNSUPPORTED_EXPRESSIONS = [
+    "0x10",
+    "007",
+    "'\\n'",
+    "a ? b : c",
+    "a ** b",
+    "a++",
+    "a--b",
+    "typeof a",
+    "new Date()",
+    "this.a",
+    "a in b",
+    "[1, , 2]",
+    "{a}",
+    "a // comment",
+    "a <!-- b",
+    "(a, b)",
+    "f(a,)",
+    "() => a",
+    "a\nb",
+]
+
+
+def _escodegen_print(node: esprima.nodes.Node) -> str:
+    return escodegen.generate(node, options={"format": {"newline": "", "indent": {"style": ""}}})
+
+
+@pytest.mark.parametrize("expr", SUPPORTED_EXPRESSIONS)
+def test_subset_matches_esprima(expr: str):
+    """The generated AST and code must match esprima and escodegen."""
+    script = f"value = {expr}"
+    reference_ast = esprima.parseScript(script)
+    assert parse_script_subset(script).toDict() == reference_ast.toDict()
+    expr_node = reference_ast.body[0].expression.right
+    try:
+        assert print_expression_subset(expr_node) == _escodegen_print(expr_node)
+    except UnsupportedEcmascriptSyntax:
+        # Objects and strings requiring escapes are always printed by escodegen
+        assert expr_node.type in ("ObjectExpression", "Literal")
+
+
+@pytest.mark.parametrize("expr", UNSUPPORTED_EXPRESSIONS)
+def test_subset_unsupported(expr: str):
+    """Code outside of the subset must be left to esprima."""
+    with pytest.raises(UnsupportedEcmascriptSyntax):
+        parse_script_subset(f"value = {expr}")
+
+
+def test_subset_statements():
+    """Check the scripts that are not assignments."""
+    for script in ("a.b + 1", "a = b = c;", "a[0] = 1"):
+        assert parse_script_subset(script).toDict() == esprima.parseScript(script).toDict()
+    # Statements made of a string literal are directives, unless wrapped or empty
+    for script in ('"q"', "'a b';", '("q")', '""', '"q" + a', '"q".length', "123"):
+        assert parse_script_subset(script).toDict() == esprima.parseScript(script).toDict()
+    for script in ("{a: 1}", "a + 1 = 2", "a; b", "var a = 1", "if (a) b"):
+        with pytest.raises(UnsupportedEcmascriptSyntax):
+            parse_script_subset(script)
+
+
+def test_print_modified_ast():
+    """Nodes generated by the conversion must be printed as escodegen does."""
+    nodes = [
+        esprima.nodes.Identifier("_event.data.a__b"),
+        esprima.nodes.ArrayExpression([esprima.nodes.Literal(x, str(x)) for x in b"as2fm"]),
+        esprima.nodes.Literal(0.25, None),
+    ]
+    for node in nodes:
+        assert print_expression_subset(node) == _escodegen_print(node)
+    with pytest.raises(UnsupportedEcmascriptSyntax):
+        print_expression_subset(esprima.nodes.Literal(-1, None))
+
+
+def test_printed_expression_ast():
+    """The AST of the printed code must match the one the parser generates."""
+    nodes = [
+        esprima.nodes.Identifier("_event.data.a__b"),
+        esprima.nodes.BinaryExpression(
+            "+", esprima.nodes.Literal(1, "1.0"), esprima.nodes.Literal(0.25, None)
+        ),
+        esprima.nodes.ArrayExpression([esprima.nodes.Literal(x, str(x)) for x in b"as2fm"]),
+    ]
+    for node in nodes:
+        script = f"value = {print_expression_subset(node)}"
+        expected_ast = parse_script_subset(script).body[0].expression.right
+        assert get_printed_expression_ast(node).toDict() == expected_ast.toDict()
+    for name in ("a.0", "true.a", "a..b"):
+        with pytest.raises(UnsupportedEcmascriptSyntax):
+            get_printed_expression_ast(esprima.nodes.Identifier(name))
+
+
+if __name__ == "__main__":
+    pytest.main(["-s", "-v", __file__])
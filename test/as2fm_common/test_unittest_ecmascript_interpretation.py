@@ -15,16 +15,28 @@
 
 """Test the SCXML data conversion"""
 
+import pickle
 import unittest
+from copy import deepcopy
 
 import pytest
+from esprima.nodes import Identifier
 
 from as2fm.as2fm_common.array_type import ArrayInfo
 from as2fm.as2fm_common.ecmascript_interpretation import (
+    ArrayAccess,
+    FrozenAstModificationError,
     MemberAccessCheckException,
+    analyze_expression,
+    ast_expression_to_string,
+    clear_ecmascript_parse_cache,
+    generate_expression_from_ast,
+    get_ecmascript_parse_cache_info,
+    get_mutable_ast,
     has_array_access,
     has_member_access,
     parse_ecmascript_expr_to_type,
+    parse_expression_to_ast,
 )
 
 
@@ -118,6 +130,74 @@ class TestEcmascriptInterpreter(unittest.TestCase):
         self.assertRaises(MemberAccessCheckException, has_member_access, "c[1]()", None)
         self.assertRaises(RuntimeError, has_member_access, "d[]", None)
 
+    def test_parse_cache(self):
+        clear_ecmascript_parse_cache()
+        ast = parse_expression_to_ast("a.b[0] + Math.max(c, 2)", None)
+        self.assertIs(parse_expression_to_ast("a.b[0] + Math.max(c, 2)", None), ast)
+        cache_info = get_ecmascript_parse_cache_info()
+        self.assertEqual((cache_info["hits"], cache_info["misses"]), (1, 1))
+        # Failures are not cached, and reported at each call
+        self.assertRaises(RuntimeError, parse_expression_to_ast, "d[]", None)
+        self.assertRaises(RuntimeError, parse_expression_to_ast, "d[]", None)
+        self.assertEqual(get_ecmascript_parse_cache_info()["size"], 1)
+        # The shared AST cannot be modified
+        self.assertRaises(FrozenAstModificationError, setattr, ast, "operator", "-")
+        self.assertRaises(FrozenAstModificationError, setattr, ast.right, "arguments", [])
+        self.assertIsInstance(ast.right.arguments, tuple)
+        # Copies keep the AST content
+        for ast_copy in (deepcopy(ast), pickle.loads(pickle.dumps(ast))):
+            self.assertEqual(ast_expression_to_string(ast_copy), "a.b[0] + Math.max(c, 2)")
+        mutable_ast = get_mutable_ast(ast)
+        mutable_ast.operator = "-"
+        mutable_ast.right.arguments.pop()
+        self.assertEqual(ast_expression_to_string(mutable_ast), "a.b[0] - Math.max(c)")
+        self.assertEqual(ast_expression_to_string(ast), "a.b[0] + Math.max(c, 2)")
+
+    def test_analyzed_expression(self):
+        analyzed = analyze_expression("a.b[0]", None)
+        self.assertIs(analyze_expression("a.b[0]", None), analyzed)
+        self.assertTrue(analyzed.has_array_access())
+        self.assertTrue(analyzed.has_member_access())
+        self.assertFalse(analyzed.has_operators())
+        self.assertFalse(analyzed.is_literal())
+        self.assertEqual(analyzed.to_string(), "a.b[0]")
+        self.assertEqual(analyzed.get_access_path(), ["a", "b", ArrayAccess])
+        # The type depends on the referenced variables only
+        typed_expr = analyze_expression("x[0] + c.d", None)
+        int_array = {"x": ArrayInfo(int, 1, [None]), "c.d": int, "y": float}
+        self.assertIs(typed_expr.get_type(int_array), int)
+        self.assertIs(typed_expr.get_type({**int_array, "c.d": float}), float)
+        self.assertIs(typed_expr.get_type({**int_array, "y": int}), int)
+        # The returned values can be modified without affecting the next requests
+        array_expr = analyze_expression("[[1, 2], [3]]", None)
+        array_type = array_expr.get_type({})
+        array_type.substitute_unbounded_dims(5)
+        self.assertEqual(array_expr.get_type({}), ArrayInfo(int, 2, [None, None]))
+        array_expr.get_array_as_list().append([4])
+        self.assertEqual(array_expr.get_array_as_list(), [[1, 2], [3]])
+        self.assertEqual(
+            array_expr.get_derived("n_entries", lambda a: len(a.get_ast().elements)), 2
+        )
+
+    def test_generate_expression_from_ast(self):
+        clear_ecmascript_parse_cache()
+        converted_ast = get_mutable_ast(parse_expression_to_ast("a.b + 1.0 * f('x')", None))
+        converted_ast.left = Identifier("_event.data.b")
+        expression = generate_expression_from_ast(converted_ast)
+        self.assertEqual(expression, "_event.data.b + 1 * f('x')")
+        # The generated expression is analyzed without parsing it
+        n_parsed = get_ecmascript_parse_cache_info()["misses"]
+        analyzed = analyze_expression(expression, None)
+        self.assertIn("_event.data.b", analyzed.get_variable_names())
+        self.assertEqual(analyzed.get_ast().right.left.raw, "1")
+        self.assertEqual(get_ecmascript_parse_cache_info()["misses"], n_parsed)
+        # Expressions out of the printable subset are parsed on request
+        object_ast = get_mutable_ast(parse_expression_to_ast("{a: 1}", None))
+        object_expr = generate_expression_from_ast(object_ast)
+        n_parsed = get_ecmascript_parse_cache_info()["misses"]
+        analyze_expression(object_expr, None).get_ast()
+        self.assertEqual(get_ecmascript_parse_cache_info()["misses"], n_parsed + 1)
+
 
 if __name__ == "__main__":
     pytest.main(["-s", "-v", __file__])
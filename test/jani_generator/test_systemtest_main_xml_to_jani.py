@@ -15,14 +15,25 @@
 
 """Test the conversion from a main.xml to JANI and running it with SMC Storm."""
 
+import json
 import os
+import shutil
+from dataclasses import replace
 
 import pytest
 
+from as2fm.jani_generator.scxml_helpers import top_level_interpreter
 from as2fm.jani_generator.scxml_helpers.top_level_interpreter import (
     RoamlMain,
+    RoamlModelWatcher,
+    convert_full_model_to_jani,
+    get_model_input_files,
     interpret_top_level_xml,
+    interpret_top_level_xml_batch,
+    interpret_top_level_xml_variants,
 )
+from as2fm.scxml_converter.ascxml_extensions.ros_entries import AscxmlRootROS
+from as2fm.scxml_converter.ascxml_extensions.ros_entries.ros_utils import get_ros_type_definition
 
 from ..as2fm_common.test_utilities_smc_storm import run_smc_storm_with_output
 from .utils import json_jani_properties_match
@@ -610,3 +621,300 @@ def test_battery_example_w_bt_main_alarm_and_charge_removed():
         "expected_result_probability": 0.0,
     }
     _test_with_main(*c)
+
+
+def test_conversion_with_cache(tmp_path):
+    """Make sure the cached conversion results match with the non-cached ones."""
+    xml_main_path = os.path.join(os.path.dirname(__file__), "_test_data", "ros_example", "main.xml")
+    cache_dir = str(tmp_path / "cache")
+    jani_files = [str(tmp_path / f"main_{idx}.jani") for idx in range(3)]
+    interpret_top_level_xml(xml_main_path, jani_file=jani_files[0])
+    # The first run fills the cache, the second one loads all entries from it
+    interpret_top_level_xml(xml_main_path, jani_file=jani_files[1], cache_dir=cache_dir)
+    interpret_top_level_xml(xml_main_path, jani_file=jani_files[2], cache_dir=cache_dir)
+    assert set(os.listdir(cache_dir)) == {"jani_automata", "plain_scxml"}
+    jani_contents = []
+    for jani_file in jani_files:
+        with open(jani_file, "r", encoding="utf-8") as f:
+            jani_contents.append(f.read())
+    assert jani_contents[0] == jani_contents[1] == jani_contents[2]
+
+
+def test_conversion_cache_ros_interfaces(tmp_path, monkeypatch):
+    """Make sure the cached models are regenerated when the ROS interface definitions change."""
+    xml_main_path = os.path.join(os.path.dirname(__file__), "_test_data", "ros_example", "main.xml")
+    cache_dir = str(tmp_path / "cache")
+    plain_scxml_dir = os.path.join(cache_dir, "plain_scxml")
+    interpret_top_level_xml(
+        xml_main_path, jani_file=str(tmp_path / "main.jani"), cache_dir=cache_dir
+    )
+    initial_entries = set(os.listdir(plain_scxml_dir))
+    interpret_top_level_xml(
+        xml_main_path, jani_file=str(tmp_path / "main.jani"), cache_dir=cache_dir
+    )
+    assert set(os.listdir(plain_scxml_dir)) == initial_entries
+
+    def get_updated_ros_type_definition(type_definition, ros_interface):
+        # Simulate the addition of a field to all definitions, e.g. after rebuilding the messages
+        definition = get_ros_type_definition(type_definition, ros_interface)
+        return definition + ({"added_field": "int32"},)
+
+    monkeypatch.setattr(
+        top_level_interpreter, "get_ros_type_definition", get_updated_ros_type_definition
+    )
+    interpret_top_level_xml(
+        xml_main_path, jani_file=str(tmp_path / "main.jani"), cache_dir=cache_dir
+    )
+    # Both skills declare ROS interfaces: their entries are regenerated, the others are reused
+    updated_entries = set(os.listdir(plain_scxml_dir)) - initial_entries
+    assert len(updated_entries) == 2
+
+
+def test_conversion_profile(tmp_path):
+    """Make sure the profile reports all conversion stages and the generated automata."""
+    xml_main_path = os.path.join(os.path.dirname(__file__), "_test_data", "ros_example", "main.xml")
+    profile_file = str(tmp_path / "profile.json")
+    interpret_top_level_xml(
+        xml_main_path, jani_file=str(tmp_path / "main.jani"), profile_file=profile_file
+    )
+    with open(profile_file, "r", encoding="utf-8") as f:
+        profile_dict = json.load(f)
+    stage_names = [stage["name"] for stage in profile_dict["stages"]]
+    assert stage_names[0] == "total"
+    for expected_stage in [
+        "roaml_load",
+        "ascxml_load",
+        "to_plain_scxml",
+        "automata_conversion",
+        "events_to_syncs",
+        "random_variables_expansion",
+        "jani_expressions_preprocessing",
+        "serialization",
+    ]:
+        assert expected_stage in stage_names
+    automata_names = {automaton["name"] for automaton in profile_dict["automata"]}
+    assert {"BatteryDrainer", "BatteryManager", "autogenerated_global_timer"}.issubset(
+        automata_names
+    )
+    assert all(automaton["n_edges"] > 0 for automaton in profile_dict["automata"])
+
+
+@pytest.mark.parametrize("model_name", ["ros_example", "uc1_docking"])
+def test_out_of_core_conversion(tmp_path, model_name):
+    """Make sure the conversion with spilled automata matches with the in-memory one."""
+    xml_main_path = os.path.join(os.path.dirname(__file__), "_test_data", model_name, "main.xml")
+    jani_files = [str(tmp_path / f"main_{idx}.jani") for idx in range(2)]
+    interpret_top_level_xml(xml_main_path, jani_file=jani_files[0])
+    interpret_top_level_xml(xml_main_path, jani_file=jani_files[1], out_of_core=True)
+    jani_contents = []
+    for jani_file in jani_files:
+        with open(jani_file, "r", encoding="utf-8") as f:
+            jani_contents.append(f.read())
+    assert jani_contents[0] == jani_contents[1]
+
+
+def test_watcher_rebuild(tmp_path):
+    """Make sure the watcher detects the changed files and regenerates the JANI model."""
+    model_dir = str(tmp_path / "ros_example")
+    shutil.copytree(os.path.join(os.path.dirname(__file__), "_test_data", "ros_example"), model_dir)
+    xml_main_path = os.path.join(model_dir, "main.xml")
+    jani_path = os.path.join(model_dir, "main.jani")
+    watcher = RoamlModelWatcher(xml_main_path, jani_file="main.jani")
+    assert watcher.build()
+    assert watcher.get_changed_files() == []
+    with open(jani_path, "r", encoding="utf-8") as f:
+        initial_jani = f.read()
+    os.remove(jani_path)
+    drainer_path = os.path.join(model_dir, "battery_drainer.ascxml")
+    with open(drainer_path, "a", encoding="utf-8") as f:
+        f.write("<!-- Additional comment -->\n")
+    assert watcher.get_changed_files() == [drainer_path]
+    assert watcher.build()
+    assert watcher.get_changed_files() == []
+    with open(jani_path, "r", encoding="utf-8") as f:
+        assert f.read() == initial_jani
+
+
+def test_watcher_rebuild_after_failure(tmp_path):
+    """Make sure the watcher detects the fix of an input file that made the first build fail."""
+    model_dir = str(tmp_path / "ros_example")
+    shutil.copytree(os.path.join(os.path.dirname(__file__), "_test_data", "ros_example"), model_dir)
+    xml_main_path = os.path.join(model_dir, "main.xml")
+    jani_path = os.path.join(model_dir, "main.jani")
+    drainer_path = os.path.join(model_dir, "battery_drainer.ascxml")
+    with open(drainer_path, "r", encoding="utf-8") as f:
+        drainer_content = f.read()
+    with open(drainer_path, "w", encoding="utf-8") as f:
+        f.write("<scxml")
+    watcher = RoamlModelWatcher(xml_main_path, jani_file="main.jani")
+    assert not watcher.build()
+    assert not os.path.exists(jani_path)
+    assert watcher.get_changed_files() == []
+    with open(drainer_path, "w", encoding="utf-8") as f:
+        f.write(drainer_content)
+    assert watcher.get_changed_files() == [drainer_path]
+    assert watcher.build()
+    assert watcher.get_changed_files() == []
+    assert os.path.exists(jani_path)
+
+
+@pytest.mark.parametrize(
+    "model_name, main_xml, prebuilt_skills",
+    [
+        ("blackboard_test", "main.xml", False),
+        ("ros_example", "main.xml", True),
+        ("data_structs", "main_json_def.xml", False),
+        ("data_structs", "main_xml_def.xml", False),
+    ],
+)
+def test_in_memory_conversion(tmp_path, model_name, main_xml, prebuilt_skills):
+    """Make sure the in-memory conversion matches the file-based one, without reading files."""
+    xml_main_path = os.path.join(os.path.dirname(__file__), "_test_data", model_name, main_xml)
+    jani_path = str(tmp_path / "main.jani")
+    interpret_top_level_xml(xml_main_path, jani_file=jani_path)
+    with open(jani_path, "r", encoding="utf-8") as f:
+        expected_jani = json.load(f)
+    # Move all paths to a non-existing folder, to make sure only the in-memory sources are used
+    model = RoamlMain(xml_main_path).get_loaded_model()
+
+    def virtual(path: str) -> str:
+        return os.path.join(str(tmp_path), "virtual", os.path.basename(path))
+
+    sources = {}
+    for file_path in get_model_input_files(xml_main_path, model)[1:]:
+        with open(file_path, "r", encoding="utf-8") as f:
+            sources[virtual(file_path)] = f.read()
+    virtual_model = replace(
+        model,
+        data_declarations=[(fmt, virtual(path)) for fmt, path in model.data_declarations],
+        bt=None if model.bt is None else virtual(model.bt),
+        plugins=[virtual(path) for path in model.plugins],
+        skills=[virtual(path) for path in model.skills],
+        components=[virtual(path) for path in model.components],
+        properties=[virtual(path) for path in model.properties],
+    )
+    if prebuilt_skills:
+        # Models without custom data types, that can be loaded without the struct definitions
+        for skill_path, virtual_path in zip(model.skills, virtual_model.skills):
+            sources[virtual_path] = AscxmlRootROS.load_scxml_file(skill_path, {})
+    jani_model = convert_full_model_to_jani(virtual_model, sources)
+    assert json.loads(json.dumps(jani_model.as_dict())) == expected_jani
+
+
+@pytest.mark.parametrize(
+    "model_name, main_xml",
+    [
+        ("string_comparison", "main.xml"),
+        ("array_of_data_structs", "main.xml"),
+        ("data_structs", "main_xml_def.xml"),
+    ],
+)
+def test_array_and_struct_access_conversion(tmp_path, model_name, main_xml):
+    """Make sure the comparisons with constant arrays and the struct accesses are converted."""
+    xml_main_path = os.path.join(os.path.dirname(__file__), "_test_data", model_name, main_xml)
+    jani_path = str(tmp_path / "main.jani")
+    interpret_top_level_xml(xml_main_path, jani_file=jani_path)
+    with open(jani_path, "r", encoding="utf-8") as f:
+        jani_dict = json.load(f)
+    # Comparisons with constant arrays are expanded to a comparison per array entry
+    expressions_to_visit = [jani_dict["automata"]]
+    while len(expressions_to_visit) > 0:
+        entry = expressions_to_visit.pop()
+        if isinstance(entry, dict):
+            if entry.get("op") == "=":
+                assert all(
+                    not isinstance(entry[side], dict) or entry[side].get("op") != "av"
+                    for side in ("left", "right")
+                ), f"Unexpected array comparison: {entry}."
+            expressions_to_visit.extend(entry.values())
+        elif isinstance(entry, list):
+            expressions_to_visit.extend(entry)
+
+
+def test_variants_conversion(tmp_path):
+    """Make sure each model variant matches the conversion of the equivalent RoAML model."""
+    model_dir = str(tmp_path / "ros_example")
+    shutil.copytree(os.path.join(os.path.dirname(__file__), "_test_data", "ros_example"), model_dir)
+    xml_main_path = os.path.join(model_dir, "main.xml")
+    with open(xml_main_path, "r", encoding="utf-8") as f:
+        main_xml_content = f.read()
+    shutil.copyfile(
+        os.path.join(model_dir, "battery_properties.jani"),
+        os.path.join(model_dir, "other_properties.jani"),
+    )
+    with open(xml_main_path, "w", encoding="utf-8") as f:
+        f.write(
+            main_xml_content.replace(
+                '<input type="jani" src="./battery_properties.jani" />',
+                '<input type="jani" src="./battery_properties.jani" />'
+                '<input type="jani" src="./other_properties.jani" />',
+            )
+        )
+    generated_files, locations_reductions = interpret_top_level_xml_variants(
+        xml_main_path,
+        "main.jani",
+        [{"max_time": 50_000_000_000}, {"max_time": 100_000_000_000}],
+    )
+    assert [os.path.basename(jani_file) for jani_file in generated_files] == [
+        "main__max_time_50000000000__battery_properties.jani",
+        "main__max_time_50000000000__other_properties.jani",
+        "main__max_time_100000000000__battery_properties.jani",
+        "main__max_time_100000000000__other_properties.jani",
+    ]
+    jani_contents = []
+    for jani_file in generated_files:
+        with open(jani_file, "r", encoding="utf-8") as f:
+            jani_contents.append(f.read())
+    assert jani_contents[0] == jani_contents[1]
+    assert jani_contents[0] != jani_contents[2]
+    # The original model has max_time = 100s and the battery properties only
+    with open(xml_main_path, "w", encoding="utf-8") as f:
+        f.write(main_xml_content)
+    interpret_top_level_xml(xml_main_path, jani_file="main.jani")
+    with open(os.path.join(model_dir, "main.jani"), "r", encoding="utf-8") as f:
+        assert f.read() == jani_contents[2]
+    assert locations_reductions == []
+
+
+def test_locations_reduction_report(tmp_path, capsys):
+    """Make sure the reduction of the simplified automata is reported to the caller, not printed."""
+    model_dir = str(tmp_path / "ros_example")
+    shutil.copytree(os.path.join(os.path.dirname(__file__), "_test_data", "ros_example"), model_dir)
+    xml_main_path = os.path.join(model_dir, "main.xml")
+    assert interpret_top_level_xml(xml_main_path, jani_file="main.jani") is None
+    locations_reduction = interpret_top_level_xml(
+        xml_main_path, jani_file="main.jani", simplify_jani=True
+    )
+    assert locations_reduction is not None
+    assert 0 < locations_reduction.n_locations_after <= locations_reduction.n_locations_before
+    _, locations_reductions = interpret_top_level_xml_variants(
+        xml_main_path,
+        "main.jani",
+        [{"max_time": 50_000_000_000}, {"max_time": 100_000_000_000}],
+        simplify_jani=True,
+    )
+    assert len(locations_reductions) == 2
+    assert locations_reductions[1] == locations_reduction
+    assert "Jani locations" not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch_conversion(tmp_path, jobs):
+    """Make sure the batch conversion matches the conversion of each single model."""
+    test_data_dir = os.path.join(os.path.dirname(__file__), "_test_data")
+    bt_models_dir = str(tmp_path / "bt_test_models")
+    shutil.copytree(os.path.join(test_data_dir, "bt_test_models"), bt_models_dir)
+    # The models share the same plugins and control nodes, loaded once per process
+    xml_main_paths = [
+        os.path.join(bt_models_dir, main_xml)
+        for main_xml in ("main_test_fallback.xml", "main_test_reactive_sequence.xml", "bad.xml")
+    ]
+    results = interpret_top_level_xml_batch(xml_main_paths, jobs=jobs)
+    assert results == [True, True, False]
+    for xml_main_path in xml_main_paths[:2]:
+        batch_jani_path = xml_main_path.removesuffix(".xml") + ".jani"
+        with open(batch_jani_path, "r", encoding="utf-8") as f:
+            batch_jani = f.read()
+        interpret_top_level_xml(xml_main_path, jani_file="single.jani")
+        with open(os.path.join(bt_models_dir, "single.jani"), "r", encoding="utf-8") as f:
+            assert f.read() == batch_jani
@@ -34,6 +34,28 @@ from as2fm.scxml_converter.scxml_entries import ScxmlRoot
 
 rel_examples_folder = os.path.join("..", "..", "..", "examples")
 
+# Transitions on the same event, where each transition condition excludes the others
+GUARDS_SCXML = """
+<scxml
+  version="1.0"
+  name="GuardsExample"
+  initial="Idle">
+    <datamodel>
+        <data id="x" expr="0" type="int32" />
+    </datamodel>
+    <state id="Idle">
+        <transition event="tick" target="Idle" cond="x == 0">
+            <assign location="x" expr="1" />
+        </transition>
+        <transition event="tick" target="Idle" cond="x == 1">
+            <assign location="x" expr="2" />
+        </transition>
+        <transition event="tick" target="Idle" cond="x == 2">
+            <assign location="x" expr="0" />
+        </transition>
+    </state>
+</scxml>"""
+
 
 # pylint: disable=too-many-public-methods
 class TestConversion(unittest.TestCase):
@@ -123,6 +145,76 @@ class TestConversion(unittest.TestCase):
         self.assertEqual(variable["type"], "bool")
         self.assertEqual(variable["initial-value"], False)
 
+    def test_guards_of_transitions_on_same_event(self):
+        """
+        Transitions on the same event are mutually exclusive, following the document order.
+        """
+        scxml_root = ScxmlRoot.from_xml_tree(ET.fromstring(GUARDS_SCXML), [])
+        eh = EventsHolder()
+        jani_automaton = convert_scxml_root_to_jani_automaton(scxml_root, eh, 100)
+
+        automaton = jani_automaton.as_dict(constant={})
+        guards = [
+            edge["guard"]["exp"]
+            for edge in automaton["edges"]
+            if edge["location"] == "Idle" and edge["action"] == "tick_on_receive"
+        ]
+        self.assertEqual(len(guards), 4)
+
+        def x_equals(value):
+            return {"op": "=", "left": "x", "right": value}
+
+        def x_differs(value):
+            return {"op": "¬", "exp": x_equals(value)}
+
+        self.assertEqual(guards[0], x_equals(0))
+        self.assertEqual(guards[1], {"op": "∧", "left": x_equals(1), "right": x_differs(0)})
+        not_0_and_1 = {"op": "∧", "left": x_differs(0), "right": x_differs(1)}
+        self.assertEqual(guards[2], {"op": "∧", "left": x_equals(2), "right": not_0_and_1})
+        # The event is discarded when no condition holds
+        self.assertEqual(guards[3], {"op": "∧", "left": not_0_and_1, "right": x_differs(2)})
+
+    def test_guards_of_transitions_in_priority_chain(self):
+        """
+        With priority chains, the conditions on the same event are checked one at a time.
+        """
+        scxml_root = ScxmlRoot.from_xml_tree(ET.fromstring(GUARDS_SCXML), [])
+        eh = EventsHolder()
+        jani_automaton = convert_scxml_root_to_jani_automaton(
+            scxml_root, eh, 100, priority_chains=True
+        )
+
+        automaton = jani_automaton.as_dict(constant={})
+        edges = {(edge["location"], edge["action"]): edge for edge in automaton["edges"]}
+
+        def get_guard(location, action):
+            return edges[(location, action)]["guard"]["exp"]
+
+        def get_target(location, action):
+            return edges[(location, action)]["destinations"][0]["location"]
+
+        def x_equals(value):
+            return {"op": "=", "left": "x", "right": value}
+
+        def x_differs(value):
+            return {"op": "¬", "exp": x_equals(value)}
+
+        # The event is received once, without checking any condition
+        self.assertEqual(
+            len([edge for edge in automaton["edges"] if edge["location"] == "Idle"]), 1
+        )
+        self.assertNotIn("guard", edges[("Idle", "tick_on_receive")])
+        self.assertEqual(get_target("Idle", "tick_on_receive"), "Idle-tick-check-0")
+        receivers = eh.get_event("tick").get_receivers()
+        self.assertEqual([receiver.edge_action_name for receiver in receivers], ["tick_on_receive"])
+        for idx in range(3):
+            check_location = f"Idle-tick-check-{idx}"
+            self.assertEqual(get_guard(check_location, f"{check_location}-match"), x_equals(idx))
+            next_target = f"Idle-tick-check-{idx + 1}" if idx < 2 else "Idle"
+            next_action = f"{check_location}-next" if idx < 2 else f"{check_location}-Idle-parent-"
+            self.assertEqual(get_guard(check_location, next_action), x_differs(idx))
+            self.assertEqual(get_target(check_location, next_action), next_target)
+
     # pylint: disable=too-many-locals
     def test_example_with_sync(self):
         """
@@ -198,6 +290,22 @@ class TestConversion(unittest.TestCase):
         if os.path.exists(test_file):
             os.remove(test_file)
 
+    def test_example_with_sync_parallel(self):
+        """
+        Testing that the conversion in multiple processes matches the sequential one.
+        """
+        test_data_folder = os.path.join(os.path.dirname(__file__), "_test_data", "battery_example")
+        in_scxmls = [
+            ScxmlRoot.load_scxml_file(os.path.join(test_data_folder, scxml_file), {})
+            for scxml_file in ("battery_drainer.scxml", "battery_manager.scxml")
+        ]
+        serial_jani_dict = convert_multiple_scxmls_to_jani(in_scxmls, 100).as_dict()
+        parallel_jani_dict = convert_multiple_scxmls_to_jani(in_scxmls, 100, jobs=2).as_dict()
+        self.maxDiff = None  # pylint: disable=invalid-name
+        self.assertEqual(
+            json.dumps(serial_jani_dict, indent=2), json.dumps(parallel_jani_dict, indent=2)
+        )
+
     def test_command_line_output_with_line_numbers(self):
         """Test the command line output with line numbers for the main.xml file."""
         tmp_test_dir = os.path.join("/tmp", "test_as2fm")
@@ -0,0 +1,73 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the conversion of the generated synthetic models to JANI."""
+
+import json
+import os
+
+import pytest
+
+from as2fm.jani_generator.main import main_generate_synthetic_model
+from as2fm.jani_generator.scxml_helpers.top_level_interpreter import interpret_top_level_xml
+from as2fm.jani_generator.synthetic_model_generator import (
+    SyntheticModelConfig,
+    generate_synthetic_model,
+)
+
+
+@pytest.mark.parametrize(
+    "model_config, expected_automata",
+    [
+        # Two nodes, the global timer and the data and clock topic handlers
+        (SyntheticModelConfig(), 5),
+        (SyntheticModelConfig(n_nodes=5, n_topics=8, subscribers_per_topic=3, array_size=4), 15),
+        (SyntheticModelConfig(n_nodes=0, n_topics=0, n_timers=0, n_services=2), 16),
+        (
+            SyntheticModelConfig(
+                n_nodes=0, n_topics=0, n_timers=0, n_actions=1, n_action_threads=3
+            ),
+            18,
+        ),
+        (SyntheticModelConfig(bt_depth=2, bt_width=3), 79),
+    ],
+)
+def test_synthetic_model_conversion(tmp_path, model_config, expected_automata):
+    """Test that the synthetic models are converted, and their size follows the configuration."""
+    main_xml = generate_synthetic_model(model_config, str(tmp_path))
+    jani_file = os.path.join(tmp_path, "main.jani")
+    interpret_top_level_xml(main_xml, jani_file=jani_file)
+    with open(jani_file, "r", encoding="utf-8") as f:
+        jani_dict = json.load(f)
+    assert len(jani_dict["automata"]) == expected_automata
+    property_exp = jani_dict["properties"][0]["expression"]["values"]["exp"]["right"]
+    assert property_exp in {jani_var["name"] for jani_var in jani_dict["variables"]}
+
+
+def test_synthetic_model_cli(tmp_path):
+    """Test the generation of a synthetic model from the command line."""
+    main_generate_synthetic_model(
+        [str(tmp_path), "--nodes", "3", "--topics", "3", "--timers", "2", "--timer-rates", "1", "5"]
+    )
+    expected_files = {f"node_{idx}.ascxml" for idx in range(3)} | {"main.xml", "properties.jani"}
+    assert set(os.listdir(tmp_path)) == expected_files
+    with open(os.path.join(tmp_path, "node_1.ascxml"), "r", encoding="utf-8") as f:
+        assert 'rate_hz="5.0"' in f.read()
+
+
+def test_invalid_synthetic_model(tmp_path):
+    """Test that inconsistent configurations are rejected."""
+    with pytest.raises(AssertionError):
+        generate_synthetic_model(SyntheticModelConfig(n_nodes=2, subscribers_per_topic=2), tmp_path)
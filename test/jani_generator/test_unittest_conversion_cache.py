@@ -0,0 +1,125 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the on-disk cache of the conversion results."""
+
+import os
+
+from lxml import etree as ET
+
+from as2fm.as2fm_common.logging import INTERNAL_FILEPATH_ATTR, get_error_msg
+from as2fm.jani_generator.scxml_helpers.conversion_cache import ConversionCache, dump_to_bytes
+
+
+def test_cache_keys():
+    """Keys must only depend on the provided entries."""
+    key = ConversionCache.make_key("model", 100, b"content")
+    assert key == ConversionCache.make_key("model", 100, b"content")
+    assert key != ConversionCache.make_key("model", 10, b"content")
+    assert key != ConversionCache.make_key("model", 100, b"other content")
+    # Different entries must not be concatenated into the same key
+    assert ConversionCache.make_key("ab", "c") != ConversionCache.make_key("a", "bc")
+
+
+def test_cache_files_hash(tmp_path):
+    """The files hash must change with their content."""
+    test_file = tmp_path / "model.ascxml"
+    test_file.write_text("<ascxml/>")
+    initial_hash = ConversionCache.hash_files([str(test_file)])
+    assert initial_hash == ConversionCache.hash_files([str(test_file)])
+    test_file.write_text("<ascxml />")
+    assert initial_hash != ConversionCache.hash_files([str(test_file)])
+
+
+def test_cache_store_and_load(tmp_path):
+    """Entries with XML elements can be stored, retaining their location in the original file."""
+    xml_tree = ET.fromstring("<scxml>\n<state id='a'/>\n</scxml>")
+    xml_tree.set(INTERNAL_FILEPATH_ATTR, "./model.scxml")
+    xml_state = xml_tree[0]
+    xml_state.set(INTERNAL_FILEPATH_ATTR, "./model.scxml")
+    cache = ConversionCache(str(tmp_path))
+    key = ConversionCache.make_key("test_entry")
+    assert cache.load("test", key) is None
+    cache.store("test", key, {"name": "a", "origin": xml_state})
+    loaded_entry = cache.load("test", key)
+    assert loaded_entry["name"] == "a"
+    assert get_error_msg(loaded_entry["origin"], "Error.") == get_error_msg(xml_state, "Error.")
+    assert cache.get_stats() == (1, 1)
+
+
+def test_cache_shared_objects(tmp_path):
+    """Shared objects are returned as they are, and never written to file."""
+    cache = ConversionCache(str(tmp_path))
+    key = ConversionCache.make_key("shared_entry")
+    assert cache.load_shared("test", key) is None
+    shared_entry = {"name": "a"}
+    cache.store_shared("test", key, shared_entry)
+    assert cache.load_shared("test", key) is shared_entry
+    assert cache.load("test", key) is None
+    assert os.listdir(tmp_path) == []
+    assert cache.get_stats() == (1, 2)
+
+
+def test_cache_shared_objects_bound():
+    """The least recently used shared objects are removed once there are too many of them."""
+    cache = ConversionCache(max_shared_objects=2)
+    keys = [ConversionCache.make_key(f"shared_entry_{idx}") for idx in range(3)]
+    shared_entries = [{"name": f"entry_{idx}"} for idx in range(3)]
+    cache.store_shared("test", keys[0], shared_entries[0])
+    cache.store_shared("test", keys[1], shared_entries[1])
+    # Loading an object marks it as the most recently used
+    assert cache.load_shared("test", keys[0]) is shared_entries[0]
+    cache.store_shared("test", keys[2], shared_entries[2])
+    assert cache.load_shared("test", keys[1]) is None
+    assert cache.load_shared("test", keys[0]) is shared_entries[0]
+    assert cache.load_shared("test", keys[2]) is shared_entries[2]
+
+
+def test_cache_prune(tmp_path):
+    """The least recently used entries are removed once the cache exceeds its size."""
+    entry = "x" * 1000
+    entry_size = len(dump_to_bytes(entry))
+    for cache_dir in [str(tmp_path), None]:
+        cache = ConversionCache(cache_dir, max_size=2 * entry_size)
+        keys = [ConversionCache.make_key(f"entry_{idx}") for idx in range(3)]
+        cache.store("test", keys[0], entry)
+        cache.store("test", keys[1], entry)
+        if cache_dir is not None:
+            # Make sure the file times differ, even with a coarse timestamp resolution
+            os.utime(os.path.join(cache_dir, "test", f"{keys[0]}.pickle"), (1, 1))
+            os.utime(os.path.join(cache_dir, "test", f"{keys[1]}.pickle"), (2, 2))
+        # Loading an entry marks it as the most recently used
+        assert cache.load("test", keys[0]) == entry
+        cache.store("test", keys[2], entry)
+        assert cache.load("test", keys[1]) is None
+        assert cache.load("test", keys[0]) == entry
+        assert cache.load("test", keys[2]) == entry
+        cache.prune(0)
+        assert cache.load("test", keys[0]) is None
+
+
+def test_cache_clear(tmp_path):
+    """Clearing the cache removes both the stored entries and the shared objects."""
+    cache = ConversionCache(str(tmp_path))
+    key = ConversionCache.make_key("entry")
+    cache.store("test", key, {"name": "a"})
+    cache.store_shared("test", key, {"name": "a"})
+    cache.clear()
+    assert cache.load("test", key) is None
+    assert cache.load_shared("test", key) is None
+    assert os.listdir(tmp_path) == []
+    # The cache can still be used after clearing it
+    cache.store("test", key, {"name": "b"})
+    assert cache.load("test", key) == {"name": "b"}
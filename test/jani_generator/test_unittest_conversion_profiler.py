@@ -0,0 +1,98 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the profiler of the conversion stages"""
+
+import json
+import os
+import tracemalloc
+
+from as2fm.jani_generator.jani_entries import JaniAutomaton, JaniEdge
+from as2fm.jani_generator.scxml_helpers.conversion_profiler import (
+    AutomatonProfile,
+    ConversionProfiler,
+    profile_stage,
+)
+
+
+def test_nested_stages():
+    """
+    Test that repeated stages are merged, and that memory peaks propagate to the outer stages.
+    """
+    with ConversionProfiler() as profiler:
+        assert tracemalloc.is_tracing()
+        with profile_stage(profiler, "outer"):
+            for _ in range(2):
+                with profile_stage(profiler, "inner"):
+                    allocated_data = bytearray(2**22)
+                    del allocated_data
+    assert not tracemalloc.is_tracing()
+    stages = profiler.get_stages()
+    assert [stage.name for stage in stages] == ["outer", "inner"]
+    assert [stage.calls for stage in stages] == [1, 2]
+    assert stages[1].peak_traced_memory_mb >= 4.0
+    assert stages[0].peak_traced_memory_mb >= stages[1].peak_traced_memory_mb
+    assert stages[0].wall_time_s >= stages[1].wall_time_s
+    with profile_stage(None, "no_profiler"):
+        pass
+
+
+def test_profile_export(tmp_path):
+    """
+    Test the export of the profile, including the automata information.
+    """
+    automaton = JaniAutomaton()
+    automaton.set_name("test_automaton")
+    automaton.add_location("start", is_initial=True)
+    automaton.add_location("end")
+    automaton.add_edge(
+        JaniEdge(
+            {
+                "location": "start",
+                "action": "go",
+                "destinations": [{"location": "end", "assignments": []}],
+            }
+        )
+    )
+    profiler = ConversionProfiler()
+    with profiler, profiler.stage("conversion"):
+        profiler.add_automaton(AutomatonProfile.from_automaton(automaton, 0.5, 0.25))
+        profiler.add_automaton(AutomatonProfile.from_automaton(automaton))
+    profile_file = os.path.join(tmp_path, "profile.json")
+    profiler.write(profile_file)
+    with open(profile_file, "r", encoding="utf-8") as f:
+        profile_dict = json.load(f)
+    assert [stage["name"] for stage in profile_dict["stages"]] == ["conversion"]
+    assert profile_dict["ecmascript_parse_cache"]["hits"] >= 0
+    assert profile_dict["automata"] == [
+        {
+            "name": "test_automaton",
+            "cached": False,
+            "wall_time_s": 0.5,
+            "cpu_time_s": 0.25,
+            "n_edges": 1,
+            "n_locations": 2,
+            "n_variables": 0,
+        },
+        {
+            "name": "test_automaton",
+            "cached": True,
+            "wall_time_s": None,
+            "cpu_time_s": None,
+            "n_edges": 1,
+            "n_locations": 2,
+            "n_variables": 0,
+        },
+    ]
@@ -18,9 +18,15 @@
 
 import pytest
 
-from as2fm.jani_generator.jani_entries import generate_jani_expression
+from as2fm.jani_generator.jani_entries import JaniModel, generate_jani_expression
 from as2fm.jani_generator.jani_entries.jani_expression_support import (
     expand_distribution_expressions,
+    extract_distributions,
+    simplify_expression,
+)
+from as2fm.jani_generator.jani_entries.jani_helpers import (
+    expand_random_variables_in_jani_model,
+    simplify_expressions_in_jani_model,
 )
 
 
@@ -182,3 +188,217 @@ def test_jani_expression_expansion_expr_with_multiple_distribution():
         "op": "av",
         "elements": [1.0, 0.95, 3.0, 0.95],
     }
+
+
+def test_jani_expression_extract_distributions():
+    """
+    Test the substitution of each distribution with a variable, also if the same one is repeated.
+    """
+    uniform_dist = {"distribution": "Uniform", "args": [0.0, 1.0]}
+    jani_expression = generate_jani_expression(
+        {"op": "+", "left": uniform_dist, "right": {"op": "*", "left": uniform_dist, "right": "x"}}
+    )
+    assert jani_expression.has_distribution()
+    sampled_expression, distributions = extract_distributions(
+        jani_expression, lambda dist_idx: f"sample_{dist_idx}"
+    )
+    assert not sampled_expression.has_distribution()
+    assert sampled_expression.as_dict() == {
+        "op": "+",
+        "left": "sample_0",
+        "right": {"op": "*", "left": "sample_1", "right": "x"},
+    }
+    assert [dist.as_dict() for dist in distributions] == [uniform_dist, uniform_dist]
+    # Expressions without distributions are left untouched
+    jani_expression = generate_jani_expression({"op": "+", "left": "x", "right": 1})
+    assert extract_distributions(jani_expression, str) == (jani_expression, [])
+
+
+def _get_random_model_dict(assignments: list) -> dict:
+    """Generate a model with an edge executing the provided assignments."""
+    return {
+        "name": "random_test",
+        "variables": [],
+        "constants": [],
+        "automata": [
+            {
+                "name": "aut",
+                "locations": [{"name": "loc"}],
+                "initial-locations": ["loc"],
+                "variables": [
+                    {"name": "x", "type": "real", "initial-value": 0.0},
+                    {"name": "y", "type": "real", "initial-value": 0.0},
+                ],
+                "edges": [
+                    {
+                        "location": "loc",
+                        "action": "step",
+                        "destinations": [{"location": "loc", "assignments": assignments}],
+                    }
+                ],
+            }
+        ],
+        "system": {"elements": [{"automaton": "aut"}], "syncs": []},
+        "properties": [],
+    }
+
+
+def test_jani_model_random_variables_expansion():
+    """
+    Test that the distributions in an assignment are sampled one after the other.
+    """
+    uniform_dist = {"distribution": "Uniform", "args": [0.0, 1.0]}
+    jani_model = JaniModel.from_dict(
+        _get_random_model_dict(
+            [
+                {"ref": "x", "value": {"op": "+", "left": uniform_dist, "right": uniform_dist}},
+                {"ref": "y", "value": uniform_dist},
+            ]
+        )
+    )
+    expand_random_variables_in_jani_model(jani_model, n_options=10, n_options_per_variable={"y": 4})
+    automaton_dict = jani_model.get_automata()[0].as_dict({})
+    n_destinations = [len(edge["destinations"]) for edge in automaton_dict["edges"]]
+    # Original edge, sampling x twice, continuation, sampling y, continuation
+    assert n_destinations == [1, 10, 10, 1, 4, 1]
+    sample_vars = [
+        var["name"] for var in automaton_dict["variables"] if var["name"] not in ("x", "y")
+    ]
+    assert len(sample_vars) == 2
+    x_assignments = automaton_dict["edges"][3]["destinations"][0]["assignments"]
+    assert x_assignments[0] == {
+        "ref": "x",
+        "value": {"op": "+", "left": sample_vars[0], "right": sample_vars[1]},
+        "index": 0,
+    }
+    # The samples are reset together with the assignment
+    assert [assign["ref"] for assign in x_assignments[1:]] == sample_vars
+    for edge in automaton_dict["edges"]:
+        for destination in edge["destinations"]:
+            for assignment in destination["assignments"]:
+                assert not generate_jani_expression(assignment["value"]).has_distribution()
+
+
+@pytest.mark.parametrize(
+    "input_expr, expected_expr",
+    [
+        # Constant folding
+        ({"op": "+", "left": 1, "right": {"op": "*", "left": 2, "right": 3}}, 7),
+        ({"op": "/", "left": 3, "right": 2}, 1.5),
+        ({"op": "/", "left": 4, "right": 2}, 2.0),
+        ({"op": "floor", "exp": {"op": "*", "left": 0.55, "right": 20}}, 11),
+        ({"op": "-", "left": 0, "right": 5}, -5),
+        ({"op": "≤", "left": 0.5, "right": 0.25}, False),
+        ({"op": "==", "left": True, "right": False}, False),
+        ({"op": "ite", "if": {"op": "<", "left": 1, "right": 2}, "then": "a", "else": "b"}, "a"),
+        # Not folded: division by zero, mixed bool and int, negative modulo, constants
+        ({"op": "/", "left": 1, "right": 0}, {"op": "/", "left": 1, "right": 0}),
+        ({"op": "=", "left": True, "right": 1}, {"op": "=", "left": True, "right": 1}),
+        ({"op": "%", "left": -3, "right": 2}, {"op": "%", "left": -3, "right": 2}),
+        ({"op": "*", "left": {"constant": "π"}, "right": 2}, None),
+        # Neutral and absorbing elements
+        ({"op": "+", "left": "x", "right": 0}, "x"),
+        ({"op": "*", "left": 1, "right": "x"}, "x"),
+        ({"op": "+", "left": "x", "right": 0.0}, None),
+        ({"op": "∧", "left": True, "right": "c"}, "c"),
+        ({"op": "&&", "left": "c", "right": False}, False),
+        ({"op": "∨", "left": "c", "right": True}, True),
+        ({"op": "⇒", "left": "c", "right": False}, {"op": "¬", "exp": "c"}),
+        # Duplicated conjuncts and double negation
+        (
+            {
+                "op": "∧",
+                "left": {"op": "∧", "left": "a", "right": {"op": "¬", "exp": "b"}},
+                "right": {
+                    "op": "∧",
+                    "left": {"op": "!", "exp": {"op": "¬", "exp": "a"}},
+                    "right": "c",
+                },
+            },
+            {
+                "op": "∧",
+                "left": {"op": "∧", "left": "a", "right": {"op": "¬", "exp": "b"}},
+                "right": "c",
+            },
+        ),
+        ({"op": "∨", "left": "a", "right": "a"}, "a"),
+        # Sub-expressions are simplified also in arrays
+        (
+            {"op": "av", "elements": [{"op": "+", "left": 1, "right": 1}, "x"]},
+            {"op": "av", "elements": [2, "x"]},
+        ),
+    ],
+)
+def test_jani_expression_simplification(input_expr, expected_expr):
+    """Test the simplification of expressions. If expected_expr is None, nothing changes."""
+    jani_expression = generate_jani_expression(input_expr)
+    simplified_expression = simplify_expression(jani_expression)
+    if expected_expr is None:
+        assert simplified_expression is jani_expression
+    else:
+        expected_dict = generate_jani_expression(expected_expr).as_dict()
+        assert simplified_expression.as_dict() == expected_dict
+        assert type(simplified_expression.as_dict()) is type(expected_dict)
+
+
+def test_jani_model_simplification():
+    """Test the removal of the trivial guards and of the assignments of a variable to itself."""
+    jani_model = JaniModel.from_dict(
+        {
+            "name": "simplification_test",
+            "variables": [{"name": "x", "type": "int", "initial-value": 0}],
+            "constants": [],
+            "automata": [
+                {
+                    "name": "aut",
+                    "locations": [{"name": "loc"}],
+                    "initial-locations": ["loc"],
+                    "edges": [
+                        {
+                            "location": "loc",
+                            "action": "step",
+                            "guard": {"exp": {"op": "∧", "left": True, "right": True}},
+                            "destinations": [
+                                {
+                                    "location": "loc",
+                                    "assignments": [
+                                        {"ref": "x", "value": {"op": "+", "left": "x", "right": 0}},
+                                        {"ref": "x", "value": {"op": "+", "left": "x", "right": 1}},
+                                    ],
+                                }
+                            ],
+                        },
+                        {
+                            "location": "loc",
+                            "action": "reset",
+                            "guard": {
+                                "exp": {
+                                    "op": "∧",
+                                    "left": {
+                                        "op": "¬",
+                                        "exp": {
+                                            "op": "¬",
+                                            "exp": {"op": ">", "left": "x", "right": 10},
+                                        },
+                                    },
+                                    "right": True,
+                                }
+                            },
+                            "destinations": [
+                                {"location": "loc", "assignments": [{"ref": "x", "value": 0}]}
+                            ],
+                        },
+                    ],
+                }
+            ],
+            "system": {"elements": [{"automaton": "aut"}], "syncs": []},
+            "properties": [],
+        }
+    )
+    simplify_expressions_in_jani_model(jani_model)
+    step_edge, reset_edge = jani_model.get_automata()[0].as_dict({})["edges"]
+    assert "guard" not in step_edge
+    assert step_edge["destinations"][0]["assignments"] == [
+        {"ref": "x", "value": {"op": "+", "left": "x", "right": 1}, "index": 0}
+    ]
+    assert reset_edge["guard"] == {"exp": {"op": ">", "left": "x", "right": 10}}
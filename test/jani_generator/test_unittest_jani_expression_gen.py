@@ -13,12 +13,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+import pickle
+
 import pytest
 
 from as2fm.as2fm_common.array_type import ArrayInfo
+from as2fm.jani_generator.jani_entries import JaniExpression
 from as2fm.jani_generator.jani_entries.jani_expression_generator import (
+    and_operator,
     array_create_operator,
     array_value_operator,
+    not_operator,
 )
 
 
@@ -105,3 +111,54 @@ def test_array_value_operator():
     array = [[], [[1], [2, 3]], [[4, 5], []]]
     result = array_value_operator(array)
     __validate_array_value_operator(result.as_dict(), array)
+
+
+def test_expressions_interning():
+    """Identical expressions must be shared, without being modifiable."""
+    cond = {"op": "<", "left": "_event.data.x", "right": 1}
+    jani_expr = and_operator(JaniExpression(cond), not_operator(JaniExpression(cond)))
+    assert jani_expr is and_operator(JaniExpression(cond), not_operator(JaniExpression(cond)))
+    assert jani_expr.operands["left"] is jani_expr.operands["right"].operands["exp"]
+    assert jani_expr.as_dict() is jani_expr.as_dict()
+    # Literals of different types must be kept apart
+    assert JaniExpression(1) != JaniExpression(1.0)
+    assert JaniExpression(1) != JaniExpression(True)
+    # Literals comparing equal, but serialized differently, must be kept apart as well
+    positive_zero = JaniExpression({"op": "*", "left": "x", "right": 0.0})
+    negative_zero = JaniExpression({"op": "*", "left": "x", "right": -0.0})
+    assert JaniExpression(-0.0) is not JaniExpression(0.0)
+    assert negative_zero is not positive_zero
+    assert json.dumps(JaniExpression(-0.0).as_dict()) == "-0.0"
+    assert json.dumps(negative_zero.as_dict()["right"]) == "-0.0"
+    assert json.dumps(positive_zero.as_dict()["right"]) == "0.0"
+    assert pickle.loads(pickle.dumps(negative_zero)) is negative_zero
+    with pytest.raises(AttributeError):
+        jani_expr.op = "∨"
+    # Modifications generate new expressions
+    replaced_expr = jani_expr.replace_event("ev")
+    assert replaced_expr.operands["left"].as_dict() == {"op": "<", "left": "ev__x", "right": 1}
+    assert jani_expr.operands["left"].as_dict() == cond
+    assert replaced_expr.replace_event("ev") is replaced_expr
+    assert jani_expr.with_comment("test").as_dict()["comment"] == "test"
+    assert pickle.loads(pickle.dumps(jani_expr)) is jani_expr
+
+
+def test_expressions_list_operands_interning():
+    """The lists of operands of shared expressions must not be modifiable either."""
+    jani_expr = array_value_operator([1, 2, 3])
+    shared_expr = array_value_operator([1, 2, 3])
+    assert jani_expr is shared_expr
+    elements = jani_expr.operands["elements"]
+    assert elements == (JaniExpression(1), JaniExpression(2), JaniExpression(3))
+    with pytest.raises(AttributeError):
+        elements.append(JaniExpression(4))
+    with pytest.raises(TypeError):
+        elements[0] = JaniExpression(4)
+    with pytest.raises(TypeError):
+        jani_expr.operands["elements"] = [JaniExpression(4)]
+    assert shared_expr.as_dict() == {"op": "av", "elements": [1, 2, 3]}
+    # Lists of expressions are accepted when generating new expressions
+    assert jani_expr.with_operands({"elements": list(elements)}) is jani_expr
+    extended_expr = jani_expr.with_operands({"elements": list(elements) + [JaniExpression(4)]})
+    assert extended_expr.as_dict() == {"op": "av", "elements": [1, 2, 3, 4]}
+    assert pickle.loads(pickle.dumps(extended_expr)) is extended_expr
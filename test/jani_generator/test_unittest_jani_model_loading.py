@@ -17,8 +17,21 @@
 
 import json
 import os
+from copy import deepcopy
 
-from as2fm.jani_generator.jani_entries import JaniModel
+import pytest
+
+from as2fm.jani_generator.jani_entries import (
+    JaniAssignment,
+    JaniAutomaton,
+    JaniComposition,
+    JaniEdge,
+    JaniExpression,
+    JaniGuard,
+    JaniModel,
+    JaniVariable,
+)
+from as2fm.jani_generator.jani_entries.jani_helpers import reduce_locations_in_jani_model
 
 
 def test_jani_file_loading():
@@ -37,3 +50,413 @@ def test_jani_file_loading():
     assert len(jani_model.get_variables()) == 2
     assert len(jani_model.get_constants()) == 0
     assert len(jani_model.get_automata()) == 1
+
+
+def test_jani_model_repeated_serialization():
+    """
+    Test that serializing a model again returns the cached entries, unless they were modified.
+    """
+    jani_file = os.path.join(
+        os.path.dirname(__file__), "_test_data", "plain_jani_examples", "array_test.jani"
+    )
+    with open(jani_file, "r", encoding="utf-8") as file:
+        convince_jani_json = json.load(file)
+    jani_model = JaniModel.from_dict(convince_jani_json)
+    first_dict = jani_model.as_dict()
+    first_dict_copy = deepcopy(first_dict)
+    second_dict = jani_model.as_dict()
+    assert second_dict == first_dict
+    assert second_dict["automata"][0] is first_dict["automata"][0]
+    # Modify the automaton: only the changed edge is generated again
+    automaton = jani_model.get_automata()[0]
+    edge = automaton.get_edges()[0]
+    edge.guard = JaniGuard(JaniExpression({"op": "<", "left": "next_id", "right": 10}))
+    edge.destinations[0].assignments[1].set_expression(JaniExpression(0))
+    automaton.add_location("done")
+    edge.destinations[0].location = "done"
+    modified_automaton = jani_model.as_dict()["automata"][0]
+    assert modified_automaton is not first_dict["automata"][0]
+    assert [loc["name"] for loc in modified_automaton["locations"]] == ["done", "step"]
+    modified_edge = modified_automaton["edges"][0]
+    assert modified_edge["guard"] == {"exp": {"op": "<", "left": "next_id", "right": 10}}
+    assert modified_edge["destinations"][0]["location"] == "done"
+    assert modified_edge["destinations"][0]["assignments"][0] is (
+        first_dict["automata"][0]["edges"][0]["destinations"][0]["assignments"][0]
+    )
+    assert modified_edge["destinations"][0]["assignments"][1] == {
+        "ref": "next_id",
+        "value": 0,
+        "index": 1,
+    }
+    # The dictionaries generated before are left untouched
+    assert first_dict == first_dict_copy
+
+
+def test_jani_automaton_serialization_updates():
+    """Test that each change of an automaton, its edges or their content is serialized again."""
+    automaton = JaniAutomaton(
+        automaton_dict={
+            "name": "aut",
+            "locations": [{"name": "a"}, {"name": "b"}],
+            "initial-locations": ["a"],
+            "edges": [
+                {
+                    "location": location,
+                    "action": f"from_{location}",
+                    "guard": {"exp": True},
+                    "destinations": [
+                        {"location": "a", "assignments": [{"ref": "x", "value": 1}]},
+                        {"location": "b", "probability": {"exp": 0.5}},
+                    ],
+                }
+                for location in ("a", "b")
+            ],
+        }
+    )
+    changed_edge, other_edge = automaton.get_edges()
+    changed_destination = changed_edge.destinations[1]
+    modifications = [
+        lambda: changed_edge.guard.set_expression(JaniExpression(False)),
+        lambda: setattr(changed_edge, "guard", None),
+        lambda: changed_edge.destinations[0].assignments[0].set_expression(JaniExpression(2)),
+        lambda: setattr(changed_destination, "location", "a"),
+        lambda: setattr(changed_destination, "probability", JaniExpression(0.25)),
+        lambda: setattr(
+            changed_destination, "assignments", [JaniAssignment({"ref": "y", "value": 3})]
+        ),
+        lambda: changed_edge.append_destination(location="b"),
+        lambda: automaton.set_edge_action(changed_edge, "renamed"),
+    ]
+    for modify in modifications:
+        automaton_dict = automaton.as_dict()
+        assert automaton.as_dict() is automaton_dict
+        modify()
+        modified_dict = automaton.as_dict()
+        assert modified_dict is not automaton_dict
+        assert modified_dict["edges"][0] != automaton_dict["edges"][0]
+        assert modified_dict["edges"][1] is automaton_dict["edges"][1]
+    assert (
+        automaton.as_dict()["edges"][0]
+        == changed_edge.as_dict()
+        == {
+            "location": "a",
+            "action": "renamed",
+            "destinations": [
+                {"location": "a", "assignments": [{"ref": "x", "value": 2, "index": 0}]},
+                {
+                    "location": "a",
+                    "probability": {"exp": 0.25},
+                    "assignments": [{"ref": "y", "value": 3, "index": 0}],
+                },
+                {"location": "b", "assignments": []},
+            ],
+        }
+    )
+    # Changes of the edges that were removed do not affect the automaton anymore
+    automaton.remove_edges([changed_edge])
+    automaton_dict = automaton.as_dict()
+    assert len(automaton_dict["edges"]) == 1
+    changed_edge.set_action("removed")
+    automaton.add_variable(JaniVariable("x", int, 0))
+    assert automaton.as_dict() is not automaton_dict
+    automaton_dict = automaton.as_dict()
+    changed_edge.set_action("removed_again")
+    assert automaton.as_dict() is automaton_dict
+
+
+def test_jani_model_serialization_is_read_only():
+    """Test that the shared dictionaries of a serialized model cannot be modified by the caller."""
+    jani_file = os.path.join(
+        os.path.dirname(__file__), "_test_data", "plain_jani_examples", "array_test.jani"
+    )
+    with open(jani_file, "r", encoding="utf-8") as file:
+        jani_model = JaniModel.from_dict(json.load(file))
+    first_dict = jani_model.as_dict()
+    first_dict_copy = deepcopy(first_dict)
+    automaton_dict = first_dict["automata"][0]
+    edge_dict = automaton_dict["edges"][0]
+    assignment_dict = edge_dict["destinations"][0]["assignments"][1]
+    modifications = [
+        lambda: automaton_dict.update({"name": "changed"}),
+        lambda: automaton_dict["locations"].append({"name": "new"}),
+        lambda: edge_dict.pop("action"),
+        lambda: edge_dict["destinations"][0]["assignments"].clear(),
+        lambda: assignment_dict.__setitem__("index", 5),
+        lambda: assignment_dict["value"].__setitem__("op", "-"),
+    ]
+    for modify in modifications:
+        with pytest.raises(TypeError):
+            modify()
+    assert jani_model.as_dict() == first_dict_copy
+    assert json.loads(json.dumps(jani_model.as_dict())) == first_dict_copy
+
+
+def test_jani_composition_syncs():
+    """
+    Test that the syncs are reported for each automaton, and serialized in the Jani format.
+    """
+    composition = JaniComposition.from_dict(
+        {
+            "elements": [{"automaton": "sender"}, {"automaton": "receiver"}],
+            "syncs": [{"result": "msg", "synchronise": ["send", "receive"]}],
+        }
+    )
+    composition.add_element("logger")
+    composition.add_sync("log", {"logger": "log", "sender": "send"})
+    composition.add_sync("clear", {"logger": "clear"})
+    assert composition.get_syncs_for_element("sender") == {"send"}
+    assert composition.get_syncs_for_element("receiver") == {"receive"}
+    assert composition.get_syncs_for_element("logger") == {"log", "clear"}
+    assert composition.as_dict() == {
+        "elements": [{"automaton": "sender"}, {"automaton": "receiver"}, {"automaton": "logger"}],
+        "syncs": [
+            {"result": "clear", "synchronise": [None, None, "clear"]},
+            {"result": "log", "synchronise": ["send", None, "log"]},
+            {"result": "msg", "synchronise": ["send", "receive", None]},
+        ],
+    }
+
+
+def test_jani_automaton_edges_indexes():
+    """
+    Test that the edges indexes of the automata are kept up to date when modifying the edges.
+    """
+
+    def generate_edge(source: str, target: str, action: str) -> JaniEdge:
+        return JaniEdge(
+            {"location": source, "action": action, "destinations": [{"location": target}]}
+        )
+
+    automaton = JaniAutomaton()
+    automaton.set_name("indexed")
+    for location in ("a", "b"):
+        automaton.add_location(location, is_initial=location == "a")
+    a_to_b = generate_edge("a", "b", "go")
+    b_to_a = generate_edge("b", "a", "back")
+    a_loop = generate_edge("a", "a", "wait")
+    b_loop = generate_edge("b", "b", "go")
+    automaton.set_edges([a_to_b, b_to_a, a_loop, b_loop])
+    assert automaton.get_actions() == {"go", "back", "wait"}
+    assert automaton.get_edges_with_action("go") == [a_to_b, b_loop]
+    assert automaton.get_edges_from_location("a") == [a_to_b, a_loop]
+    automaton.set_edge_action(a_to_b, "leave")
+    assert automaton.get_edges_with_action("go") == [b_loop]
+    assert automaton.get_edges_with_action("leave") == [a_to_b]
+    # Setting the action from the edge keeps the automaton indexes up to date as well
+    b_to_a.set_action("return")
+    assert automaton.get_actions() == {"go", "leave", "return", "wait"}
+    assert automaton.get_edges_with_action("back") == []
+    assert automaton.get_edges_with_action("return") == [b_to_a]
+    b_to_a.set_action("back")
+    automaton.remove_empty_self_loop_edges()
+    assert automaton.get_edges() == [a_to_b, b_to_a]
+    assert automaton.get_actions() == {"leave", "back"}
+    assert automaton.get_edges_from_location("b") == [b_to_a]
+    automaton.remove_edges_with_action_name("back")
+    assert automaton.get_edges() == [a_to_b]
+    assert automaton.get_edges_from_location("b") == []
+    jani_model = JaniModel()
+    jani_model.add_jani_automaton(automaton)
+    assert jani_model.get_automaton("indexed") is automaton
+    assert jani_model.get_automaton("missing") is None
+    jani_model.remove_edges_with_action("leave", ["missing", "indexed"])
+    assert automaton.get_edges() == []
+    assert automaton.get_actions() == set()
+
+
+def _edge_dict(location, action, target, assignments=(), guard=None):
+    edge_dict = {
+        "location": location,
+        "action": action,
+        "destinations": [{"location": target, "assignments": list(assignments)}],
+    }
+    if guard is not None:
+        edge_dict["guard"] = {"exp": guard}
+    return edge_dict
+
+
+def _reduction_model(locations, edges, silent_actions, shared_actions=("go", "loop")):
+    """Model with the automata "aut" and "other", synchronizing the shared actions."""
+    syncs = [{"result": action, "synchronise": [action, action]} for action in shared_actions]
+    syncs.extend({"result": action, "synchronise": [action, None]} for action in silent_actions)
+    return JaniModel.from_dict(
+        {
+            "name": "reduction_test",
+            "variables": [{"name": "g", "type": "int", "initial-value": 0}],
+            "constants": [],
+            "automata": [
+                {
+                    "name": "aut",
+                    "variables": [{"name": "x", "type": "int", "initial-value": 0}],
+                    "locations": [{"name": loc} for loc in locations],
+                    "initial-locations": ["init"],
+                    "edges": edges,
+                },
+                {
+                    "name": "other",
+                    "locations": [{"name": "loc"}],
+                    "initial-locations": ["loc"],
+                    "edges": [_edge_dict("loc", action, "loc") for action in shared_actions],
+                },
+            ],
+            "system": {
+                "elements": [{"automaton": "aut"}, {"automaton": "other"}],
+                "syncs": syncs,
+            },
+            "properties": [],
+        }
+    )
+
+
+def test_jani_model_locations_reduction():
+    """Test the merge of the silent edges and the removal of the unneeded locations and edges."""
+    jani_model = _reduction_model(
+        ["init", "mid", "end", "dead"],
+        [
+            _edge_dict("init", "go", "mid", [{"ref": "x", "value": 1}]),
+            _edge_dict("mid", "step", "end", [{"ref": "x", "value": 2}]),
+            _edge_dict("end", "loop", "end", [{"ref": "g", "value": "x"}]),
+            _edge_dict("end", "never", "init", guard={"op": ">", "left": 1, "right": 2}),
+            _edge_dict("dead", "dead_step", "init"),
+        ],
+        ["step", "never", "dead_step"],
+    )
+    reduction = reduce_locations_in_jani_model(jani_model)
+    assert (reduction.n_locations_before, reduction.n_locations_after) == (5, 3)
+    assert (reduction.n_edges_before, reduction.n_edges_after) == (7, 4)
+    model_dict = jani_model.as_dict()
+    automaton_dict = model_dict["automata"][0]
+    assert [loc["name"] for loc in automaton_dict["locations"]] == ["end", "init"]
+    go_edge, loop_edge = automaton_dict["edges"]
+    assert go_edge["action"] == "go"
+    assert go_edge["destinations"][0]["location"] == "end"
+    # The assignments of the merged edge are executed after the ones of the original edge
+    assert go_edge["destinations"][0]["assignments"] == [
+        {"ref": "x", "value": 1, "index": 0},
+        {"ref": "x", "value": 2, "index": 1},
+    ]
+    assert loop_edge["action"] == "loop"
+    assert model_dict["system"]["syncs"] == [
+        {"result": "go", "synchronise": ["go", "go"]},
+        {"result": "loop", "synchronise": ["loop", "loop"]},
+    ]
+
+
+def test_jani_model_locations_reduction_multiple_in_edges():
+    """Test the merge of a location reached by several edges, one of them probabilistic."""
+    increment = {"ref": "x", "value": {"op": "+", "left": "x", "right": 1}}
+    probabilistic_edge = {
+        "location": "init",
+        "action": "loop",
+        "destinations": [
+            {"location": "mid", "probability": {"exp": 0.3}, "assignments": []},
+            {"location": "init", "probability": {"exp": 0.7}, "assignments": []},
+        ],
+    }
+    jani_model = _reduction_model(
+        ["init", "mid", "end"],
+        [
+            _edge_dict("init", "go", "mid", [{"ref": "x", "value": 1}]),
+            probabilistic_edge,
+            _edge_dict("mid", "step", "end", [increment]),
+            _edge_dict("end", "go", "init"),
+        ],
+        ["step"],
+    )
+    reduction = reduce_locations_in_jani_model(jani_model)
+    assert (reduction.n_locations_before, reduction.n_locations_after) == (4, 3)
+    assert (reduction.n_edges_before, reduction.n_edges_after) == (6, 5)
+    automaton = jani_model.get_automaton("aut")
+    assert automaton.get_actions() == {"go", "loop"}
+    edges_dict = automaton.as_dict()["edges"]
+    assert edges_dict[0]["destinations"] == [
+        {
+            "location": "end",
+            "assignments": [
+                {"ref": "x", "value": 1, "index": 0},
+                {**increment, "index": 1},
+            ],
+        }
+    ]
+    # Only the destination reaching the merged location is moved, keeping its probability
+    assert edges_dict[1]["destinations"] == [
+        {
+            "location": "end",
+            "probability": {"exp": 0.3},
+            "assignments": [{**increment, "index": 0}],
+        },
+        {"location": "init", "probability": {"exp": 0.7}, "assignments": []},
+    ]
+    # Each destination owns its copy of the merged assignments
+    go_edge, loop_edge = automaton.get_edges()[:2]
+    loop_edge.destinations[0].assignments[0].set_expression(JaniExpression(2))
+    assert go_edge.as_dict()["destinations"][0]["assignments"][1] == {**increment, "index": 1}
+
+
+def test_jani_model_locations_reduction_chain():
+    """Test the merge of a chain of silent edges, when a later location is merged first."""
+    jani_model = _reduction_model(
+        ["init", "c", "b", "d"],
+        [
+            _edge_dict("init", "go", "c", [{"ref": "x", "value": 1}]),
+            _edge_dict(
+                "c", "s1", "b", [{"ref": "x", "value": {"op": "+", "left": "x", "right": 1}}]
+            ),
+            _edge_dict(
+                "b", "s2", "d", [{"ref": "x", "value": {"op": "*", "left": "x", "right": 2}}]
+            ),
+            _edge_dict("d", "loop", "init"),
+        ],
+        ["s1", "s2"],
+    )
+    reduction = reduce_locations_in_jani_model(jani_model)
+    assert (reduction.n_locations_before, reduction.n_locations_after) == (5, 3)
+    assert (reduction.n_edges_before, reduction.n_edges_after) == (6, 4)
+    edges_dict = jani_model.get_automaton("aut").as_dict()["edges"]
+    assert [edge["action"] for edge in edges_dict] == ["go", "loop"]
+    assert edges_dict[0]["destinations"] == [
+        {
+            "location": "d",
+            "assignments": [
+                {"ref": "x", "value": 1, "index": 0},
+                {"ref": "x", "value": {"op": "+", "left": "x", "right": 1}, "index": 1},
+                {"ref": "x", "value": {"op": "*", "left": "x", "right": 2}, "index": 2},
+            ],
+        }
+    ]
+    assert [sync["result"] for sync in jani_model.as_dict()["system"]["syncs"]] == ["go", "loop"]
+
+
+def test_jani_model_locations_reduction_silent_cycle():
+    """Test that a cycle of silent edges is kept, as a silent self-loop."""
+    jani_model = _reduction_model(
+        ["init", "b", "c"],
+        [
+            _edge_dict("init", "go", "b"),
+            _edge_dict("b", "s1", "c", [{"ref": "x", "value": 1}]),
+            _edge_dict("c", "s2", "b", [{"ref": "x", "value": 2}]),
+        ],
+        ["s1", "s2"],
+        shared_actions=("go",),
+    )
+    reduction = reduce_locations_in_jani_model(jani_model)
+    assert (reduction.n_locations_before, reduction.n_locations_after) == (4, 3)
+    assert (reduction.n_edges_before, reduction.n_edges_after) == (4, 3)
+    automaton_dict = jani_model.get_automaton("aut").as_dict()
+    assert sorted(loc["name"] for loc in automaton_dict["locations"]) == ["c", "init"]
+    go_edge, loop_edge = automaton_dict["edges"]
+    assert go_edge["destinations"] == [
+        {"location": "c", "assignments": [{"ref": "x", "value": 1, "index": 0}]}
+    ]
+    assert loop_edge["location"] == "c"
+    assert loop_edge["action"] == "s2"
+    assert loop_edge["destinations"] == [
+        {
+            "location": "c",
+            "assignments": [
+                {"ref": "x", "value": 2, "index": 0},
+                {"ref": "x", "value": 1, "index": 1},
+            ],
+        }
+    ]
+    assert [sync["result"] for sync in jani_model.as_dict()["system"]["syncs"]] == ["go", "s2"]
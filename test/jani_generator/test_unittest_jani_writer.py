@@ -0,0 +1,62 @@
+# Copyright (c) 2025 - for information on the respective copyright owner
+# see the NOTICE file
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the streaming writer of Jani models"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from as2fm.jani_generator.jani_entries import JaniModel
+from as2fm.jani_generator.jani_entries.jani_writer import write_jani_model
+
+
+def _load_test_model() -> JaniModel:
+    jani_file = os.path.join(
+        os.path.dirname(__file__), "_test_data", "plain_jani_examples", "array_test.jani"
+    )
+    with open(jani_file, "r", encoding="utf-8") as file:
+        return JaniModel.from_dict(json.load(file))
+
+
+@pytest.mark.parametrize("fast_json", [False, True])
+def test_indented_output(tmp_path, fast_json):
+    """
+    Test that the indented output is the same as the one generated by json.dump.
+    """
+    jani_model = _load_test_model()
+    output_file = os.path.join(tmp_path, "model.jani")
+    write_jani_model(jani_model, output_file, fast_json=fast_json)
+    with open(output_file, "r", encoding="utf-8") as f:
+        written_text = f.read()
+    assert written_text == json.dumps(jani_model.as_dict(), indent=2, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("fast_json", [False, True])
+@pytest.mark.parametrize("file_name", ["model.jani", "model.jani.gz"])
+def test_compact_output(tmp_path, fast_json, file_name):
+    """
+    Test that the compact and the compressed outputs contain the same model.
+    """
+    jani_model = _load_test_model()
+    output_file = os.path.join(tmp_path, file_name)
+    write_jani_model(jani_model, output_file, compact=True, fast_json=fast_json)
+    open_fn = gzip.open if file_name.endswith(".gz") else open
+    with open_fn(output_file, "rt", encoding="utf-8") as f:
+        written_text = f.read()
+    assert "\n" not in written_text
+    assert json.loads(written_text) == jani_model.as_dict()
@@ -56,7 +56,7 @@ def get_time_step_from_timer_automaton(automaton: JaniAutomaton) -> int:
     assert (
         len(global_tick_edge) == 2
     ), f"Expected exactly two edges advancing the global timer in >{automaton.get_name()}<"
-    edge_dict = global_tick_edge[0].as_dict({})
+    edge_dict = global_tick_edge[0].as_dict()
     return int(edge_dict["destinations"][0]["assignments"][0]["value"]["right"])
 
 
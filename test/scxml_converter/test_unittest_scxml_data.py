@@ -16,6 +16,7 @@
 """Test the SCXML data conversion from all possible declaration types"""
 
 import unittest
+from copy import deepcopy
 
 import lxml.etree as ET
 import pytest
@@ -153,6 +154,22 @@ class TestScxmlData(unittest.TestCase):
         self.assertEqual(data_entries[2].get_name(), "condition")
         self.assertEqual(data_entries[3].get_name(), "some_array")
 
+    def test_datamodel_copy(self):
+        """
+        Test that copies of SCXML entries share the XML origin with the original ones.
+        """
+        xml_tree = ET.fromstring('<datamodel><data id="level" type="int32" expr="0" /></datamodel>')
+        scxml_data_model = ScxmlDataModel.from_xml_tree(xml_tree, {})
+        data_model_copy = deepcopy(scxml_data_model)
+        self.assertIsNot(data_model_copy, scxml_data_model)
+        self.assertIs(data_model_copy.get_xml_origin(), scxml_data_model.get_xml_origin())
+        data_entry = scxml_data_model.get_data_entries()[0]
+        data_entry_copy = data_model_copy.get_data_entries()[0]
+        self.assertIsNot(data_entry_copy, data_entry)
+        self.assertIs(data_entry_copy.get_xml_origin(), data_entry.get_xml_origin())
+        data_model_copy.get_data_entries().clear()
+        self.assertEqual(len(scxml_data_model.get_data_entries()), 1)
+
 
 if __name__ == "__main__":
     pytest.main(["-s", "-v", __file__])